@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+AI Bulletin rendering benchmark
+Runs the dashboard headless (streamlit AppTest) for the working tree and a
+baseline git revision, with NBFC_AI_INITIATIVES at 1× and N× its current
+size (scaled copy of the data store), and reports what the AI Bulletin tab
+sends per rerun: element count, markdown elements and protobuf payload.
+
+Run with:
+    python3 bench_ai_cards.py                    # baseline = HEAD, 10×
+    python3 bench_ai_cards.py --baseline <rev> --scale 20
+"""
+
+import os, shutil, subprocess, sys, tempfile, warnings
+
+ROOT   = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = 'nbfc_dashboard_v1.py'
+AI_TAB = 8
+sys.path.insert(0, ROOT)
+import nbfc_store
+
+warnings.filterwarnings('ignore')
+
+
+def scaled_store(tmp, n):
+    """A copy of the data store with every NBFC's AI initiatives repeated n times."""
+    path = os.path.join(tmp, f'store_{n}x.sqlite')
+    nbfc_store.build(path)
+    ai = dict(nbfc_store.load('ai', path))
+    ai['NBFC_AI_INITIATIVES'] = {k: v * n for k, v in ai['NBFC_AI_INITIATIVES'].items()}
+    nbfc_store.write_dataset('ai', ai, path, source='bench_ai_cards')
+    return path
+
+
+def _leaves(node):
+    children = getattr(node, 'children', None)
+    if children:
+        for child in children.values():
+            yield from _leaves(child)
+    elif hasattr(node, 'proto'):
+        yield node
+
+
+def measure(script, store):
+    from streamlit.testing.v1 import AppTest
+    nbfc_store.STORE_PATH = store
+    at = AppTest.from_file(script, default_timeout=600).run()
+    assert not at.exception, at.exception
+    leaves = list(_leaves(at.tabs[AI_TAB]))
+    md = [e for e in leaves if e.type == 'markdown']
+    return len(leaves), len(md), sum(e.proto.ByteSize() for e in leaves)
+
+
+def main(argv):
+    rev = argv[argv.index('--baseline') + 1] if '--baseline' in argv else 'HEAD'
+    n   = int(argv[argv.index('--scale') + 1]) if '--scale' in argv else 10
+    tmp = tempfile.mkdtemp()
+    store_path = nbfc_store.STORE_PATH
+    try:
+        baseline = os.path.join(tmp, SCRIPT)
+        with open(baseline, 'w') as f:
+            f.write(subprocess.check_output(['git', 'show', f'{rev}:{SCRIPT}'], cwd=ROOT, text=True))
+        print(f"{'AI Bulletin, default view':<32} {'elements':>9} {'markdown':>9} {'payload KB':>11}")
+        for scale in (1, n):
+            store = scaled_store(tmp, scale)
+            for label, script in ((f'baseline ({rev})', baseline), ('working tree', os.path.join(ROOT, SCRIPT))):
+                elements, markdown, size = measure(script, store)
+                print(f'{label + f", {scale}×":<32} {elements:>9} {markdown:>9} {size / 1024:>11.1f}')
+    finally:
+        nbfc_store.STORE_PATH = store_path
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
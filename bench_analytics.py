@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Analytics layer benchmark
+Times each nbfc_analytics computation on its own — without building the
+Plotly figure around it — over the current store: rankings and heat-map
+colours for every quarter, QoQ / YoY growth for every metric, radar scores
+(per NBFC, and the vectorised matrix for every quarter and method),
+SWOT for every NBFC (one at a time, and batched off one insight frame), the
+cross-sectional peer statistics, and daily P/B / indexed returns on
+synthetic 2-year price histories. With --workers, the per-NBFC work is also
+run in a process pool and checked against the in-process result.
+
+Run with:
+    python3 bench_analytics.py
+    python3 bench_analytics.py --workers 4
+"""
+
+import os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+import nbfc_analytics as na
+
+
+def best_of(fn, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def nbfc_bundle(args):
+    """Everything the Lens tab derives for one NBFC — picklable, for the worker pool."""
+    ts, td, nbfc = args
+    return na.swot(ts, td, nbfc), na.radar_scores(ts, nbfc, na.radar_bounds(ts))
+
+
+def main(argv):
+    workers = int(argv[argv.index('--workers') + 1]) if '--workers' in argv else 0
+    snap = nbfc_store.get_registry().current()
+    ts   = dict(snap['timeseries']['NBFC_TIMESERIES'])
+    td   = dict(snap['transcripts']['TRANSCRIPT_DATA'])
+    quarters = snap['timeseries']['QUARTERS']
+    metrics  = [m for m in snap['timeseries']['METRIC_LABELS'] if all(m in s for s in ts.values())]
+
+    days   = [date(2024, 4, 1) + timedelta(days=i) for i in range(730)]
+    closes = {n: [100.0 + (i * 7 + k * 13) % 50 for i in range(len(days))] for k, n in enumerate(na.DISPLAY_NAMES)}
+    closes_pd = {n: pd.Series(c, index=pd.DatetimeIndex(days)) for n, c in closes.items()}
+
+    radar_cube = na.metric_cube(ts, [m[0] for m in na.RADAR_METRICS], len(quarters))
+
+    def heat_all():
+        for q in range(len(quarters)):
+            for m, _, fmt, lib in na.RANKINGS_METRICS:
+                col = [na.value(ts, n, m, q) for n in na.DISPLAY_NAMES]
+                na.heat_colors(col, lib), [na.fmt_cell(v, fmt) for v in col]
+
+    cases = [
+        (f'rankings × {len(quarters)} quarters',  lambda: [na.rankings(ts, q) for q in range(len(quarters))]),
+        (f'heat colours × {len(quarters)} quarters', heat_all),
+        (f'growth QoQ+YoY × {len(metrics)} metrics', lambda: [(na.growth(v, 1), na.growth(v, 4))
+                                                            for m in metrics for v in na.series(ts, m).values()]),
+        ('radar scores, all NBFCs',               lambda: [na.radar_scores(ts, n, na.radar_bounds(ts)) for n in na.DISPLAY_NAMES]),
+        (f'radar matrix × {len(quarters)}q × 3 methods',
+                                                  lambda: [na.radar_matrix(radar_cube, m) for m in na.RADAR_METHODS]),
+        ('SWOT, all NBFCs',                       lambda: [na.swot(ts, td, n) for n in na.DISPLAY_NAMES]),
+        ('SWOT, all NBFCs, one insight frame',    lambda: na.swot_all(na.insight_frame(na.peer_stats(ts)), td)),
+        ('peer stats, all metrics × quarters',    lambda: na.peer_stats(ts)),
+        ('daily P/B, 2Y × all NBFCs',             lambda: [na.pb_series(ts[na.CACHE_KEY[n]]['bvps_inr'], quarters, days, c)
+                                                           for n, c in closes.items()]),
+        ('indexed returns, 2Y × all NBFCs',       lambda: [na.indexed(c) for c in closes_pd.values()]),
+    ]
+    print(f"{'Computation':<36} {'ms':>8}")
+    for label, fn in cases:
+        print(f'{label:<36} {best_of(fn) * 1e3:>8.2f}')
+
+    if workers:
+        jobs = [(ts, td, n) for n in na.DISPLAY_NAMES]
+        t0 = time.perf_counter()
+        local = [nbfc_bundle(j) for j in jobs]
+        t_local = time.perf_counter() - t0
+        with ProcessPoolExecutor(workers) as ex:
+            list(ex.map(nbfc_bundle, jobs))            # warm the workers
+            t0 = time.perf_counter()
+            pooled = list(ex.map(nbfc_bundle, jobs))
+            t_pool = time.perf_counter() - t0
+        assert pooled == local
+        print(f'\nLens bundle, all NBFCs: in-process {t_local * 1e3:.2f} ms, '
+              f'{workers} workers {t_pool * 1e3:.2f} ms (results identical)')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
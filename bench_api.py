@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Analytics API load test
+Starts `nbfc_api.py serve` as one process on a free port and drives it
+with keep-alive HTTP/1.1 connections from an asyncio client: for each
+route, full 200 responses and If-None-Match revalidations (304), reporting
+requests/s and p50 / p99 latency. The client shares the machine with the
+server, so the numbers are a floor for what the single process sustains.
+/v1/pb is left out: it needs a live price download.
+
+Run with:
+    python3 bench_api.py                          # 64 connections, 5 s per row
+    python3 bench_api.py --connections 256 --seconds 10
+"""
+
+import asyncio, os, socket, subprocess, sys, time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PATHS = ['/v1/meta', '/v1/rankings', '/v1/rankings?quarter=Q4FY25', '/v1/deltas/aum_cr',
+         '/v1/radar', '/v1/swot/Bajaj%20Finance']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def request(reader, writer, path, etag=None):
+    """One GET on an open connection → (status, etag, body)."""
+    extra = f'If-None-Match: {etag}\r\n' if etag else ''
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: bench\r\n{extra}\r\n'.encode())
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+    headers = {k.lower(): v for k, v in headers.items()}
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return int(lines[0].split()[1]), headers.get('etag'), body
+
+
+async def load(port, path, etag, connections, seconds):
+    """(requests, latencies) from `connections` clients looping for `seconds`."""
+    stop = time.perf_counter() + seconds
+    latencies = []
+    expected = 304 if etag else 200
+
+    async def client():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            while time.perf_counter() < stop:
+                t0 = time.perf_counter()
+                status, _, _ = await request(reader, writer, path, etag)
+                latencies.append(time.perf_counter() - t0)
+                assert status == expected, (path, status)
+        finally:
+            writer.close()
+
+    await asyncio.gather(*[client() for _ in range(connections)])
+    return len(latencies), sorted(latencies)
+
+
+async def wait_ready(port, proc, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            sys.exit('server exited during start-up')
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            status, _, _ = await request(reader, writer, '/v1/meta')
+            writer.close()
+            if status == 200:
+                return
+        except OSError:
+            await asyncio.sleep(0.2)
+    sys.exit('server did not start')
+
+
+async def run(port, proc, connections, seconds):
+    await wait_ready(port, proc)
+    print(f"{'Route':<32} {'mode':>5} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>8}")
+    for path in PATHS:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        status, etag, body = await request(reader, writer, path)
+        writer.close()
+        assert status == 200, (path, status)
+        for mode, tag in (('200', None), ('304', etag)):
+            n, lat = await load(port, path, tag, connections, seconds)
+            print(f'{path:<32} {mode:>5} {n / seconds:>8.0f} {lat[len(lat) // 2] * 1e3:>8.2f} '
+                  f'{lat[int(len(lat) * 0.99)] * 1e3:>8.2f} {len(body) if mode == "200" else 0:>8}')
+
+
+def main(argv):
+    connections = int(argv[argv.index('--connections') + 1]) if '--connections' in argv else 64
+    seconds     = float(argv[argv.index('--seconds') + 1]) if '--seconds' in argv else 5
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'nbfc_api.py'), 'serve', '--port', str(port)],
+                            stdout=subprocess.DEVNULL)
+    try:
+        print(f'{connections} connections, {seconds:g} s per row, 1 server process, {os.cpu_count()} CPU(s)\n')
+        asyncio.run(run(port, proc, connections, seconds))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
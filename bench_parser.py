@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+PDF parser benchmark
+Times per-page extraction of the current fetch_presentations against a
+baseline revision loaded from git, on a synthetic deck (or real decks in
+data/pdfs/ when present), and checks both give the same metrics. Also times
+row clustering (page_rows) on jittered word grids and counts rows recovered.
+
+Run with:
+    python3 bench_parser.py                    # baseline = tree before this benchmark was added
+    python3 bench_parser.py --baseline <rev>   # any rev that has _extract_page
+"""
+
+import glob, os, random, subprocess, sys, time, types
+
+import fitz  # PyMuPDF
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import fetch_presentations as fp
+
+
+def base_rev():
+    """Parent of the commit that added this benchmark: the parser before the tokenizer."""
+    added = subprocess.check_output(['git', 'log', '--diff-filter=A', '--format=%H', '--', 'bench_parser.py'],
+                                    cwd=ROOT, text=True).split()[-1]
+    return added + '^'
+
+
+def load_baseline(rev):
+    """Import fetch_presentations.py as it was at git revision `rev`."""
+    src = subprocess.check_output(['git', 'show', f'{rev}:fetch_presentations.py'],
+                                  cwd=ROOT, text=True)
+    mod = types.ModuleType('fp_baseline')
+    mod.__file__ = os.path.join(ROOT, 'fetch_presentations.py')
+    exec(compile(src, 'fp_baseline', 'exec'), mod.__dict__)
+    return mod
+
+
+# ── Synthetic deck: narrative-heavy highlights + ratio tables ───────────────
+
+_NARRATIVE = (
+    'Key Highlights Q3 FY26. AUM grew 24% YoY to ₹ 55,017 crore; Gross Loan Book '
+    'crossed the ₹50,000 Cr milestone. Disbursement of Rs. 12,345 crore in the quarter, '
+    'up 18%. Net Interest Income stood at ₹ 1,245 crore while NIM expanded 35 bps. '
+    'Standalone Profit after Tax of ₹ 150 Cr. GNPA & NNPA stood at 1.51% & 0.80%. '
+    'Stage 3 assets were Rs 830 Cr; credit cost 2.1%. CRAR at 18.17%. '
+)
+_RATIO_ROWS = ['NIM', 'GNPA (%)', 'NNPA (%)', 'RoA', 'RoE', 'CRAR']
+
+
+def _synthetic_pages(n_pages=40):
+    pages = []
+    for i in range(n_pages):
+        cells = []
+        if i % 2 == 0:
+            for j in range(6):
+                cells.append((40, 60 + j * 90, _NARRATIVE[j * 60:(j + 1) * 60]))
+                cells.append((40, 80 + j * 90, _NARRATIVE[(j + 1) * 60:(j + 2) * 60]))
+        else:
+            cells.append((40, 50, 'Key Ratios Q2FY26 Q3FY26'))
+            for r, label in enumerate(_RATIO_ROWS):
+                y = 90 + r * 22
+                cells += [(60, y, label), (260, y, f'{1 + r * 0.7:.2f}'),
+                          (370, y, f'{1.2 + r * 0.7:.2f}')]
+            cells += [(260, 60, 'Q2FY26'), (370, 60, 'Q3FY26')]
+        pages.append(cells)
+    return pages
+
+
+def build_synthetic_deck(path, n_pages=40):
+    doc = fitz.open()
+    for placements in _synthetic_pages(n_pages):
+        page = doc.new_page()
+        for x, y, text in placements:
+            page.insert_text((x, y), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+# ── Timing ───────────────────────────────────────────────────────────────────
+
+def _time_pages(mod, pages, repeat):
+    """
+    Best-of-`repeat` seconds per page for _extract_page with every group on.
+    Word rows are precomputed so only the extractors themselves are timed.
+    """
+    groups = list(mod._METRIC_GROUPS)
+    rows   = {page.number: mod.page_rows(page) for page, _ in pages}
+    real   = mod.page_rows
+    mod.page_rows = lambda page, *a, **kw: rows[page.number]
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for page, text in pages:
+                mod._extract_page(page, text, groups, {}, False)
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        mod.page_rows = real
+    return best / len(pages)
+
+
+def bench_pdf(path, baseline, repeat=5):
+    doc   = fitz.open(path)
+    pages = [(doc[i], doc[i].get_text()) for i in range(len(doc))]
+    before = _time_pages(baseline, pages, repeat)
+    after  = _time_pages(fp, pages, repeat)
+    doc.close()
+    same = baseline.parse_pdf(path) == fp.parse_pdf(path)
+    return before, after, same
+
+
+class _WordsPage:
+    """Stand-in page exposing get_text('words') over a prepared word list."""
+    def __init__(self, words):
+        self.words = words
+
+    def get_text(self, _kind):
+        return self.words
+
+
+def _jittered_words(n_words, per_row=12, pitch=14, jitter=2.0, seed=0):
+    """Table-like word grid whose y-midpoints wobble ±jitter around each row."""
+    rnd, words, r = random.Random(seed), [], 0
+    while len(words) < n_words:
+        yc = 30 + r * pitch
+        for c in range(per_row):
+            x, y = 40 + c * 45, yc + rnd.uniform(-jitter, jitter)
+            words.append((x, y - 4, x + 30, y + 4, f'w{len(words)}', 0, 0, 0))
+        r += 1
+    rnd.shuffle(words)
+    return words, r
+
+
+def bench_rows(baseline, sizes=(100, 1_000, 10_000), repeat=7):
+    print(f"{'Words':>7} {'Before ms':>10} {'After ms':>9} {'Speedup':>8}  Rows before/after/true")
+    for n in sizes:
+        words, true_rows = _jittered_words(n)
+        page = _WordsPage(words)
+        times, counts = [], []
+        for mod in (baseline, fp):
+            best = float('inf')
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                rows = mod.page_rows(page)
+                best = min(best, time.perf_counter() - t0)
+            times.append(best)
+            counts.append(len(rows))
+        print(f'{n:>7} {times[0] * 1e3:>10.2f} {times[1] * 1e3:>9.2f} '
+              f'{times[0] / times[1]:>7.2f}x  {counts[0]}/{counts[1]}/{true_rows}')
+
+
+def main(argv):
+    rev = argv[argv.index('--baseline') + 1] if '--baseline' in argv else base_rev()
+    baseline = load_baseline(rev)
+
+    pdfs = sorted(glob.glob(os.path.join(fp.PDF_DIR, '*.pdf')))
+    tmp  = None
+    if not pdfs:
+        tmp = os.path.join(ROOT, '_bench_synthetic.pdf')
+        build_synthetic_deck(tmp)
+        pdfs = [tmp]
+
+    print(f'Baseline: {rev}')
+    print(f"{'Deck':<32} {'Before µs/pg':>13} {'After µs/pg':>12} {'Speedup':>8}  Same")
+    try:
+        for path in pdfs:
+            before, after, same = bench_pdf(path, baseline)
+            print(f'{os.path.basename(path):<32} {before * 1e6:>13.0f} {after * 1e6:>12.0f} '
+                  f'{before / after:>7.2f}x  {"yes" if same else "NO"}')
+    finally:
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+
+    print()
+    bench_rows(baseline)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Rankings heat-map benchmark
+Times the Rankings table's cell text and fills for every quarter of the
+store, with the NBFC list widened by synthetic peers (each a copy of a real
+NBFC's series, scaled) to show how it scales:
+  string round trip  format every value, parse the text back, colour per column
+  per column         look values up one by one, colour per column
+  cube               metric_cube once per data version, then rankings_cells
+                     (one vectorised colour pass, formatting last) per quarter
+All three are checked to produce the same cells. The last column is
+rank_matrices: ranks and percentiles for every metric × quarter at once,
+which the Rankings quarter slider and rank sparklines read.
+
+Run with:
+    python3 bench_rankings.py                    # 9, 100 and 500 NBFCs
+    python3 bench_rankings.py --nbfcs 9,1000
+"""
+
+import os, sys, time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+import nbfc_analytics as na
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def widen(ts, n):
+    """(timeseries, names) with `n` NBFCs: the real ones, then scaled copies."""
+    ts, names = dict(ts), list(na.DISPLAY_NAMES[:n])
+    for i in range(len(names), n):
+        src = ts[na.CACHE_KEY[na.DISPLAY_NAMES[i % len(na.DISPLAY_NAMES)]]]
+        k = 1 + (i * 37 % 101) / 200
+        ts[f'Peer {i}'] = {m: [None if v is None else v * k for v in vals] for m, vals in src.items()}
+        names.append(f'Peer {i}')
+    return ts, names
+
+
+def _parse_num(s):
+    if s == '—':
+        return None
+    return float(s.replace('₹', '').replace(',', '').replace('%', '').replace('x', ''))
+
+
+def cells_round_trip(ts, names, q):
+    """The table before: text first, colours from the text parsed back into floats."""
+    text, fills = [], []
+    for metric, _, fmt, lib in na.RANKINGS_METRICS:
+        col = [na.fmt_cell(ts[na.CACHE_KEY.get(n, n)].get(metric, [None] * (q + 1))[q], fmt) for n in names]
+        text.append(col)
+        fills.append(na.heat_colors([_parse_num(c) for c in col], lib))
+    return text, fills
+
+
+def cells_per_column(ts, names, q):
+    text, fills = [], []
+    for metric, _, fmt, lib in na.RANKINGS_METRICS:
+        col = [ts[na.CACHE_KEY.get(n, n)].get(metric, [None] * (q + 1))[q] for n in names]
+        text.append([na.fmt_cell(v, fmt) for v in col])
+        fills.append(na.heat_colors(col, lib))
+    return text, fills
+
+
+def main(argv):
+    sizes = [int(n) for n in argv[argv.index('--nbfcs') + 1].split(',')] if '--nbfcs' in argv else [9, 100, 500]
+    snap = nbfc_store.get_registry().current()
+    quarters = snap['timeseries']['QUARTERS']
+    metric_keys = [m[0] for m in na.RANKINGS_METRICS]
+    lower = [m[3] for m in na.RANKINGS_METRICS]
+    nq = len(quarters)
+
+    print(f'Rankings cells for all {nq} quarters, {len(metric_keys)} metrics\n')
+    print(f"{'NBFCs':>6} {'round trip ms':>14} {'per column ms':>14} {'cube build ms':>14} {'cube cells ms':>14} {'rank matrices ms':>17}")
+    for n in sizes:
+        ts, names = widen(snap['timeseries']['NBFC_TIMESERIES'], n)
+        cube = na.metric_cube(ts, metric_keys, nq, names)
+        for q in range(nq):
+            new = na.rankings_cells(cube[:, :, q])
+            assert new == cells_per_column(ts, names, q), q
+            # the round trip loses whatever fmt_cell rounds away, so only the text is comparable
+            assert new[0] == cells_round_trip(ts, names, q)[0], q
+        t_rt   = best_of(lambda: [cells_round_trip(ts, names, q) for q in range(nq)])
+        t_col  = best_of(lambda: [cells_per_column(ts, names, q) for q in range(nq)])
+        t_cube = best_of(lambda: na.metric_cube(ts, metric_keys, nq, names))
+        t_cell = best_of(lambda: [na.rankings_cells(cube[:, :, q]) for q in range(nq)])
+        t_rank = best_of(lambda: na.rank_matrices(cube, lower))
+        print(f'{n:>6} {t_rt * 1e3:>14.2f} {t_col * 1e3:>14.2f} {t_cube * 1e3:>14.2f} {t_cell * 1e3:>14.2f} {t_rank * 1e3:>17.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
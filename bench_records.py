@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Record-type benchmark
+Compares the dict form of NBFC_AI_INITIATIVES / SHAREHOLDING named_entities
+(as decoded from the data store) with the slotted records in nbfc_records,
+at N× the current data size: retained memory (tracemalloc) and the time of
+the tab9 filter + sort and tab10 category grouping loops, plus tab9 queries
+through AIIndex.
+
+Run with:
+    python3 bench_records.py            # 10× current size
+    python3 bench_records.py --scale 50
+"""
+
+import gc, json, os, sys, time, tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+import nbfc_records
+
+SH_CATEGORIES = ['Promoter', 'FII', 'DII – MF', 'DII – Insurance', 'DII – Pension',
+                 'DII – Other', 'Public']
+
+
+def scaled(value, n):
+    """JSON text of `value` with every per-NBFC list repeated n times."""
+    return json.dumps({k: v * n for k, v in value.items()}, ensure_ascii=False)
+
+
+def scaled_shareholding(sh, n):
+    return json.dumps({k: dict(v, named_entities=v['named_entities'] * n) for k, v in sh.items()},
+                      ensure_ascii=False)
+
+
+def retained(build):
+    """Bytes still allocated after build() returns (its result kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def best_of(fn, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ── The render loops, in both forms ──────────────────────────────────────────
+
+def _parse_ai_date(d):
+    try:
+        return datetime.strptime(d.strip(), "%d %b %Y")
+    except Exception:
+        return datetime(1970, 1, 1)
+
+
+def ai_loop_dicts(initiatives, func):
+    items = [(nbfc, init) for nbfc, lst in initiatives.items() for init in lst
+             if func in init.get('functions', [])]
+    items.sort(key=lambda x: _parse_ai_date(x[1].get('date', '')), reverse=True)
+    return [(init.get('title', ''), init.get('date', ''), init.get('source_url', '')) for _, init in items]
+
+
+def ai_loop_records(records, func):
+    items = [r for lst in records.values() for r in lst if func in r.functions]
+    items.sort(key=lambda r: r.day, reverse=True)
+    return [(r.title, r.date, r.source_url) for r in items]
+
+
+def _latest(lst):
+    for v in reversed(lst):
+        if v is not None:
+            return v
+    return 0
+
+
+def sh_loop_dicts(sh):
+    out = 0
+    for data in sh.values():
+        ents = data.get('named_entities', [])
+        for cat in SH_CATEGORIES:
+            rows = sorted((e for e in ents if e.get('category') == cat),
+                          key=lambda e: _latest(e['pct']), reverse=True)
+            out += sum(len(e['name']) for e in rows)
+    return out
+
+
+def sh_loop_records(records):
+    out = 0
+    for ents in records.values():
+        for cat in SH_CATEGORIES:
+            rows = sorted((e for e in ents if e.category == cat),
+                          key=lambda e: _latest(e.pct), reverse=True)
+            out += sum(len(e.name) for e in rows)
+    return out
+
+
+def main(argv):
+    n  = int(argv[argv.index('--scale') + 1]) if '--scale' in argv else 10
+    ai = nbfc_store.load('ai')['NBFC_AI_INITIATIVES']
+    sh = nbfc_store.load('shareholding')['SHAREHOLDING']
+    ai_json, sh_json = scaled(ai, n), scaled_shareholding(sh, n)
+
+    ai_dicts = json.loads(ai_json)
+    sh_dicts = json.loads(sh_json)
+    ai_recs  = nbfc_records.ai_records(ai_dicts)
+    sh_recs  = nbfc_records.entity_records(sh_dicts)
+    n_ai  = sum(len(v) for v in ai_recs.values())
+    n_ent = sum(len(v) for v in sh_recs.values())
+    assert ai_loop_dicts(ai_dicts, 'Collections') == ai_loop_records(ai_recs, 'Collections')
+    assert sh_loop_dicts(sh_dicts) == sh_loop_records(sh_recs)
+
+    print(f'Scale {n}×: {n_ai} AI initiatives, {n_ent} named shareholders\n')
+    print(f"{'Memory (retained)':<28} {'dicts KB':>10} {'records KB':>11} {'saved':>7}")
+    for label, src, build in (
+            ('AI initiatives', ai_json, nbfc_records.ai_records),
+            ('Shareholders (+pct lists)', sh_json, nbfc_records.entity_records)):
+        d = retained(lambda: json.loads(src))
+        r = retained(lambda: build(json.loads(src)))
+        print(f'{label:<28} {d / 1024:>10.0f} {r / 1024:>11.0f} {1 - r / d:>6.0%}')
+
+    print(f"\n{'Loop':<28} {'dicts ms':>10} {'records ms':>11} {'speedup':>8}")
+    for label, f_d, f_r in (
+            ('tab9 filter + sort', lambda: ai_loop_dicts(ai_dicts, 'Collections'),
+                                   lambda: ai_loop_records(ai_recs, 'Collections')),
+            ('tab10 group by category', lambda: sh_loop_dicts(sh_dicts),
+                                        lambda: sh_loop_records(sh_recs))):
+        td, tr = best_of(f_d), best_of(f_r)
+        print(f'{label:<28} {td * 1e3:>10.3f} {tr * 1e3:>11.3f} {td / tr:>7.2f}x')
+
+    index = nbfc_records.AIIndex(ai_recs)
+    nbfc  = next(iter(ai_recs))
+    print(f"\n{'tab9 query':<28} {'scan ms':>10} {'index ms':>11} {'speedup':>8}")
+    for label, kw in (('all, newest first', {}),
+                      ('function, newest first', {'function': 'Collections'}),
+                      ('NBFC + function, title', {'nbfc': nbfc, 'function': 'Collections', 'sort': 'Title'})):
+        key, reverse = nbfc_records.AI_SORTS[kw.get('sort', 'Newest first')]
+        def scan(nbfc=kw.get('nbfc'), func=kw.get('function')):
+            items = [r for lst in ai_recs.values() for r in lst
+                     if (nbfc is None or r.nbfc == nbfc) and (func is None or func in r.functions)]
+            return sorted(items, key=key, reverse=reverse)
+        assert scan() == index.query(**kw)
+        ts, ti = best_of(scan), best_of(lambda: index.query(**kw))
+        print(f'{label:<28} {ts * 1e3:>10.3f} {ti * 1e3:>11.3f} {ts / ti:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Full-text search benchmark
+Builds the nbfc_search index over AI initiatives, transcript commentary,
+guidance and SWOT items (transcript swot_prepend) replicated N× and times
+typical search-box queries: single terms, prefixes, multi-term AND and a
+stop-word-like worst case.
+
+Run with:
+    python3 bench_search.py             # 100× current corpus
+    python3 bench_search.py --scale 10
+"""
+
+import os, sys, time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+import nbfc_records
+import nbfc_search
+
+QUERIES = ['collections', 'underwr', 'credit cost', 'aum growth fy27', 'gen ai',
+           'digital lending platform', 'cre', 'the']
+
+
+def best_of(fn, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv):
+    n  = int(argv[argv.index('--scale') + 1]) if '--scale' in argv else 100
+    ai = nbfc_records.AIIndex(nbfc_records.ai_records(nbfc_store.load('ai')['NBFC_AI_INITIATIVES']))
+    td = nbfc_store.load('transcripts')['TRANSCRIPT_DATA']
+    swot = {nbfc: tuple(t.get('swot_prepend', {}).get(k, []) for k in 'SWOT') for nbfc, t in td.items()}
+    docs = nbfc_search.documents(ai.items, td, swot) * n
+
+    t0 = time.perf_counter()
+    index = nbfc_search.SearchIndex(docs)
+    build = time.perf_counter() - t0
+    print(f'Scale {n}×: {len(docs)} documents, {len(index.vocab)} terms, built in {build * 1e3:.0f} ms\n')
+
+    print(f"{'Query':<28} {'matches':>8} {'top-20 ms':>10}")
+    worst = 0
+    for q in QUERIES:
+        matches = len(index.search(q, limit=None))
+        t = best_of(lambda: index.search(q, limit=20))
+        worst = max(worst, t)
+        print(f'{q:<28} {matches:>8} {t * 1e3:>10.2f}')
+    print(f"\n{'worst':<28} {'':>8} {worst * 1e3:>10.2f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
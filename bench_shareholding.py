@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Shareholding render benchmark
+Times the tab10 HTML for every NBFC in SHAREHOLDING — cross-NBFC snapshot,
+summary cards and ≥1% holders table — built from scratch (what each rerun
+paid before) and served from the view cache (what a rerun pays now).
+
+Run with:
+    python3 bench_shareholding.py
+    python3 bench_shareholding.py --scale 10    # 10× named shareholders per NBFC
+"""
+
+import os, sys, time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+import nbfc_views
+import nbfc_records
+import nbfc_shareholding
+from nbfc_views import constants
+
+
+def best_of(fn, repeat=50):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv):
+    n   = int(argv[argv.index('--scale') + 1]) if '--scale' in argv else 1
+    sh  = nbfc_store.load('shareholding')
+    data = {k: dict(v, named_entities=v.get('named_entities', []) * n) for k, v in sh['SHAREHOLDING'].items()}
+    quarters = sh['SH_QUARTERS']
+    names    = list(data)
+    entities = nbfc_records.entity_records(data)
+
+    def build(nbfc, mode):
+        if mode == 'snapshot':
+            return nbfc_shareholding.snapshot_table(data, quarters, names, {})
+        if mode == 'summary':
+            return nbfc_shareholding.summary_cards(data[nbfc], quarters, sh['CATEGORY_COLORS'])
+        return nbfc_shareholding.holders_table(data[nbfc], entities[nbfc], quarters,
+                                               sh['ENTITY_CATEGORY_COLORS'], sh['ENTITY_BADGE_TEXT_COLORS'])
+
+    graph = nbfc_views.ViewGraph(nbfc_store.Registry(poll_interval=60))
+    cached = graph.view('sh_html', constants('shareholding', 'SHAREHOLDING', 'SH_QUARTERS', 'CATEGORY_COLORS',
+                                             'ENTITY_CATEGORY_COLORS', 'ENTITY_BADGE_TEXT_COLORS'))(build)
+
+    def render_all(fn):
+        return [fn(None, 'snapshot')] + [fn(nbfc, mode) for nbfc in names for mode in ('summary', 'holders')]
+
+    assert render_all(build) == render_all(cached)
+    n_ents = sum(len(v) for v in entities.values())
+    size   = sum(len(h) if isinstance(h, str) else sum(map(len, h)) for h in render_all(build))
+    print(f'{len(names)} NBFCs, {n_ents} named shareholders, {size / 1024:.0f} KB of HTML\n')
+
+    print(f"{'Render (all NBFCs)':<28} {'ms':>8}")
+    t_build  = best_of(lambda: render_all(build))
+    t_cached = best_of(lambda: render_all(cached))
+    print(f"{'built every rerun':<28} {t_build * 1e3:>8.3f}")
+    print(f"{'view cache hit':<28} {t_cached * 1e3:>8.3f}")
+    print(f"{'speedup':<28} {t_build / t_cached:>7.1f}x")
+    print(f"\n{'holders table only':<28} {'build ms':>8} {'cached ms':>10}")
+    for nbfc in names:
+        tb, tc = best_of(lambda: build(nbfc, 'holders')), best_of(lambda: cached(nbfc, 'holders'))
+        print(f'{nbfc:<28} {tb * 1e3:>8.3f} {tc * 1e3:>10.4f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Dashboard startup benchmark
+Times a session's first full run of the dashboard (streamlit AppTest, fresh
+interpreter per run) for the working tree and a baseline git revision, plus
+the prelude alone (everything above st.set_page_config: imports and data
+loads). For the full run it also records when the market-data stack
+(yfinance, and the pandas it pulls in) is first imported, measured from the
+start of the script. Writes a -X importtime profile of both preludes to
+benchmarks/importtime.txt.
+
+Live prices need the network; without it the yfinance calls fail fast and the
+full-run numbers cover imports and rendering only.
+
+Run with:
+    python3 bench_startup.py                    # baseline = pre-series root commit
+    python3 bench_startup.py --baseline <rev>   # e.g. HEAD~1
+    python3 bench_startup.py --repeat 5
+"""
+
+import os, statistics, subprocess, sys, tempfile
+
+ROOT    = os.path.dirname(os.path.abspath(__file__))
+SCRIPT  = 'nbfc_dashboard_v1.py'
+REPORT  = os.path.join(ROOT, 'benchmarks', 'importtime.txt')
+_MARKER = 'st.set_page_config('
+
+# Streamlit itself is already imported by the server before a script runs
+_TIMED = ('import streamlit, time\n'
+          't0 = time.perf_counter()\n'
+          'exec(compile({src!r}, "prelude", "exec"), {{"__name__": "__prelude__"}})\n'
+          'print(time.perf_counter() - t0)\n')
+
+# A full first run; a meta-path hook notes when yfinance is first imported
+_FIRST_RUN = ('import sys, time\n'
+              'from streamlit.testing.v1 import AppTest\n'
+              'seen = {{}}\n'
+              'class Hook:\n'
+              '    def find_spec(self, name, path=None, target=None):\n'
+              '        if name == "yfinance" and name not in seen:\n'
+              '            seen[name] = time.perf_counter()\n'
+              'sys.meta_path.insert(0, Hook())\n'
+              'at = AppTest.from_file({path!r}, default_timeout=600)\n'
+              't0 = time.perf_counter()\n'
+              'at.run()\n'
+              'total = time.perf_counter() - t0\n'
+              'assert not at.exception, at.exception\n'
+              'print(total, seen.get("yfinance", t0 + total) - t0)\n')
+
+
+def source(rev=None):
+    """The dashboard script, from the tree or a git rev."""
+    if rev is None:
+        with open(os.path.join(ROOT, SCRIPT)) as f:
+            return f.read()
+    return subprocess.check_output(['git', 'show', f'{rev}:{SCRIPT}'], cwd=ROOT, text=True)
+
+
+def prelude(rev=None):
+    """Source of the dashboard above st.set_page_config, from the tree or a git rev."""
+    src = source(rev)
+    return src[:src.index(_MARKER)]
+
+
+def root_rev():
+    """The repository's first commit: the dashboard before this optimisation series."""
+    out = subprocess.check_output(['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=ROOT, text=True)
+    return out.split()[-1]
+
+
+def _python(args, pycache, write=False):
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+    env['PYTHONWARNINGS'] = 'ignore'
+    cmd = [sys.executable, '-X', f'pycache_prefix={pycache}'] + ([] if write else ['-B'])
+    return subprocess.run(cmd + args, cwd=ROOT, env=env, text=True,
+                          capture_output=True, check=True)
+
+
+def time_prelude(src, repeat, pycache):
+    code = _TIMED.format(src=src)
+    _python(['-c', code], pycache, write=True)          # warm the bytecode cache
+    runs = [float(_python(['-c', code], pycache).stdout.strip().splitlines()[-1])
+            for _ in range(repeat)]
+    return statistics.median(runs)
+
+
+def time_first_run(path, repeat, pycache):
+    """Median (total, market-stack import) seconds of a session's first full run."""
+    code = _FIRST_RUN.format(path=path)
+    _python(['-c', code], pycache, write=True)
+    runs = [tuple(map(float, _python(['-c', code], pycache).stdout.strip().splitlines()[-1].split()))
+            for _ in range(repeat)]
+    return tuple(statistics.median(col) for col in zip(*runs))
+
+
+def importtime_report(src, pycache):
+    """Top-level imports of the prelude, slowest first (cumulative µs)."""
+    code = 'import streamlit\n' + f'exec(compile({src!r}, "prelude", "exec"), {{"__name__": "__prelude__"}})\n'
+    err  = _python(['-X', 'importtime', '-c', code], pycache).stderr
+    seen, rows = False, []
+    for line in err.splitlines():
+        parts = line[len('import time:'):].split('|')
+        if not line.startswith('import time:') or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]                  # drop the separator space; nesting is indented
+        if name.startswith(' '):
+            continue
+        if name == 'streamlit' and not seen:
+            seen = True                      # interpreter / streamlit start-up ends here
+            continue
+        if seen:
+            rows.append((int(parts[1]), name))
+    rows.sort(reverse=True)
+    return rows
+
+
+def main(argv):
+    rev    = argv[argv.index('--baseline') + 1] if '--baseline' in argv else root_rev()
+    repeat = int(argv[argv.index('--repeat') + 1]) if '--repeat' in argv else 3
+    label  = f'baseline ({rev[:10]})'
+    pycache = tempfile.mkdtemp()
+
+    # The baseline must sit next to the nbfc_* modules it imports
+    fd, base_path = tempfile.mkstemp(prefix='_bench_base_', suffix='.py', dir=ROOT)
+    with os.fdopen(fd, 'w') as f:
+        f.write(source(rev))
+    try:
+        before = time_first_run(base_path, repeat, pycache)
+        after  = time_first_run(os.path.join(ROOT, SCRIPT), repeat, pycache)
+    finally:
+        os.remove(base_path)
+    pre_before = time_prelude(prelude(rev), repeat, pycache)
+    pre_after  = time_prelude(prelude(), repeat, pycache)
+
+    print(f"{'':<24} {'Prelude ms':>11} {'First run ms':>13} {'yfinance at ms':>15}")
+    for name, pre, (total, market) in ((label, pre_before, before), ('working tree', pre_after, after)):
+        print(f"{name:<24} {pre * 1e3:>11.1f} {total * 1e3:>13.1f} {market * 1e3:>15.1f}")
+    print(f"{'speedup':<24} {pre_before / pre_after:>10.2f}x {before[0] / after[0]:>12.2f}x")
+
+    os.makedirs(os.path.dirname(REPORT), exist_ok=True)
+    with open(REPORT, 'w') as f:
+        f.write('# -X importtime, top-level imports of the nbfc_dashboard_v1.py prelude\n')
+        f.write('# (after streamlit; warm bytecode cache). Regenerate: python3 bench_startup.py\n')
+        f.write(f'# prelude median: {label} {pre_before * 1e3:.1f} ms, working tree {pre_after * 1e3:.1f} ms\n')
+        f.write(f'# first full run median: {label} {before[0] * 1e3:.1f} ms, working tree {after[0] * 1e3:.1f} ms\n')
+        f.write(f'# yfinance first imported at: {label} {before[1] * 1e3:.1f} ms, '
+                f'working tree {after[1] * 1e3:.1f} ms into the run\n')
+        for name, src in ((label, prelude(rev)), ('working tree', prelude())):
+            rows = importtime_report(src, pycache)
+            f.write(f'\n## {name}: {sum(c for c, _ in rows) / 1e3:.1f} ms in imports\n')
+            f.write(f"{'cumulative µs':>14}  module\n")
+            for cum, mod in rows:
+                f.write(f'{cum:>14}  {mod}\n')
+    print(f'\nImport profile → {os.path.relpath(REPORT, ROOT)}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
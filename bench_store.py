@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Data startup benchmark
+Times, in fresh interpreter processes, getting the dashboard's data via the
+Python-literal modules versus the SQLite store (nbfc_store):
+
+  - modules, cold   — no usable .pyc, every literal is compiled from source
+  - modules, warm   — .pyc present, literals are unmarshalled
+  - store, all      — every dataset loaded from data/nbfc_store.sqlite
+  - store, one      — only 'timeseries' (what a single-dataset page needs)
+
+Run with:
+    python3 bench_store.py [--repeat N]
+"""
+
+import os, statistics, subprocess, sys, tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+
+_MODULES = ', '.join(nbfc_store.DATASETS.values())
+
+# Each snippet prints its own elapsed seconds so interpreter start-up is excluded
+_TIMED = 'import time; t0 = time.perf_counter(); {body}; print(time.perf_counter() - t0)'
+
+CASES = {
+    'modules, cold': (f'import {_MODULES}', True),
+    'modules, warm': (f'import {_MODULES}', False),
+    'store, all':    ('import nbfc_store; [nbfc_store.load(d) for d in nbfc_store.DATASETS]', False),
+    'store, one':    ("import nbfc_store; nbfc_store.load('timeseries')", False),
+}
+
+
+def _python(*args, pycache, write=False):
+    """Run the interpreter with its bytecode cache redirected to `pycache`."""
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+    cmd = [sys.executable, '-X', f'pycache_prefix={pycache}'] + ([] if write else ['-B'])
+    return subprocess.check_output(cmd + list(args), cwd=ROOT, env=env, text=True)
+
+
+def time_case(body, cold, repeat, warm_cache):
+    runs = []
+    for _ in range(repeat):
+        # an empty cache dir forces a source compile; -B keeps it empty
+        cache = tempfile.mkdtemp() if cold else warm_cache
+        out = _python('-c', _TIMED.format(body=body), pycache=cache)
+        runs.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(runs)
+
+
+def main(argv):
+    repeat = int(argv[argv.index('--repeat') + 1]) if '--repeat' in argv else 7
+    nbfc_store.build()
+    warm_cache = tempfile.mkdtemp()
+    _python('-c', f'import {_MODULES}, nbfc_store', pycache=warm_cache, write=True)
+
+    size = os.path.getsize(nbfc_store.STORE_PATH)
+    src  = sum(os.path.getsize(os.path.join(ROOT, m + '.py')) for m in nbfc_store.DATASETS.values())
+    print(f'Source modules: {src / 1024:.0f} KB   Store: {size / 1024:.0f} KB')
+    print(f"{'Case':<16} {'Median ms':>10}")
+    for name, (body, cold) in CASES.items():
+        print(f'{name:<16} {time_case(body, cold, repeat, warm_cache) * 1e3:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
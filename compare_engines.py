@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Table engine comparison harness
+Parses the same decks with the 'heuristic' and 'find_tables' engines and
+reports parse time and accuracy for each.
+
+Reference values:
+  - synthetic decks (always run) carry their own known answers, including
+    layouts the heuristic path gets wrong (latest quarter first, 9M columns);
+  - real decks in data/pdfs/<company>/YYYYMM.pdf are checked against the
+    curated NBFC_TIMESERIES quarter the filing reports.
+
+Run with:
+    python3 compare_engines.py
+"""
+
+import glob, os, sys, tempfile, time
+
+import fitz  # PyMuPDF
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import fetch_presentations as fp
+from nbfc_data_cache import NBFC_TIMESERIES, QUARTERS
+from ingest_presentations import CACHE_NAMES, filing_quarter, values_agree
+
+ENGINES = fp.TABLE_ENGINES
+
+# Parsed field → NBFC_TIMESERIES metric
+REFERENCE_FIELDS = {
+    'aum_cr': 'aum_cr', 'pat_cr': 'pat_cr', 'nim_pct': 'nim_pct',
+    'roa_pct': 'roa_pct', 'roe_pct': 'roe_pct', 'gnpa_pct': 'gnpa_pct',
+    'nnpa_pct': 'nnpa_pct', 'car_pct': 'car_pct', 'book_value_per_share': 'bvps_inr',
+}
+
+
+# ── Synthetic decks with known answers ───────────────────────────────────────
+
+def _table(y0, header, rows, x0=60, col_w=90, label_w=200):
+    cells = [(x0 + label_w + i * col_w, y0, h) for i, h in enumerate(header)]
+    for r, (label, vals) in enumerate(rows, start=1):
+        y = y0 + r * 22
+        cells.append((x0, y, label))
+        cells += [(x0 + label_w + i * col_w, y, v) for i, v in enumerate(vals)]
+    return cells
+
+
+SYNTHETIC = {
+    'oldest_first': (
+        [[(60, 50, 'Profit and Loss Statement')] + _table(90, ['Q2FY26', 'Q3FY26'], [
+            ('Net Interest Income', ['1,100', '1,245']),
+            ('Profit after Tax',    ['74',    '150'])]),
+         [(60, 50, 'Key Ratios')] + _table(90, ['Q2FY26', 'Q3FY26'], [
+            ('NIM', ['8.40', '8.62']), ('GNPA (%)', ['1.59', '1.51']),
+            ('NNPA (%)', ['0.81', '0.80']), ('CRAR', ['20.85', '18.17'])])],
+        {'nii_cr': 1245, 'pat_cr': 150, 'nim_pct': 8.62, 'gnpa_pct': 1.51,
+         'nnpa_pct': 0.80, 'car_pct': 18.17},
+    ),
+    'latest_first': (
+        [[(60, 50, 'Profit and Loss Statement')] + _table(90, ['Q3FY26', 'Q2FY26', 'Q3FY25'], [
+            ('Net Interest Income', ['1,245', '1,100', '980']),
+            ('Profit after Tax',    ['150',   '74',    '120'])]),
+         [(60, 50, 'Key Ratios')] + _table(90, ['Q3FY26', 'Q2FY26', 'Q3FY25'], [
+            ('NIM', ['8.62', '8.40', '8.10']), ('GNPA (%)', ['1.51', '1.59', '1.40']),
+            ('NNPA (%)', ['0.80', '0.81', '0.70']), ('CRAR', ['18.17', '20.85', '22.10'])])],
+        {'nii_cr': 1245, 'pat_cr': 150, 'nim_pct': 8.62, 'gnpa_pct': 1.51,
+         'nnpa_pct': 0.80, 'car_pct': 18.17},
+    ),
+    'with_9m_columns': (
+        [[(60, 50, 'Profit and Loss Statement')] + _table(
+            90, ['Q3FY25', 'Q2FY26', 'Q3FY26', '9MFY25', '9MFY26'], [
+                ('Net Interest Income', ['980', '1,100', '1,245', '2,850', '3,410']),
+                ('Profit after Tax',    ['120', '74',    '150',   '330',   '290'])],
+            col_w=75)],
+        {'nii_cr': 1245, 'pat_cr': 150},
+    ),
+}
+
+
+def build_pdf(path, pages):
+    doc = fitz.open()
+    for placements in pages:
+        page = doc.new_page()
+        for x, y, text in placements:
+            page.insert_text((x, y), text, fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+# ── Harness ──────────────────────────────────────────────────────────────────
+
+def run_deck(path, expected, **kw):
+    """{engine: (seconds, correct, checked)} for one deck."""
+    out = {}
+    for engine in ENGINES:
+        fp._TABLE_CACHE.clear()
+        t0   = time.perf_counter()
+        data = fp.parse_pdf(path, engine=engine, **kw)
+        dt   = time.perf_counter() - t0
+        hits = sum(values_agree(data.get(k), v) for k, v in expected.items())
+        out[engine] = (dt, hits, len(expected))
+    return out
+
+
+def _real_decks():
+    """Yield (label, path, expected, parse kwargs) for downloaded decks with reference data."""
+    for key, cfg in fp.COMPANIES.items():
+        series = NBFC_TIMESERIES.get(CACHE_NAMES.get(key, cfg['name']))
+        if not series:
+            continue
+        for path in sorted(glob.glob(os.path.join(fp.PDF_DIR, key, '*.pdf'))):
+            q = filing_quarter(os.path.basename(path)[:6])
+            if q not in QUARTERS:
+                continue
+            qi = QUARTERS.index(q)
+            expected = {f: series[m][qi] for f, m in REFERENCE_FIELDS.items()
+                        if m in series and series[m][qi] is not None}
+            if expected:
+                yield (f'{key}/{q}', path, expected,
+                       {'face_value': cfg.get('face_value', 2),
+                        'lending_only': cfg.get('lending_only', False)})
+
+
+def main():
+    header = f"{'Deck':<26}" + ''.join(f"{e + ' ms':>16}{e + ' acc':>16}" for e in ENGINES)
+    print(header)
+    totals = {e: [0.0, 0, 0] for e in ENGINES}
+
+    def report(label, res):
+        line = f'{label:<26}'
+        for e in ENGINES:
+            dt, hits, n = res[e]
+            totals[e][0] += dt
+            totals[e][1] += hits
+            totals[e][2] += n
+            line += f'{dt * 1e3:>16.1f}{f"{hits}/{n}":>16}'
+        print(line)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (pages, expected) in SYNTHETIC.items():
+            path = os.path.join(tmp, f'{name}.pdf')
+            build_pdf(path, pages)
+            report(f'synthetic/{name}', run_deck(path, expected))
+
+    for label, path, expected, kw in _real_decks():
+        report(label, run_deck(path, expected, **kw))
+
+    line = f"{'TOTAL':<26}"
+    for e in ENGINES:
+        dt, hits, n = totals[e]
+        line += f'{dt * 1e3:>16.1f}{f"{hits}/{n} ({hits / n:.0%})" if n else "-":>16}'
+    print('-' * len(header))
+    print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,11 @@ and extracts key financial metrics for the NBFC dashboard.
 Run quarterly after new results are published:
     python3 fetch_presentations.py             # all companies
     python3 fetch_presentations.py poonawalla  # single company
+    python3 fetch_presentations.py --workers 4 # parse pages in 4 processes
+    python3 fetch_presentations.py --ingest    # also merge the results into the data store
+
+Without --ingest the parsed values are only compared with the store (the
+ingest dry-run report); review that before merging unreviewed parser output.
 
 Metrics extracted (where available):
   aum_cr, nii_cr, nim_pct, pat_cr, gnpa_pct, nnpa_pct,
@@ -15,10 +20,19 @@ Metrics extracted (where available):
 
 import os, re, json, sys
 import requests
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF
+import numpy as np
 from datetime import datetime
 
+import ingest_presentations
+
 # ─── CONFIG ────────────────────────────────────────────────────────────────────
+# Optional per-company keys:
+#   lending_only  — skip non-lending segment rows (AMC, insurance, …)
+#   table_engine  — 'heuristic' (default, word positions) or 'find_tables'
+#                   (PyMuPDF table detection; see STRUCTURED TABLE ENGINE)
 
 COMPANIES = {
     'poonawalla': {
@@ -157,30 +171,84 @@ def safe_float(s):
         return None
 
 
+# Pages with at least this many words are clustered with NumPy
+_NUMPY_MIN_WORDS = 200
+
+
+def cluster_rows(words, y_tol=8):
+    """
+    Group PDF words (x0, y0, x1, y1, word, ...) into text rows with one sorted
+    sweep over y-midpoints: a row starts at its topmost word and takes every
+    word within y_tol below it, so a row is never split at an arbitrary bucket
+    edge and staggered lines cannot chain into one tall row. Returns
+    [(words, x_mids, y_mids)] top to bottom, each row sorted by x_mid — NumPy
+    arrays on large pages, lists otherwise.
+    """
+    text, xs, ys, bounds = _sweep_rows(words, y_tol)
+    return [(text[i:j], xs[i:j], ys[i:j]) for i, j in zip(bounds, bounds[1:])]
+
+
+def _sweep_rows(words, y_tol):
+    """
+    Sort words into reading order. Returns (text, x_mids, y_mids, bounds):
+    flat sequences ordered row by row, then by x, and row boundaries so that
+    row k is [bounds[k]:bounds[k+1]].
+    """
+    if len(words) >= _NUMPY_MIN_WORDS:
+        n     = len(words)
+        x0, y0, x1, y1, text = list(zip(*words))[:5]
+        xs    = (np.array(x0) + np.array(x1)) / 2
+        ys    = (np.array(y0) + np.array(y1)) / 2
+        by_y  = np.argsort(ys, kind='stable')
+        ys_sorted = ys[by_y]
+        # One binary search per row: the next row starts past this row's window
+        starts = np.zeros(n, dtype=np.int64)
+        i = 0
+        while i < n:
+            starts[i] = 1
+            i = int(np.searchsorted(ys_sorted, ys_sorted[i] + y_tol, side='right'))
+        row   = np.empty(n, dtype=np.int64)
+        row[by_y] = np.cumsum(starts) - 1
+        order = np.lexsort((xs, row))
+        cuts  = np.flatnonzero(np.diff(row[order])) + 1
+        text  = np.array(text, dtype=object)[order]
+        return text, xs[order], ys[order], [0, *cuts.tolist(), n]
+
+    items = sorted(((w[1] + w[3]) / 2, (w[0] + w[2]) / 2, w[4]) for w in words)
+    out, bounds, start = [], [0], 0
+    for k, item in enumerate(items):
+        if k and item[0] - items[start][0] > y_tol:
+            out += sorted(items[start:k], key=lambda t: t[1])
+            bounds.append(k)
+            start = k
+    out += sorted(items[start:], key=lambda t: t[1])
+    bounds.append(len(items))
+    return [w for _, _, w in out], [x for _, x, _ in out], [y for y, _, _ in out], bounds
+
+
 def page_rows(page, y_tol=8):
     """Return rows of (word, x_mid) sorted by y then x_mid."""
-    rows = {}
-    for (x0, y0, x1, y1, word, *_) in page.get_text("words"):
-        y_key = round((y0 + y1) / 2 / y_tol) * y_tol
-        x_mid = (x0 + x1) / 2
-        rows.setdefault(y_key, []).append((word, x_mid))
-    return [sorted(rows[k], key=lambda t: t[1]) for k in sorted(rows)]
+    text, xs, ys, bounds = _sweep_rows(page.get_text("words"), y_tol)
+    if isinstance(xs, np.ndarray):
+        text, xs = text.tolist(), xs.tolist()
+    pairs = list(zip(text, xs))
+    return [pairs[i:j] for i, j in zip(bounds, bounds[1:]) if j > i]
 
 
 # Quarter label e.g. Q3FY26, and month names used as balance-sheet col headers
 _QTR_PAT   = re.compile(r'Q[1-4]FY\d{2}')
-_MONTH_PAT = re.compile(r'^(Dec|Mar|Jun|Sep)$')
-_DATE_PAT  = re.compile(r'(Dec|Mar|Jun|Sep)-\d{2}$')
+_COL_DATE  = re.compile(r'(?:Dec|Mar|Jun|Sep)(?:-\d{2})?$')
 
 
-def find_col_xs(rows):
+def find_col_xs(rows, row_texts=None):
     """
     Find x-midpoints of column headers.
     Handles: Q3FY26 quarter labels and Jun-25 / Jun 30, 2024 date formats.
     Returns sorted list of x-mids (≥2 columns), or None.
     """
-    for row in rows:
-        row_text = ' '.join(w for w, _ in row)
+    if row_texts is None:
+        row_texts = [' '.join(w for w, _ in row) for row in rows]
+    for row, row_text in zip(rows, row_texts):
 
         # Quarter labels: Q1FY25, Q4FY25 …
         if _QTR_PAT.search(row_text):
@@ -190,7 +258,7 @@ def find_col_xs(rows):
 
         # Date columns: "Jun-25", "Dec-24" or month-word "Jun" "Dec" "Mar"
         months = [(w, x) for w, x in row
-                  if _MONTH_PAT.match(w) or _DATE_PAT.match(w)]
+                  if _COL_DATE.match(w)]
         if len(months) >= 2:
             return sorted(x for _, x in months)
 
@@ -207,19 +275,24 @@ def assign_col(num_words, col_xs):
     return [safe_float(''.join(c)) for c in cols]
 
 
+_NUMERIC_WORD = re.compile(r'^-?[\d,()]+\.?\d*$')
+_DECIMAL      = re.compile(r'\d+\.\d+')
+_NUMBER       = re.compile(r'[\d,]+(?:\.\d+)?')
+
+
 def is_numeric_word(w):
-    return bool(re.match(r'^-?[\d,()]+\.?\d*$', w)) and any(c.isdigit() for c in w)
+    return bool(_NUMERIC_WORD.match(w)) and any(c.isdigit() for c in w)
 
 
 def extract_pct_from_row(row_text):
     """Extract all percentage values from a row of text."""
-    return [float(m) for m in re.findall(r'([\d]+\.[\d]+)%?', row_text)
+    return [float(m) for m in _DECIMAL.findall(row_text)
             if 0 < float(m) < 100]
 
 
 def find_number_in_range(row_text, lo, hi):
     """Find first number in row_text that falls within [lo, hi]."""
-    nums = re.findall(r'[\d,]+(?:\.\d+)?', row_text)
+    nums = _NUMBER.findall(row_text)
     for n in nums:
         v = safe_float(n)
         if v is not None and lo <= v <= hi:
@@ -229,14 +302,75 @@ def find_number_in_range(row_text, lo, hi):
 
 # ─── GENERIC MULTI-FORMAT PARSER ───────────────────────────────────────────────
 
-# Pattern: "₹ 4,066 crore" / "₹1,64,720 Crores" / "Rs.2,10,722 Cr"
-_NARRATIVE_AMT = re.compile(
-    r'(?:₹|Rs\.?)\s*([\d,]+(?:\.\d+)?)\s*(?:lakh\s*(?:Cr|crore)s?|Cr|Crs|crore|Crores?)\b',
+# One pass over page text yields every amount-like token:
+#   "₹ 4,066 crore" / "₹1,64,720 Crores" / "Rs.2,10,722 Cr" / "₹2.1 lakh crore"
+# Percentages are not tokens: the ratio extractors read them off table rows and
+# the NPA narrative patterns, which need their own keyword context.
+# The unit sits in a lookahead so the next scan can start inside it, as the
+# separate per-pattern regexes this replaces could. The currency prefix is read
+# backwards from the number: '₹', or "Rs"/"Rs." at a word start (so the "rs" in
+# "Crs 1,234" is not a prefix).
+_AMOUNT_TOKEN = re.compile(
+    r'[\d,]+(?:\.\d+)?'
+    r'(?=\s*(?:(?P<lakh>lakh\s*(?:crore|Cr)s?)|(?P<cr>Crores?|Crs|Cr)))',
     re.I
 )
 # Inline ₹ token without space: "₹55,017"
 _INLINE_RS = re.compile(r'^₹([\d,]+(?:\.\d+)?)$')
 
+_TOKEN_KINDS = {'lakh': 'lakh_cr', 'cr': 'cr'}
+AmountToken  = namedtuple('AmountToken', 'kind value start end cur bounded')
+PageTokens   = namedtuple('PageTokens', 'text rows row_texts amounts col_xs')
+
+
+def _currency_before(text, i):
+    """Return (prefix, start) for a ₹/Rs/Rs. prefix ending at text[i], else (None, i)."""
+    j = i
+    while j > 0 and text[j - 1].isspace():
+        j -= 1
+    if j and text[j - 1] == '₹':
+        return '₹', j - 1
+    for cur in (text[j - 3:j], text[j - 2:j]) if j >= 2 else ():
+        k = j - len(cur)
+        if cur.lower() in ('rs.', 'rs') and not (k and text[k - 1].isascii()
+                                                 and text[k - 1].isalpha()):
+            return cur, k
+    return None, i
+
+
+def tokenize_amounts(text):
+    """
+    Scan text once and return AmountTokens in position order.
+    kind is 'lakh_cr' or 'cr'; value is the number as written
+    (lakh_cr values are NOT yet multiplied by 1e5); cur is the currency prefix
+    as written ('₹', 'Rs', 'Rs.' or None) and start is its position when
+    present, else the number's. bounded is False when the unit runs into a
+    word character (e.g. "Crx").
+    """
+    tokens = []
+    n = len(text)
+    for m in _AMOUNT_TOKEN.finditer(text):
+        kind     = m.lastgroup
+        end      = m.end(kind)
+        cur, start = _currency_before(text, m.start())
+        tokens.append(AmountToken(
+            _TOKEN_KINDS[kind], safe_float(m.group()), start, end, cur,
+            end == n or not (text[end].isalnum() or text[end] == '_'),
+        ))
+    return tokens
+
+
+def tokenize_page(page_text, rows=(), scan_amounts=True):
+    """
+    Tokenize a page once for all extractors: row texts joined once, column
+    headers located once, amounts scanned once (skipped when no extractor
+    that reads them will run).
+    """
+    row_texts = [' '.join(w for w, _ in row) for row in rows]
+    return PageTokens(page_text, rows, row_texts,
+                      tokenize_amounts(page_text) if scan_amounts else [],
+                      find_col_xs(rows, row_texts) if rows else None)
+
 
 def _parse_amount(text):
     """
@@ -244,44 +378,114 @@ def _parse_amount(text):
     Handles: ₹55,017  /  ₹ 4,066 crore  /  Rs.2,10,722 Cr  /  1,64,720 Crores
     Returns value in Cr, or None.
     """
+    return _amount_from_tokens(tokenize_amounts(text))
+
+
+def _amount_from_tokens(tokens):
     # lakh crore special case (multiply by 1e5)
-    m = re.search(r'(?:₹|Rs\.?)\s*([\d,.]+)\s*lakh\s*(?:Cr|crore)s?', text, re.I)
-    if m:
-        v = safe_float(m.group(1))
-        if v:
-            return round(v * 1e5, 0)
+    for t in tokens:
+        if t.kind == 'lakh_cr' and t.cur and t.value:
+            return round(t.value * 1e5, 0)
     # Standard "₹/Rs + number + Cr" narrative
-    m = _NARRATIVE_AMT.search(text)
-    if m:
-        return safe_float(m.group(1))
+    for t in tokens:
+        if t.cur and t.kind == 'cr' and t.bounded:
+            return t.value
     return None
 
 
-def _find_narrative_value(page_text, keyword_patterns, lo, hi, window=250):
+def _find_narrative_value(tok, keyword_patterns, lo, hi, window=250):
     """
     Search for keyword in page text; return first numeric amount in [lo,hi]
     found within `window` characters after the keyword.
+    `tok` is the page's PageTokens; keyword_patterns are compiled regexes.
     """
+    amounts = tok.amounts
     for kw_pat in keyword_patterns:
-        for km in re.finditer(kw_pat, page_text, re.I):
-            snippet = page_text[km.start(): km.start() + window]
-            v = _parse_amount(snippet)
+        for km in kw_pat.finditer(tok.text):
+            start, limit = km.start(), km.start() + window
+            snippet = [t for t in amounts if t.start >= start and t.end <= limit]
+            v = _amount_from_tokens(snippet)
             if v and lo <= v <= hi:
                 return v
             # Also check plain numbers followed by Cr in the snippet
-            for nm in re.finditer(r'([\d,]+(?:\.\d+)?)\s*(?:Cr|crore)s?\b', snippet, re.I):
-                v2 = safe_float(nm.group(1))
-                if v2 and lo <= v2 <= hi:
-                    return v2
+            for t in snippet:
+                if t.kind == 'cr' and t.bounded and t.value and lo <= t.value <= hi:
+                    return t.value
     return None
 
 
-def parse_pdf(pdf_path, face_value=2, lending_only=False):
+# ─── PAGE KEYWORD INDEX ────────────────────────────────────────────────────────
+
+# Metric group → (page-text trigger, fields it fills).
+# A trigger is the same page-level test parse_pdf has always applied before
+# running that extractor (NPA was previously unconditional; its trigger is a
+# superset of every row/narrative pattern in _extract_npa). Order matters:
+# groups run in this order on each page, matching the original pass.
+_METRIC_GROUPS = {
+    'aum':  (re.compile('|'.join(re.escape(kw) for kw in
+                                 ['AUM', 'Assets Under Management', 'Loan Book',
+                                  'Gross Loan Book', 'Loan AUM', 'Business AUM',
+                                  'Retail Book'])),
+             ('aum_cr',)),
+    'pl':   (re.compile(r'net interest income|profit after tax|'
+                        r'profit/\(loss\) after tax|\bnii\b|\bpat\b', re.I),
+             ('nii_cr', 'pat_cr')),
+    'nim':  (re.compile(r'NIM'),                        ('nim_pct',)),
+    'npa':  (re.compile(r'NPA|Stage', re.I),            ('gnpa_pct', 'nnpa_pct')),
+    'roa':  (re.compile(r'Ro?A\b'),                     ('roa_pct',)),
+    'roe':  (re.compile(r'Ro?E\b'),                     ('roe_pct',)),
+    'car':  (re.compile(r'CRAR|Capital Adequacy'),      ('car_pct',)),
+    'disb': (re.compile(r'Disbursement'),               ('disbursements_cr',)),
+    'bs':   (re.compile(r'Balance Sheet'),              ('share_capital_cr', 'reserves_cr')),
+}
+
+# Groups whose extractor works on page text alone (no word-level rows needed)
+_TEXT_ONLY_GROUPS = {'disb'}
+# Groups whose extractor reads the page's amount tokens
+_AMOUNT_GROUPS    = {'aum', 'pl', 'disb'}
+
+
+def build_page_index(pages):
+    """
+    Fast first pass over page text: {group: set of positions in `pages`}.
+    `pages` is a list of (page_num, page, page_text) as built by parse_pdf.
+    """
+    index = {g: set() for g in _METRIC_GROUPS}
+    for pos, (_, _, page_text) in enumerate(pages):
+        for group, (trigger, _) in _METRIC_GROUPS.items():
+            if trigger.search(page_text):
+                index[group].add(pos)
+    return index
+
+
+def _pending_groups(data, page_groups):
+    """Groups triggered on this page that still have at least one field missing."""
+    return [g for g in _METRIC_GROUPS
+            if g in page_groups and any(f not in data for f in _METRIC_GROUPS[g][1])]
+
+
+def _all_metrics_found(data):
+    return all(f in data for _, fields in _METRIC_GROUPS.values() for f in fields)
+
+
+def parse_pdf(pdf_path, face_value=2, lending_only=False, workers=None, engine='heuristic'):
     """
     Parse one investor presentation PDF.
     Returns dict of extracted quarterly metrics.
     Uses column-based parsing for structured tables + narrative extraction fallback.
+
+    Word extraction (page_rows) only runs on pages whose text triggers a metric
+    group that is still missing, and parsing stops once every metric is found.
+
+    workers > 1 fans page-level extraction out across a process pool; results
+    are merged first-match in page order, so output matches the serial path.
+
+    engine='find_tables' reads table metrics from PyMuPDF's table detection
+    first (see _extract_tables); the word-position heuristics then fill
+    whatever the detected tables did not yield.
     """
+    if engine not in TABLE_ENGINES:
+        raise ValueError(f'unknown table engine {engine!r}; expected one of {TABLE_ENGINES}')
     doc = fitz.open(pdf_path)
     data = {}
 
@@ -290,97 +494,25 @@ def parse_pdf(pdf_path, face_value=2, lending_only=False):
     # Find offset page for decks where first N pages are regulatory filings
     # (e.g. Shriram: investor update starts at p35 after financial statements)
     deck_start = _find_deck_start(all_pages)
+    pages      = all_pages[deck_start:]
+    page_index = build_page_index(pages)
+    candidates = sorted(set().union(*page_index.values()))
+
+    def _groups_at(pos):
+        return {g for g, hits in page_index.items() if pos in hits}
 
-    for page_num, page, page_text in all_pages[deck_start:]:
-        rows = page_rows(page)
-
-        # ── AUM / Loan Book ────────────────────────────────────────────────────
-        if 'aum_cr' not in data and any(kw in page_text for kw in
-                ['AUM', 'Assets Under Management', 'Loan Book', 'Gross Loan Book',
-                 'Loan AUM', 'Business AUM', 'Retail Book']):
-            aum = _extract_aum(rows, page_text, lending_only)
-            if aum:
-                data['aum_cr'] = aum
-
-        # ── P&L: NII and PAT ──────────────────────────────────────────────────
-        pl_keywords = [r'net interest income', r'profit after tax',
-                       r'profit/\(loss\) after tax', r'\bnii\b', r'\bpat\b']
-        if any(re.search(kw, page_text, re.I) for kw in pl_keywords):
-            _extract_pl_page(rows, page_text, data, lending_only)
-
-        # ── NIM % ─────────────────────────────────────────────────────────────
-        if 'nim_pct' not in data and ('NIM' in page_text or 'NIMs' in page_text):
-            for row in rows:
-                rt = ' '.join(w for w, _ in row)
-                if re.search(r'\bNIMs?\b', rt):
-                    # Take LAST pct in range (latest quarter in a trend row)
-                    pcts = [float(p) for p in re.findall(r'([\d]+\.[\d]+)', rt)
-                            if 1 < float(p) < 20]
-                    if pcts:
-                        data['nim_pct'] = pcts[-1]
-
-        # ── GNPA / NNPA % ─────────────────────────────────────────────────────
-        if 'gnpa_pct' not in data or 'nnpa_pct' not in data:
-            _extract_npa(rows, page_text, data)
-
-        # ── ROA % ─────────────────────────────────────────────────────────────
-        if 'roa_pct' not in data and re.search(r'Ro?A\b', page_text):
-            for row in rows:
-                rt = ' '.join(w for w, _ in row)
-                if re.search(r'\bRo?A\b', rt, re.I) and not re.search(r'annuali[sz]', rt, re.I):
-                    # Take last pct in range for trend rows; first for highlight rows
-                    pcts = [float(p) for p in re.findall(r'([\d]+\.[\d]+)', rt)
-                            if 0 < float(p) < 10]
-                    if pcts:
-                        data['roa_pct'] = pcts[-1]
-
-        # ── ROE % ─────────────────────────────────────────────────────────────
-        if 'roe_pct' not in data and re.search(r'Ro?E\b', page_text):
-            for row in rows:
-                rt = ' '.join(w for w, _ in row)
-                if re.search(r'\bRo?E\b', rt, re.I):
-                    pcts = [float(p) for p in re.findall(r'([\d]+\.[\d]+)', rt)
-                            if 0 < float(p) < 80]
-                    if pcts:
-                        data['roe_pct'] = pcts[-1]
-
-        # ── CAR / CRAR % ──────────────────────────────────────────────────────
-        if 'car_pct' not in data and re.search(r'CRAR|Capital Adequacy', page_text):
-            for row in rows:
-                rt = ' '.join(w for w, _ in row)
-                if re.search(r'CRAR|Capital\s+Adequacy', rt, re.I):
-                    pcts = [float(p) for p in re.findall(r'([\d]+\.[\d]+)', rt)
-                            if 10 < float(p) < 60]
-                    if pcts:
-                        data['car_pct'] = pcts[-1]
-
-        # ── Disbursements ─────────────────────────────────────────────────────
-        if 'disbursements_cr' not in data and 'Disbursement' in page_text:
-            v = _find_narrative_value(
-                page_text,
-                [r'Disbursement'],
-                500, 500_000
-            )
-            if v:
-                data['disbursements_cr'] = v
-
-        # ── Balance Sheet ─────────────────────────────────────────────────────
-        if 'Balance Sheet' in page_text:
-            col_xs = find_col_xs(rows)
-            if col_xs:
-                for row in rows:
-                    rt = ' '.join(w for w, _ in row)
-                    num_ws = [(w, x) for w, x in row if is_numeric_word(w)]
-                    if not num_ws:
-                        continue
-                    if re.search(r'\bShare\b.*\bCapital\b', rt, re.I):
-                        vals = assign_col(num_ws, col_xs)
-                        if vals and vals[-1] and 'share_capital_cr' not in data:
-                            data['share_capital_cr'] = vals[-1]
-                    if re.search(r'\bReserve', rt, re.I) and re.search(r'\bSurplus\b', rt, re.I):
-                        vals = assign_col(num_ws, col_xs)
-                        if vals and vals[-1] and 'reserves_cr' not in data:
-                            data['reserves_cr'] = vals[-1]
+    if workers and workers > 1 and len(candidates) > 1:
+        jobs = [(pos, pages[pos][0], sorted(_groups_at(pos))) for pos in candidates]
+        data = _parse_pages_parallel(pdf_path, jobs, lending_only, workers, engine)
+    else:
+        for pos in candidates:
+            _, page, page_text = pages[pos]
+            pending = _pending_groups(data, _groups_at(pos))
+            if not pending:
+                continue
+            _extract_page(page, page_text, pending, data, lending_only, engine)
+            if _all_metrics_found(data):
+                break
 
     doc.close()
 
@@ -397,6 +529,155 @@ def parse_pdf(pdf_path, face_value=2, lending_only=False):
     return data
 
 
+# Row-level label patterns used by _extract_page
+_NIM_ROW           = re.compile(r'\bNIMs?\b')
+_ROA_ROW           = re.compile(r'\bRo?A\b', re.I)
+_ANNUALISED        = re.compile(r'annuali[sz]', re.I)
+_ROE_ROW           = re.compile(r'\bRo?E\b', re.I)
+_CAR_ROW           = re.compile(r'CRAR|Capital\s+Adequacy', re.I)
+_SHARE_CAPITAL_ROW = re.compile(r'\bShare\b.*\bCapital\b', re.I)
+_RESERVE_ROW       = re.compile(r'\bReserve', re.I)
+_SURPLUS_ROW       = re.compile(r'\bSurplus\b', re.I)
+_DISB_KW           = [re.compile(r'Disbursement', re.I)]
+
+
+def _extract_page(page, page_text, groups, data, lending_only, engine='heuristic'):
+    """
+    Run the extractors for `groups` on one page, filling missing keys of `data`.
+    Each field's value depends only on this page and on that field being
+    missing, which is what lets pages be extracted independently and merged.
+    """
+    if engine == 'find_tables' and set(groups) & _TABLE_GROUPS:
+        _extract_tables(page_tables(page), groups, data, lending_only)
+        groups = _pending_groups(data, set(groups))
+        if not groups:
+            return
+
+    rows = page_rows(page) if set(groups) - _TEXT_ONLY_GROUPS else []
+    tok  = tokenize_page(page_text, rows, scan_amounts=bool(set(groups) & _AMOUNT_GROUPS))
+
+    # ── AUM / Loan Book ────────────────────────────────────────────────────
+    if 'aum' in groups:
+        aum = _extract_aum(tok, lending_only)
+        if aum:
+            data['aum_cr'] = aum
+
+    # ── P&L: NII and PAT ──────────────────────────────────────────────────
+    if 'pl' in groups:
+        _extract_pl_page(tok, data, lending_only)
+
+    # ── NIM % ─────────────────────────────────────────────────────────────
+    if 'nim' in groups:
+        for rt in tok.row_texts:
+            if _NIM_ROW.search(rt):
+                # Take LAST pct in range (latest quarter in a trend row)
+                pcts = [float(p) for p in _DECIMAL.findall(rt)
+                        if 1 < float(p) < 20]
+                if pcts:
+                    data['nim_pct'] = pcts[-1]
+
+    # ── GNPA / NNPA % ─────────────────────────────────────────────────────
+    if 'npa' in groups:
+        _extract_npa(tok, data)
+
+    # ── ROA % ─────────────────────────────────────────────────────────────
+    if 'roa' in groups:
+        for rt in tok.row_texts:
+            if _ROA_ROW.search(rt) and not _ANNUALISED.search(rt):
+                # Take last pct in range for trend rows; first for highlight rows
+                pcts = [float(p) for p in _DECIMAL.findall(rt)
+                        if 0 < float(p) < 10]
+                if pcts:
+                    data['roa_pct'] = pcts[-1]
+
+    # ── ROE % ─────────────────────────────────────────────────────────────
+    if 'roe' in groups:
+        for rt in tok.row_texts:
+            if _ROE_ROW.search(rt):
+                pcts = [float(p) for p in _DECIMAL.findall(rt)
+                        if 0 < float(p) < 80]
+                if pcts:
+                    data['roe_pct'] = pcts[-1]
+
+    # ── CAR / CRAR % ──────────────────────────────────────────────────────
+    if 'car' in groups:
+        for rt in tok.row_texts:
+            if _CAR_ROW.search(rt):
+                pcts = [float(p) for p in _DECIMAL.findall(rt)
+                        if 10 < float(p) < 60]
+                if pcts:
+                    data['car_pct'] = pcts[-1]
+
+    # ── Disbursements ─────────────────────────────────────────────────────
+    if 'disb' in groups:
+        v = _find_narrative_value(tok, _DISB_KW, 500, 500_000)
+        if v:
+            data['disbursements_cr'] = v
+
+    # ── Balance Sheet ─────────────────────────────────────────────────────
+    if 'bs' in groups:
+        col_xs = tok.col_xs
+        if col_xs:
+            for row, rt in zip(rows, tok.row_texts):
+                num_ws = [(w, x) for w, x in row if is_numeric_word(w)]
+                if not num_ws:
+                    continue
+                if _SHARE_CAPITAL_ROW.search(rt):
+                    vals = assign_col(num_ws, col_xs)
+                    if vals and vals[-1] and 'share_capital_cr' not in data:
+                        data['share_capital_cr'] = vals[-1]
+                if _RESERVE_ROW.search(rt) and _SURPLUS_ROW.search(rt):
+                    vals = assign_col(num_ws, col_xs)
+                    if vals and vals[-1] and 'reserves_cr' not in data:
+                        data['reserves_cr'] = vals[-1]
+
+
+# Keys that are only meaningful alongside the field that set them
+_LINKED_KEYS = {'gnpa_note': 'gnpa_pct'}
+
+
+def _extract_pages_worker(pdf_path, jobs, lending_only, engine='heuristic'):
+    """Process-pool worker: [(pos, page_num, groups)] → [(pos, page_data)]."""
+    doc = fitz.open(pdf_path)
+    out = []
+    for pos, page_num, groups in jobs:
+        page = doc[page_num]
+        page_data = {}
+        _extract_page(page, page.get_text(), groups, page_data, lending_only, engine)
+        out.append((pos, page_data))
+    doc.close()
+    return out
+
+
+def merge_page_results(page_results):
+    """
+    Merge per-page extraction dicts with the serial path's priority:
+    the earliest page (by position) that yields a field wins.
+    """
+    data = {}
+    for _, page_data in sorted(page_results, key=lambda t: t[0]):
+        for key, val in page_data.items():
+            if key in _LINKED_KEYS:
+                continue
+            if key not in data:
+                data[key] = val
+                for linked, owner in _LINKED_KEYS.items():
+                    if owner == key and linked in page_data:
+                        data[linked] = page_data[linked]
+    return data
+
+
+def _parse_pages_parallel(pdf_path, jobs, lending_only, workers, engine='heuristic'):
+    # Interleave so each worker gets a mix of early and late pages
+    n      = min(workers, len(jobs))
+    chunks = [jobs[i::n] for i in range(n)]
+    with ProcessPoolExecutor(max_workers=n) as ex:
+        futures = [ex.submit(_extract_pages_worker, pdf_path, c, lending_only, engine)
+                   for c in chunks]
+        results = [r for f in futures for r in f.result()]
+    return merge_page_results(results)
+
+
 def _find_deck_start(all_pages):
     """
     Some PDFs (e.g. Shriram) bundle regulatory filings before the investor deck.
@@ -410,7 +691,14 @@ def _find_deck_start(all_pages):
     return 0
 
 
-def _extract_aum(rows, page_text, lending_only):
+_AUM_SKIP   = ['Housing', 'Wealth', 'Insurance', 'AMC', 'Broking']
+_AUM_LABELS = re.compile(
+    r'\bAUM\b|Assets\s+Under\s+Management|Loan\s+AUM|Business\s+AUM|'
+    r'Gross\s+Loan\s+Book|Loan\s+Book|Retail\s+Book|Book\s+Size', re.I)
+_MILESTONE  = re.compile(r'crossed|surpassed|milestone|first time|achieve', re.I)
+
+
+def _extract_aum(tok, lending_only):
     """
     Extract AUM / Loan Book value in Crore.
     Handles: ₹ prefix (direct/space), Rs. prefix, lakh Cr, plain Cr suffix.
@@ -421,14 +709,8 @@ def _extract_aum(rows, page_text, lending_only):
        in [5_000, 800_000] Cr range (AUM is usually the biggest number shown).
     3. Narrative: keyword → look forward/backward for amount.
     """
-    SKIP = ['Housing', 'Wealth', 'Insurance', 'AMC', 'Broking']
-    AUM_LABELS = [
-        r'\bAUM\b', r'Assets\s+Under\s+Management', r'Loan\s+AUM',
-        r'Business\s+AUM', r'Gross\s+Loan\s+Book', r'Loan\s+Book',
-        r'Retail\s+Book', r'Book\s+Size',
-    ]
-
-    if not any(re.search(lbl, page_text, re.I) for lbl in AUM_LABELS):
+    page_text = tok.text
+    if not _AUM_LABELS.search(page_text):
         return None
 
     # ── Collect ALL candidates from the full page ─────────────────────────────
@@ -437,19 +719,19 @@ def _extract_aum(rows, page_text, lending_only):
     candidates = []
 
     # Lakh crore patterns (highest priority — largest unit)
-    for m in re.finditer(r'(?:₹|Rs\.?)\s*([\d,.]+)\s*lakh\s*(?:Cr|crore)', page_text, re.I):
-        ctx = page_text[max(0, m.start()-80): m.start()]
+    for t in tok.amounts:
+        if t.kind != 'lakh_cr' or not t.cur:
+            continue
+        ctx = page_text[max(0, t.start-80): t.start]
         # Skip milestone/historical context ("crossed", "surpassed", etc.)
-        if re.search(r'crossed|surpassed|milestone|first time|achieve', ctx, re.I):
+        if _MILESTONE.search(ctx):
             continue
-        v = safe_float(m.group(1))
-        if v:
-            candidates.append(v * 1e5)
+        if t.value:
+            candidates.append(t.value * 1e5)
 
     # ₹XX,XXX (direct token) or ₹ XX,XXX (₹ separate word from number)
-    for row in rows:
-        rt = ' '.join(w for w, _ in row)
-        if lending_only and any(kw in rt for kw in SKIP):
+    for row, rt in zip(tok.rows, tok.row_texts):
+        if lending_only and any(kw in rt for kw in _AUM_SKIP):
             continue
         for j, (word, x) in enumerate(row):
             if word == '₹' or _INLINE_RS.match(word):
@@ -459,10 +741,9 @@ def _extract_aum(rows, page_text, lending_only):
                     candidates.append(n)
 
     # "Rs.2,10,722 Cr" or plain "2,10,722 Cr" patterns anywhere on page
-    for m in re.finditer(r'Rs\.?\s*([\d,]+(?:\.\d+)?)\s*(?:Cr|crore)', page_text, re.I):
-        v = safe_float(m.group(1))
-        if v and 5_000 < v < 800_000:
-            candidates.append(v)
+    for t in tok.amounts:
+        if t.kind == 'cr' and t.cur and t.cur[0] in 'Rr' and t.value and 5_000 < t.value < 800_000:
+            candidates.append(t.value)
 
     if candidates:
         return max(candidates)  # AUM is the largest financial figure on the page
@@ -470,11 +751,21 @@ def _extract_aum(rows, page_text, lending_only):
     return None
 
 
-def _extract_pl_page(rows, page_text, data, lending_only):
+_PL_SKIP = ['Housing', 'Wealth', 'Insurance', 'AMC']
+_NII_KW  = [re.compile(r'Net\s+Interest\s+Income', re.I), re.compile(r'\bNII\b', re.I)]
+_PAT_KW  = [re.compile(p, re.I) for p in
+            [r'[Ss]tandalone\s+[Pp]rofit\s+[Aa]fter\s+[Tt]ax',
+             r'[Pp]rofit\s+after\s+[Tt]ax.*?Q3',
+             r'[Pp]rofit\s+after\s+[Tt]ax.*?quarter',
+             r'[Pp]rofit\s+after\s+[Tt]ax\s*\(PAT\)',
+             r'consolidated\s+profit\s+after\s+tax.*?Q3']]
+
+
+def _extract_pl_page(tok, data, lending_only):
     """Extract NII and PAT from this page — handles column tables and narratives."""
-    SKIP = ['Housing', 'Wealth', 'Insurance', 'AMC']
+    rows = tok.rows
 
-    col_xs = find_col_xs(rows)
+    col_xs = tok.col_xs
     if col_xs:
         n_header_cols = sum(
             1 for row in rows
@@ -489,9 +780,8 @@ def _extract_pl_page(rows, page_text, data, lending_only):
         # Track best PAT: prefer "excl." over "incld."
         pat_plain, pat_excl = None, None
 
-        for row in rows:
-            rt = ' '.join(w for w, _ in row)
-            if lending_only and any(kw in rt for kw in SKIP):
+        for row, rt in zip(rows, tok.row_texts):
+            if lending_only and any(kw in rt for kw in _PL_SKIP):
                 continue
             num_ws = [(w, x) for w, x in row if is_numeric_word(w)]
             if not num_ws:
@@ -532,48 +822,45 @@ def _extract_pl_page(rows, page_text, data, lending_only):
 
     # Narrative fallback for companies using "₹ X,XXX crore" format (Bajaj, Muthoot)
     if 'nii_cr' not in data:
-        nii = _find_narrative_value(
-            page_text,
-            [r'Net\s+Interest\s+Income', r'\bNII\b'],
-            50, 50_000
-        )
+        nii = _find_narrative_value(tok, _NII_KW, 50, 50_000)
         if nii:
             data['nii_cr'] = nii
 
     if 'pat_cr' not in data:
         # Prefer "standalone" PAT over "consolidated" in narrative
         # Search for "Profit after tax.*?₹ X,XXX crore" or similar
-        pat = _find_narrative_value(
-            page_text,
-            [r'[Ss]tandalone\s+[Pp]rofit\s+[Aa]fter\s+[Tt]ax',
-             r'[Pp]rofit\s+after\s+[Tt]ax.*?Q3',
-             r'[Pp]rofit\s+after\s+[Tt]ax.*?quarter',
-             r'[Pp]rofit\s+after\s+[Tt]ax\s*\(PAT\)',
-             r'consolidated\s+profit\s+after\s+tax.*?Q3'],
-            10, 20_000
-        )
+        pat = _find_narrative_value(tok, _PAT_KW, 10, 20_000)
         if pat is not None:
             data['pat_cr'] = pat
 
 
-def _extract_npa(rows, page_text, data):
+_GNPA_ROW       = re.compile(r'Gross\s+NPA\s*\(%\)|GNPA\s*\(%\)')
+_NNPA_ROW       = re.compile(r'Net\s+NPA\s*\(%\)|NNPA\s*\(%\)')
+_STAGE3_ROW     = re.compile(r'Ratio|%|Asset')
+_GNPA_NNPA_PAIR = re.compile(
+    r'GNPA\s*[&and,]+\s*NNPA\D{0,20}([\d]+\.[\d]+)\s*%\s*[&and,]+\s*([\d]+\.[\d]+)\s*%', re.I)
+_GNPA_NARRATIVE = [re.compile(r'GNPA\D{0,20}([\d]+\.[\d]+)\s*%', re.I),
+                   re.compile(r'Gross\s+NPA[^%\d]{0,30}([\d]+\.[\d]+)\s*%', re.I)]
+_NNPA_NARRATIVE = [re.compile(r'NNPA\D{0,20}([\d]+\.[\d]+)\s*%', re.I),
+                   re.compile(r'Net\s+NPA[^%\d]{0,30}([\d]+\.[\d]+)\s*%', re.I)]
+
+
+def _extract_npa(tok, data):
     """Extract GNPA% and NNPA% from NPA section rows."""
-    for row in rows:
-        rt = ' '.join(w for w, _ in row)
-        if re.search(r'Gross\s+NPA\s*\(%\)|GNPA\s*\(%\)', rt):
-            pcts = re.findall(r'([\d]+\.[\d]+)', rt)
+    page_text = tok.text
+    for rt in tok.row_texts:
+        if _GNPA_ROW.search(rt):
+            pcts = _DECIMAL.findall(rt)
             if pcts and 'gnpa_pct' not in data:
                 data['gnpa_pct'] = float(pcts[-1])
-        if re.search(r'Net\s+NPA\s*\(%\)|NNPA\s*\(%\)', rt):
-            pcts = re.findall(r'([\d]+\.[\d]+)', rt)
+        if _NNPA_ROW.search(rt):
+            pcts = _DECIMAL.findall(rt)
             if pcts and 'nnpa_pct' not in data:
                 data['nnpa_pct'] = float(pcts[-1])
 
     # Narrative: "GNPA & NNPA stood at 1.21% & 0.47%"  (first = GNPA, second = NNPA)
     if 'gnpa_pct' not in data or 'nnpa_pct' not in data:
-        m = re.search(
-            r'GNPA\s*[&and,]+\s*NNPA\D{0,20}([\d]+\.[\d]+)\s*%\s*[&and,]+\s*([\d]+\.[\d]+)\s*%',
-            page_text, re.I)
+        m = _GNPA_NNPA_PAIR.search(page_text)
         if m:
             g, n = float(m.group(1)), float(m.group(2))
             if 0 < g < 20 and 'gnpa_pct' not in data:
@@ -582,9 +869,8 @@ def _extract_npa(rows, page_text, data):
                 data['nnpa_pct'] = n
 
     if 'gnpa_pct' not in data:
-        for pat in [r'GNPA\D{0,20}([\d]+\.[\d]+)\s*%',
-                    r'Gross\s+NPA[^%\d]{0,30}([\d]+\.[\d]+)\s*%']:
-            m = re.search(pat, page_text, re.I)
+        for pat in _GNPA_NARRATIVE:
+            m = pat.search(page_text)
             if m:
                 v = float(m.group(1))
                 if 0 < v < 20:
@@ -592,9 +878,8 @@ def _extract_npa(rows, page_text, data):
                     break
 
     if 'nnpa_pct' not in data:
-        for pat in [r'NNPA\D{0,20}([\d]+\.[\d]+)\s*%',
-                    r'Net\s+NPA[^%\d]{0,30}([\d]+\.[\d]+)\s*%']:
-            m = re.search(pat, page_text, re.I)
+        for pat in _NNPA_NARRATIVE:
+            m = pat.search(page_text)
             if m:
                 v = float(m.group(1))
                 if 0 < v < 20:
@@ -603,10 +888,9 @@ def _extract_npa(rows, page_text, data):
 
     # Stage 3 proxy when standard NPA labels absent
     if 'gnpa_pct' not in data:
-        for row in rows:
-            rt = ' '.join(w for w, _ in row)
-            if 'Stage 3' in rt and re.search(r'Ratio|%|Asset', rt):
-                pcts = re.findall(r'([\d]+\.[\d]+)', rt)
+        for rt in tok.row_texts:
+            if 'Stage 3' in rt and _STAGE3_ROW.search(rt):
+                pcts = _DECIMAL.findall(rt)
                 if pcts:
                     v = float(pcts[-1])
                     if 0 < v < 20:
@@ -624,29 +908,165 @@ def _count_header_cols(rows):
     return 2
 
 
+_NII_ROW = re.compile(r'\bNII\b')
+_NII_LBL = re.compile(r'Net\s+Interest\s+Income', re.I)
+_PAT_ROW = re.compile(r'\bProfit\b.{0,25}\bTax\b', re.I)
+
+
 def _is_nii_row(row_text):
-    return bool(
-        re.search(r'\bNII\b', row_text) or
-        re.search(r'Net\s+Interest\s+Income', row_text, re.I)
-    )
+    return bool(_NII_ROW.search(row_text) or _NII_LBL.search(row_text))
 
 
 def _is_pat_row(row_text):
     # Fix: use \b and allow non-space between Profit and Tax (Profit/(Loss) after Tax)
     return bool(
-        re.search(r'\bProfit\b.{0,25}\bTax\b', row_text, re.I) and
+        _PAT_ROW.search(row_text) and
         'before' not in row_text.lower()
     )
 
 
+# ─── STRUCTURED TABLE ENGINE ───────────────────────────────────────────────────
+# Alternative to the word-position heuristics above: PyMuPDF's own table
+# detection gives cell grids, and each metric is read from the column whose
+# header is the LATEST period (Q3FY26 beats Q2FY26; Dec-25 beats Sep-25),
+# wherever that column sits. Selected per company via COMPANIES[...]['table_engine'].
+
+TABLE_ENGINES = ('heuristic', 'find_tables')
+
+# Metric groups that live in tables (AUM and disbursements are narrative)
+_TABLE_GROUPS = {'pl', 'nim', 'npa', 'roa', 'roe', 'car', 'bs'}
+
+# (pdf path, mtime, page number) → detected grids; reused across groups and runs.
+# LRU-bounded so a long --workers batch does not hold every deck's tables.
+_TABLE_CACHE     = OrderedDict()
+_TABLE_CACHE_MAX = 256
+
+_PERIOD_QTR  = re.compile(r"Q([1-4])\s*FY\s*'?(\d{2})\b", re.I)
+_PERIOD_DATE = re.compile(r"\b(Mar(?:ch)?|June?|Sept?(?:ember)?|Dec(?:ember)?)[-\s',]*(?:\d{1,2},?\s*)?(\d{4}|\d{2})\b", re.I)
+_MONTH_NUM   = {'mar': 3, 'jun': 6, 'sep': 9, 'dec': 12}
+
+
+def page_tables(page):
+    """
+    Return the page's detected tables as grids (rows of cell strings).
+    Ruled tables are tried first; decks that lay tables out with whitespace
+    only fall back to text-alignment detection. Cached per file version.
+    """
+    path = page.parent.name
+    key  = (path, os.path.getmtime(path), page.number) if path and os.path.exists(path) else None
+    if key in _TABLE_CACHE:
+        _TABLE_CACHE.move_to_end(key)
+        return _TABLE_CACHE[key]
+
+    grids = []
+    for strategy in ('lines', 'text'):
+        found = page.find_tables(strategy=strategy)
+        grids = [[[(c or '').strip() for c in row] for row in tab.extract()]
+                 for tab in found.tables]
+        if grids:
+            break
+    if key:
+        _TABLE_CACHE[key] = grids
+        if len(_TABLE_CACHE) > _TABLE_CACHE_MAX:
+            _TABLE_CACHE.popitem(last=False)
+    return grids
+
+
+def _period_key(cell):
+    """Sortable period for a header cell ('Q3FY26' → (26, 9), 'Dec-25' → (25, 12)), else None."""
+    m = _PERIOD_QTR.search(cell)
+    if m:
+        q, fy = int(m.group(1)), int(m.group(2))
+        # Indian FY: Q1 = Apr-Jun of the previous calendar year
+        return (fy - 1, 3 + 3 * q) if q < 4 else (fy, 3)
+    m = _PERIOD_DATE.search(cell)
+    if m:
+        return (int(m.group(2)) % 100, _MONTH_NUM[m.group(1)[:3].lower()])
+    return None
+
+
+def _latest_column(grid):
+    """(header row index, column index of the latest period) or None."""
+    for r, row in enumerate(grid):
+        periods = [(k, c) for c, cell in enumerate(row) if (k := _period_key(cell))]
+        if len(periods) >= 2:
+            return r, max(periods)[1]
+    return None
+
+
+def _table_rows(grid):
+    """Yield (label, latest-period value) for each body row of a grid."""
+    hdr = _latest_column(grid)
+    if not hdr:
+        return
+    r0, col = hdr
+    for row in grid[r0 + 1:]:
+        if col >= len(row):
+            continue
+        label = ' '.join(c for c in row[:col] if c and safe_float(c) is None)
+        value = safe_float(row[col].split('\n')[0])
+        if label and value is not None:
+            yield label, value
+
+
+def _extract_tables(grids, groups, data, lending_only):
+    """Fill missing table metrics for `groups` from detected grids."""
+    nii_plain = nii_with_fees = pat_plain = pat_excl = None
+    found = {}
+
+    def first(key, v):
+        found.setdefault(key, v)
+
+    for grid in grids:
+        for label, v in _table_rows(grid):
+            low = label.lower()
+            if 'pl' in groups and not (lending_only and any(kw in label for kw in _PL_SKIP)):
+                if _is_nii_row(label) and 10 < v < 50_000:
+                    if 'fee' in low or 'inc.' in low:
+                        nii_with_fees = nii_with_fees or v
+                    else:
+                        nii_plain = nii_plain or v
+                if _is_pat_row(label) and abs(v) < 20_000:
+                    if 'excl' in low:
+                        pat_excl = v if pat_excl is None else pat_excl
+                    elif 'incld' not in low:
+                        pat_plain = v if pat_plain is None else pat_plain
+            if 'nim' in groups and _NIM_ROW.search(label) and 1 < v < 20:
+                first('nim_pct', v)
+            if 'npa' in groups and _GNPA_ROW.search(label):
+                first('gnpa_pct', v)
+            if 'npa' in groups and _NNPA_ROW.search(label):
+                first('nnpa_pct', v)
+            if 'roa' in groups and _ROA_ROW.search(label) and not _ANNUALISED.search(label) and 0 < v < 10:
+                first('roa_pct', v)
+            if 'roe' in groups and _ROE_ROW.search(label) and 0 < v < 80:
+                first('roe_pct', v)
+            if 'car' in groups and _CAR_ROW.search(label) and 10 < v < 60:
+                first('car_pct', v)
+            if 'bs' in groups and v:
+                if _SHARE_CAPITAL_ROW.search(label):
+                    first('share_capital_cr', v)
+                if _RESERVE_ROW.search(label) and _SURPLUS_ROW.search(label):
+                    first('reserves_cr', v)
+
+    if nii_with_fees or nii_plain:
+        found['nii_cr'] = nii_with_fees or nii_plain
+    pat = pat_excl if pat_excl is not None else pat_plain
+    if pat is not None:
+        found['pat_cr'] = pat
+    for key, v in found.items():
+        data.setdefault(key, v)
+
+
 # ─── MAIN PIPELINE ─────────────────────────────────────────────────────────────
 
-def run(company_key):
+def run(company_key, workers=None, ingest=False):
     cfg  = COMPANIES[company_key]
     code = cfg['bse_code']
     fv   = cfg.get('face_value', 2)
     name = cfg['name']
     lo   = cfg.get('lending_only', False)
+    eng  = cfg.get('table_engine', 'heuristic')
 
     pdf_company_dir = os.path.join(PDF_DIR, company_key)
     os.makedirs(pdf_company_dir, exist_ok=True)
@@ -694,7 +1114,8 @@ def run(company_key):
             print(f"    SKIP {pdf_path}")
             continue
         print(f"    {os.path.basename(pdf_path)} … ", end='', flush=True)
-        metrics = parse_pdf(pdf_path, face_value=fv, lending_only=lo)
+        metrics = parse_pdf(pdf_path, face_value=fv, lending_only=lo, workers=workers,
+                            engine=eng)
         metrics['filing_date'] = filing_date
         quarters.append(metrics)
         aum = metrics.get('aum_cr', '?')
@@ -715,15 +1136,20 @@ def run(company_key):
     out_file = os.path.join(DATA_DIR, f'{company_key}.json')
     with open(out_file, 'w') as f:
         json.dump(output, f, indent=2)
-    print(f"[4] Saved → {out_file}  ({len(quarters)} quarters)\n")
+    print(f"[4] Saved → {out_file}  ({len(quarters)} quarters)")
+
+    # 5 — compare with (or, with --ingest, merge into) the data store the dashboard reads
+    print("[5] Ingesting …" if ingest else "[5] Store diff (dry run — pass --ingest to merge) …")
+    ingest_presentations.print_report(ingest_presentations.ingest([out_file], dry_run=not ingest))
+    print()
     return output
 
 
-def run_all():
+def run_all(workers=None, ingest=False):
     results = {}
     for key in COMPANIES:
         try:
-            results[key] = run(key)
+            results[key] = run(key, workers=workers, ingest=ingest)
         except Exception as e:
             print(f"ERROR processing {key}: {e}")
     return results
@@ -812,8 +1238,16 @@ def print_summary_table(all_results):
 
 
 if __name__ == '__main__':
-    if len(sys.argv) > 1 and sys.argv[1] in COMPANIES:
-        results = {sys.argv[1]: run(sys.argv[1])}
+    args    = sys.argv[1:]
+    workers = None
+    if '--workers' in args:
+        i       = args.index('--workers')
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    ingest = '--ingest' in args
+    args   = [a for a in args if a != '--ingest']
+    if args and args[0] in COMPANIES:
+        results = {args[0]: run(args[0], workers=workers, ingest=ingest)}
     else:
-        results = run_all()
+        results = run_all(workers=workers, ingest=ingest)
     print_summary_table(results)
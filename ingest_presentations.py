@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Ingest stage: merges the per-filing metrics fetch_presentations.py writes to
+data/<company>.json into the quarterly series in the data store
+(nbfc_store 'timeseries' → NBFC_TIMESERIES), so a refreshed deck reaches the
+dashboard on its next rerun without a code edit or restart.
+
+  - each filing_date is mapped to the results quarter it reports;
+  - when several filings land in one quarter, the earliest (the results
+    deck) is used and the rest are reported as duplicates;
+  - parsed values fill empty cells; a value that disagrees with one already
+    in the store is reported as a conflict and the stored value is kept
+    unless --overwrite is given;
+  - files unchanged since their last ingest are skipped.
+
+Run with:
+    python3 ingest_presentations.py              # all data/*.json
+    python3 ingest_presentations.py bajaj        # single company
+    python3 ingest_presentations.py --dry-run    # report only, write nothing
+    python3 ingest_presentations.py --overwrite  # parsed values win conflicts
+    python3 ingest_presentations.py --force      # re-read unchanged files
+"""
+
+import glob, json, os, sys
+from collections import namedtuple
+
+import nbfc_store
+
+ROOT     = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(ROOT, 'data')
+
+# Parsed field → NBFC_TIMESERIES metric
+FIELD_METRICS = {
+    'aum_cr':               'aum_cr',
+    'nii_cr':               'nii_cr',
+    'pat_cr':               'pat_cr',
+    'nim_pct':              'nim_pct',
+    'roa_pct':              'roa_pct',
+    'roe_pct':              'roe_pct',
+    'gnpa_pct':             'gnpa_pct',
+    'nnpa_pct':             'nnpa_pct',
+    'car_pct':              'car_pct',
+    'book_value_per_share': 'bvps_inr',
+    'disbursements_cr':     'disbursements_cr',
+}
+# Company keys whose data/<key>.json 'company' name differs from the cache's
+CACHE_NAMES = {'chola': 'Chola Finance'}
+
+# status: added | match | conflict | overwritten | duplicate | out_of_range | unknown_company
+Change = namedtuple('Change', 'company quarter metric old new filing status')
+
+
+def filing_quarter(filing_date):
+    """Results quarter a filing dated YYYY-MM-DD (or YYYYMM) reports, e.g. '2026-02-03' → 'Q3FY26'."""
+    digits = filing_date.replace('-', '')
+    year, month = int(digits[:4]), int(digits[4:6])
+    if month <= 3:
+        return f'Q3FY{year % 100:02d}'
+    if month <= 6:
+        return f'Q4FY{year % 100:02d}'
+    if month <= 9:
+        return f'Q1FY{(year + 1) % 100:02d}'
+    return f'Q2FY{(year + 1) % 100:02d}'
+
+
+def values_agree(a, b):
+    """Same figure up to rounding: within 0.05 absolute or 2% relative."""
+    if a is None or b is None:
+        return False
+    return abs(a - b) <= max(0.05, abs(b) * 0.02)
+
+
+# ── Reconciliation ───────────────────────────────────────────────────────────
+
+def reconcile(company_key, doc, timeseries, quarters, overwrite=False):
+    """Changes one company file implies against the current series (pure; writes nothing)."""
+    entity = CACHE_NAMES.get(company_key, doc.get('company', company_key))
+    if entity not in timeseries:
+        return [Change(entity, None, None, None, None, None, 'unknown_company')]
+    series = timeseries[entity]
+
+    by_quarter = {}
+    for filing in sorted(doc.get('quarters', []), key=lambda f: f.get('filing_date', '')):
+        if filing.get('filing_date'):
+            by_quarter.setdefault(filing_quarter(filing['filing_date']), []).append(filing)
+
+    changes = []
+    for q, filings in by_quarter.items():
+        used, later = filings[0], filings[1:]
+        for f in later:
+            changes.append(Change(entity, q, None, None, None, f['filing_date'], 'duplicate'))
+        if q not in quarters:
+            changes.append(Change(entity, q, None, None, None, used['filing_date'], 'out_of_range'))
+            continue
+        qi = quarters.index(q)
+        for field, metric in FIELD_METRICS.items():
+            new = used.get(field)
+            if new is None:
+                continue
+            old = series.get(metric, [None] * len(quarters))[qi]
+            if old is None:
+                status = 'added'
+            elif values_agree(new, old):
+                status = 'match'
+            else:
+                status = 'overwritten' if overwrite else 'conflict'
+            changes.append(Change(entity, q, metric, old, new, used['filing_date'], status))
+    return changes
+
+
+def _cells(changes, timeseries, quarters):
+    """Store cells for the changes that write; new metrics get a full None-padded list."""
+    writes = {}
+    for c in changes:
+        if c.status in ('added', 'overwritten'):
+            writes.setdefault((c.company, c.metric), {})[quarters.index(c.quarter)] = c.new
+    for (entity, metric), vals in writes.items():
+        idxs = vals if metric in timeseries[entity] else range(len(quarters))
+        for i in idxs:
+            yield entity, metric, i, vals.get(i)
+
+
+# ── Ingest ───────────────────────────────────────────────────────────────────
+
+def ingest(paths=None, store_path=None, overwrite=False, force=False, dry_run=False):
+    """
+    Reconcile data/*.json (or `paths`) against the store and merge the result.
+    Returns the list of Changes, including matches and skipped filings.
+    """
+    paths = sorted(paths or glob.glob(os.path.join(DATA_DIR, '*.json')))
+    ts    = nbfc_store.load('timeseries', store_path)
+    seen  = {} if force else nbfc_store.ingested_sources('timeseries', store_path)
+
+    timeseries, quarters = ts['NBFC_TIMESERIES'], ts['QUARTERS']
+    changes, mtimes = [], {}
+    for path in paths:
+        mtime = os.path.getmtime(path)
+        if seen.get(os.path.abspath(path)) == mtime:
+            continue
+        with open(path) as f:
+            doc = json.load(f)
+        key = os.path.splitext(os.path.basename(path))[0]
+        changes += reconcile(key, doc, timeseries, quarters, overwrite)
+        mtimes[os.path.abspath(path)] = mtime
+
+    if not dry_run:
+        nbfc_store.update_series('timeseries', 'NBFC_TIMESERIES',
+                                 _cells(changes, timeseries, quarters),
+                                 store_path, source='ingest', ingested=mtimes)
+    return changes
+
+
+def print_report(changes):
+    counts = {}
+    for c in changes:
+        counts[c.status] = counts.get(c.status, 0) + 1
+    print('  '.join(f'{k}={v}' for k, v in sorted(counts.items())) or 'Nothing to ingest')
+
+    flagged = [c for c in changes if c.status in ('conflict', 'overwritten')]
+    if flagged:
+        print(f"\n{'Company':<22} {'Quarter':<8} {'Metric':<18} {'Stored':>12} {'Parsed':>12}  Filing      Status")
+        for c in flagged:
+            print(f'{c.company:<22} {c.quarter:<8} {c.metric:<18} {c.old:>12} {c.new:>12}  '
+                  f'{c.filing}  {c.status}')
+    for c in changes:
+        if c.status == 'unknown_company':
+            print(f'  no series for {c.company!r}')
+
+
+if __name__ == '__main__':
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    keys  = [a for a in sys.argv[1:] if not a.startswith('--')]
+    paths = [os.path.join(DATA_DIR, f'{k}.json') for k in keys] or None
+    print_report(ingest(paths, overwrite='--overwrite' in flags, force='--force' in flags,
+                        dry_run='--dry-run' in flags))
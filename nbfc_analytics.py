@@ -0,0 +1,763 @@
+"""
+Derived analytics
+The numbers behind the dashboard's charts and insight text — rankings, their
+heat-map colours and per-quarter rank / percentile matrices, peer statistics
+(medians, z-scores, outlier flags), QoQ / YoY growth, daily P/B, indexed
+returns, market cap, peer-normalised radar scores, the rule-based SWOT and
+the end-label layout the line charts share — as pure functions returning
+lists, dicts, NumPy arrays and pandas Series (no Streamlit, no Plotly). The
+chart factories in nbfc_dashboard_v1.py only assemble figures from these,
+and the JSON API in nbfc_api.py serves them, so a risk model reading the API
+gets exactly the figures the dashboard draws. Being plain module-level
+functions of their arguments, they can be cached per layer, benchmarked on
+their own and shipped to worker processes.
+
+Functions take the NBFC_TIMESERIES dict (and TRANSCRIPT_DATA for SWOT)
+explicitly and address NBFCs by display name.
+
+Usage:
+    ts = snapshot['timeseries']['NBFC_TIMESERIES']
+    rankings(ts, INSIGHT_BASE_Q)          # {nbfc: {metric: (value, rank)}}
+    growth(ts[key]['aum_cr'], 1)          # QoQ % aligned to QUARTERS
+    radar_scores(ts, 'Bajaj Finance', radar_bounds(ts))
+    radar_matrix(metric_cube(ts, [m[0] for m in RADAR_METRICS], 9))   # every NBFC × quarter
+    swot(ts, TRANSCRIPT_DATA, 'Bajaj Finance')
+    swot_all(insight_frame(peer_stats(ts)), TRANSCRIPT_DATA)   # {nbfc: (S, W, O, T)}
+    peer_stats(ts).outlier                # NBFC × metric × quarter flags
+    indexed(closes)                       # (closes rebased to 100, first, last)
+"""
+
+from collections import namedtuple
+from datetime import date, timedelta
+
+# ── NBFC registry ────────────────────────────────────────────────────────────
+
+NBFCS = {
+    'Poonawalla Fincorp':    'POONAWALLA.NS',
+    'Bajaj Finance':         'BAJFINANCE.NS',
+    'Shriram Finance':       'SHRIRAMFIN.NS',
+    'L&T Finance':           'LTF.NS',
+    'Cholamandalam Finance': 'CHOLAFIN.NS',
+    'Aditya Birla Capital':  'ABCAPITAL.NS',
+    'Piramal Finance':       'PIRAMALFIN.NS',
+    'Muthoot Finance':       'MUTHOOTFIN.NS',
+    'Mahindra Finance':      'M&MFIN.NS',
+}
+
+# display name → NBFC_TIMESERIES key
+CACHE_KEY = {
+    'Poonawalla Fincorp':    'Poonawalla Fincorp',
+    'Bajaj Finance':         'Bajaj Finance',
+    'Shriram Finance':       'Shriram Finance',
+    'L&T Finance':           'L&T Finance',
+    'Cholamandalam Finance': 'Chola Finance',
+    'Aditya Birla Capital':  'Aditya Birla Capital',
+    'Piramal Finance':       'Piramal Finance',
+    'Muthoot Finance':       'Muthoot Finance',
+    'Mahindra Finance':      'Mahindra Finance',
+}
+
+DISPLAY_NAMES = list(NBFCS.keys())
+POON_KEY = 'Poonawalla Fincorp'
+
+# Chart colour per NBFC — the Streamlit dashboard and the static export share it
+COLORS = {
+    'Poonawalla Fincorp':    '#0284c7',
+    'Bajaj Finance':         '#f97316',
+    'Shriram Finance':       '#10b981',
+    'L&T Finance':           '#8b5cf6',
+    'Cholamandalam Finance': '#ef4444',
+    'Aditya Birla Capital':  '#0891b2',
+    'Piramal Finance':       '#be123c',
+    'Muthoot Finance':       '#65a30d',
+    'Mahindra Finance':      '#7c3aed',
+}
+
+# Hard-coded to Q4FY26 as base quarter (index 8).  Update INSIGHT_BASE_Q each
+# quarter release to auto-shift all narratives forward.
+INSIGHT_BASE_Q = 8   # Q4FY26
+INSIGHT_PREV_Q = 7   # Q3FY26
+INSIGHT_YOY_Q  = 4   # Q4FY25
+
+# (display_label, roa_norm_low, roa_norm_high, segment_context_note)
+SEGMENT_META = {
+    'Poonawalla Fincorp':    ('Consumer & Personal Finance', 1.0, 3.0,  ''),
+    'Bajaj Finance':         ('Diversified Retail',          3.5, 5.5,  ''),
+    'Shriram Finance':       ('Commercial Vehicle & MSME',   2.5, 4.0,  ''),
+    'L&T Finance':           ('Retail / Home Loans',         1.5, 2.5,  ''),
+    'Cholamandalam Finance': ('Vehicle, Home & SME',         2.0, 3.5,  ''),
+    'Aditya Birla Capital':  ('Diversified Lending',         1.0, 2.0,  ''),
+    'Piramal Finance':       ('Real Estate / Corporate',     0.5, 2.0,  'Transitioning from wholesale; legacy DHFL book still winding down'),
+    'Muthoot Finance':       ('Gold Loans',                  4.0, 7.0,  'Gold-loan ROA structurally 4–7%; direct Poonawalla ROA comparison not meaningful'),
+    'Mahindra Finance':      ('Rural & Vehicle Finance',     1.5, 2.5,  ''),
+}
+
+# (metric, label, fmt, lower_is_better)
+RANKINGS_METRICS = [
+    ('aum_cr', 'AUM (₹ Cr)', 'cr', False),
+    ('pat_cr', 'PAT (₹ Cr)', 'cr', False),
+    ('gnpa_pct', 'GNPA %', 'pct', True),
+    ('nnpa_pct', 'NNPA %', 'pct', True),
+    ('nim_pct', 'NIM %', 'pct', False),
+    ('roa_pct', 'ROA %', 'pct', False),
+    ('roe_pct', 'ROE %', 'pct', False),
+    ('cost_of_borrowing_pct', 'CoB %', 'pct', True),
+    ('d_e_ratio', 'D/E', 'ratio', True),
+    ('car_pct', 'CAR %', 'pct', False),
+    ('bvps_inr', 'BVPS (₹)', 'bvps', False),
+]
+
+# (metric, label, lower_is_better)
+RADAR_METRICS = [
+    ('roa_pct',              'ROA',        False),
+    ('roe_pct',              'ROE',        False),
+    ('nim_pct',              'NIM',        False),
+    ('gnpa_pct',             'GNPA',       True ),   # lower = better → invert
+    ('nnpa_pct',             'NNPA',       True ),
+    ('pcr_pct',              'PCR',        False),
+    ('car_pct',              'CAR',        False),
+    ('cost_of_borrowing_pct','CoB',        True ),
+]
+
+# Metrics the insight generators (SWOT, scorecard bullets, benchmark table,
+# movers, macro signals) read off insight_frame
+INSIGHT_METRICS = ['aum_cr', 'pat_cr', 'nim_pct', 'roa_pct', 'roe_pct', 'gnpa_pct', 'nnpa_pct',
+                   'pcr_pct', 'cost_of_borrowing_pct', 'd_e_ratio', 'car_pct', 'bvps_inr']
+
+
+# ── Accessors ────────────────────────────────────────────────────────────────
+
+def value(ts, nbfc, metric, idx):
+    """NBFC_TIMESERIES value for a display name at quarter index `idx` (None if missing)."""
+    series = ts.get(CACHE_KEY[nbfc], {}).get(metric, [])
+    return series[idx] if idx < len(series) else None
+
+
+def series(ts, metric):
+    """{display name: values aligned to QUARTERS} for one metric."""
+    return {n: ts[CACHE_KEY[n]][metric] for n in DISPLAY_NAMES}
+
+
+def latest(values):
+    """(last non-None value, its index), or (None, -1)."""
+    for i in range(len(values) - 1, -1, -1):
+        if values[i] is not None:
+            return values[i], i
+    return None, -1
+
+
+def short_fmt(v, fmt='pct'):
+    """Short display formatter for insight text."""
+    if v is None: return '—'
+    if fmt == 'cr':
+        if abs(v) >= 100000: return f'₹{v/1000:.0f}k Cr'
+        if abs(v) >= 1000:   return f'₹{v/1000:.1f}k Cr'
+        return f'₹{int(v)} Cr'
+    if fmt == 'pp':
+        s = '+' if v > 0 else ''
+        return f'{s}{v:.2f}pp'
+    if fmt == 'bps':
+        bps = v * 100
+        s = '+' if bps > 0 else ''
+        return f'{s}{bps:.0f} bps'
+    return f'{v:.2f}%'
+
+
+# ── Growth & rankings ────────────────────────────────────────────────────────
+
+def growth(values, lag):
+    """
+    % change vs `lag` quarters earlier, aligned to `values` (lag=1 QoQ, 4 YoY).
+    The first `lag` entries and gaps are None; a non-positive base gives 0.0,
+    as the growth charts plot it.
+    """
+    out = [None] * min(lag, len(values))
+    for i in range(lag, len(values)):
+        cur, prev = values[i], values[i - lag]
+        if cur is None or prev is None:
+            out.append(None)
+        elif prev <= 0:
+            out.append(0.0)
+        else:
+            out.append((cur - prev) / prev * 100)
+    return out
+
+
+def rankings(ts, q_idx, metric_defs=RANKINGS_METRICS):
+    """
+    {nbfc: {metric: (value, rank)}} at quarter `q_idx`. Rank 1 is best
+    (respecting lower_is_better); tied values share a rank and NBFCs that
+    did not report get rank None.
+    """
+    out = {n: {} for n in DISPLAY_NAMES}
+    for metric, _, _, lower in metric_defs:
+        vals = {n: value(ts, n, metric, q_idx) for n in DISPLAY_NAMES}
+        ranked = sorted((v if lower else -v) for v in vals.values() if v is not None)
+        for n, v in vals.items():
+            out[n][metric] = (v, None if v is None else ranked.index(v if lower else -v) + 1)
+    return out
+
+
+# Red (worst) → amber → green (best) heat-map stops, as (r, g, b)
+HEAT_LOW, HEAT_MID, HEAT_HIGH = (220, 60, 60), (255, 215, 50), (60, 190, 80)
+HEAT_NONE = 'rgba(241,245,249,0.5)'   # not reported
+HEAT_FLAT = 'rgba(248,250,252,0.7)'   # every NBFC equal
+
+
+def metric_cube(ts, metrics, n_quarters, names=DISPLAY_NAMES):
+    """
+    float array (NBFC × metric × quarter) of NBFC_TIMESERIES, NaN where a
+    value was not reported. Names outside CACHE_KEY are used as keys as-is.
+    """
+    import numpy as np
+    cube = np.full((len(names), len(metrics), n_quarters), np.nan)
+    for i, n in enumerate(names):
+        s = ts.get(CACHE_KEY.get(n, n), {})
+        for j, m in enumerate(metrics):
+            vals = s.get(m, [])[:n_quarters]
+            if vals:
+                cube[i, j, :len(vals)] = np.array(vals, dtype=float)   # None → NaN
+    return cube
+
+
+def heat_matrix(values, lower_is_better):
+    """
+    RGBA fills for a (NBFC × metric) array, each column min-max scaled over
+    its non-NaN values — all columns in one vectorised pass, strings built
+    last. `lower_is_better` has one flag per column; returns one list of
+    fills per column, as go.Table takes them.
+    """
+    import numpy as np
+    v = np.asarray(values, dtype=float)
+    valid = ~np.isnan(v)
+    mn = np.where(valid, v, np.inf).min(axis=0, initial=np.inf)
+    mx = np.where(valid, v, -np.inf).max(axis=0, initial=-np.inf)
+    flat = mx == mn
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (v - mn) / (mx - mn)
+    t = np.where(np.asarray(lower_is_better, dtype=bool), 1.0 - t, t)
+    low = (t <= 0.5)[..., None]
+    s = np.where(low[..., 0], t * 2, (t - 0.5) * 2)[..., None]
+    a = np.where(low, HEAT_LOW, HEAT_MID)
+    z = np.where(low, HEAT_MID, HEAT_HIGH)
+    rgb = np.nan_to_num(a + s * (z - a)).astype(int).tolist()
+
+    state = np.where(valid, np.where(flat, 1, 2), 0).T.tolist()   # 0 none, 1 flat, 2 scaled
+    return [[HEAT_NONE if k == 0 else HEAT_FLAT if k == 1 else 'rgba(%d,%d,%d,0.35)' % tuple(rgb[i][j])
+             for i, k in enumerate(col)]
+            for j, col in enumerate(state)]
+
+
+def heat_colors(values, lower_is_better):
+    """RGBA fill per value, min-max scaled over the non-None values of the column."""
+    if not values:
+        return []
+    return heat_matrix([[v] for v in values], [lower_is_better])[0]
+
+
+def rankings_cells(values, metric_defs=RANKINGS_METRICS):
+    """
+    (cell text, cell fills) columns for the rankings table from a
+    (NBFC × metric) slice of metric_cube: colours straight from the numbers,
+    formatting applied only to the text.
+    """
+    import numpy as np
+    fills = heat_matrix(values, [m[3] for m in metric_defs])
+    cols = np.asarray(values, dtype=float).T.tolist()
+    text = [[fmt_cell(None if v != v else v, fmt) for v in col]   # v != v: NaN
+            for col, (_, _, fmt, _) in zip(cols, metric_defs)]
+    return text, fills
+
+
+def rank_matrices(cube, lower_is_better):
+    """
+    (ranks, percentiles) arrays shaped like `cube` (NBFC × metric × quarter),
+    from one argsort along the NBFC axis. Ranks follow rankings(): 1 is best,
+    ties share the better rank, NaN where not reported. The percentile is the
+    share of the other reporting NBFCs an NBFC is at least level with
+    (100 = best, 0 = worst, 100 when it is the only one reporting).
+    """
+    import numpy as np
+    cube = np.asarray(cube, dtype=float)
+    sign = np.where(np.asarray(lower_is_better, dtype=bool), 1.0, -1.0)[None, :, None]
+    key = cube * sign                                  # ascending = better first
+    order = np.argsort(key, axis=0, kind='stable')     # NaN sorts last
+    ranked = np.take_along_axis(key, order, axis=0)
+
+    pos = np.arange(cube.shape[0]).reshape(-1, 1, 1)
+    starts = np.ones(ranked.shape, dtype=bool)
+    starts[1:] = ranked[1:] != ranked[:-1]
+    first = np.maximum.accumulate(np.where(starts, pos, 0), axis=0)   # start of each tie run
+
+    ranks = np.empty_like(cube)
+    np.put_along_axis(ranks, order, first + 1.0, axis=0)
+    valid = ~np.isnan(cube)
+    ranks[~valid] = np.nan
+
+    n = valid.sum(axis=0, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pct = np.where(n > 1, (n - ranks) / (n - 1) * 100, 100.0)
+    pct[~valid] = np.nan
+    return ranks, pct
+
+
+def leaders(ranks, values, q_idx):
+    """Per metric, (row, value) of the first rank-1 NBFC at quarter `q_idx`, or (None, None)."""
+    out = []
+    for j in range(ranks.shape[1]):
+        rows = (ranks[:, j, q_idx] == 1).nonzero()[0]
+        out.append((int(rows[0]), float(values[rows[0], j, q_idx])) if len(rows) else (None, None))
+    return out
+
+
+def fmt_cell(v, fmt):
+    """Rankings table cell text."""
+    if v is None:
+        return "—"
+    if fmt == 'cr':
+        return f"₹{int(v):,}"
+    elif fmt == 'pct':
+        return f"{v:.2f}%"
+    elif fmt == 'ratio':
+        return f"{v:.2f}x"
+    elif fmt == 'bvps':
+        return f"₹{int(v):,}"
+    return str(v)
+
+
+# ── Peer statistics ──────────────────────────────────────────────────────────
+
+# Metrics where a lower value is the better one (asset quality, funding, leverage)
+LOWER_IS_BETTER = frozenset({'gnpa_pct', 'nnpa_pct', 'cost_of_borrowing_pct', 'd_e_ratio'})
+
+OUTLIER_Z = 3.5   # |modified z-score| cut-off for outlier flags (Iglewicz & Hoaglin)
+
+# Arrays are NBFC × metric × quarter unless noted; NaN where not reported.
+#   value      the metric cube
+#   qoq_diff   change vs the previous quarter; qoq_pct / yoy_pct % change vs
+#              1 / 4 quarters earlier (NaN on a zero base)
+#   median     peer median (metric × quarter)
+#   pct        rank_matrices percentile, 100 = best
+#   z          (value − peer mean) / peer sd
+#   robust_z   0.6745 · (value − median) / MAD, the outlier score; where most
+#              peers report the same value (MAD = 0) the mean absolute
+#              deviation stands in: (value − median) / (1.253314 · MeanAD),
+#              and NaN (never flagged) when every peer is level
+#   outlier    |robust_z| > OUTLIER_Z
+#   segment    ROA placed in the NBFC's SEGMENT_META norm band
+#              (0 = floor, 1 = ceiling); NaN for every other metric
+PeerStats = namedtuple('PeerStats', 'names metrics value qoq_diff qoq_pct yoy_pct median pct z robust_z outlier segment')
+
+
+def _lagged_pct(v, lag):
+    import numpy as np
+    out = np.full(v.shape, np.nan)
+    cur, base = v[..., lag:], v[..., :-lag]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[..., lag:] = np.where(base != 0, (cur - base) / np.abs(base) * 100, np.nan)
+    return out
+
+
+def peer_stats(ts, names=DISPLAY_NAMES, metrics=None):
+    """
+    PeerStats for the given NBFCs plus Poonawalla over every metric they
+    report (or `metrics`) and every quarter — cross-sectional statistics
+    computed in one vectorised pass over the metric cube, for the insight
+    generators to read.
+    """
+    import numpy as np, warnings
+    names = list(dict.fromkeys([POON_KEY, *names]))
+    rows = [ts.get(CACHE_KEY.get(n, n), {}) for n in names]
+    metrics = list(metrics or dict.fromkeys(m for r in rows for m in r))
+    n_q = max((len(v) for r in rows for v in r.values()), default=0)
+    v = metric_cube(ts, metrics, n_q, names)
+    valid = ~np.isnan(v)
+
+    qoq_diff = np.full(v.shape, np.nan)
+    qoq_diff[..., 1:] = v[..., 1:] - v[..., :-1]
+
+    n = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)           # all-NaN columns
+        median = np.nanmedian(v, axis=0)
+        mean = np.where(valid, v, 0).sum(axis=0) / n
+        sd = np.sqrt((np.where(valid, v - mean, 0) ** 2).sum(axis=0) / n)
+        z = (v - mean) / sd
+        dev = np.abs(v - median)
+        mad = np.nanmedian(dev, axis=0)
+        mean_ad = np.nanmean(dev, axis=0)
+        robust_z = np.where(mad > 0, 0.6745 * (v - median) / mad, (v - median) / (1.253314 * mean_ad))
+
+    segment = np.full(v.shape, np.nan)
+    if 'roa_pct' in metrics:
+        j = metrics.index('roa_pct')
+        for i, name in enumerate(names):
+            if name in SEGMENT_META:
+                _, lo, hi, _ = SEGMENT_META[name]
+                segment[i, j] = (v[i, j] - lo) / (hi - lo)
+
+    return PeerStats(names, metrics, v, qoq_diff, _lagged_pct(v, 1), _lagged_pct(v, 4), median,
+                     rank_matrices(v, [m in LOWER_IS_BETTER for m in metrics])[1],
+                     z, robust_z, np.abs(robust_z) > OUTLIER_Z, segment)
+
+
+# One NBFC × metric at the insight quarters, with the moves the insight
+# generators read.
+Moves = namedtuple('Moves', 'base prev yoy qoq_diff qoq_pct yoy_pct')
+NO_MOVES = Moves(None, None, None, None, None, None)
+
+
+class _MovesRow(dict):
+    """{metric: Moves} for one NBFC; metrics it does not report read as NO_MOVES."""
+    def __missing__(self, metric):
+        return NO_MOVES
+
+
+def insight_frame(stats):
+    """
+    {nbfc: {metric: Moves}} at INSIGHT_BASE_Q / PREV_Q / YOY_Q, sliced out of
+    a PeerStats in one pass — the same numbers as value / qoq_diff / qoq_pct /
+    yoy_pct. Unreported metrics read as NO_MOVES.
+    """
+    import numpy as np
+    v = stats.value
+    if v.shape[2] <= INSIGHT_BASE_Q:
+        return {n: _MovesRow() for n in stats.names}
+    c, p, y = v[..., INSIGHT_BASE_Q], v[..., INSIGHT_PREV_Q], v[..., INSIGHT_YOY_Q]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cols = [c, p, y, c - p,
+                np.where(p != 0, (c - p) / np.abs(p) * 100, np.nan),
+                np.where(y != 0, (c - y) / np.abs(y) * 100, np.nan)]
+    cols = np.stack(cols, axis=-1).tolist()                        # NBFC × metric × 6
+    return {n: _MovesRow((m, Moves(*[None if x != x else x for x in cols[i][j]]))
+                         for j, m in enumerate(stats.metrics) if not np.isnan(v[i, j]).all())
+            for i, n in enumerate(stats.names)}
+
+
+# ── Prices ───────────────────────────────────────────────────────────────────
+
+def quarter_end(label):
+    """'Q4FY26' → date(2026, 3, 31); Indian fiscal quarters (FY ends in March)."""
+    q, fy = int(label[1]), 2000 + int(label[-2:])
+    year  = fy if q == 4 else fy - 1
+    return {1: date(year, 6, 30), 2: date(year, 9, 30), 3: date(year, 12, 31), 4: date(year, 3, 31)}[q]
+
+
+def pb_series(bvps, quarters, days, closes):
+    """
+    Daily P/B from closing prices against the BVPS of the latest reported
+    quarter end on or before each day. `days` are dates (or datetimes),
+    ascending. Returns (days, pb, prices, bvps) for the days that have a
+    positive BVPS.
+    """
+    ends = [(quarter_end(q), i) for i, q in enumerate(quarters)]
+    out  = ([], [], [], [])
+    j, q_idx = 0, None
+    for day, price in zip(days, closes):
+        d = day.date() if hasattr(day, 'date') else day
+        while j < len(ends) and ends[j][0] <= d:
+            q_idx = ends[j][1]
+            j += 1
+        if q_idx is None:
+            continue
+        b = bvps[q_idx] if q_idx < len(bvps) else None
+        if b is None or b <= 0:
+            continue
+        price = float(price)
+        for col, v in zip(out, (day, price / b, price, b)):
+            col.append(v)
+    return out
+
+
+# Comparison-chart periods (days back from today) and the yfinance period
+# used when a date-range download comes back empty
+PERIOD_DAYS = {'1W': 7, '1M': 30, '3M': 90, '6M': 180, '1Y': 365, '3Y': 1095, '5Y': 1825}
+FALLBACK_PERIODS = [(7, '5d'), (30, '1mo'), (90, '3mo'), (180, '6mo'), (365, '1y'), (1095, '3y')]
+
+
+def comparison_window(time_period, today):
+    """(start, end) dates for a period button; unknown periods get 6 months."""
+    return today - timedelta(days=PERIOD_DAYS.get(time_period, 180)), today
+
+
+def fallback_period(time_period):
+    days = PERIOD_DAYS.get(time_period, 180)
+    return next((p for limit, p in FALLBACK_PERIODS if days <= limit), '5y')
+
+
+def indexed(closes):
+    """(closes rebased to 100 at the first day, first close, last close) — closes a pandas Series."""
+    return closes / closes.iloc[0] * 100, float(closes.iloc[0]), float(closes.iloc[-1])
+
+
+def market_cap_lcr(closes, shares):
+    """Daily market cap in ₹ lakh crore (1 L.Cr = 10^12)."""
+    return closes * shares / 1e12
+
+
+# ── Chart label layout ───────────────────────────────────────────────────────
+
+def label_gap(ys, frac, floor):
+    """Minimum spacing between end-of-line labels: `frac` of the y-range (1.0 if flat), at least `floor`."""
+    y_range = (max(ys) - min(ys)) if ys else 0
+    return max((y_range or 1.0) * frac, floor)
+
+
+def label_slots(values, gap):
+    """
+    Label y positions for end values sorted high → low: each label is pushed
+    `gap` below any earlier one it would overlap.
+    """
+    slots = []
+    for pos in values:
+        for prev in slots:
+            if abs(pos - prev) < gap:
+                pos = prev - gap
+        slots.append(pos)
+    return slots
+
+
+# ── Radar ────────────────────────────────────────────────────────────────────
+
+def radar_bounds(ts, q_idx=INSIGHT_BASE_Q):
+    """Peer (min, max) per radar metric for min-max normalisation."""
+    all_vals = {}
+    for key, lbl, inv in RADAR_METRICS:
+        vals = [value(ts, n, key, q_idx) for n in DISPLAY_NAMES]
+        clean = [v for v in vals if v is not None]
+        all_vals[key] = (min(clean) if clean else 0, max(clean) if clean else 1)
+    return all_vals
+
+
+def radar_scores(ts, nbfc, bounds, q_idx=INSIGHT_BASE_Q):
+    """0 (worst in peer group) … 1 (best) per RADAR_METRICS entry; 0.5 when not reported."""
+    scores = []
+    for key, _, inv in RADAR_METRICS:
+        lo, hi = bounds[key]
+        val = value(ts, nbfc, key, q_idx)
+        if hi == lo or val is None:
+            scores.append(0.5)
+            continue
+        score = (val - lo) / (hi - lo)
+        scores.append(1 - score if inv else score)
+    return scores
+
+
+RADAR_METHODS = ('minmax', 'zscore', 'percentile')
+
+
+def radar_matrix(cube, method='minmax'):
+    """
+    0 (worst) … 1 (best) scores for a RADAR_METRICS metric_cube (NBFC ×
+    metric × quarter), every NBFC and quarter in one pass; 0.5 where an NBFC
+    did not report or the peers cannot be scaled. Lower-is-better metrics
+    are inverted so outward is better.
+      minmax      peer min → 0, max → 1 (radar_scores, vectorised)
+      zscore      peer mean → 0.5, ±2 standard deviations → 0 / 1, clipped
+      percentile  the rank_matrices percentile / 100
+    """
+    import numpy as np
+    cube = np.asarray(cube, dtype=float)
+    lower = [m[2] for m in RADAR_METRICS]
+    inv = np.array(lower, dtype=bool)[None, :, None]
+    valid = ~np.isnan(cube)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == 'minmax':
+            lo = np.where(valid, cube, np.inf).min(axis=0, initial=np.inf)
+            hi = np.where(valid, cube, -np.inf).max(axis=0, initial=-np.inf)
+            score = (cube - lo) / (hi - lo)
+            score = np.where(inv, 1 - score, score)
+        elif method == 'zscore':
+            n = valid.sum(axis=0)
+            mean = np.where(valid, cube, 0).sum(axis=0) / n
+            sd = np.sqrt((np.where(valid, cube - mean, 0) ** 2).sum(axis=0) / n)
+            z = (cube - mean) / sd
+            score = np.clip(np.where(inv, -z, z) / 4 + 0.5, 0, 1)
+        elif method == 'percentile':
+            score = rank_matrices(cube, lower)[1] / 100
+        else:
+            raise ValueError(f'unknown radar method {method!r}; expected one of {RADAR_METHODS}')
+    return np.where(np.isnan(score), 0.5, score)
+
+
+# ── SWOT ─────────────────────────────────────────────────────────────────────
+
+def swot(ts, transcripts, nbfc_disp):
+    """Rule-based (S, W, O, T) lists for one NBFC, transcript items first, max 5 each."""
+    return _swot(insight_frame(peer_stats(ts, [nbfc_disp])), transcripts, nbfc_disp)
+
+
+def swot_all(frame, transcripts):
+    """{nbfc: (S, W, O, T)} for every NBFC of an insight_frame."""
+    return {n: _swot(frame, transcripts, n) for n in frame}
+
+
+def _swot(frame, transcripts, nbfc_disp):
+    S, W, O, T = [], [], [], []
+    f, poon = frame[nbfc_disp], frame[POON_KEY]
+    seg_lbl, roa_lo, roa_hi, seg_note = SEGMENT_META[nbfc_disp]
+    is_gold = 'Gold' in seg_lbl
+    is_poon = nbfc_disp == POON_KEY
+
+    poon_roa  = poon['roa_pct'].base
+    poon_gnpa = poon['gnpa_pct'].base
+    poon_nnpa = poon['nnpa_pct'].base
+
+    # ── ROA ──────────────────────────────────────────────────────────────────
+    roa     = f['roa_pct'].base
+    roa_qoq = f['roa_pct'].qoq_diff
+    if roa is not None:
+        if is_gold:
+            if roa >= roa_lo:
+                S.append(f'ROA {roa:.2f}% — within gold-loan norms ({roa_lo}–{roa_hi}%); structurally not comparable to Poonawalla')
+            else:
+                W.append(f'ROA {roa:.2f}% — below gold-loan sector floor of {roa_lo}%')
+        elif not is_poon and poon_roa is not None:
+            gap = roa - poon_roa
+            if roa >= roa_lo and gap > 0.3:
+                S.append(f'ROA {roa:.2f}% — {abs(gap):.2f}pp ahead of Poonawalla ({poon_roa:.2f}%); within {seg_lbl} norms')
+            elif roa >= roa_hi:
+                S.append(f'ROA {roa:.2f}% — top of {seg_lbl} range ({roa_lo}–{roa_hi}%)')
+            elif roa < roa_lo:
+                W.append(f'ROA {roa:.2f}% — below {seg_lbl} norms ({roa_lo}–{roa_hi}%)')
+            if gap < -0.5 and roa < roa_lo:
+                W.append(f'Trails Poonawalla by {abs(gap):.2f}pp on ROA despite different segment')
+        elif is_poon:
+            if roa >= roa_lo:
+                S.append(f'ROA {roa:.2f}% — in line with consumer-finance norms ({roa_lo}–{roa_hi}%)')
+            else:
+                W.append(f'ROA {roa:.2f}% — still rebuilding post FY25 one-time provisions; expected to recover')
+    if roa_qoq is not None:
+        if roa_qoq > 0.15:
+            O.append(f'ROA expanding +{roa_qoq:.2f}pp QoQ — profitability trajectory positive')
+        elif roa_qoq < -0.2:
+            W.append(f'ROA compressed {abs(roa_qoq):.2f}pp QoQ — monitor earnings quality')
+
+    # ── GNPA ─────────────────────────────────────────────────────────────────
+    gnpa     = f['gnpa_pct'].base
+    gnpa_qoq = f['gnpa_pct'].qoq_diff
+    gnpa_yoy = f['gnpa_pct'].yoy
+    if gnpa is not None:
+        if not is_poon and poon_gnpa is not None:
+            gap_bps = (gnpa - poon_gnpa) * 100
+            if gap_bps > 150:
+                W.append(f'GNPA {gnpa:.2f}% — {gap_bps:.0f} bps above Poonawalla ({poon_gnpa:.2f}%)')
+            elif gap_bps < -50:
+                S.append(f'GNPA {gnpa:.2f}% — {abs(gap_bps):.0f} bps below Poonawalla ({poon_gnpa:.2f}%)')
+        if gnpa > 4.5:
+            T.append(f'GNPA at {gnpa:.2f}% — elevated; credit quality under scrutiny')
+        elif gnpa < 1.5:
+            S.append(f'GNPA {gnpa:.2f}% — best-in-class asset quality')
+        if gnpa_qoq is not None:
+            bps = gnpa_qoq * 100
+            if bps > 25:
+                T.append(f'GNPA deteriorated {bps:.0f} bps QoQ to {gnpa:.2f}% — watch credit trend')
+            elif bps < -25:
+                S.append(f'GNPA improved {abs(bps):.0f} bps QoQ to {gnpa:.2f}%')
+        if gnpa_yoy is not None:
+            yoy_bps = (gnpa - gnpa_yoy) * 100
+            if yoy_bps > 50:
+                T.append(f'GNPA up {yoy_bps:.0f} bps YoY (Q4FY25 to Q4FY26) — systemic pressure building')
+            elif yoy_bps < -50:
+                O.append(f'GNPA down {abs(yoy_bps):.0f} bps YoY — sustained asset-quality improvement')
+
+    # ── NNPA ─────────────────────────────────────────────────────────────────
+    nnpa     = f['nnpa_pct'].base
+    nnpa_qoq = f['nnpa_pct'].qoq_diff
+    if nnpa is not None:
+        if not is_poon and poon_nnpa is not None:
+            gap_bps = (nnpa - poon_nnpa) * 100
+            if gap_bps > 100:
+                W.append(f'NNPA {nnpa:.2f}% — net credit exposure {gap_bps:.0f} bps above Poonawalla ({poon_nnpa:.2f}%)')
+        if nnpa > 2.5:
+            T.append(f'NNPA at {nnpa:.2f}% — net credit risk elevated; provisioning adequacy key watch')
+        if nnpa_qoq is not None:
+            bps = nnpa_qoq * 100
+            if bps > 20:
+                T.append(f'NNPA widened {bps:.0f} bps QoQ — provisioning may need to catch up')
+            elif bps < -20:
+                O.append(f'NNPA easing {abs(bps):.0f} bps QoQ — net credit risk declining')
+
+    # ── AUM ──────────────────────────────────────────────────────────────────
+    aum     = f['aum_cr'].base
+    aum_qoq = f['aum_cr'].qoq_pct
+    aum_yoy = f['aum_cr'].yoy_pct
+    if aum_yoy is not None:
+        if aum_yoy > 20:
+            O.append(f'AUM growing {aum_yoy:.1f}% YoY to {short_fmt(aum, "cr")} — strong volume momentum')
+        elif aum_yoy > 10:
+            O.append(f'AUM expanding {aum_yoy:.1f}% YoY — healthy growth')
+        elif aum_yoy < 5:
+            W.append(f'AUM growth tepid at {aum_yoy:.1f}% YoY — volume expansion needed')
+    if aum_qoq is not None and aum_qoq > 8:
+        S.append(f'AUM +{aum_qoq:.1f}% QoQ — one of the stronger sequential expansions in the peer set')
+
+    # ── PAT ──────────────────────────────────────────────────────────────────
+    pat     = f['pat_cr'].base
+    pat_yoy = f['pat_cr'].yoy_pct
+    pat_qoq = f['pat_cr'].qoq_pct
+    if pat_yoy is not None:
+        if pat_yoy > 20:
+            S.append(f'PAT grew {pat_yoy:.1f}% YoY to {short_fmt(pat, "cr")} — strong earnings growth')
+        elif pat_yoy < -10:
+            W.append(f'PAT down {abs(pat_yoy):.1f}% YoY — earnings under pressure')
+    if pat_qoq is not None and pat_qoq < -10:
+        W.append(f'PAT fell {abs(pat_qoq):.1f}% QoQ — watch sequential profitability')
+
+    # ── PCR ──────────────────────────────────────────────────────────────────
+    pcr     = f['pcr_pct'].base
+    pcr_qoq = f['pcr_pct'].qoq_diff
+    if pcr is not None:
+        if pcr > 55:
+            S.append(f'PCR {pcr:.1f}% — strong provisioning buffer absorbs credit stress well')
+        elif pcr < 35:
+            W.append(f'PCR {pcr:.1f}% — thin provisioning buffer; vulnerable to credit deterioration')
+    if pcr_qoq is not None and pcr_qoq < -3:
+        T.append(f'PCR declined {abs(pcr_qoq):.1f}pp QoQ — coverage eroding even as GNPA moves')
+
+    # ── CAR ──────────────────────────────────────────────────────────────────
+    car = f['car_pct'].base
+    if car is not None:
+        if car > 20:
+            S.append(f'CAR {car:.2f}% — well above RBI 15% minimum; strong capital buffer')
+        elif car < 16.5:
+            W.append(f'CAR {car:.2f}% — limited headroom above RBI 15% minimum; capital raise may be needed')
+
+    # ── D/E ──────────────────────────────────────────────────────────────────
+    de     = f['d_e_ratio'].base
+    de_qoq = f['d_e_ratio'].qoq_diff
+    if de is not None:
+        if de < 4.5:
+            S.append(f'D/E {de:.1f}x — conservatively levered; significant room to grow the book')
+        elif de > 8:
+            T.append(f'D/E {de:.1f}x — leverage elevated; limits ability to raise incremental debt cheaply')
+    if de_qoq is not None and de_qoq < -0.3:
+        O.append(f'Leverage declining: D/E down {abs(de_qoq):.1f}x QoQ — balance sheet strengthening')
+
+    # ── CoB ──────────────────────────────────────────────────────────────────
+    cob     = f['cost_of_borrowing_pct'].base
+    cob_qoq = f['cost_of_borrowing_pct'].qoq_diff
+    if cob_qoq is not None:
+        if cob_qoq < -0.1:
+            O.append(f'Funding cost easing: CoB down {abs(cob_qoq):.2f}pp QoQ to {cob:.2f}% — NIM support in rate-cut cycle')
+        elif cob_qoq > 0.1:
+            T.append(f'CoB up {cob_qoq:.2f}pp QoQ to {cob:.2f}% — funding cost pressure may squeeze margins')
+
+    # ── Segment context note ──────────────────────────────────────────────────
+    if seg_note:
+        O.append(f'📌 Segment note: {seg_note}')
+
+    # Prepend transcript-sourced items (higher signal than rule-based)
+    td_swot = transcripts.get(nbfc_disp, {}).get('swot_prepend', {})
+    for bucket, lst in [('S', S), ('W', W), ('O', O), ('T', T)]:
+        prepend = td_swot.get(bucket, [])
+        # Insert transcript items at front, deduplicate by keeping unique items
+        lst[:0] = prepend
+
+    # Minimum content
+    if not S: S.append('No clear outperformance vs peers in Q4FY26 — watch next quarter')
+    if not W: W.append('No significant weaknesses flagged vs sector in Q4FY26')
+    if not O: O.append('Monitor AUM growth and margin trajectory into FY27')
+    if not T: T.append('No acute threats flagged in Q4FY26 data')
+
+    return S[:5], W[:5], O[:5], T[:5]
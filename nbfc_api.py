@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Analytics JSON API
+Serves the numbers behind the dashboard's charts — rankings, QoQ / YoY
+growth, daily P/B, radar scores and SWOT — to downstream models over local
+HTTP, computed by nbfc_analytics (the same functions the chart factories
+use) with no Plotly or Streamlit in the path. Ranks, radar scores and SWOT
+read the rank / radar matrices and insight frame of nbfc_views.SeriesViews,
+the views the dashboard draws from.
+
+  GET /v1/meta                quarters, NBFCs, metric labels, data versions
+  GET /v1/rankings[?quarter=] value and peer rank per rankings metric (default: latest quarter)
+  GET /v1/deltas/<metric>     every NBFC's series with QoQ % and YoY %
+  GET /v1/radar               peer bounds and 0–1 radar scores for every NBFC
+  GET /v1/swot/<nbfc>         rule-based + transcript SWOT
+  GET /v1/pb/<nbfc>           2Y daily P/B, close and BVPS (prices from Yahoo Finance)
+
+NBFCs are addressed by display name, NBFC_TIMESERIES key or NSE symbol
+(case-insensitive): /v1/swot/BAJFINANCE, /v1/swot/L%26T%20Finance.
+
+One asyncio process (Starlette on uvicorn, both already installed with
+Streamlit); store-backed routes run in its threadpool. Each response body is serialised once and cached in a
+nbfc_views graph against the data it reads, so it is rebuilt only when the
+store changes under it; prices are fetched at most once an hour per symbol,
+off the event loop, with concurrent requests sharing the download. Every
+response carries a content-hash ETag and answers If-None-Match with 304.
+
+Run with:
+    python3 nbfc_api.py serve                          # http://127.0.0.1:8510
+    python3 nbfc_api.py serve --host 0.0.0.0 --port 9000
+"""
+
+import asyncio, hashlib, json, os, sys, time
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+import nbfc_views
+import nbfc_analytics as na
+from nbfc_views import constants
+
+HOST, PORT = '127.0.0.1', 8510
+PRICE_TTL  = 3600   # s a price download is reused
+FAIL_TTL   = 60     # s before a failed download is retried
+
+
+def encode(obj):
+    """(body, etag) — compact JSON and a strong ETag over its bytes."""
+    body = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode()
+    return body, '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(',')]
+    return '*' in tags or etag in tags or 'W/' + etag in tags
+
+
+def yahoo_closes(symbol):
+    """([date, …], [close, …]) over the last 2 years, or None if the download fails."""
+    import yfinance as yf
+    try:
+        hist = yf.Ticker(symbol).history(period='2y')
+    except Exception:
+        return None
+    if hist is None or len(hist) == 0:
+        return None
+    idx = hist.index.tz_localize(None) if hist.index.tzinfo is not None else hist.index
+    return [d.date() for d in idx], [float(c) for c in hist['Close']]
+
+
+class API:
+    """Route handlers over one store registry; `prices(symbol)` is the (blocking) price source."""
+
+    def __init__(self, registry=None, prices=yahoo_closes):
+        self.registry = registry or nbfc_store.get_registry()
+        self.graph    = nbfc_views.ViewGraph(self.registry)
+        self.prices   = prices
+        self._closes   = {}   # symbol → (fetched_at, data or None)
+        self._inflight = {}   # symbol → Future of the running download
+        self._pb       = {}   # nbfc → (fetched_at, stamps, body, etag)
+        self._resolve  = {}
+        for name in na.DISPLAY_NAMES:
+            for alias in (name, na.CACHE_KEY[name], na.NBFCS[name], na.NBFCS[name].rsplit('.', 1)[0]):
+                self._resolve[alias.lower()] = name
+
+        # Rank / radar matrices and the insight frame are the dashboard's own
+        # views (nbfc_views.SeriesViews), with the same dependency declarations
+        self.series = nbfc_views.SeriesViews(self.graph)
+        view = self.graph.view
+        ts_all = constants('timeseries', 'NBFC_TIMESERIES', 'QUARTERS')
+        swot_deps = nbfc_views.INSIGHT_DEPS + constants('transcripts', 'TRANSCRIPT_DATA')
+        self.meta_body     = view('api_meta', [('timeseries',), ('transcripts',)])(self._meta)
+        self.rankings_body = view('api_rankings', nbfc_views.RANKINGS_DEPS)(self._rankings)
+        self.deltas_body   = view('api_deltas', ts_all + constants('timeseries', 'METRIC_LABELS'))(self._deltas)
+        self.radar_body    = view('api_radar', nbfc_views.RADAR_DEPS)(self._radar)
+        self.swots         = view('api_swots', swot_deps)(self._swots)
+        self.swot_body     = view('api_swot', swot_deps)(self._swot)
+
+    # ── Bodies (cached per data version by self.graph) ───────────────────────
+
+    def _ts(self):
+        return self.graph.snapshot()['timeseries']
+
+    def _meta(self):
+        snap = self.graph.snapshot()
+        ts   = snap['timeseries']
+        return encode({
+            'quarters': ts['QUARTERS'],
+            'base_quarter': ts['QUARTERS'][na.INSIGHT_BASE_Q],
+            'nbfcs': [{'name': n, 'key': na.CACHE_KEY[n], 'symbol': na.NBFCS[n],
+                       'segment': na.SEGMENT_META[n][0]} for n in na.DISPLAY_NAMES],
+            'metrics': {m: list(lu) for m, lu in ts['METRIC_LABELS'].items()},
+            'versions': {ds: snap.versions[ds] for ds in ('timeseries', 'transcripts')},
+        })
+
+    def _rankings(self, q_idx):
+        ts    = self._ts()
+        ranks = self.series.rank_matrices()[0][:, :, q_idx].tolist()
+        keys  = [m[0] for m in na.RANKINGS_METRICS]
+        return encode({
+            'quarter': ts['QUARTERS'][q_idx],
+            'metrics': [{'metric': m, 'label': lbl, 'lower_is_better': lib}
+                        for m, lbl, _, lib in na.RANKINGS_METRICS],
+            'rows': [{'nbfc': n,
+                      'values': {m: na.value(ts['NBFC_TIMESERIES'], n, m, q_idx) for m in keys},
+                      'ranks':  {m: None if r != r else int(r) for m, r in zip(keys, ranks[i])}}
+                     for i, n in enumerate(na.DISPLAY_NAMES)],
+        })
+
+    def _deltas(self, metric):
+        ts = self._ts()
+        label, unit = ts['METRIC_LABELS'][metric]
+        out = {}
+        for n in na.DISPLAY_NAMES:
+            vals = ts['NBFC_TIMESERIES'].get(na.CACHE_KEY[n], {}).get(metric, [None] * len(ts['QUARTERS']))
+            out[n] = {'values': vals, 'qoq_pct': na.growth(vals, 1), 'yoy_pct': na.growth(vals, 4)}
+        return encode({'metric': metric, 'label': label, 'unit': unit, 'quarters': ts['QUARTERS'], 'nbfcs': out})
+
+    def _radar(self):
+        ts     = self._ts()
+        scores = self.series.radar_matrix()[:, :, na.INSIGHT_BASE_Q].tolist()
+        return encode({
+            'quarter': ts['QUARTERS'][na.INSIGHT_BASE_Q],
+            'metrics': [{'metric': m, 'label': lbl, 'lower_is_better': inv} for m, lbl, inv in na.RADAR_METRICS],
+            'bounds':  {m: list(b) for m, b in na.radar_bounds(ts['NBFC_TIMESERIES']).items()},
+            'scores':  dict(zip(na.DISPLAY_NAMES, scores)),
+        })
+
+    def _swots(self):
+        """{nbfc: (S, W, O, T)} off the shared insight frame, as the dashboard's Lens tab builds them."""
+        return na.swot_all(self.series.insight_frame(), self.graph.snapshot()['transcripts']['TRANSCRIPT_DATA'])
+
+    def _swot(self, nbfc):
+        S, W, O, T = self.swots()[nbfc]
+        return encode({'nbfc': nbfc, 'quarter': self._ts()['QUARTERS'][na.INSIGHT_BASE_Q],
+                       'strengths': S, 'weaknesses': W, 'opportunities': O, 'threats': T})
+
+    # ── Prices ───────────────────────────────────────────────────────────────
+
+    async def _download(self, symbol):
+        try:
+            data = await asyncio.to_thread(self.prices, symbol)
+        except Exception:
+            data = None
+        self._closes[symbol] = hit = (time.monotonic(), data)
+        del self._inflight[symbol]
+        return hit
+
+    async def closes(self, symbol):
+        """(fetched_at, data) — cached download; concurrent callers for a symbol share one fetch."""
+        hit = self._closes.get(symbol)
+        if hit and time.monotonic() - hit[0] < (PRICE_TTL if hit[1] is not None else FAIL_TTL):
+            return hit
+        task = self._inflight.get(symbol)
+        if task is None:
+            task = self._inflight[symbol] = asyncio.ensure_future(self._download(symbol))
+        # a disconnecting client must not cancel the download other requests wait on
+        return await asyncio.shield(task)
+
+    async def pb_body(self, nbfc):
+        fetched, data = await self.closes(na.NBFCS[nbfc])
+        if data is None:
+            raise HTTPException(503, f'prices for {nbfc} are unavailable')
+        snap   = await asyncio.to_thread(self.registry.current)   # may reload / rebuild the store
+        stamps = (snap.stamp('timeseries', 'NBFC_TIMESERIES', 'bvps_inr'), snap.stamp('timeseries', 'QUARTERS'))
+        hit = self._pb.get(nbfc)
+        if hit and hit[:2] == (fetched, stamps):
+            return hit[2:]
+        ts   = snap['timeseries']
+        bvps = ts['NBFC_TIMESERIES'][na.CACHE_KEY[nbfc]].get('bvps_inr', [])
+        days, pb, price, bv = na.pb_series(bvps, ts['QUARTERS'], *data)
+        body = encode({'nbfc': nbfc, 'symbol': na.NBFCS[nbfc], 'dates': [d.isoformat() for d in days],
+                       'pb': pb, 'close': price, 'bvps': bv})
+        self._pb[nbfc] = (fetched, stamps) + body
+        return body
+
+    # ── Routes ───────────────────────────────────────────────────────────────
+    # registry.current() may check the store for staleness, reload a source
+    # module, rebuild and read SQLite, so the store-backed handlers are plain
+    # functions, which Starlette runs in its threadpool (each thread pins its
+    # own snapshot); only /v1/pb, which awaits the price download, is async.
+
+    def nbfc(self, request):
+        name = self._resolve.get(request.path_params['nbfc'].lower())
+        if name is None:
+            raise HTTPException(404, f"unknown NBFC {request.path_params['nbfc']!r}")
+        return name
+
+    def respond(self, request, body, etag):
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type='application/json', headers=headers)
+
+    def meta(self, request):
+        self.graph.use(self.registry.current())
+        return self.respond(request, *self.meta_body())
+
+    def rankings(self, request):
+        self.graph.use(self.registry.current())
+        quarters = self._ts()['QUARTERS']
+        q = request.query_params.get('quarter', quarters[-1])
+        if q not in quarters:
+            raise HTTPException(404, f'unknown quarter {q!r}; one of {quarters}')
+        return self.respond(request, *self.rankings_body(quarters.index(q)))
+
+    def deltas(self, request):
+        self.graph.use(self.registry.current())
+        metric = request.path_params['metric']
+        if metric not in self._ts()['METRIC_LABELS']:
+            raise HTTPException(404, f'unknown metric {metric!r}')
+        return self.respond(request, *self.deltas_body(metric))
+
+    def radar(self, request):
+        self.graph.use(self.registry.current())
+        return self.respond(request, *self.radar_body())
+
+    def swot(self, request):
+        self.graph.use(self.registry.current())
+        return self.respond(request, *self.swot_body(self.nbfc(request)))
+
+    async def pb(self, request):
+        return self.respond(request, *await self.pb_body(self.nbfc(request)))
+
+
+async def _error(request, exc):
+    return JSONResponse({'error': exc.detail}, status_code=exc.status_code)
+
+
+def create_app(registry=None, prices=yahoo_closes):
+    api = API(registry, prices)
+    app = Starlette(routes=[
+        Route('/v1/meta',           api.meta),
+        Route('/v1/rankings',       api.rankings),
+        Route('/v1/deltas/{metric}', api.deltas),
+        Route('/v1/radar',          api.radar),
+        Route('/v1/swot/{nbfc}',    api.swot),
+        Route('/v1/pb/{nbfc}',      api.pb),
+    ], exception_handlers={HTTPException: _error})
+    app.state.api = api
+    return app
+
+
+def serve(host=HOST, port=PORT):
+    import uvicorn
+    uvicorn.run(create_app(), host=host, port=port, log_level='warning', access_log=False)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args or args[0] != 'serve':
+        sys.exit(f'Usage: {sys.argv[0]} serve [--host HOST] [--port PORT]')
+    host = args[args.index('--host') + 1] if '--host' in args else HOST
+    port = int(args[args.index('--port') + 1]) if '--port' in args else PORT
+    print(f'NBFC analytics API on http://{host}:{port}/v1/meta')
+    serve(host, port)
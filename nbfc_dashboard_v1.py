@@ -2,23 +2,73 @@
 # Streamlit dashboard for 9 Indian NBFCs
 # Run: streamlit run nbfc_dashboard_v1.py
 
+import html
+
 import streamlit as st
 import streamlit.components.v1 as components
-import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta, date as _date
-from datetime import datetime as _dt
 from concurrent.futures import ThreadPoolExecutor
-import numpy as _np
-import yfinance as yf
 import pytz
 
-from nbfc_data_cache import NBFC_TIMESERIES, QUARTERS as CACHE_QUARTERS, METRIC_LABELS
-from nbfc_ai_data import NBFC_AI_INITIATIVES, FUNCTION_TAXONOMY
-from shareholding_data import SHAREHOLDING, SH_QUARTERS, CATEGORY_COLORS, ENTITY_CATEGORY_COLORS, ENTITY_BADGE_TEXT_COLORS
-from nbfc_annual_data import NBFC_ANNUAL, ANNUAL_YEARS
-from nbfc_transcript_data import TRANSCRIPT_DATA
+# yfinance (≈0.4 s cold, with the pandas/numpy it pulls in) is imported inside
+# the market-data functions. Those sections are drawn last (see DEFERRED MARKET
+# DATA), so the header, tabs and fundamentals are sent first; the import still
+# happens once per process, on the first session's first run.
+
+import nbfc_store
+import nbfc_views
+import nbfc_records
+import nbfc_search
+import nbfc_shareholding
+import nbfc_analytics
+from nbfc_views import metrics, constants, QUARTER_AXIS, RANKINGS_DEPS, RADAR_DEPS, INSIGHT_DEPS
+from nbfc_analytics import (NBFCS, CACHE_KEY, DISPLAY_NAMES, POON_KEY, COLORS, SEGMENT_META, RANKINGS_METRICS,
+                            RADAR_METRICS, INSIGHT_BASE_Q, INSIGHT_PREV_Q, INSIGHT_YOY_Q)
+
+# Data comes from the versioned store (data/nbfc_store.sqlite). The process-wide
+# registry hot-reloads it when the file changes; this rerun pins one immutable
+# snapshot so every tab reads the same version even if a write lands mid-run.
+DATA = nbfc_store.get_registry().current()
+NBFC_TIMESERIES, CACHE_QUARTERS, METRIC_LABELS = (
+    DATA['timeseries']['NBFC_TIMESERIES'], DATA['timeseries']['QUARTERS'], DATA['timeseries']['METRIC_LABELS'])
+NBFC_AI_INITIATIVES, FUNCTION_TAXONOMY = DATA['ai']['NBFC_AI_INITIATIVES'], DATA['ai']['FUNCTION_TAXONOMY']
+_sh = DATA['shareholding']
+SHAREHOLDING, SH_QUARTERS, CATEGORY_COLORS = _sh['SHAREHOLDING'], _sh['SH_QUARTERS'], _sh['CATEGORY_COLORS']
+ENTITY_CATEGORY_COLORS, ENTITY_BADGE_TEXT_COLORS = _sh['ENTITY_CATEGORY_COLORS'], _sh['ENTITY_BADGE_TEXT_COLORS']
+NBFC_ANNUAL, ANNUAL_YEARS = DATA['annual']['NBFC_ANNUAL'], DATA['annual']['ANNUAL_YEARS']
+TRANSCRIPT_DATA = DATA['transcripts']['TRANSCRIPT_DATA']
+
+# Derived views below are cached across reruns and invalidated only when the
+# datasets / metrics they declare change (see nbfc_views).
+VIEWS = nbfc_views.get_graph()
+VIEWS.use(DATA)
+
+# Cubes, rank / radar matrices and the insight frame are shared with the API
+# (nbfc_views.SeriesViews); each depends on the metrics it reads plus the
+# quarter list, so an ingested cell recomputes only the views that read it.
+SERIES = nbfc_views.SeriesViews(VIEWS)
+rankings_cube, rank_matrices, insight_frame = SERIES.rankings_cube, SERIES.rank_matrices, SERIES.insight_frame
+_radar_cube, _radar_matrix = SERIES.radar_cube, SERIES.radar_matrix
+
+
+@VIEWS.view('ai_records', constants('ai', 'NBFC_AI_INITIATIVES'))
+def ai_records():
+    """{nbfc: (AIInitiative, …)} — built once per data version, shared by every rerun."""
+    return nbfc_records.ai_records(VIEWS.snapshot()['ai']['NBFC_AI_INITIATIVES'])
+
+
+@VIEWS.view('ai_index', constants('ai', 'NBFC_AI_INITIATIVES'))
+def ai_index():
+    """AI Bulletin query index over ai_records()."""
+    return nbfc_records.AIIndex(ai_records())
+
+
+@VIEWS.view('sh_entity_records', constants('shareholding', 'SHAREHOLDING'))
+def sh_entity_records():
+    """{nbfc: (ShareholderEntity, …)} — built once per data version, shared by every rerun."""
+    return nbfc_records.entity_records(VIEWS.snapshot()['shareholding']['SHAREHOLDING'])
 
 st.set_page_config(
     page_title="NBFC Dashboard",
@@ -39,6 +89,7 @@ st.markdown("""
 .tab-intro { background: white; border-left: 4px solid #0284c7; padding: 12px 18px; border-radius: 5px; margin-bottom: 16px; }
 .tab-intro-title { font-size: 17px; font-weight: 700; color: #0a2540; }
 .tab-intro-sub { font-size: 12.5px; color: #94a3b8; }
+mark { background: #fef08a; color: inherit; padding: 0 1px; border-radius: 2px; }
 .metric-note { background: #f8fafc; border-radius: 4px; padding: 6px 12px; border-left: 2px solid #cbd5e1; font-size: 11px; color: #64748b; margin-top: 8px; }
 .stTabs [data-baseweb="tab-list"] { background: white; border-bottom: 1px solid #e2e8f0; gap: 0; }
 .stTabs [data-baseweb="tab"] { color: #64748b; font-size: 13px; font-weight: 500; padding: 10px 18px; border-bottom: 2px solid transparent; }
@@ -117,62 +168,16 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ── NBFC REGISTRY ──────────────────────────────────────────────────────────────
-NBFCS = {
-    'Poonawalla Fincorp':    'POONAWALLA.NS',
-    'Bajaj Finance':         'BAJFINANCE.NS',
-    'Shriram Finance':       'SHRIRAMFIN.NS',
-    'L&T Finance':           'LTF.NS',
-    'Cholamandalam Finance': 'CHOLAFIN.NS',
-    'Aditya Birla Capital':  'ABCAPITAL.NS',
-    'Piramal Finance':       'PIRAMALFIN.NS',
-    'Muthoot Finance':       'MUTHOOTFIN.NS',
-    'Mahindra Finance':      'M&MFIN.NS',
-}
-
-CACHE_KEY = {
-    'Poonawalla Fincorp':    'Poonawalla Fincorp',
-    'Bajaj Finance':         'Bajaj Finance',
-    'Shriram Finance':       'Shriram Finance',
-    'L&T Finance':           'L&T Finance',
-    'Cholamandalam Finance': 'Chola Finance',
-    'Aditya Birla Capital':  'Aditya Birla Capital',
-    'Piramal Finance':       'Piramal Finance',
-    'Muthoot Finance':       'Muthoot Finance',
-    'Mahindra Finance':      'Mahindra Finance',
-}
-
-COLORS = {
-    'Poonawalla Fincorp':    '#0284c7',
-    'Bajaj Finance':         '#f97316',
-    'Shriram Finance':       '#10b981',
-    'L&T Finance':           '#8b5cf6',
-    'Cholamandalam Finance': '#ef4444',
-    'Aditya Birla Capital':  '#0891b2',
-    'Piramal Finance':       '#be123c',
-    'Muthoot Finance':       '#65a30d',
-    'Mahindra Finance':      '#7c3aed',
-}
-
-DISPLAY_NAMES = list(NBFCS.keys())
+# ── NBFC REGISTRY (tickers, cache keys & colours: nbfc_analytics) ───────────────
 DEFAULT_COMPARISON = ['Bajaj Finance', 'Shriram Finance', 'L&T Finance']
 Q_LABELS = CACHE_QUARTERS  # ["Q4FY24", "Q1FY25", ..., "Q4FY26"]
 
 # ── DATA HELPERS ───────────────────────────────────────────────────────────────
 def get_series(metric: str) -> dict:
-    """Returns {display_name: [8 values aligned to Q_LABELS]}."""
-    out = {}
-    for disp in DISPLAY_NAMES:
-        cache = CACHE_KEY[disp]
-        out[disp] = NBFC_TIMESERIES[cache][metric]
-    return out
+    """Returns {display_name: [values aligned to Q_LABELS]}."""
+    return nbfc_analytics.series(NBFC_TIMESERIES, metric)
 
-def latest_val(series_list):
-    """Return last non-None value and its index."""
-    for i in range(len(series_list) - 1, -1, -1):
-        if series_list[i] is not None:
-            return series_list[i], i
-    return None, -1
+latest_val = nbfc_analytics.latest  # (last non-None value, its index)
 
 
 def get_annual_series(metric: str) -> dict:
@@ -261,21 +266,10 @@ def make_trend_chart(metric, selected, title, ylabel, fmt='pct', note=None, heig
     # Stagger annotations
     if ann_points:
         all_y = [v for _, vals, _, _ in series_info for v in vals if v is not None]
-        if all_y:
-            y_min, y_max = min(all_y), max(all_y)
-            y_range = y_max - y_min if y_max != y_min else 1.0
-        else:
-            y_range = 1.0
-        GAP = max(y_range * 0.11, 0.2)
+        GAP = nbfc_analytics.label_gap(all_y, 0.11, 0.2)
 
         ann_points_sorted = sorted(ann_points, key=lambda x: -x[2])
-        label_positions = []
-        for name, xi, yv in ann_points_sorted:
-            pos = yv
-            for prev_pos in label_positions:
-                if abs(pos - prev_pos) < GAP:
-                    pos = prev_pos - GAP
-            label_positions.append(pos)
+        label_positions = nbfc_analytics.label_slots([yv for *_, yv in ann_points_sorted], GAP)
 
         for idx, (name, xi, yv) in enumerate(ann_points_sorted):
             label_y = label_positions[idx]
@@ -380,21 +374,10 @@ def make_annual_chart(metric, selected, title, ylabel, fmt='pct', note=None, hei
     ann_points = [(name, li, lv) for name, vals, lv, li in series_info if lv not in (None, -1e9)]
     if ann_points:
         all_y = [v for _, vals, _, _ in series_info for v in vals if v is not None]
-        if all_y:
-            y_min, y_max = min(all_y), max(all_y)
-            y_range = y_max - y_min if y_max != y_min else 1.0
-        else:
-            y_range = 1.0
-        GAP = max(y_range * 0.11, 0.2)
+        GAP = nbfc_analytics.label_gap(all_y, 0.11, 0.2)
 
         ann_points_sorted = sorted(ann_points, key=lambda x: -x[2])
-        label_positions = []
-        for name, xi, yv in ann_points_sorted:
-            pos = yv
-            for prev_pos in label_positions:
-                if abs(pos - prev_pos) < GAP:
-                    pos = prev_pos - GAP
-            label_positions.append(pos)
+        label_positions = nbfc_analytics.label_slots([yv for *_, yv in ann_points_sorted], GAP)
 
         for idx, (name, xi, yv) in enumerate(ann_points_sorted):
             label_y = label_positions[idx]
@@ -527,21 +510,11 @@ def make_yoy_chart(metric, selected, title, height=310):
     """YoY growth line chart for last 4 quarters."""
     data = get_series(metric)
     YOY_LABELS = ["Q4FY25", "Q1FY26", "Q2FY26", "Q3FY26", "Q4FY26"]
-    YOY_PAIRS = [(4, 0), (5, 1), (6, 2), (7, 3), (8, 4)]
 
     series_info = []
     for name in selected:
         vals = data[name]
-        growth = []
-        for cur_idx, py_idx in YOY_PAIRS:
-            cur = vals[cur_idx] if cur_idx < len(vals) else None
-            py = vals[py_idx] if py_idx < len(vals) else None
-            if cur is None or py is None:
-                growth.append(None)
-            elif py <= 0:
-                growth.append(0.0)
-            else:
-                growth.append((cur - py) / py * 100)
+        growth = nbfc_analytics.growth(vals, 4)[4:]
         last_g = None
         for g in reversed(growth):
             if g is not None:
@@ -567,12 +540,7 @@ def make_yoy_chart(metric, selected, title, height=310):
         ))
 
     all_g = [g for _, glist, _ in series_info for g in glist if g is not None]
-    if all_g:
-        y_min, y_max = min(all_g), max(all_g)
-        y_range = y_max - y_min if y_max != y_min else 1.0
-    else:
-        y_range = 1.0
-    GAP = max(y_range * 0.14, 2.0)
+    GAP = nbfc_analytics.label_gap(all_g, 0.14, 2.0)
 
     ann_points = []
     for name, growth, _ in series_info:
@@ -585,13 +553,7 @@ def make_yoy_chart(metric, selected, title, height=310):
             ann_points.append((name, last_g))
 
     ann_points_sorted = sorted(ann_points, key=lambda x: -x[1])
-    label_positions = []
-    for name, yv in ann_points_sorted:
-        pos = yv
-        for prev_pos in label_positions:
-            if abs(pos - prev_pos) < GAP:
-                pos = prev_pos - GAP
-        label_positions.append(pos)
+    label_positions = nbfc_analytics.label_slots([yv for *_, yv in ann_points_sorted], GAP)
 
     for idx, (name, yv) in enumerate(ann_points_sorted):
         label_y = label_positions[idx]
@@ -654,21 +616,11 @@ def make_qoq_chart(metric, selected, title, height=310):
     """QoQ growth line chart for Q1FY25 through Q4FY26."""
     data = get_series(metric)
     QOQ_LABELS = ["Q1FY25", "Q2FY25", "Q3FY25", "Q4FY25", "Q1FY26", "Q2FY26", "Q3FY26", "Q4FY26"]
-    QOQ_PAIRS = [(1, 0), (2, 1), (3, 2), (4, 3), (5, 4), (6, 5), (7, 6), (8, 7)]
 
     series_info = []
     for name in selected:
         vals = data[name]
-        growth = []
-        for cur_idx, prev_idx in QOQ_PAIRS:
-            cur = vals[cur_idx] if cur_idx < len(vals) else None
-            prev = vals[prev_idx] if prev_idx < len(vals) else None
-            if cur is None or prev is None:
-                growth.append(None)
-            elif prev <= 0:
-                growth.append(0.0)
-            else:
-                growth.append((cur - prev) / prev * 100)
+        growth = nbfc_analytics.growth(vals, 1)[1:]
         last_g = None
         for g in reversed(growth):
             if g is not None:
@@ -694,12 +646,7 @@ def make_qoq_chart(metric, selected, title, height=310):
         ))
 
     all_g = [g for _, glist, _ in series_info for g in glist if g is not None]
-    if all_g:
-        y_min, y_max = min(all_g), max(all_g)
-        y_range = y_max - y_min if y_max != y_min else 1.0
-    else:
-        y_range = 1.0
-    GAP = max(y_range * 0.14, 1.5)
+    GAP = nbfc_analytics.label_gap(all_g, 0.14, 1.5)
 
     ann_points = []
     for name, growth, _ in series_info:
@@ -712,13 +659,7 @@ def make_qoq_chart(metric, selected, title, height=310):
             ann_points.append((name, last_g))
 
     ann_points_sorted = sorted(ann_points, key=lambda x: -x[1])
-    label_positions = []
-    for name, yv in ann_points_sorted:
-        pos = yv
-        for prev_pos in label_positions:
-            if abs(pos - prev_pos) < GAP:
-                pos = prev_pos - GAP
-        label_positions.append(pos)
+    label_positions = nbfc_analytics.label_slots([yv for *_, yv in ann_points_sorted], GAP)
 
     for idx, (name, yv) in enumerate(ann_points_sorted):
         label_y = label_positions[idx]
@@ -779,18 +720,7 @@ def make_qoq_chart(metric, selected, title, height=310):
 
 def make_pb_chart(selected, height=520):
     """Daily P/B ratio chart over 2 years."""
-    QUARTER_ENDS = [
-        (_date(2024, 3, 31), 0),
-        (_date(2024, 6, 30), 1),
-        (_date(2024, 9, 30), 2),
-        (_date(2024, 12, 31), 3),
-        (_date(2025, 3, 31), 4),
-        (_date(2025, 6, 30), 5),
-        (_date(2025, 9, 30), 6),
-        (_date(2025, 12, 31), 7),
-        (_date(2026, 3, 31), 8),
-    ]
-
+    import numpy as _np
     fig = go.Figure()
     series_info = []
     trace_data = []
@@ -805,33 +735,8 @@ def make_pb_chart(selected, height=520):
 
         hist = hist.copy()
         hist.index = hist.index.tz_localize(None) if hist.index.tzinfo is not None else hist.index
-
-        dates = []
-        pb_vals = []
-        prices = []
-        bvps_vals = []
-
-        for dt_idx, row in hist.iterrows():
-            dt_date = dt_idx.date() if hasattr(dt_idx, 'date') else dt_idx
-            # Find most recent quarter end <= date
-            best_q_idx = None
-            for qe_date, q_idx in QUARTER_ENDS:
-                if qe_date <= dt_date:
-                    best_q_idx = q_idx
-                else:
-                    break
-            if best_q_idx is None:
-                continue
-            bvps = bvps_series[best_q_idx] if best_q_idx < len(bvps_series) else None
-            if bvps is None or bvps <= 0:
-                continue
-            price = float(row['Close'])
-            pb = price / bvps
-            dates.append(dt_idx)
-            pb_vals.append(pb)
-            prices.append(price)
-            bvps_vals.append(bvps)
-
+        dates, pb_vals, prices, bvps_vals = nbfc_analytics.pb_series(
+            bvps_series, Q_LABELS, hist.index, hist['Close'])
         if not dates:
             continue
 
@@ -865,21 +770,10 @@ def make_pb_chart(selected, height=520):
         all_pb = []
         for trace in fig.data:
             all_pb.extend([v for v in trace.y if v is not None])
-        if all_pb:
-            y_min, y_max = min(all_pb), max(all_pb)
-            y_range = y_max - y_min if y_max != y_min else 1.0
-        else:
-            y_range = 1.0
-        GAP = max(y_range * 0.08, 0.12)
+        GAP = nbfc_analytics.label_gap(all_pb, 0.08, 0.12)
 
         series_info_sorted = sorted(series_info, key=lambda x: -x[1])
-        label_positions = []
-        for name, yv in series_info_sorted:
-            pos = yv
-            for prev_pos in label_positions:
-                if abs(pos - prev_pos) < GAP:
-                    pos = prev_pos - GAP
-            label_positions.append(pos)
+        label_positions = nbfc_analytics.label_slots([yv for *_, yv in series_info_sorted], GAP)
 
         for idx, (name, yv) in enumerate(series_info_sorted):
             label_y = label_positions[idx]
@@ -959,7 +853,7 @@ def make_mktcap_trend_chart(selected, height=440):
         hist = hist.copy()
         hist.index = hist.index.tz_localize(None) if hist.index.tzinfo is not None else hist.index
 
-        mktcap = hist['Close'] * shares / 1e12  # ₹ Lakh Crore (1 L.Cr = 1 Trillion)
+        mktcap = nbfc_analytics.market_cap_lcr(hist['Close'], shares)
 
         color = COLORS[name]
         lv = float(mktcap.iloc[-1]) if len(mktcap) > 0 else 0
@@ -989,21 +883,10 @@ def make_mktcap_trend_chart(selected, height=440):
         for trace in fig.data:
             if trace.mode and 'lines' in trace.mode:
                 all_mc.extend([v for v in trace.y if v is not None])
-        if all_mc:
-            y_min, y_max = min(all_mc), max(all_mc)
-            y_range = y_max - y_min if y_max != y_min else 1.0
-        else:
-            y_range = 1.0
-        GAP = max(y_range * 0.08, 0.02)
+        GAP = nbfc_analytics.label_gap(all_mc, 0.08, 0.02)
 
         series_info_sorted = sorted(series_info, key=lambda x: -x[1])
-        label_positions = []
-        for name, yv in series_info_sorted:
-            pos = yv
-            for prev_pos in label_positions:
-                if abs(pos - prev_pos) < GAP:
-                    pos = prev_pos - GAP
-            label_positions.append(pos)
+        label_positions = nbfc_analytics.label_slots([yv for *_, yv in series_info_sorted], GAP)
 
         for idx, (name, yv) in enumerate(series_info_sorted):
             label_y = label_positions[idx]
@@ -1054,95 +937,16 @@ def make_mktcap_trend_chart(selected, height=440):
     return fig
 
 
-def build_rankings_table():
-    """Plotly Table for Tab 8."""
-    METRICS = [
-        ('aum_cr', 'AUM (₹ Cr)', 'cr', False),
-        ('pat_cr', 'PAT (₹ Cr)', 'cr', False),
-        ('gnpa_pct', 'GNPA %', 'pct', True),
-        ('nnpa_pct', 'NNPA %', 'pct', True),
-        ('nim_pct', 'NIM %', 'pct', False),
-        ('roa_pct', 'ROA %', 'pct', False),
-        ('roe_pct', 'ROE %', 'pct', False),
-        ('cost_of_borrowing_pct', 'CoB %', 'pct', True),
-        ('d_e_ratio', 'D/E', 'ratio', True),
-        ('car_pct', 'CAR %', 'pct', False),
-        ('bvps_inr', 'BVPS (₹)', 'bvps', False),
-    ]
-    Q_IDX = 8
-
-    def _fmt_cell(v, fmt):
-        if v is None:
-            return "—"
-        if fmt == 'cr':
-            return f"₹{int(v):,}"
-        elif fmt == 'pct':
-            return f"{v:.2f}%"
-        elif fmt == 'ratio':
-            return f"{v:.2f}x"
-        elif fmt == 'bvps':
-            return f"₹{int(v):,}"
-        return str(v)
+@VIEWS.view('rankings_table', RANKINGS_DEPS)
+def build_rankings_table(q_idx=INSIGHT_BASE_Q):
+    """Plotly Table for Tab 8 at quarter index `q_idx`."""
+    METRICS = RANKINGS_METRICS
 
-    def _parse_num(s):
-        if s == "—":
-            return None
-        try:
-            return float(s.replace('₹', '').replace(',', '').replace('%', '').replace('x', ''))
-        except:
-            return None
-
-    def color_col(col_values, lower_is_better):
-        nums = [_parse_num(v) for v in col_values]
-        valid = [n for n in nums if n is not None]
-        if not valid:
-            return ['rgba(241,245,249,0.5)'] * len(col_values)
-        mn, mx = min(valid), max(valid)
-        colors = []
-        for n in nums:
-            if n is None:
-                colors.append('rgba(241,245,249,0.5)')
-                continue
-            if mx == mn:
-                colors.append('rgba(248,250,252,0.7)')
-                continue
-            t = (n - mn) / (mx - mn)
-            if lower_is_better:
-                t = 1.0 - t
-            if t <= 0.5:
-                s = t * 2
-                r = int(220 + s * (255 - 220))
-                g = int(60 + s * (215 - 60))
-                b = int(60 + s * (50 - 60))
-            else:
-                s = (t - 0.5) * 2
-                r = int(255 + s * (60 - 255))
-                g = int(215 + s * (190 - 215))
-                b = int(50 + s * (80 - 50))
-            colors.append(f'rgba({r},{g},{b},0.35)')
-        return colors
-
-    # Build table data
     nbfc_names = DISPLAY_NAMES
     header_vals = ['NBFC'] + [m[1] for m in METRICS]
-
-    rows = {}
-    for name in nbfc_names:
-        cache = CACHE_KEY[name]
-        row = []
-        for metric, label, fmt, lib in METRICS:
-            vals = NBFC_TIMESERIES[cache].get(metric, [None] * 9)
-            v = vals[Q_IDX] if Q_IDX < len(vals) else None
-            row.append(_fmt_cell(v, fmt))
-        rows[name] = row
-
-    cell_vals = [nbfc_names]
-    cell_colors = [['rgba(240,249,255,0.6)'] * len(nbfc_names)]
-
-    for i, (metric, label, fmt, lib) in enumerate(METRICS):
-        col = [rows[name][i] for name in nbfc_names]
-        cell_vals.append(col)
-        cell_colors.append(color_col(col, lib))
+    text, fills = nbfc_analytics.rankings_cells(rankings_cube()[:, :, q_idx], METRICS)
+    cell_vals = [nbfc_names] + text
+    cell_colors = [['rgba(240,249,255,0.6)'] * len(nbfc_names)] + fills
 
     fig = go.Figure(data=[go.Table(
         columnwidth=[160] + [80] * len(METRICS),
@@ -1171,6 +975,60 @@ def build_rankings_table():
     return fig
 
 
+@VIEWS.view('rank_sparklines', RANKINGS_DEPS)
+def make_rank_sparklines(metric, q_idx=INSIGHT_BASE_Q):
+    """3×3 small multiples of each NBFC's peer rank in `metric` across quarters (Tab 8)."""
+    j = [m[0] for m in RANKINGS_METRICS].index(metric)
+    ranks = rank_matrices()[0][:, j, :]
+    n = len(DISPLAY_NAMES)
+    quarters = VIEWS.snapshot()['timeseries']['QUARTERS']
+    x_vals = list(range(len(quarters)))
+
+    titles = []
+    for i, name in enumerate(DISPLAY_NAMES):
+        r, p = ranks[i, q_idx], ranks[i, q_idx - 1] if q_idx > 0 else float('nan')
+        if r != r:
+            titles.append(f"{name} · —")
+        elif p != p or p == r:
+            titles.append(f"{name} · #{int(r)}")
+        else:
+            arrow = '▲' if r < p else '▼'
+            titles.append(f"{name} · #{int(r)} {arrow}{abs(int(p - r))}")
+
+    fig = make_subplots(rows=3, cols=3, subplot_titles=titles,
+                        vertical_spacing=0.16, horizontal_spacing=0.06)
+    for i, name in enumerate(DISPLAY_NAMES):
+        row, col = i // 3 + 1, i % 3 + 1
+        ys = [None if v != v else int(v) for v in ranks[i]]
+        fig.add_trace(go.Scatter(
+            x=x_vals, y=ys, mode='lines', connectgaps=False,
+            line=dict(color=COLORS[name], width=2),
+            customdata=quarters,
+            hovertemplate=f"<b>{name}</b><br>%{{customdata}}: #%{{y}}<extra></extra>",
+            showlegend=False,
+        ), row=row, col=col)
+        if ys[q_idx] is not None:
+            fig.add_trace(go.Scatter(
+                x=[q_idx], y=[ys[q_idx]], mode='markers',
+                marker=dict(color=COLORS[name], size=7),
+                showlegend=False, hoverinfo='skip',
+            ), row=row, col=col)
+
+    fig.update_xaxes(showticklabels=False, showgrid=False, zeroline=False,
+                     range=[-0.3, len(quarters) - 0.7])
+    fig.update_yaxes(range=[n + 0.5, 0.5], tickvals=[1, n], showgrid=True,
+                     gridcolor='#f1f5f9', zeroline=False, tickfont=dict(size=9, color='#94a3b8'))
+    fig.update_annotations(font=dict(size=11, color='#1a3a52', family='Inter'))
+    fig.update_layout(
+        margin=dict(l=10, r=10, t=30, b=10),
+        height=420,
+        plot_bgcolor='white',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter'),
+    )
+    return fig
+
+
 def make_deep_dive(nbfc_disp):
     """5×3 subplot grid for one NBFC (14 metrics)."""
     metrics_grid = [
@@ -1336,6 +1194,7 @@ def make_deep_dive(nbfc_disp):
 
 @st.cache_data(ttl=3600, persist="disk")
 def fetch_stock_data(symbol, period='1y'):
+    import yfinance as yf
     try:
         return yf.Ticker(symbol).history(period=period)
     except:
@@ -1344,6 +1203,7 @@ def fetch_stock_data(symbol, period='1y'):
 
 @st.cache_data(ttl=3600, persist="disk")
 def fetch_stock_data_range(symbol, start_str, end_str):
+    import yfinance as yf
     try:
         return yf.Ticker(symbol).history(start=start_str, end=end_str)
     except Exception:
@@ -1352,6 +1212,8 @@ def fetch_stock_data_range(symbol, start_str, end_str):
 
 @st.cache_data(ttl=3600, persist="disk")
 def fetch_shares_outstanding():
+    import yfinance as yf
+
     def _fetch_one(args):
         name, symbol = args
         try:
@@ -1369,6 +1231,7 @@ def fetch_shares_outstanding():
 
 def _fetch_all_prices():
     """Batch download all 9 tickers and return price data list."""
+    import yfinance as yf
     symbols = list(NBFCS.values())
     names = list(NBFCS.keys())
     result = []
@@ -1481,12 +1344,8 @@ def get_current_prices():
 
 def create_comparison_chart(time_period, selected_stocks, start_date=None, end_date=None):
     """Returns (fig, start_date, end_date)."""
-    DAYS_MAP = {'1W': 7, '1M': 30, '3M': 90, '6M': 180, '1Y': 365, '3Y': 1095, '5Y': 1825}
-
     if start_date is None or end_date is None:
-        days = DAYS_MAP.get(time_period, 180)
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=days)
+        start_date, end_date = nbfc_analytics.comparison_window(time_period, datetime.now().date())
 
     start_str = start_date.strftime('%Y-%m-%d')
     end_str = end_date.strftime('%Y-%m-%d')
@@ -1503,22 +1362,7 @@ def create_comparison_chart(time_period, selected_stocks, start_date=None, end_d
         hist = fetch_stock_data_range(symbol, start_str, end_str)
         if hist is None or len(hist) < 2:
             # Fall back to period-based fetch
-            days = DAYS_MAP.get(time_period, 180)
-            if days <= 7:
-                period = '5d'
-            elif days <= 30:
-                period = '1mo'
-            elif days <= 90:
-                period = '3mo'
-            elif days <= 180:
-                period = '6mo'
-            elif days <= 365:
-                period = '1y'
-            elif days <= 1095:
-                period = '3y'
-            else:
-                period = '5y'
-            hist = fetch_stock_data(symbol, period=period)
+            hist = fetch_stock_data(symbol, period=nbfc_analytics.fallback_period(time_period))
 
         if hist is None or len(hist) < 2:
             continue
@@ -1529,10 +1373,8 @@ def create_comparison_chart(time_period, selected_stocks, start_date=None, end_d
         if len(closes) < 2:
             continue
 
-        indexed = (closes / closes.iloc[0]) * 100
+        indexed, first_prices[name], last_prices[name] = nbfc_analytics.indexed(closes)
         all_indexed[name] = indexed
-        first_prices[name] = float(closes.iloc[0])
-        last_prices[name] = float(closes.iloc[-1])
         lv = float(indexed.iloc[-1])
         series_info.append((name, lv))
 
@@ -1540,7 +1382,6 @@ def create_comparison_chart(time_period, selected_stocks, start_date=None, end_d
         if name not in all_indexed:
             continue
         indexed = all_indexed[name]
-        raw_prices = list(last_prices.get(name, 0) * indexed / 100) if name in all_indexed else []
         color = COLORS[name]
 
         fig.add_trace(go.Scatter(
@@ -1574,21 +1415,10 @@ def create_comparison_chart(time_period, selected_stocks, start_date=None, end_d
         for trace in fig.data:
             if trace.y is not None:
                 all_ys.extend([v for v in trace.y if v is not None])
-        if all_ys:
-            y_min, y_max = min(all_ys), max(all_ys)
-            y_range = y_max - y_min if y_max != y_min else 1.0
-        else:
-            y_range = 1.0
-        GAP = max(4.0, y_range * 0.13)
+        GAP = nbfc_analytics.label_gap(all_ys, 0.13, 4.0)
 
         series_info_sorted = sorted(series_info, key=lambda x: -x[1])
-        label_positions = []
-        for name, yv in series_info_sorted:
-            pos = yv
-            for prev_pos in label_positions:
-                if abs(pos - prev_pos) < GAP:
-                    pos = prev_pos - GAP
-            label_positions.append(pos)
+        label_positions = nbfc_analytics.label_slots([yv for *_, yv in series_info_sorted], GAP)
 
         # Expand y bounds to include label positions
         if label_positions:
@@ -1665,76 +1495,30 @@ def nbfc_selector(tab_key: str, default_on=None) -> list:
 
 
 # ── INSIGHT ENGINE ─────────────────────────────────────────────────────────────
-# Hard-coded to Q4FY26 as base quarter (index 8).  Update INSIGHT_BASE_Q each
-# quarter release to auto-shift all narratives forward.
-
-INSIGHT_BASE_Q = 8   # Q4FY26
-INSIGHT_PREV_Q = 7   # Q3FY26
-INSIGHT_YOY_Q  = 4   # Q4FY25
-POON_KEY = 'Poonawalla Fincorp'
-
-# (display_label, roa_norm_low, roa_norm_high, segment_context_note)
-SEGMENT_META = {
-    'Poonawalla Fincorp':    ('Consumer & Personal Finance', 1.0, 3.0,  ''),
-    'Bajaj Finance':         ('Diversified Retail',          3.5, 5.5,  ''),
-    'Shriram Finance':       ('Commercial Vehicle & MSME',   2.5, 4.0,  ''),
-    'L&T Finance':           ('Retail / Home Loans',         1.5, 2.5,  ''),
-    'Cholamandalam Finance': ('Vehicle, Home & SME',         2.0, 3.5,  ''),
-    'Aditya Birla Capital':  ('Diversified Lending',         1.0, 2.0,  ''),
-    'Piramal Finance':       ('Real Estate / Corporate',     0.5, 2.0,  'Transitioning from wholesale; legacy DHFL book still winding down'),
-    'Muthoot Finance':       ('Gold Loans',                  4.0, 7.0,  'Gold-loan ROA structurally 4–7%; direct Poonawalla ROA comparison not meaningful'),
-    'Mahindra Finance':      ('Rural & Vehicle Finance',     1.5, 2.5,  ''),
-}
+# Rules and base quarter (INSIGHT_BASE_Q) live in nbfc_analytics; the
+# generators below read this rerun's data through the insight_frame view.
+
+_scr = nbfc_analytics.short_fmt
+
+
+# The outlier table covers every metric the NBFCs report (as of this run's data)
+@VIEWS.view('peer_stats', metrics(*dict.fromkeys(m for row in NBFC_TIMESERIES.values() for m in row)))
+def peer_stats():
+    """Peer medians, percentiles, z-scores, outlier flags for every NBFC × metric × quarter."""
+    return nbfc_analytics.peer_stats(VIEWS.snapshot()['timeseries']['NBFC_TIMESERIES'])
 
-# ── low-level data accessors ────────────────────────────────────────────────
-
-def _iq(nbfc_disp, metric, idx):
-    cache = CACHE_KEY[nbfc_disp]
-    series = NBFC_TIMESERIES.get(cache, {}).get(metric, [])
-    return series[idx] if idx < len(series) else None
-
-def _qoq_diff(nbfc_disp, metric):
-    c, p = _iq(nbfc_disp, metric, INSIGHT_BASE_Q), _iq(nbfc_disp, metric, INSIGHT_PREV_Q)
-    return (c - p) if (c is not None and p is not None) else None
-
-def _qoq_pct(nbfc_disp, metric):
-    c, p = _iq(nbfc_disp, metric, INSIGHT_BASE_Q), _iq(nbfc_disp, metric, INSIGHT_PREV_Q)
-    return ((c - p) / abs(p) * 100) if (c is not None and p is not None and p != 0) else None
-
-def _yoy_pct(nbfc_disp, metric):
-    c, p = _iq(nbfc_disp, metric, INSIGHT_BASE_Q), _iq(nbfc_disp, metric, INSIGHT_YOY_Q)
-    return ((c - p) / abs(p) * 100) if (c is not None and p is not None and p != 0) else None
-
-def _vs_poon_diff(nbfc_disp, metric):
-    nv, pv = _iq(nbfc_disp, metric, INSIGHT_BASE_Q), _iq(POON_KEY, metric, INSIGHT_BASE_Q)
-    return (nv - pv) if (nv is not None and pv is not None) else None
-
-def _scr(v, fmt='pct'):
-    """Short display formatter for insight text."""
-    if v is None: return '—'
-    if fmt == 'cr':
-        if abs(v) >= 100000: return f'₹{v/1000:.0f}k Cr'
-        if abs(v) >= 1000:   return f'₹{v/1000:.1f}k Cr'
-        return f'₹{int(v)} Cr'
-    if fmt == 'pp':
-        s = '+' if v > 0 else ''
-        return f'{s}{v:.2f}pp'
-    if fmt == 'bps':
-        bps = v * 100
-        s = '+' if bps > 0 else ''
-        return f'{s}{bps:.0f} bps'
-    return f'{v:.2f}%'
 
 # ── scorecard headline bullets (max 3, priority: GNPA > PAT > AUM > ROA) ───
 
-def scorecard_bullets(nbfc_disp):
+def scorecard_bullets(nbfc_disp, frame):
     bullets = []
+    f, poon = frame[nbfc_disp], frame[POON_KEY]
     seg_lbl, roa_lo, roa_hi, _ = SEGMENT_META[nbfc_disp]
     is_gold = 'Gold' in seg_lbl
 
     # GNPA — always call out if moved > 15 bps
-    gnpa     = _iq(nbfc_disp, 'gnpa_pct', INSIGHT_BASE_Q)
-    gnpa_qoq = _qoq_diff(nbfc_disp, 'gnpa_pct')
+    gnpa     = f['gnpa_pct'].base
+    gnpa_qoq = f['gnpa_pct'].qoq_diff
     if gnpa is not None and gnpa_qoq is not None:
         bps = gnpa_qoq * 100
         if abs(bps) >= 15:
@@ -1743,8 +1527,8 @@ def scorecard_bullets(nbfc_disp):
             bullets.append((col, f'GNPA <span class="{col}">{icon} {abs(bps):.0f} bps QoQ</span> → {gnpa:.2f}%'))
 
     # NNPA — call out if moved > 15 bps
-    nnpa     = _iq(nbfc_disp, 'nnpa_pct', INSIGHT_BASE_Q)
-    nnpa_qoq = _qoq_diff(nbfc_disp, 'nnpa_pct')
+    nnpa     = f['nnpa_pct'].base
+    nnpa_qoq = f['nnpa_pct'].qoq_diff
     if nnpa is not None and nnpa_qoq is not None and len(bullets) < 3:
         bps = nnpa_qoq * 100
         if abs(bps) >= 15:
@@ -1753,24 +1537,24 @@ def scorecard_bullets(nbfc_disp):
             bullets.append((col, f'NNPA <span class="{col}">{icon} {abs(bps):.0f} bps QoQ</span> → {nnpa:.2f}%'))
 
     # PAT — if moved > 8% QoQ
-    pat     = _iq(nbfc_disp, 'pat_cr', INSIGHT_BASE_Q)
-    pat_qoq = _qoq_pct(nbfc_disp, 'pat_cr')
+    pat     = f['pat_cr'].base
+    pat_qoq = f['pat_cr'].qoq_pct
     if pat is not None and pat_qoq is not None and abs(pat_qoq) >= 8 and len(bullets) < 3:
         col  = 'qoq-g' if pat_qoq > 0 else 'qoq-r'
         sign = '+' if pat_qoq > 0 else ''
         bullets.append((col, f'PAT <span class="{col}">{sign}{pat_qoq:.1f}% QoQ</span> → {_scr(pat, "cr")}'))
 
     # AUM — if QoQ > 4%
-    aum     = _iq(nbfc_disp, 'aum_cr', INSIGHT_BASE_Q)
-    aum_qoq = _qoq_pct(nbfc_disp, 'aum_cr')
+    aum     = f['aum_cr'].base
+    aum_qoq = f['aum_cr'].qoq_pct
     if aum is not None and aum_qoq is not None and abs(aum_qoq) >= 4 and len(bullets) < 3:
         col  = 'qoq-g' if aum_qoq > 0 else 'qoq-r'
         sign = '+' if aum_qoq > 0 else ''
         bullets.append((col, f'AUM <span class="{col}">{sign}{aum_qoq:.1f}% QoQ</span> → {_scr(aum, "cr")}'))
 
     # ROA vs Poonawalla (skip for gold loans)
-    roa      = _iq(nbfc_disp, 'roa_pct', INSIGHT_BASE_Q)
-    poon_roa = _iq(POON_KEY, 'roa_pct', INSIGHT_BASE_Q)
+    roa      = f['roa_pct'].base
+    poon_roa = poon['roa_pct'].base
     if roa is not None and poon_roa is not None and nbfc_disp != POON_KEY and not is_gold and len(bullets) < 3:
         gap = roa - poon_roa
         if abs(gap) >= 0.4:
@@ -1786,205 +1570,33 @@ def scorecard_bullets(nbfc_disp):
 # ── SWOT generation ─────────────────────────────────────────────────────────
 
 def generate_swot(nbfc_disp):
-    S, W, O, T = [], [], [], []
-    seg_lbl, roa_lo, roa_hi, seg_note = SEGMENT_META[nbfc_disp]
-    is_gold = 'Gold' in seg_lbl
-    is_poon = nbfc_disp == POON_KEY
-
-    poon_roa  = _iq(POON_KEY, 'roa_pct',  INSIGHT_BASE_Q)
-    poon_gnpa = _iq(POON_KEY, 'gnpa_pct', INSIGHT_BASE_Q)
-    poon_nnpa = _iq(POON_KEY, 'nnpa_pct', INSIGHT_BASE_Q)
-
-    # ── ROA ──────────────────────────────────────────────────────────────────
-    roa     = _iq(nbfc_disp, 'roa_pct', INSIGHT_BASE_Q)
-    roa_qoq = _qoq_diff(nbfc_disp, 'roa_pct')
-    if roa is not None:
-        if is_gold:
-            if roa >= roa_lo:
-                S.append(f'ROA {roa:.2f}% — within gold-loan norms ({roa_lo}–{roa_hi}%); structurally not comparable to Poonawalla')
-            else:
-                W.append(f'ROA {roa:.2f}% — below gold-loan sector floor of {roa_lo}%')
-        elif not is_poon and poon_roa is not None:
-            gap = roa - poon_roa
-            if roa >= roa_lo and gap > 0.3:
-                S.append(f'ROA {roa:.2f}% — {abs(gap):.2f}pp ahead of Poonawalla ({poon_roa:.2f}%); within {seg_lbl} norms')
-            elif roa >= roa_hi:
-                S.append(f'ROA {roa:.2f}% — top of {seg_lbl} range ({roa_lo}–{roa_hi}%)')
-            elif roa < roa_lo:
-                W.append(f'ROA {roa:.2f}% — below {seg_lbl} norms ({roa_lo}–{roa_hi}%)')
-            if gap < -0.5 and roa < roa_lo:
-                W.append(f'Trails Poonawalla by {abs(gap):.2f}pp on ROA despite different segment')
-        elif is_poon:
-            if roa >= roa_lo:
-                S.append(f'ROA {roa:.2f}% — in line with consumer-finance norms ({roa_lo}–{roa_hi}%)')
-            else:
-                W.append(f'ROA {roa:.2f}% — still rebuilding post FY25 one-time provisions; expected to recover')
-    if roa_qoq is not None:
-        if roa_qoq > 0.15:
-            O.append(f'ROA expanding +{roa_qoq:.2f}pp QoQ — profitability trajectory positive')
-        elif roa_qoq < -0.2:
-            W.append(f'ROA compressed {abs(roa_qoq):.2f}pp QoQ — monitor earnings quality')
-
-    # ── GNPA ─────────────────────────────────────────────────────────────────
-    gnpa     = _iq(nbfc_disp, 'gnpa_pct', INSIGHT_BASE_Q)
-    gnpa_qoq = _qoq_diff(nbfc_disp, 'gnpa_pct')
-    gnpa_yoy = _iq(nbfc_disp, 'gnpa_pct', INSIGHT_YOY_Q)
-    if gnpa is not None:
-        if not is_poon and poon_gnpa is not None:
-            gap_bps = (gnpa - poon_gnpa) * 100
-            if gap_bps > 150:
-                W.append(f'GNPA {gnpa:.2f}% — {gap_bps:.0f} bps above Poonawalla ({poon_gnpa:.2f}%)')
-            elif gap_bps < -50:
-                S.append(f'GNPA {gnpa:.2f}% — {abs(gap_bps):.0f} bps below Poonawalla ({poon_gnpa:.2f}%)')
-        if gnpa > 4.5:
-            T.append(f'GNPA at {gnpa:.2f}% — elevated; credit quality under scrutiny')
-        elif gnpa < 1.5:
-            S.append(f'GNPA {gnpa:.2f}% — best-in-class asset quality')
-        if gnpa_qoq is not None:
-            bps = gnpa_qoq * 100
-            if bps > 25:
-                T.append(f'GNPA deteriorated {bps:.0f} bps QoQ to {gnpa:.2f}% — watch credit trend')
-            elif bps < -25:
-                S.append(f'GNPA improved {abs(bps):.0f} bps QoQ to {gnpa:.2f}%')
-        if gnpa_yoy is not None:
-            yoy_bps = (gnpa - gnpa_yoy) * 100
-            if yoy_bps > 50:
-                T.append(f'GNPA up {yoy_bps:.0f} bps YoY (Q4FY25 to Q4FY26) — systemic pressure building')
-            elif yoy_bps < -50:
-                O.append(f'GNPA down {abs(yoy_bps):.0f} bps YoY — sustained asset-quality improvement')
-
-    # ── NNPA ─────────────────────────────────────────────────────────────────
-    nnpa     = _iq(nbfc_disp, 'nnpa_pct', INSIGHT_BASE_Q)
-    nnpa_qoq = _qoq_diff(nbfc_disp, 'nnpa_pct')
-    if nnpa is not None:
-        if not is_poon and poon_nnpa is not None:
-            gap_bps = (nnpa - poon_nnpa) * 100
-            if gap_bps > 100:
-                W.append(f'NNPA {nnpa:.2f}% — net credit exposure {gap_bps:.0f} bps above Poonawalla ({poon_nnpa:.2f}%)')
-        if nnpa > 2.5:
-            T.append(f'NNPA at {nnpa:.2f}% — net credit risk elevated; provisioning adequacy key watch')
-        if nnpa_qoq is not None:
-            bps = nnpa_qoq * 100
-            if bps > 20:
-                T.append(f'NNPA widened {bps:.0f} bps QoQ — provisioning may need to catch up')
-            elif bps < -20:
-                O.append(f'NNPA easing {abs(bps):.0f} bps QoQ — net credit risk declining')
-
-    # ── AUM ──────────────────────────────────────────────────────────────────
-    aum     = _iq(nbfc_disp, 'aum_cr', INSIGHT_BASE_Q)
-    aum_qoq = _qoq_pct(nbfc_disp, 'aum_cr')
-    aum_yoy = _yoy_pct(nbfc_disp, 'aum_cr')
-    if aum_yoy is not None:
-        if aum_yoy > 20:
-            O.append(f'AUM growing {aum_yoy:.1f}% YoY to {_scr(aum, "cr")} — strong volume momentum')
-        elif aum_yoy > 10:
-            O.append(f'AUM expanding {aum_yoy:.1f}% YoY — healthy growth')
-        elif aum_yoy < 5:
-            W.append(f'AUM growth tepid at {aum_yoy:.1f}% YoY — volume expansion needed')
-    if aum_qoq is not None and aum_qoq > 8:
-        S.append(f'AUM +{aum_qoq:.1f}% QoQ — one of the stronger sequential expansions in the peer set')
-
-    # ── PAT ──────────────────────────────────────────────────────────────────
-    pat     = _iq(nbfc_disp, 'pat_cr', INSIGHT_BASE_Q)
-    pat_yoy = _yoy_pct(nbfc_disp, 'pat_cr')
-    pat_qoq = _qoq_pct(nbfc_disp, 'pat_cr')
-    if pat_yoy is not None:
-        if pat_yoy > 20:
-            S.append(f'PAT grew {pat_yoy:.1f}% YoY to {_scr(pat, "cr")} — strong earnings growth')
-        elif pat_yoy < -10:
-            W.append(f'PAT down {abs(pat_yoy):.1f}% YoY — earnings under pressure')
-    if pat_qoq is not None and pat_qoq < -10:
-        W.append(f'PAT fell {abs(pat_qoq):.1f}% QoQ — watch sequential profitability')
-
-    # ── PCR ──────────────────────────────────────────────────────────────────
-    pcr     = _iq(nbfc_disp, 'pcr_pct', INSIGHT_BASE_Q)
-    pcr_qoq = _qoq_diff(nbfc_disp, 'pcr_pct')
-    if pcr is not None:
-        if pcr > 55:
-            S.append(f'PCR {pcr:.1f}% — strong provisioning buffer absorbs credit stress well')
-        elif pcr < 35:
-            W.append(f'PCR {pcr:.1f}% — thin provisioning buffer; vulnerable to credit deterioration')
-    if pcr_qoq is not None and pcr_qoq < -3:
-        T.append(f'PCR declined {abs(pcr_qoq):.1f}pp QoQ — coverage eroding even as GNPA moves')
-
-    # ── CAR ──────────────────────────────────────────────────────────────────
-    car = _iq(nbfc_disp, 'car_pct', INSIGHT_BASE_Q)
-    if car is not None:
-        if car > 20:
-            S.append(f'CAR {car:.2f}% — well above RBI 15% minimum; strong capital buffer')
-        elif car < 16.5:
-            W.append(f'CAR {car:.2f}% — limited headroom above RBI 15% minimum; capital raise may be needed')
-
-    # ── D/E ──────────────────────────────────────────────────────────────────
-    de     = _iq(nbfc_disp, 'd_e_ratio', INSIGHT_BASE_Q)
-    de_qoq = _qoq_diff(nbfc_disp, 'd_e_ratio')
-    if de is not None:
-        if de < 4.5:
-            S.append(f'D/E {de:.1f}x — conservatively levered; significant room to grow the book')
-        elif de > 8:
-            T.append(f'D/E {de:.1f}x — leverage elevated; limits ability to raise incremental debt cheaply')
-    if de_qoq is not None and de_qoq < -0.3:
-        O.append(f'Leverage declining: D/E down {abs(de_qoq):.1f}x QoQ — balance sheet strengthening')
-
-    # ── CoB ──────────────────────────────────────────────────────────────────
-    cob     = _iq(nbfc_disp, 'cost_of_borrowing_pct', INSIGHT_BASE_Q)
-    cob_qoq = _qoq_diff(nbfc_disp, 'cost_of_borrowing_pct')
-    if cob_qoq is not None:
-        if cob_qoq < -0.1:
-            O.append(f'Funding cost easing: CoB down {abs(cob_qoq):.2f}pp QoQ to {cob:.2f}% — NIM support in rate-cut cycle')
-        elif cob_qoq > 0.1:
-            T.append(f'CoB up {cob_qoq:.2f}pp QoQ to {cob:.2f}% — funding cost pressure may squeeze margins')
-
-    # ── Segment context note ──────────────────────────────────────────────────
-    if seg_note:
-        O.append(f'📌 Segment note: {seg_note}')
-
-    # Prepend transcript-sourced items (higher signal than rule-based)
-    td_swot = TRANSCRIPT_DATA.get(nbfc_disp, {}).get('swot_prepend', {})
-    for bucket, lst in [('S', S), ('W', W), ('O', O), ('T', T)]:
-        prepend = td_swot.get(bucket, [])
-        # Insert transcript items at front, deduplicate by keeping unique items
-        lst[:0] = prepend
-
-    # Minimum content
-    if not S: S.append('No clear outperformance vs peers in Q4FY26 — watch next quarter')
-    if not W: W.append('No significant weaknesses flagged vs sector in Q4FY26')
-    if not O: O.append('Monitor AUM growth and margin trajectory into FY27')
-    if not T: T.append('No acute threats flagged in Q4FY26 data')
-
-    return S[:5], W[:5], O[:5], T[:5]
+    return lens_insights()[nbfc_disp]['swot']
+
+
+@VIEWS.view('search_index', constants('ai', 'NBFC_AI_INITIATIVES') + constants('transcripts', 'TRANSCRIPT_DATA')
+            + INSIGHT_DEPS)
+def search_index():
+    """BM25 index over AI initiatives, call commentary, guidance and every NBFC's SWOT."""
+    return nbfc_search.SearchIndex(nbfc_search.documents(
+        ai_index().items, VIEWS.snapshot()['transcripts']['TRANSCRIPT_DATA'],
+        {n: generate_swot(n) for n in DISPLAY_NAMES}))
 
 
 # ── Radar chart for NBFC Lens ───────────────────────────────────────────────
 
-def make_radar_chart(nbfc_disp):
-    RADAR_METRICS = [
-        ('roa_pct',              'ROA',        False),
-        ('roe_pct',              'ROE',        False),
-        ('nim_pct',              'NIM',        False),
-        ('gnpa_pct',             'GNPA',       True ),   # lower = better → invert
-        ('nnpa_pct',             'NNPA',       True ),
-        ('pcr_pct',              'PCR',        False),
-        ('car_pct',              'CAR',        False),
-        ('cost_of_borrowing_pct','CoB',        True ),
-    ]
-    labels = [m[1] for m in RADAR_METRICS]
+RADAR_METHOD_NOTES = {
+    'minmax':     '0 = worst in peer group · 1 = best in peer group',
+    'zscore':     'mid-ring = peer mean · edge = 2σ better · centre = 2σ worse',
+    'percentile': 'share of peers matched or beaten · edge = best in peer group',
+}
 
-    # Collect all peer values for min-max normalisation
-    all_vals = {}
-    for key, lbl, inv in RADAR_METRICS:
-        vals = [_iq(n, key, INSIGHT_BASE_Q) for n in DISPLAY_NAMES]
-        clean = [v for v in vals if v is not None]
-        all_vals[key] = (min(clean) if clean else 0, max(clean) if clean else 1)
 
-    def _norm(key, val, inv):
-        lo, hi = all_vals[key]
-        if hi == lo or val is None: return 0.5
-        score = (val - lo) / (hi - lo)
-        return 1 - score if inv else score
+def make_radar_chart(nbfc_disp, overlay=(), method='minmax', q_idx=INSIGHT_BASE_Q):
+    labels = [m[1] for m in RADAR_METRICS]
+    matrix = _radar_matrix(method)
 
     def _get_scores(name):
-        return [_norm(k, _iq(name, k, INSIGHT_BASE_Q), inv) for k, _, inv in RADAR_METRICS]
+        return matrix[DISPLAY_NAMES.index(name), :, q_idx].tolist()
 
     fig = go.Figure()
     # Poonawalla baseline (always shown)
@@ -2009,6 +1621,17 @@ def make_radar_chart(nbfc_disp):
             line=dict(color=color, width=2.5),
             name=nbfc_disp,
         ))
+    # Overlay peers: rows of the same precomputed matrix
+    for name in overlay:
+        if name in (POON_KEY, nbfc_disp):
+            continue
+        sc = _get_scores(name)
+        fig.add_trace(go.Scatterpolar(
+            r=sc + [sc[0]],
+            theta=labels + [labels[0]],
+            line=dict(color=COLORS[name], width=1.5, dash='dash'),
+            name=name,
+        ))
 
     fig.update_layout(
         polar=dict(
@@ -2027,7 +1650,7 @@ def make_radar_chart(nbfc_disp):
         font=dict(family='Inter'),
         title=dict(
             text='<b style="color:#0a2540;font-size:13px;">Peer-Normalised Scorecard</b>'
-                 '<br><span style="color:#94a3b8;font-size:9px;">0 = worst in peer group · 1 = best in peer group</span>',
+                 f'<br><span style="color:#94a3b8;font-size:9px;">{RADAR_METHOD_NOTES[method]}</span>',
             x=0.5, xanchor='center',
         ),
     )
@@ -2036,12 +1659,14 @@ def make_radar_chart(nbfc_disp):
 
 # ── macro signals for Peer Pulse top strip ──────────────────────────────────
 
+@VIEWS.view('macro_signals', metrics('aum_cr', 'pat_cr', 'gnpa_pct', 'roa_pct') + QUARTER_AXIS)
 def _macro_signals():
     """Returns list of (label, value_html, sub_html) for top strip cards."""
     signals = []
+    frame = insight_frame()
 
     # Best AUM growth QoQ
-    aum_moves = [(n, _qoq_pct(n, 'aum_cr')) for n in DISPLAY_NAMES]
+    aum_moves = [(n, frame[n]['aum_cr'].qoq_pct) for n in DISPLAY_NAMES]
     aum_moves = [(n, v) for n, v in aum_moves if v is not None]
     if aum_moves:
         best = max(aum_moves, key=lambda x: x[1])
@@ -2050,7 +1675,7 @@ def _macro_signals():
                          best[0]))
 
     # Best PAT growth QoQ
-    pat_moves = [(n, _qoq_pct(n, 'pat_cr')) for n in DISPLAY_NAMES]
+    pat_moves = [(n, frame[n]['pat_cr'].qoq_pct) for n in DISPLAY_NAMES]
     pat_moves = [(n, v) for n, v in pat_moves if v is not None]
     if pat_moves:
         best = max(pat_moves, key=lambda x: x[1])
@@ -2059,7 +1684,7 @@ def _macro_signals():
                          best[0]))
 
     # GNPA: most improved
-    gnpa_moves = [(n, _qoq_diff(n, 'gnpa_pct')) for n in DISPLAY_NAMES]
+    gnpa_moves = [(n, frame[n]['gnpa_pct'].qoq_diff) for n in DISPLAY_NAMES]
     gnpa_moves = [(n, v) for n, v in gnpa_moves if v is not None]
     if gnpa_moves:
         best = min(gnpa_moves, key=lambda x: x[1])  # most negative = most improved
@@ -2071,9 +1696,9 @@ def _macro_signals():
                          best[0]))
 
     # Poonawalla headline
-    poon_aum     = _iq(POON_KEY, 'aum_cr',  INSIGHT_BASE_Q)
-    poon_roa     = _iq(POON_KEY, 'roa_pct', INSIGHT_BASE_Q)
-    poon_aum_qoq = _qoq_pct(POON_KEY, 'aum_cr')
+    poon_aum     = frame[POON_KEY]['aum_cr'].base
+    poon_roa     = frame[POON_KEY]['roa_pct'].base
+    poon_aum_qoq = frame[POON_KEY]['aum_cr'].qoq_pct
     sub = f'AUM {_scr(poon_aum, "cr")} · {f"+{poon_aum_qoq:.1f}% QoQ" if poon_aum_qoq else ""}'
     signals.append(('Poonawalla Q4FY26',
                      f'ROA <span style="color:#0284c7;font-weight:700;">{poon_roa:.2f}%</span>',
@@ -2083,7 +1708,7 @@ def _macro_signals():
 
 # ── benchmark table HTML ────────────────────────────────────────────────────
 
-def _benchmark_table_html(nbfc_disp):
+def _benchmark_table_html(nbfc_disp, frame):
     BM_ROWS = [
         ('aum_cr',              'AUM',              'cr',    False),
         ('pat_cr',              'PAT',              'cr',    False),
@@ -2098,10 +1723,11 @@ def _benchmark_table_html(nbfc_disp):
         ('car_pct',             'CAR',              'pct',   False),
         ('bvps_inr',            'BVPS',             'inr',   False),
     ]
+    f, poon = frame[nbfc_disp], frame[POON_KEY]
     seg_lbl, _, _, _ = SEGMENT_META[nbfc_disp]
     is_gold = 'Gold' in seg_lbl
 
-    html = f'''<table class="bm-table">
+    table = f'''<table class="bm-table">
 <thead><tr>
   <th style="text-align:left;">Metric</th>
   <th>Poonawalla</th>
@@ -2112,9 +1738,9 @@ def _benchmark_table_html(nbfc_disp):
 </tr></thead><tbody>'''
 
     for key, lbl, fmt, lib in BM_ROWS:
-        pv  = _iq(POON_KEY,   key, INSIGHT_BASE_Q)
-        nv  = _iq(nbfc_disp,  key, INSIGHT_BASE_Q)
-        qoq = _qoq_diff(nbfc_disp, key)
+        pv  = poon[key].base
+        nv  = f[key].base
+        qoq = f[key].qoq_diff
 
         def _fv(v):
             if v is None: return '—'
@@ -2173,7 +1799,7 @@ def _benchmark_table_html(nbfc_disp):
             qcls = 'qoq-g' if improving else 'qoq-r'
             qoq_html = f'<span class="{qcls}">{qstr}</span>'
 
-        html += f'''<tr>
+        table += f'''<tr>
   <td>{lbl}</td>
   <td>{_fv(pv)}</td>
   <td>{_fv(nv)}</td>
@@ -2182,8 +1808,22 @@ def _benchmark_table_html(nbfc_disp):
   <td>{sig_html}</td>
 </tr>'''
 
-    html += '</tbody></table>'
-    return html
+    table += '</tbody></table>'
+    return table
+
+
+@VIEWS.view('lens_insights', INSIGHT_DEPS + constants('transcripts', 'TRANSCRIPT_DATA'))
+def lens_insights():
+    """
+    {nbfc: {'swot', 'bullets', 'benchmark'}} for every NBFC, generated together
+    off one insight frame, so switching the Lens NBFC is a lookup.
+    """
+    frame = insight_frame()
+    swots = nbfc_analytics.swot_all(frame, VIEWS.snapshot()['transcripts']['TRANSCRIPT_DATA'])
+    return {n: {'swot':      swots[n],
+                'bullets':   scorecard_bullets(n, frame),
+                'benchmark': _benchmark_table_html(n, frame)}
+            for n in DISPLAY_NAMES}
 
 
 # ── AUTO-REFRESH JS ────────────────────────────────────────────────────────────
@@ -2235,6 +1875,15 @@ if 'use_custom_date' not in st.session_state:
     st.session_state.use_custom_date = False
 
 
+def _set_period(period):
+    """Period / Apply button callback: runs before the comparison fragment redraws, so no extra rerun."""
+    if period is None:
+        st.session_state.use_custom_date = True
+    else:
+        st.session_state.time_period = period
+        st.session_state.use_custom_date = False
+
+
 # ── HEADER ─────────────────────────────────────────────────────────────────────
 ist = pytz.timezone('Asia/Kolkata')
 now_ist = datetime.now(ist)
@@ -2261,6 +1910,12 @@ st.markdown(f"""
 
 
 # ── TABS ───────────────────────────────────────────────────────────────────────
+# Every selector-driven section is a fragment: a widget inside it reruns only
+# that function, and reads its data through the cached views above. Streamlit
+# runs a fragment rerun on a new thread, so fragment() re-pins the DATA of the
+# full run that defined the section (the one its globals belong to) before the
+# body runs. Period buttons update state in on_click callbacks, so they need
+# no extra st.rerun().
 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11, tab12 = st.tabs([
     "Market", "Financials", "Asset Quality", "Capital & Leverage",
     "Profitability Ratios", "Valuation Metrics", "Deep Dive", "Rankings",
@@ -2269,6 +1924,31 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11, tab12 = st.t
 ])
 
 
+def fragment(fn):
+    """st.fragment whose reruns compute views against this full run's DATA."""
+    return st.fragment(VIEWS.pinned(DATA)(fn))
+
+
+# ── DEFERRED MARKET DATA ───────────────────────────────────────────────────────
+# Sections that need live prices (yfinance, and the pandas it returns) keep
+# their place in the layout with an empty container and are drawn after every
+# other tab, so a session's first run sends the fundamentals before the
+# market-data stack is imported or any download starts.
+_DEFERRED = []
+
+
+def deferred(fn):
+    """Reserve fn's place in the layout here; draw_deferred() fills it at the end of the script."""
+    _DEFERRED.append((st.container(), fn))
+    return fn
+
+
+def draw_deferred():
+    for slot, fn in _DEFERRED:
+        with slot:
+            fn()
+
+
 # ── TAB 1 — MARKET ─────────────────────────────────────────────────────────────
 with tab1:
     st.markdown("""
@@ -2278,93 +1958,96 @@ with tab1:
     """, unsafe_allow_html=True)
     st.markdown('<div style="height:14px;"></div>', unsafe_allow_html=True)
 
-    with st.spinner("Fetching live prices…"):
-        prices_data = get_current_prices()
-
-    if not prices_data:
-        st.warning("Unable to fetch prices. Check your internet connection.")
-    else:
-        def _fmt_vol(v):
-            if v is None or v == 0:
-                return "—"
-            if v >= 1e7:
-                return f"{v/1e7:.1f}Cr"
-            elif v >= 1e5:
-                return f"{v/1e5:.1f}L"
-            elif v >= 1e3:
-                return f"{v/1e3:.1f}K"
-            return str(int(v))
-
-        def _fmt_mc(mc):
-            if mc is None:
-                return "—"
-            mc_lc = mc / 1e12
-            if mc_lc >= 1:
-                return f"₹{mc_lc:.2f} L.Cr"
-            mc_k = mc / 1e9
-            if mc_k >= 1:
-                return f"₹{mc_k:.1f}K Cr"
-            mc_cr = mc / 1e7
-            return f"₹{mc_cr:.0f} Cr"
-
-        rows_of_3 = [prices_data[i:i+3] for i in range(0, len(prices_data), 3)]
-        for row_items in rows_of_3:
-            cols = st.columns(3)
-            for ci, item in enumerate(row_items):
-                name = item['name']
-                sym = NBFCS[name].replace('.NS', '')
-                price = item['price']
-                chg_abs = item['change_abs']
-                chg_pct = item['change_pct']
-                vol = item['volume']
-                mc = item['market_cap']
-
-                is_pos = (chg_pct is not None and chg_pct >= 0)
-                border_color = '#16a34a' if is_pos else '#dc2626'
-                chg_cls = 'ticker-pos' if is_pos else 'ticker-neg'
-                arrow = '▲' if is_pos else '▼'
-
-                if price is not None:
-                    price_str = f"₹{price:,.2f}"
-                    chg_str = f"{arrow} {abs(chg_pct):.2f}%" if chg_pct is not None else "—"
-                    meta1 = f"±₹{abs(chg_abs):.2f} · Vol {_fmt_vol(vol)}" if chg_abs is not None else f"Vol {_fmt_vol(vol)}"
-                else:
-                    price_str = "—"
-                    chg_str = "—"
-                    meta1 = "—"
-
-                meta2 = f"MCap {_fmt_mc(mc)}"
+    @deferred
+    def price_cards():
+        """Live quote cards for every NBFC."""
+        with st.spinner("Fetching live prices…"):
+            prices_data = get_current_prices()
 
-                with cols[ci]:
-                    st.markdown(f"""
-                    <div class="ticker-card" style="border-top-color:{border_color};">
-                      <div style="display:flex;justify-content:space-between;align-items:flex-start;">
-                        <div>
-                          <div class="ticker-name-sm">{name}</div>
-                          <div class="ticker-sym">{sym}</div>
-                        </div>
-                        <div style="text-align:right;">
-                          <div class="ticker-price">{price_str}</div>
-                          <div class="{chg_cls}">{chg_str}</div>
+        if not prices_data:
+            st.warning("Unable to fetch prices. Check your internet connection.")
+        else:
+            def _fmt_vol(v):
+                if v is None or v == 0:
+                    return "—"
+                if v >= 1e7:
+                    return f"{v/1e7:.1f}Cr"
+                elif v >= 1e5:
+                    return f"{v/1e5:.1f}L"
+                elif v >= 1e3:
+                    return f"{v/1e3:.1f}K"
+                return str(int(v))
+
+            def _fmt_mc(mc):
+                if mc is None:
+                    return "—"
+                mc_lc = mc / 1e12
+                if mc_lc >= 1:
+                    return f"₹{mc_lc:.2f} L.Cr"
+                mc_k = mc / 1e9
+                if mc_k >= 1:
+                    return f"₹{mc_k:.1f}K Cr"
+                mc_cr = mc / 1e7
+                return f"₹{mc_cr:.0f} Cr"
+
+            rows_of_3 = [prices_data[i:i+3] for i in range(0, len(prices_data), 3)]
+            for row_items in rows_of_3:
+                cols = st.columns(3)
+                for ci, item in enumerate(row_items):
+                    name = item['name']
+                    sym = NBFCS[name].replace('.NS', '')
+                    price = item['price']
+                    chg_abs = item['change_abs']
+                    chg_pct = item['change_pct']
+                    vol = item['volume']
+                    mc = item['market_cap']
+
+                    is_pos = (chg_pct is not None and chg_pct >= 0)
+                    border_color = '#16a34a' if is_pos else '#dc2626'
+                    chg_cls = 'ticker-pos' if is_pos else 'ticker-neg'
+                    arrow = '▲' if is_pos else '▼'
+
+                    if price is not None:
+                        price_str = f"₹{price:,.2f}"
+                        chg_str = f"{arrow} {abs(chg_pct):.2f}%" if chg_pct is not None else "—"
+                        meta1 = f"±₹{abs(chg_abs):.2f} · Vol {_fmt_vol(vol)}" if chg_abs is not None else f"Vol {_fmt_vol(vol)}"
+                    else:
+                        price_str = "—"
+                        chg_str = "—"
+                        meta1 = "—"
+
+                    meta2 = f"MCap {_fmt_mc(mc)}"
+
+                    with cols[ci]:
+                        st.markdown(f"""
+                        <div class="ticker-card" style="border-top-color:{border_color};">
+                          <div style="display:flex;justify-content:space-between;align-items:flex-start;">
+                            <div>
+                              <div class="ticker-name-sm">{name}</div>
+                              <div class="ticker-sym">{sym}</div>
+                            </div>
+                            <div style="text-align:right;">
+                              <div class="ticker-price">{price_str}</div>
+                              <div class="{chg_cls}">{chg_str}</div>
+                            </div>
+                          </div>
+                          <div style="margin-top:6px;">
+                            <span class="ticker-meta">{meta1}</span><br>
+                            <span class="ticker-meta">{meta2}</span>
+                          </div>
                         </div>
-                      </div>
-                      <div style="margin-top:6px;">
-                        <span class="ticker-meta">{meta1}</span><br>
-                        <span class="ticker-meta">{meta2}</span>
-                      </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        """, unsafe_allow_html=True)
 
-            st.markdown('<div style="height:4px;"></div>', unsafe_allow_html=True)
+                st.markdown('<div style="height:4px;"></div>', unsafe_allow_html=True)
 
-        # Fetch timestamp
-        cache_ts = st.session_state.get('_prices_ts', 0)
-        if cache_ts > 0:
-            mins_ago = int((datetime.now().timestamp() - cache_ts) / 60)
-            st.markdown(
-                f'<div style="text-align:right;font-size:10px;color:#94a3b8;font-family:\'JetBrains Mono\',monospace;">↻ fetched {mins_ago} min ago</div>',
-                unsafe_allow_html=True
-            )
+            # Fetch timestamp
+            cache_ts = st.session_state.get('_prices_ts', 0)
+            if cache_ts > 0:
+                mins_ago = int((datetime.now().timestamp() - cache_ts) / 60)
+                st.markdown(
+                    f'<div style="text-align:right;font-size:10px;color:#94a3b8;font-family:\'JetBrains Mono\',monospace;">↻ fetched {mins_ago} min ago</div>',
+                    unsafe_allow_html=True
+                )
 
     st.markdown('<div style="height:6px;"></div>', unsafe_allow_html=True)
 
@@ -2374,80 +2057,79 @@ with tab1:
     </div>
     """, unsafe_allow_html=True)
 
-    sel_cmp = nbfc_selector('mkt', default_on=DEFAULT_COMPARISON)
-
-    st.markdown('<div style="height:6px;"></div>', unsafe_allow_html=True)
-
-    # Period buttons
-    periods = ['1W', '1M', '3M', '6M', '1Y', '3Y', '5Y']
-    btn_cols = st.columns([1, 1, 1, 1, 1, 1, 1, 16], gap="small")
-    for i, p in enumerate(periods):
-        with btn_cols[i]:
-            if st.button(p, key=f"period_{p}"):
-                st.session_state.time_period = p
-                st.session_state.use_custom_date = False
-                st.rerun()
-
-    active_label = 'CUSTOM' if st.session_state.use_custom_date else st.session_state.time_period
-
-    # Highlight active period button
-    js_highlight = f"""
-    <script>
-    (function() {{
-        var active = "{active_label}";
-        var buttons = window.parent.document.querySelectorAll('button[kind="secondary"]');
-        buttons.forEach(function(btn) {{
-            if (btn.innerText.trim() === active) {{
-                btn.style.background = '#0284c7';
-                btn.style.color = 'white';
-                btn.style.fontWeight = '700';
-                btn.style.borderColor = '#0284c7';
-            }}
-        }});
-    }})();
-    </script>
-    """
-    components.html(js_highlight, height=0)
-
-    # Custom date picker
-    c1, c2, c3, c4 = st.columns([1.4, 1.4, 0.8, 4.4])
-    today = _date.today()
-    with c1:
-        custom_from = st.date_input("From", value=today - timedelta(days=180), key="cust_from", label_visibility="visible")
-    with c2:
-        custom_to = st.date_input("To", value=today, key="cust_to", label_visibility="visible")
-    with c3:
-        st.markdown('<div style="height:28px;"></div>', unsafe_allow_html=True)
-        if st.button("Apply", key="apply_custom"):
-            st.session_state.use_custom_date = True
-            st.rerun()
-
-    if st.session_state.use_custom_date:
-        s_date = custom_from
-        e_date = custom_to
-    else:
-        days = {'1W': 7, '1M': 30, '3M': 90, '6M': 180, '1Y': 365, '3Y': 1095, '5Y': 1825}.get(st.session_state.time_period, 180)
-        e_date = today
-        s_date = e_date - timedelta(days=days)
-
-    fmt_from = s_date.strftime('%-d %b\'%y')
-    fmt_to = e_date.strftime('%-d %b\'%y')
-
-    st.markdown('<div style="height:14px;"></div>', unsafe_allow_html=True)
-    with st.spinner("Loading comparison chart…"):
-        cmp_fig, _, _ = create_comparison_chart(
-            st.session_state.time_period,
-            sel_cmp,
-            start_date=s_date if st.session_state.use_custom_date else None,
-            end_date=e_date if st.session_state.use_custom_date else None,
-        )
-        # Update title with date range
-        date_label = f"{fmt_from} – {fmt_to}"
-        period_label = 'CUSTOM' if st.session_state.use_custom_date else st.session_state.time_period
-        cmp_fig.update_layout(
-            title_text=f'<b style="color:#0a2540;font-size:17px;">Performance Comparison — {period_label} · {date_label} (Indexed to 100)</b>'
-        )
-        st.plotly_chart(cmp_fig, use_container_width=True, key="mkt_comparison")
+    @deferred
+    @fragment
+    def comparison_section():
+        """Stock selector, period buttons and the indexed comparison chart."""
+        sel_cmp = nbfc_selector('mkt', default_on=DEFAULT_COMPARISON)
+
+        st.markdown('<div style="height:6px;"></div>', unsafe_allow_html=True)
+
+        # Period buttons
+        periods = ['1W', '1M', '3M', '6M', '1Y', '3Y', '5Y']
+        btn_cols = st.columns([1, 1, 1, 1, 1, 1, 1, 16], gap="small")
+        for i, p in enumerate(periods):
+            with btn_cols[i]:
+                st.button(p, key=f"period_{p}", on_click=_set_period, args=(p,))
+
+        active_label = 'CUSTOM' if st.session_state.use_custom_date else st.session_state.time_period
+
+        # Highlight active period button
+        js_highlight = f"""
+        <script>
+        (function() {{
+            var active = "{active_label}";
+            var buttons = window.parent.document.querySelectorAll('button[kind="secondary"]');
+            buttons.forEach(function(btn) {{
+                if (btn.innerText.trim() === active) {{
+                    btn.style.background = '#0284c7';
+                    btn.style.color = 'white';
+                    btn.style.fontWeight = '700';
+                    btn.style.borderColor = '#0284c7';
+                }}
+            }});
+        }})();
+        </script>
+        """
+        components.html(js_highlight, height=0)
+
+        # Custom date picker
+        c1, c2, c3, c4 = st.columns([1.4, 1.4, 0.8, 4.4])
+        today = _date.today()
+        with c1:
+            custom_from = st.date_input("From", value=today - timedelta(days=180), key="cust_from", label_visibility="visible")
+        with c2:
+            custom_to = st.date_input("To", value=today, key="cust_to", label_visibility="visible")
+        with c3:
+            st.markdown('<div style="height:28px;"></div>', unsafe_allow_html=True)
+            st.button("Apply", key="apply_custom", on_click=_set_period, args=(None,))
+
+        if st.session_state.use_custom_date:
+            s_date = custom_from
+            e_date = custom_to
+        else:
+            days = {'1W': 7, '1M': 30, '3M': 90, '6M': 180, '1Y': 365, '3Y': 1095, '5Y': 1825}.get(st.session_state.time_period, 180)
+            e_date = today
+            s_date = e_date - timedelta(days=days)
+
+        fmt_from = s_date.strftime('%-d %b\'%y')
+        fmt_to = e_date.strftime('%-d %b\'%y')
+
+        st.markdown('<div style="height:14px;"></div>', unsafe_allow_html=True)
+        with st.spinner("Loading comparison chart…"):
+            cmp_fig, _, _ = create_comparison_chart(
+                st.session_state.time_period,
+                sel_cmp,
+                start_date=s_date if st.session_state.use_custom_date else None,
+                end_date=e_date if st.session_state.use_custom_date else None,
+            )
+            # Update title with date range
+            date_label = f"{fmt_from} – {fmt_to}"
+            period_label = 'CUSTOM' if st.session_state.use_custom_date else st.session_state.time_period
+            cmp_fig.update_layout(
+                title_text=f'<b style="color:#0a2540;font-size:17px;">Performance Comparison — {period_label} · {date_label} (Indexed to 100)</b>'
+            )
+            st.plotly_chart(cmp_fig, use_container_width=True, key="mkt_comparison")
 
     st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
 
@@ -2457,13 +2139,17 @@ with tab1:
     </div>
     """, unsafe_allow_html=True)
 
-    sel_mc = nbfc_selector('mc_', default_on=DEFAULT_COMPARISON)
+    @deferred
+    @fragment
+    def mktcap_section():
+        """Stock selector and the market-cap trend chart."""
+        sel_mc = nbfc_selector('mc_', default_on=DEFAULT_COMPARISON)
 
-    st.markdown('<div style="height:6px;"></div>', unsafe_allow_html=True)
+        st.markdown('<div style="height:6px;"></div>', unsafe_allow_html=True)
 
-    with st.spinner("Loading market cap chart…"):
-        mc_fig = make_mktcap_trend_chart(sel_mc, height=440)
-        st.plotly_chart(mc_fig, use_container_width=True, key="mkt_mcap")
+        with st.spinner("Loading market cap chart…"):
+            mc_fig = make_mktcap_trend_chart(sel_mc, height=440)
+            st.plotly_chart(mc_fig, use_container_width=True, key="mkt_mcap")
 
     st.markdown("""
     <div class="metric-note">
@@ -2482,37 +2168,42 @@ with tab2:
     </div>
     """, unsafe_allow_html=True)
 
-    sel2 = nbfc_selector('fin')
-    st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+    @fragment
+    def financials_section():
+        """NBFC selector and the AUM / PAT / NIM charts."""
+        sel2 = nbfc_selector('fin')
+        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+
+        st.markdown('<div class="section-label">Scale</div>', unsafe_allow_html=True)
 
-    st.markdown('<div class="section-label">Scale</div>', unsafe_allow_html=True)
+        aum_line = make_trend_chart('aum_cr', sel2, 'Assets Under Management (AUM)', '₹ Crore', fmt='cr', height=380)
+        st.plotly_chart(aum_line, use_container_width=True, key="fin_aum_line")
 
-    aum_line = make_trend_chart('aum_cr', sel2, 'Assets Under Management (AUM)', '₹ Crore', fmt='cr', height=380)
-    st.plotly_chart(aum_line, use_container_width=True, key="fin_aum_line")
+        col_a, col_b = st.columns(2)
+        with col_a:
+            qoq_aum = make_qoq_chart('aum_cr', sel2, 'AUM')
+            st.plotly_chart(qoq_aum, use_container_width=True, key="fin_aum_qoq")
+        with col_b:
+            yoy_aum = make_yoy_chart('aum_cr', sel2, 'AUM')
+            st.plotly_chart(yoy_aum, use_container_width=True, key="fin_aum_yoy")
 
-    col_a, col_b = st.columns(2)
-    with col_a:
-        qoq_aum = make_qoq_chart('aum_cr', sel2, 'AUM')
-        st.plotly_chart(qoq_aum, use_container_width=True, key="fin_aum_qoq")
-    with col_b:
-        yoy_aum = make_yoy_chart('aum_cr', sel2, 'AUM')
-        st.plotly_chart(yoy_aum, use_container_width=True, key="fin_aum_yoy")
+        pat_line = make_trend_chart('pat_cr', sel2, 'Profit After Tax (PAT)', '₹ Crore', fmt='cr', height=380)
+        st.plotly_chart(pat_line, use_container_width=True, key="fin_pat_line")
 
-    pat_line = make_trend_chart('pat_cr', sel2, 'Profit After Tax (PAT)', '₹ Crore', fmt='cr', height=380)
-    st.plotly_chart(pat_line, use_container_width=True, key="fin_pat_line")
+        col_c, col_d = st.columns(2)
+        with col_c:
+            qoq_pat = make_qoq_chart('pat_cr', sel2, 'PAT')
+            st.plotly_chart(qoq_pat, use_container_width=True, key="fin_pat_qoq")
+        with col_d:
+            yoy_pat = make_yoy_chart('pat_cr', sel2, 'PAT')
+            st.plotly_chart(yoy_pat, use_container_width=True, key="fin_pat_yoy")
 
-    col_c, col_d = st.columns(2)
-    with col_c:
-        qoq_pat = make_qoq_chart('pat_cr', sel2, 'PAT')
-        st.plotly_chart(qoq_pat, use_container_width=True, key="fin_pat_qoq")
-    with col_d:
-        yoy_pat = make_yoy_chart('pat_cr', sel2, 'PAT')
-        st.plotly_chart(yoy_pat, use_container_width=True, key="fin_pat_yoy")
+        st.markdown('<div class="section-label">Yield</div>', unsafe_allow_html=True)
 
-    st.markdown('<div class="section-label">Yield</div>', unsafe_allow_html=True)
+        nim_chart = make_trend_chart('nim_pct', sel2, 'Net Interest Margin (NIM)', 'NIM (%)')
+        st.plotly_chart(nim_chart, use_container_width=True, key="fin_nim")
 
-    nim_chart = make_trend_chart('nim_pct', sel2, 'Net Interest Margin (NIM)', 'NIM (%)')
-    st.plotly_chart(nim_chart, use_container_width=True, key="fin_nim")
+    financials_section()
 
 
 # ── TAB 3 — ASSET QUALITY ──────────────────────────────────────────────────────
@@ -2524,23 +2215,28 @@ with tab3:
     </div>
     """, unsafe_allow_html=True)
 
-    sel3 = nbfc_selector('aq')
-    st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+    @fragment
+    def asset_quality_section():
+        """NBFC selector and the GNPA / NNPA / PCR charts."""
+        sel3 = nbfc_selector('aq')
+        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
 
-    gnpa_chart = make_trend_chart('gnpa_pct', sel3, 'Gross NPA (GNPA %)', 'GNPA (%)', lower_is_better=True)
-    st.plotly_chart(gnpa_chart, use_container_width=True, key="aq_gnpa")
+        gnpa_chart = make_trend_chart('gnpa_pct', sel3, 'Gross NPA (GNPA %)', 'GNPA (%)', lower_is_better=True)
+        st.plotly_chart(gnpa_chart, use_container_width=True, key="aq_gnpa")
 
-    nnpa_chart = make_trend_chart('nnpa_pct', sel3, 'Net NPA (NNPA %)', 'NNPA (%)', lower_is_better=True)
-    st.plotly_chart(nnpa_chart, use_container_width=True, key="aq_nnpa")
+        nnpa_chart = make_trend_chart('nnpa_pct', sel3, 'Net NPA (NNPA %)', 'NNPA (%)', lower_is_better=True)
+        st.plotly_chart(nnpa_chart, use_container_width=True, key="aq_nnpa")
 
-    pcr_chart = make_trend_chart('pcr_pct', sel3, 'Provision Coverage Ratio (PCR %)', 'PCR (%)', height=380)
-    st.plotly_chart(pcr_chart, use_container_width=True, key="aq_pcr")
+        pcr_chart = make_trend_chart('pcr_pct', sel3, 'Provision Coverage Ratio (PCR %)', 'PCR (%)', height=380)
+        st.plotly_chart(pcr_chart, use_container_width=True, key="aq_pcr")
 
-    st.markdown("""
-    <div class="metric-note">
-      Lower GNPA/NNPA = better credit quality. Higher PCR = more conservative provisioning.
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("""
+        <div class="metric-note">
+          Lower GNPA/NNPA = better credit quality. Higher PCR = more conservative provisioning.
+        </div>
+        """, unsafe_allow_html=True)
+
+    asset_quality_section()
 
 
 # ── TAB 4 — CAPITAL & LEVERAGE ─────────────────────────────────────────────────
@@ -2552,33 +2248,38 @@ with tab4:
     </div>
     """, unsafe_allow_html=True)
 
-    sel4 = nbfc_selector('cap')
-    st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+    @fragment
+    def capital_section():
+        """NBFC selector and the borrowing-cost, leverage and capital charts."""
+        sel4 = nbfc_selector('cap')
+        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
 
-    cob_chart = make_trend_chart('cost_of_borrowing_pct', sel4, 'Cost of Borrowing (%)', 'CoB (%)', lower_is_better=True)
-    st.plotly_chart(cob_chart, use_container_width=True, key="cap_cob")
+        cob_chart = make_trend_chart('cost_of_borrowing_pct', sel4, 'Cost of Borrowing (%)', 'CoB (%)', lower_is_better=True)
+        st.plotly_chart(cob_chart, use_container_width=True, key="cap_cob")
 
-    de_chart = make_trend_chart('d_e_ratio', sel4, 'Debt-to-Equity Ratio (D/E)', 'D/E Ratio', fmt='ratio', lower_is_better=True)
-    st.plotly_chart(de_chart, use_container_width=True, key="cap_de")
+        de_chart = make_trend_chart('d_e_ratio', sel4, 'Debt-to-Equity Ratio (D/E)', 'D/E Ratio', fmt='ratio', lower_is_better=True)
+        st.plotly_chart(de_chart, use_container_width=True, key="cap_de")
 
-    car_chart = make_trend_chart('car_pct', sel4, 'Capital Adequacy Ratio (CAR/CRAR %)', 'CAR (%)')
-    st.plotly_chart(car_chart, use_container_width=True, key="cap_car")
+        car_chart = make_trend_chart('car_pct', sel4, 'Capital Adequacy Ratio (CAR/CRAR %)', 'CAR (%)')
+        st.plotly_chart(car_chart, use_container_width=True, key="cap_car")
 
-    t1_note = 'Chola · AB Capital · L&T Finance only — others not disclosed separately'
-    t1_chart = make_trend_chart('t1_pct', sel4, 'Tier 1 Capital (%)', 'Tier 1 (%)', note=t1_note)
-    st.plotly_chart(t1_chart, use_container_width=True, key="cap_t1")
+        t1_note = 'Chola · AB Capital · L&T Finance only — others not disclosed separately'
+        t1_chart = make_trend_chart('t1_pct', sel4, 'Tier 1 Capital (%)', 'Tier 1 (%)', note=t1_note)
+        st.plotly_chart(t1_chart, use_container_width=True, key="cap_t1")
 
-    t2_note = 'Chola · AB Capital · L&T Finance only — others not disclosed separately'
-    t2_chart = make_trend_chart('t2_pct', sel4, 'Tier 2 Capital (%)', 'Tier 2 (%)', note=t2_note)
-    st.plotly_chart(t2_chart, use_container_width=True, key="cap_t2")
+        t2_note = 'Chola · AB Capital · L&T Finance only — others not disclosed separately'
+        t2_chart = make_trend_chart('t2_pct', sel4, 'Tier 2 Capital (%)', 'Tier 2 (%)', note=t2_note)
+        st.plotly_chart(t2_chart, use_container_width=True, key="cap_t2")
 
-    st.markdown("""
-    <div class="metric-note">
-      D/E: lower = less levered. CAR: higher = better capitalised (RBI minimum 15%).
-      Tier 1 = core equity capital; Tier 2 = supplementary capital.
-      T1/T2 available for Chola, AB Capital, and L&T Finance only.
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("""
+        <div class="metric-note">
+          D/E: lower = less levered. CAR: higher = better capitalised (RBI minimum 15%).
+          Tier 1 = core equity capital; Tier 2 = supplementary capital.
+          T1/T2 available for Chola, AB Capital, and L&T Finance only.
+        </div>
+        """, unsafe_allow_html=True)
+
+    capital_section()
 
 
 # ── TAB 5 — PROFITABILITY RATIOS ───────────────────────────────────────────────
@@ -2590,14 +2291,19 @@ with tab5:
     </div>
     """, unsafe_allow_html=True)
 
-    sel5 = nbfc_selector('prof')
-    st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+    @fragment
+    def profitability_section():
+        """NBFC selector and the ROA / ROE charts."""
+        sel5 = nbfc_selector('prof')
+        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+
+        roa_chart = make_trend_chart('roa_pct', sel5, 'Return on Assets (ROA)', 'ROA (%)')
+        st.plotly_chart(roa_chart, use_container_width=True, key="prof_roa")
 
-    roa_chart = make_trend_chart('roa_pct', sel5, 'Return on Assets (ROA)', 'ROA (%)')
-    st.plotly_chart(roa_chart, use_container_width=True, key="prof_roa")
+        roe_chart = make_trend_chart('roe_pct', sel5, 'Return on Equity (ROE)', 'ROE (%)')
+        st.plotly_chart(roe_chart, use_container_width=True, key="prof_roe")
 
-    roe_chart = make_trend_chart('roe_pct', sel5, 'Return on Equity (ROE)', 'ROE (%)')
-    st.plotly_chart(roe_chart, use_container_width=True, key="prof_roe")
+    profitability_section()
 
 
 # ── TAB 6 — VALUATION METRICS ─────────────────────────────────────────────────
@@ -2609,35 +2315,39 @@ with tab6:
     </div>
     """, unsafe_allow_html=True)
 
-    sel6 = nbfc_selector('val')
-    st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+    @deferred
+    @fragment
+    def valuation_section():
+        """NBFC selector and the P/B and BVPS charts."""
+        sel6 = nbfc_selector('val')
+        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
 
-    st.markdown("""
-    <div class="section-label">Price-to-Book Ratio
-      <span class="section-label-sub" style="margin-left:8px;">Daily NSE closing price ÷ latest quarterly BVPS</span>
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("""
+        <div class="section-label">Price-to-Book Ratio
+          <span class="section-label-sub" style="margin-left:8px;">Daily NSE closing price ÷ latest quarterly BVPS</span>
+        </div>
+        """, unsafe_allow_html=True)
 
-    with st.spinner("Loading P/B chart…"):
-        pb_chart = make_pb_chart(sel6, height=520)
-        st.plotly_chart(pb_chart, use_container_width=True, key="val_pb")
+        with st.spinner("Loading P/B chart…"):
+            pb_chart = make_pb_chart(sel6, height=520)
+            st.plotly_chart(pb_chart, use_container_width=True, key="val_pb")
 
-    st.markdown("""
-    <div class="section-label">Book Value Per Share (BVPS)
-      <span class="section-label-sub" style="margin-left:8px;">₹ per share · quarterly — absolute reference</span>
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("""
+        <div class="section-label">Book Value Per Share (BVPS)
+          <span class="section-label-sub" style="margin-left:8px;">₹ per share · quarterly — absolute reference</span>
+        </div>
+        """, unsafe_allow_html=True)
 
-    bvps_chart = make_trend_chart('bvps_inr', sel6, 'Book Value Per Share (BVPS)', 'BVPS (₹)', fmt='inr', height=380)
-    st.plotly_chart(bvps_chart, use_container_width=True, key="val_bvps")
+        bvps_chart = make_trend_chart('bvps_inr', sel6, 'Book Value Per Share (BVPS)', 'BVPS (₹)', fmt='inr', height=380)
+        st.plotly_chart(bvps_chart, use_container_width=True, key="val_bvps")
 
-    st.markdown("""
-    <div class="metric-note">
-      P/B = Daily NSE closing price ÷ most recently reported quarterly BVPS.
-      BVPS steps up at each quarter-end (Q4FY24–Q4FY26). Dotted line at P/B = 1 (book value floor).
-      Lower P/B may indicate undervaluation relative to peers.
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("""
+        <div class="metric-note">
+          P/B = Daily NSE closing price ÷ most recently reported quarterly BVPS.
+          BVPS steps up at each quarter-end (Q4FY24–Q4FY26). Dotted line at P/B = 1 (book value floor).
+          Lower P/B may indicate undervaluation relative to peers.
+        </div>
+        """, unsafe_allow_html=True)
 
 
 # ── TAB 7 — DEEP DIVE ──────────────────────────────────────────────────────────
@@ -2649,97 +2359,114 @@ with tab7:
     </div>
     """, unsafe_allow_html=True)
 
-    chosen = st.selectbox(
-        "Select NBFC",
-        DISPLAY_NAMES,
-        index=0,
-        key="deep_dive_nbfc",
-        label_visibility="collapsed"
-    )
+    @fragment
+    def deep_dive_section():
+        """NBFC picker and its 14-metric deep dive."""
+        chosen = st.selectbox(
+            "Select NBFC",
+            DISPLAY_NAMES,
+            index=0,
+            key="deep_dive_nbfc",
+            label_visibility="collapsed"
+        )
 
-    with st.spinner(f"Loading deep dive for {chosen}…"):
-        dd_fig = make_deep_dive(chosen)
-        st.plotly_chart(dd_fig, use_container_width=True, key="deep_dive_chart")
+        with st.spinner(f"Loading deep dive for {chosen}…"):
+            dd_fig = make_deep_dive(chosen)
+            st.plotly_chart(dd_fig, use_container_width=True, key="deep_dive_chart")
 
-    st.markdown("""
-    <div class="metric-note">
-      Gaps in charts = metric not disclosed for that quarter.
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("""
+        <div class="metric-note">
+          Gaps in charts = metric not disclosed for that quarter.
+        </div>
+        """, unsafe_allow_html=True)
+
+    deep_dive_section()
 
 
 # ── TAB 8 — RANKINGS ───────────────────────────────────────────────────────────
 with tab8:
-    st.markdown("""
-    <div class="tab-intro">
-      <div class="tab-intro-title">Peer Scorecard — Q4 FY26</div>
-      <div class="tab-intro-sub">All 9 NBFCs · 11 metrics · Red → Yellow → Green spectrum within each column</div>
-    </div>
-    """, unsafe_allow_html=True)
+    @fragment
+    def rankings_section():
+        """Quarter slider, scorecard, highlights and rank sparklines."""
+        rank_q = st.select_slider(
+            "Quarter",
+            options=Q_LABELS,
+            value=Q_LABELS[INSIGHT_BASE_Q],
+            key="rank_quarter",
+            label_visibility="collapsed",
+        )
+        q_idx = Q_LABELS.index(rank_q)
+        q_disp = f"{rank_q[:2]} {rank_q[2:]}"
 
-    rank_fig = build_rankings_table()
-    st.plotly_chart(rank_fig, use_container_width=True, key="rank_table")
+        st.markdown(f"""
+        <div class="tab-intro">
+          <div class="tab-intro-title">Peer Scorecard — {q_disp}</div>
+          <div class="tab-intro-sub">All 9 NBFCs · 11 metrics · Red → Yellow → Green spectrum within each column</div>
+        </div>
+        """, unsafe_allow_html=True)
 
-    st.markdown("""
-    <div class="metric-note">
-      Color coding: green = best-in-class, yellow = mid-range, red = weakest.
-      For GNPA/NNPA/CoB/D/E lower is better; for AUM/PAT/NIM/ROA/ROE/CAR higher is better.
-      — = not disclosed.
-    </div>
-    """, unsafe_allow_html=True)
+        rank_fig = build_rankings_table(q_idx)
+        st.plotly_chart(rank_fig, use_container_width=True, key="rank_table")
 
-    st.markdown('<div class="section-label">Quick Highlights — Q4 FY26</div>', unsafe_allow_html=True)
+        st.markdown("""
+        <div class="metric-note">
+          Color coding: green = best-in-class, yellow = mid-range, red = weakest.
+          For GNPA/NNPA/CoB/D/E lower is better; for AUM/PAT/NIM/ROA/ROE/CAR higher is better.
+          — = not disclosed.
+        </div>
+        """, unsafe_allow_html=True)
 
-    # Compute highlights
-    Q_IDX = 8
+        st.markdown(f'<div class="section-label">Quick Highlights — {q_disp}</div>', unsafe_allow_html=True)
 
-    def _get_q4(metric):
-        best_name, best_val = None, None
-        for name in DISPLAY_NAMES:
-            cache = CACHE_KEY[name]
-            vals = NBFC_TIMESERIES[cache].get(metric, [None] * 9)
-            v = vals[Q_IDX] if Q_IDX < len(vals) else None
-            if v is not None:
-                if best_val is None or v > best_val:
-                    best_val = v
-                    best_name = name
-        return best_name, best_val
-
-    def _get_q4_min(metric):
-        best_name, best_val = None, None
-        for name in DISPLAY_NAMES:
-            cache = CACHE_KEY[name]
-            vals = NBFC_TIMESERIES[cache].get(metric, [None] * 9)
-            v = vals[Q_IDX] if Q_IDX < len(vals) else None
-            if v is not None:
-                if best_val is None or v < best_val:
-                    best_val = v
-                    best_name = name
-        return best_name, best_val
-
-    aum_name, aum_val = _get_q4('aum_cr')
-    pat_name, pat_val = _get_q4('pat_cr')
-    roa_name, roa_val = _get_q4('roa_pct')
-    gnpa_name, gnpa_val = _get_q4_min('gnpa_pct')
-
-    hl_cols = st.columns(4)
-    highlights = [
-        ("Largest AUM", aum_name, f"₹{int(aum_val):,} Cr" if aum_val else "—", "AUM Q4FY26", '#0284c7'),
-        ("Highest PAT", pat_name, f"₹{int(pat_val):,} Cr" if pat_val else "—", "PAT Q4FY26", '#10b981'),
-        ("Best ROA", roa_name, f"{roa_val:.2f}%" if roa_val else "—", "ROA Q4FY26", '#f97316'),
-        ("Cleanest Book", gnpa_name, f"GNPA {gnpa_val:.2f}%" if gnpa_val else "—", "GNPA Q4FY26", '#8b5cf6'),
-    ]
+        # Rank-1 NBFC per metric, read off the precomputed rank matrix
+        _keys = [m[0] for m in RANKINGS_METRICS]
+        _lead = nbfc_analytics.leaders(rank_matrices()[0], rankings_cube(), q_idx)
 
-    for i, (label, name, value, note_txt, color) in enumerate(highlights):
-        with hl_cols[i]:
-            st.markdown(f"""
-            <div style="background:white;border-radius:5px;padding:12px 14px;border-top:3px solid {color};box-shadow:0 1px 2px rgba(0,0,0,0.05);">
-              <div style="font-size:10px;font-weight:700;letter-spacing:0.06em;text-transform:uppercase;color:#94a3b8;">{label}</div>
-              <div style="font-size:15px;font-weight:700;color:#0a2540;margin:4px 0 2px;">{name or '—'}</div>
-              <div style="font-size:12px;font-weight:600;color:{color};">{value}</div>
-              <div style="font-size:10.5px;color:#64748b;">{note_txt}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        def _leader(metric):
+            row, v = _lead[_keys.index(metric)]
+            return (None, None) if row is None else (DISPLAY_NAMES[row], v)
+
+        aum_name, aum_val = _leader('aum_cr')
+        pat_name, pat_val = _leader('pat_cr')
+        roa_name, roa_val = _leader('roa_pct')
+        gnpa_name, gnpa_val = _leader('gnpa_pct')
+
+        hl_cols = st.columns(4)
+        highlights = [
+            ("Largest AUM", aum_name, f"₹{int(aum_val):,} Cr" if aum_val else "—", f"AUM {rank_q}", '#0284c7'),
+            ("Highest PAT", pat_name, f"₹{int(pat_val):,} Cr" if pat_val else "—", f"PAT {rank_q}", '#10b981'),
+            ("Best ROA", roa_name, f"{roa_val:.2f}%" if roa_val else "—", f"ROA {rank_q}", '#f97316'),
+            ("Cleanest Book", gnpa_name, f"GNPA {gnpa_val:.2f}%" if gnpa_val else "—", f"GNPA {rank_q}", '#8b5cf6'),
+        ]
+
+        for i, (label, name, value, note_txt, color) in enumerate(highlights):
+            with hl_cols[i]:
+                st.markdown(f"""
+                <div style="background:white;border-radius:5px;padding:12px 14px;border-top:3px solid {color};box-shadow:0 1px 2px rgba(0,0,0,0.05);">
+                  <div style="font-size:10px;font-weight:700;letter-spacing:0.06em;text-transform:uppercase;color:#94a3b8;">{label}</div>
+                  <div style="font-size:15px;font-weight:700;color:#0a2540;margin:4px 0 2px;">{name or '—'}</div>
+                  <div style="font-size:12px;font-weight:600;color:{color};">{value}</div>
+                  <div style="font-size:10.5px;color:#64748b;">{note_txt}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+        st.markdown(f"""
+        <div class="section-label">Rank Over Time
+          <span class="section-label-sub" style="margin-left:8px;">Peer rank each quarter · ▲/▼ = change vs prior quarter · dot = {rank_q}</span>
+        </div>
+        """, unsafe_allow_html=True)
+
+        spark_label = st.selectbox(
+            "Metric",
+            [m[1] for m in RANKINGS_METRICS],
+            index=0,
+            key="rank_spark_metric",
+            label_visibility="collapsed",
+        )
+        spark_metric = RANKINGS_METRICS[[m[1] for m in RANKINGS_METRICS].index(spark_label)][0]
+        st.plotly_chart(make_rank_sparklines(spark_metric, q_idx), use_container_width=True, key="rank_sparklines")
+
+    rankings_section()
 
 
 # ── TAB 9 — AI BULLETIN ────────────────────────────────────────────────────────
@@ -2751,83 +2478,121 @@ with tab9:
     </div>
     """, unsafe_allow_html=True)
 
-    def _parse_ai_date(d):
-        try:
-            return _dt.strptime(d.strip(), "%d %b %Y")
-        except Exception:
-            return _dt(1970, 1, 1)
-
-    # Filter row
-    ai_col1, ai_col2, ai_col3 = st.columns([2, 2, 1])
-    with ai_col1:
-        ai_nbfc_filter = st.selectbox(
-            "Filter by NBFC",
-            ["All NBFCs"] + list(NBFC_AI_INITIATIVES.keys()),
-            key="ai_nbfc_filter",
-        )
-    with ai_col2:
-        ai_func_filter = st.selectbox(
-            "Filter by Function",
-            ["All Functions"] + FUNCTION_TAXONOMY,
-            key="ai_func_filter",
-        )
-    with ai_col3:
-        ai_sort = st.selectbox(
-            "Sort by",
-            ["Newest first", "Oldest first", "NBFC", "Title"],
-            key="ai_sort",
+    # ── Card HTML ─────────────────────────────────────────────────────────────
+    def _ai_card_html(init, hl=lambda t: t):
+        """One initiative card as a single line of HTML (cards are joined into one payload per page)."""
+        color = COLORS.get(init.nbfc, '#0284c7')
+        tags_html = ''.join(f'<span class="ai-func-tag">{fn}</span> ' for fn in init.functions)
+        if init.source_url:
+            src_html = (f'<a class="ai-source-link" href="{init.source_url}" target="_blank" '
+                        f'rel="noopener">↗ {init.source_name}</a>')
+        else:
+            src_html = f'<span style="font-size:11px;color:#94a3b8;">{init.source_name}</span>'
+        return (
+            f'<div class="ai-row-card" style="--nbfc-color:{color};">'
+            f'<div class="ai-row-header" style="display:flex;align-items:center;justify-content:space-between;margin-bottom:7px;">'
+            f'<span class="ai-nbfc-badge" style="background:{color};">{init.nbfc}</span>'
+            f'<span class="ai-date-badge">{init.date}</span></div>'
+            f'<div class="ai-row-title">{hl(init.title)}</div>'
+            f'<div class="ai-impact">⚡ {hl(init.impact)}</div>'
+            f'<div class="ai-row-desc">{hl(init.description)}</div>'
+            f'<div class="ai-row-footer" style="display:flex;align-items:flex-start;justify-content:space-between;flex-wrap:wrap;gap:6px;border-top:1px solid #f1f5f9;padding-top:8px;margin-top:4px;">'
+            f'<div style="display:flex;flex-wrap:wrap;gap:4px;">{tags_html}</div>{src_html}</div>'
+            f'</div>'
         )
 
-    # Build items list
-    tbl_items = []
-    for nbfc, initiatives in NBFC_AI_INITIATIVES.items():
-        if ai_nbfc_filter != "All NBFCs" and nbfc != ai_nbfc_filter:
-            continue
-        for init in initiatives:
-            if ai_func_filter != "All Functions":
-                if ai_func_filter not in init.get('functions', []):
-                    continue
-            tbl_items.append((nbfc, init))
-
-    # Sort
-    if ai_sort == "Newest first":
-        tbl_items.sort(key=lambda x: _parse_ai_date(x[1].get('date', '')), reverse=True)
-    elif ai_sort == "Oldest first":
-        tbl_items.sort(key=lambda x: _parse_ai_date(x[1].get('date', '')))
-    elif ai_sort == "NBFC":
-        tbl_items.sort(key=lambda x: x[0])
-    elif ai_sort == "Title":
-        tbl_items.sort(key=lambda x: x[1].get('title', ''))
-
-    # Render cards
-    for nbfc, init in tbl_items:
-        color = COLORS.get(nbfc, '#0284c7')
-        tags_html = ''.join(
-            f'<span class="ai-func-tag">{fn}</span> '
-            for fn in init.get('functions', [])
+    @VIEWS.view('ai_cards_html', constants('ai', 'NBFC_AI_INITIATIVES'))
+    def ai_cards_html():
+        """Card HTML per ai_index().items position."""
+        return tuple(_ai_card_html(init) for init in ai_index().items)
+
+    @fragment
+    def ai_list_section():
+        """Search, filters, pagination and the initiative cards."""
+        ai_query = st.text_input(
+            "Search initiatives",
+            placeholder="🔎  Search titles, descriptions and impact — e.g. collections, underwriting, voice bot",
+            key="ai_search",
+            label_visibility="collapsed",
+        ).strip()
+
+        # Filter row
+        ai_col1, ai_col2, ai_col3, ai_col4 = st.columns([2, 2, 1, 1])
+        with ai_col1:
+            ai_nbfc_filter = st.selectbox(
+                "Filter by NBFC",
+                ["All NBFCs"] + list(NBFC_AI_INITIATIVES.keys()),
+                key="ai_nbfc_filter",
+            )
+        with ai_col2:
+            ai_func_filter = st.selectbox(
+                "Filter by Function",
+                ["All Functions"] + FUNCTION_TAXONOMY,
+                key="ai_func_filter",
+            )
+        with ai_col3:
+            ai_sort = st.selectbox(
+                "Sort by",
+                list(nbfc_records.AI_SORTS),
+                key="ai_sort",
+            )
+        with ai_col4:
+            ai_page_size = st.selectbox(
+                "Per page",
+                [20, 50, 100],
+                key="ai_page_size",
+            )
+
+        # Filter + sort from the prebuilt index (bitmap intersection, presorted ranks)
+        ai_filters = dict(
+            nbfc=None if ai_nbfc_filter == "All NBFCs" else ai_nbfc_filter,
+            function=None if ai_func_filter == "All Functions" else ai_func_filter,
         )
-        src_url = init.get('source_url', '')
-        src_name = init.get('source_name', '')
-        if src_url:
-            src_html = f'<a class="ai-source-link" href="{src_url}" target="_blank" rel="noopener">↗ {src_name}</a>'
+        if ai_query:
+            # Search results in relevance order, restricted to the active filters
+            ai_mask = ai_index().mask(**ai_filters)
+            ai_positions = [h.doc.ref for h in search_index().search(ai_query, limit=None, kinds=('ai',))
+                            if ai_mask >> h.doc.ref & 1]
         else:
-            src_html = f'<span style="font-size:11px;color:#94a3b8;">{src_name}</span>'
+            ai_positions = ai_index().select(sort=ai_sort, **ai_filters)
+
+        # Pagination — back to page 1 whenever the result set changes
+        ai_n_pages = max(1, -(-len(ai_positions) // ai_page_size))
+        ai_page_sig = (ai_query, ai_nbfc_filter, ai_func_filter, ai_sort, ai_page_size)
+        if st.session_state.get('_ai_page_sig') != ai_page_sig or st.session_state.get('ai_page', 1) > ai_n_pages:
+            st.session_state['_ai_page_sig'] = ai_page_sig
+            st.session_state['ai_page'] = 1
+        pg_col1, pg_col2 = st.columns([5, 1])
+        with pg_col2:
+            ai_page = st.number_input(
+                f"Page (of {ai_n_pages})",
+                min_value=1, max_value=ai_n_pages, step=1,
+                key="ai_page",
+            )
+        ai_start = (ai_page - 1) * ai_page_size
+        page_positions = ai_positions[ai_start:ai_start + ai_page_size]
+        with pg_col1:
+            if ai_positions:
+                shown = f'Showing {ai_start + 1}–{ai_start + len(page_positions)} of {len(ai_positions)} initiatives'
+                if ai_query:
+                    shown += f' matching “{html.escape(ai_query)}” · ranked by relevance'
+            elif ai_query:
+                shown = f'No initiatives matching “{html.escape(ai_query)}” with the current filters'
+            else:
+                shown = 'No initiatives match the current filters'
+            st.markdown(f'<div class="metric-note">{shown}</div>', unsafe_allow_html=True)
 
-        st.markdown(f"""
-        <div class="ai-row-card" style="--nbfc-color:{color};">
-          <div class="ai-row-header" style="display:flex;align-items:center;justify-content:space-between;margin-bottom:7px;">
-            <span class="ai-nbfc-badge" style="background:{color};">{nbfc}</span>
-            <span class="ai-date-badge">{init.get('date', '')}</span>
-          </div>
-          <div class="ai-row-title">{init.get('title', '')}</div>
-          <div class="ai-impact">⚡ {init.get('impact', '')}</div>
-          <div class="ai-row-desc">{init.get('description', '')}</div>
-          <div class="ai-row-footer" style="display:flex;align-items:flex-start;justify-content:space-between;flex-wrap:wrap;gap:6px;border-top:1px solid #f1f5f9;padding-top:8px;margin-top:4px;">
-            <div style="display:flex;flex-wrap:wrap;gap:4px;">{tags_html}</div>
-            {src_html}
-          </div>
-        </div>
-        """, unsafe_allow_html=True)
+        # Render the page as one HTML payload (cached cards; search results are highlighted per query)
+        if ai_query:
+            hl = lambda t: nbfc_search.highlight(t, ai_query)
+            page_html = ''.join(_ai_card_html(ai_index().items[i], hl) for i in page_positions)
+        else:
+            cards = ai_cards_html()
+            page_html = ''.join(cards[i] for i in page_positions)
+        if page_html:
+            st.markdown(f'<div class="ai-card-list">{page_html}</div>', unsafe_allow_html=True)
+
+    ai_list_section()
 
     st.markdown("""
     <div class="metric-note">
@@ -2847,155 +2612,21 @@ with tab10:
     </div>
     """, unsafe_allow_html=True)
 
-    # ── Helper functions ──────────────────────────────────────────────────────
-    def sh_latest(lst):
-        for v in reversed(lst):
-            if v is not None: return v
-        return None
-
-    def sh_first(lst):
-        for v in lst:
-            if v is not None: return v
-        return None
-
-    def sh_delta_str(lst):
-        f, l = sh_first(lst), sh_latest(lst)
-        if f is None or l is None: return 0, ""
-        d = l - f
-        if abs(d) < 0.05:
-            return d, '<span style="color:#64748b;font-size:11px;">→ flat</span>'
-        arrow = "▲" if d > 0 else "▼"
-        col = "#16a34a" if d > 0 else "#dc2626"
-        return d, f'<span style="color:{col};font-size:11px;">{arrow} {abs(d):.2f}%</span>'
-
-    def _cell_html(val, prev_val, is_first_app, is_last_app):
-        if val is None:
-            return '<td class="sh-cell-nil">—</td>'
-        v_str = f"{val:.2f}%"
-        marker = ""
-        if is_first_app:
-            marker = '<span class="sh-entry-dot">●</span>'
-        elif is_last_app:
-            marker = '<span class="sh-exit-dot">○</span>'
-        if prev_val is None:
-            cls = "sh-cell-flat"
-        elif val > prev_val + 0.04:
-            cls = "sh-cell-up"
-        elif val < prev_val - 0.04:
-            cls = "sh-cell-dn"
-        else:
-            cls = "sh-cell-flat"
-        return f'<td class="{cls}">{v_str}{marker}</td>'
-
-    def _total_row(label, vals_list, bg):
-        cells, prev = "", None
-        for val in vals_list:
-            if val is None:
-                cells += f'<td class="sh-cell-nil" style="font-weight:700;">—</td>'
-            else:
-                if prev is None:
-                    cls = "sh-cell-flat"
-                elif val > prev + 0.04:
-                    cls = "sh-cell-up"
-                elif val < prev - 0.04:
-                    cls = "sh-cell-dn"
-                else:
-                    cls = "sh-cell-flat"
-                cells += f'<td class="{cls}" style="font-weight:700;background:{bg};">{val:.2f}%</td>'
-                prev = val
-        fv, lv = sh_first(vals_list), sh_latest(vals_list)
-        non_none_vals = [v for v in vals_list if v is not None]
-        if len(non_none_vals) >= 2:
-            d = non_none_vals[-1] - non_none_vals[-2]
-            if d > 0.04:
-                trend = f'<span class="sh-cell-up">▲ {abs(d):.2f}%</span>'
-            elif d < -0.04:
-                trend = f'<span class="sh-cell-dn">▼ {abs(d):.2f}%</span>'
-            else:
-                trend = '<span class="sh-cell-flat">→ flat</span>'
-        else:
-            trend = "—"
-        return (
-            f'<tr style="background:{bg};">'
-            f'<td class="sh-td-name" style="font-weight:700;color:#0a2540;">{label}</td>'
-            f'<td></td>{cells}'
-            f'<td style="font-size:10.5px;text-align:center;">{trend}</td>'
-            f'</tr>'
-        )
-
-    TOTAL_BG = {
-        "Promoter": "#d1fae5",
-        "FII":      "#e0f2fe",
-        "DII":      "#ffedd5",
-        "Public":   "#f1f5f9",
-    }
-
-    def _group_hdr(label, n_cols):
-        empty_cells = ''.join(['<td></td>'] * (n_cols - 1))
-        return (
-            f'<tr style="background:#f1f5f9;">'
-            f'<td colspan="1" style="font-size:10px;font-weight:700;text-transform:uppercase;'
-            f'color:#64748b;letter-spacing:0.06em;padding:5px 10px;">{label}</td>'
-            f'{empty_cells}'
-            f'</tr>'
-        )
-
-    def _entity_rows(cat, rows_list, n_q):
-        rows_list_sorted = sorted(
-            rows_list,
-            key=lambda r: (sh_latest(r['pct']) or 0),
-            reverse=True,
-        )
-        html = ""
-        for ent in rows_list_sorted:
-            pct_vals = ent['pct']
-            n = len(pct_vals)
-            first_app_i = next((i for i, v in enumerate(pct_vals) if v is not None), None)
-            last_app_i = next((i for i, v in enumerate(reversed(pct_vals)) if v is not None), None)
-            if last_app_i is not None:
-                last_app_i = n - 1 - last_app_i
-            is_exited = (last_app_i is not None and last_app_i < n - 1)
-
-            cells = ""
-            for qi in range(n_q):
-                val = pct_vals[qi] if qi < n else None
-                prev_val = pct_vals[qi - 1] if qi > 0 and (qi - 1) < n else None
-                is_first = (qi == first_app_i)
-                is_last_exit = (qi == last_app_i and is_exited)
-                cells += _cell_html(val, prev_val, is_first, is_last_exit)
-
-            # Trend: QoQ change between last two non-None data points
-            fv, lv = sh_first(pct_vals), sh_latest(pct_vals)
-            non_none_vals = [v for v in pct_vals if v is not None]
-            if len(non_none_vals) >= 2:
-                d = non_none_vals[-1] - non_none_vals[-2]
-                suffix = " → exited" if is_exited else ""
-                if d > 0.04:
-                    trend = f'<span class="sh-cell-up">▲ {abs(d):.2f}%{suffix}</span>'
-                elif d < -0.04:
-                    trend = f'<span class="sh-cell-dn">▼ {abs(d):.2f}%{suffix}</span>'
-                else:
-                    trend = f'<span class="sh-cell-flat">→ {"exited" if is_exited else "flat"}</span>'
-            elif is_exited:
-                trend = '<span class="sh-cell-flat">→ exited</span>'
-            else:
-                trend = "—"
-
-            badge_bg = ENTITY_CATEGORY_COLORS.get(cat, '#94a3b8')
-            badge_fg = ENTITY_BADGE_TEXT_COLORS.get(cat, 'white')
-            badge = f'<span class="sh-cat-badge" style="background:{badge_bg};color:{badge_fg};">{cat}</span>'
-
-            html += (
-                f'<tr>'
-                f'<td class="sh-td-name">{ent["name"]}</td>'
-                f'<td style="padding:6px 10px;text-align:center;">{badge}</td>'
-                f'{cells}'
-                f'<td style="font-size:10.5px;text-align:center;">{trend}</td>'
-                f'</tr>'
-            )
-        return html
+    available_sh = [n for n in DISPLAY_NAMES if n in SHAREHOLDING]
 
-    DII_CATS = ["DII – MF", "DII – Insurance", "DII – Pension", "DII – Other"]
+    # Tables are built once per (NBFC, view) and data version, then served from cache
+    @VIEWS.view('sh_html', constants('shareholding', 'SHAREHOLDING', 'SH_QUARTERS', 'CATEGORY_COLORS',
+                                     'ENTITY_CATEGORY_COLORS', 'ENTITY_BADGE_TEXT_COLORS'))
+    def sh_html(nbfc, mode):
+        """'snapshot' (all NBFCs, nbfc=None) · 'summary' (4 category cards) · 'holders' (≥1% table)."""
+        sh = VIEWS.snapshot()['shareholding']
+        if mode == 'snapshot':
+            return nbfc_shareholding.snapshot_table(sh['SHAREHOLDING'], sh['SH_QUARTERS'], available_sh, COLORS)
+        if mode == 'summary':
+            return nbfc_shareholding.summary_cards(sh['SHAREHOLDING'][nbfc], sh['SH_QUARTERS'], sh['CATEGORY_COLORS'])
+        return nbfc_shareholding.holders_table(sh['SHAREHOLDING'][nbfc], sh_entity_records().get(nbfc, ()),
+                                               sh['SH_QUARTERS'], sh['ENTITY_CATEGORY_COLORS'],
+                                               sh['ENTITY_BADGE_TEXT_COLORS'])
 
     # ── Section 1 — Q4FY26 Cross-NBFC Snapshot ───────────────────────────────
     st.markdown("""
@@ -3004,74 +2635,7 @@ with tab10:
     </div>
     """, unsafe_allow_html=True)
 
-    available_sh = [n for n in DISPLAY_NAMES if n in SHAREHOLDING]
-    Q3_IDX = len(SH_QUARTERS) - 1
-
-    snapshot_rows = []
-    for name in available_sh:
-        sh_data = SHAREHOLDING[name]
-        cat_pct = sh_data.get('category_pct', {})
-        row = {'name': name}
-        for cat in ['Promoter', 'FII', 'DII', 'Public']:
-            vals = cat_pct.get(cat, [None] * len(SH_QUARTERS))
-            row[cat] = vals[Q3_IDX] if Q3_IDX < len(vals) else None
-        snapshot_rows.append(row)
-
-    snapshot_rows.sort(key=lambda r: (r['Promoter'] or 0), reverse=True)
-
-    # Per-column min/max for shading
-    col_stats = {}
-    for cat in ['Promoter', 'FII', 'DII', 'Public']:
-        vals = [r[cat] for r in snapshot_rows if r[cat] is not None]
-        if vals:
-            col_stats[cat] = (min(vals), max(vals))
-        else:
-            col_stats[cat] = (0, 1)
-
-    cat_header_colors = {
-        'Promoter': '#059669',
-        'FII': '#0284c7',
-        'DII': '#ea580c',
-        'Public': '#64748b',
-    }
-
-    snap_html = '<table style="border-collapse:collapse;width:100%;font-size:12px;">'
-    snap_html += '<thead><tr>'
-    snap_html += '<th style="background:#0a2540;color:white;padding:8px 12px;text-align:left;font-size:11px;">NBFC</th>'
-    for cat in ['Promoter', 'FII', 'DII', 'Public']:
-        hc = cat_header_colors[cat]
-        snap_html += f'<th style="background:{hc};color:white;padding:8px 12px;text-align:right;font-size:11px;">{cat}</th>'
-    snap_html += '</tr></thead><tbody>'
-
-    for row in snapshot_rows:
-        nbfc_color = COLORS.get(row['name'], '#0284c7')
-        name_cell = (
-            f'<td style="padding:8px 12px;font-weight:600;color:#0a2540;">'
-            f'<span style="display:inline-block;width:8px;height:8px;border-radius:50%;'
-            f'background:{nbfc_color};margin-right:6px;"></span>'
-            f'{row["name"]}</td>'
-        )
-        snap_html += f'<tr>{name_cell}'
-        for cat in ['Promoter', 'FII', 'DII', 'Public']:
-            v = row[cat]
-            mn, mx = col_stats[cat]
-            if v is not None and mx > mn:
-                intensity = (v - mn) / (mx - mn)
-            else:
-                intensity = 0
-            hc = cat_header_colors[cat]
-            # Parse r,g,b from hex
-            hx = hc.lstrip('#')
-            r0, g0, b0 = int(hx[0:2], 16), int(hx[2:4], 16), int(hx[4:6], 16)
-            bg_alpha = 0.07 + intensity * 0.23
-            fw = '700' if intensity > 0.65 else '400'
-            cell_bg = f'rgba({r0},{g0},{b0},{bg_alpha:.2f})'
-            v_str = f"{v:.2f}%" if v is not None else "—"
-            snap_html += f'<td style="padding:8px 12px;text-align:right;background:{cell_bg};font-weight:{fw};font-family:JetBrains Mono,monospace;font-size:11.5px;">{v_str}</td>'
-        snap_html += '</tr>'
-
-    snap_html += '</tbody></table>'
-    st.markdown(snap_html, unsafe_allow_html=True)
+    st.markdown(sh_html(None, 'snapshot'), unsafe_allow_html=True)
 
     st.markdown('<div style="height:12px;"></div>', unsafe_allow_html=True)
 
@@ -3082,125 +2646,47 @@ with tab10:
     </div>
     """, unsafe_allow_html=True)
 
-    sh_sel = st.radio(
-        "NBFC",
-        available_sh,
-        horizontal=True,
-        key="sh_nbfc_sel",
-        label_visibility="collapsed",
-    )
+    @fragment
+    def shareholding_section():
+        """NBFC picker, summary cards and the ≥1% shareholders table."""
+        sh_sel = st.radio(
+            "NBFC",
+            available_sh,
+            horizontal=True,
+            key="sh_nbfc_sel",
+            label_visibility="collapsed",
+        )
 
-    if sh_sel and sh_sel in SHAREHOLDING:
-        sh_data = SHAREHOLDING[sh_sel]
-        cat_pct = sh_data.get('category_pct', {})
-        named_ents = sh_data.get('named_entities', [])
-
-        # ── Section 3 — Summary Cards ──────────────────────────────────────────
-        sum_cols = st.columns(4)
-        for ci, cat in enumerate(['Promoter', 'FII', 'DII', 'Public']):
-            vals = cat_pct.get(cat, [None] * len(SH_QUARTERS))
-            lv = sh_latest(vals)
-            _, delta_html = sh_delta_str(vals)
-            cat_color = CATEGORY_COLORS.get(cat, '#94a3b8')
-            lv_str = f"{lv:.2f}%" if lv is not None else "—"
-            with sum_cols[ci]:
-                st.markdown(f"""
-                <div class="sh-summary-card" style="border-top-color:{cat_color};">
-                  <div class="sh-summary-label">{cat}</div>
-                  <div class="sh-summary-num">{lv_str}</div>
-                  <div class="sh-summary-delta">{delta_html}</div>
-                </div>
-                """, unsafe_allow_html=True)
+        if sh_sel and sh_sel in SHAREHOLDING:
+            # ── Section 3 — Summary Cards ──────────────────────────────────────────
+            sum_cols = st.columns(4)
+            for col, card_html in zip(sum_cols, sh_html(sh_sel, 'summary')):
+                with col:
+                    st.markdown(card_html, unsafe_allow_html=True)
 
-        st.markdown('<div style="height:12px;"></div>', unsafe_allow_html=True)
+            st.markdown('<div style="height:12px;"></div>', unsafe_allow_html=True)
 
-        # ── Section 4 — ≥1% Shareholders Table ────────────────────────────────
-        n_q = len(SH_QUARTERS)
-        st.markdown(f"""
-        <div class="section-label">≥1% Shareholders
-          <span class="section-label-sub" style="margin-left:8px;">
-            {sh_sel} · Q4FY24 – Q4FY26 · green = building · red = reducing ·
-            ● = new entry · ○ = exited · shaded rows = category totals
-          </span>
-        </div>
-        """, unsafe_allow_html=True)
+            # ── Section 4 — ≥1% Shareholders Table ────────────────────────────────
+            st.markdown(f"""
+            <div class="section-label">≥1% Shareholders
+              <span class="section-label-sub" style="margin-left:8px;">
+                {sh_sel} · Q4FY24 – Q4FY26 · green = building · red = reducing ·
+                ● = new entry · ○ = exited · shaded rows = category totals
+              </span>
+            </div>
+            """, unsafe_allow_html=True)
 
-        # Build full-width table
-        n_total_cols = 2 + n_q + 1  # name + category + quarters + trend
-
-        header_html = '<thead><tr>'
-        header_html += '<th style="background:#0a2540;color:white;padding:7px 10px;text-align:left;font-size:10.5px;min-width:180px;">Shareholder</th>'
-        header_html += '<th style="background:#0a2540;color:white;padding:7px 10px;text-align:center;font-size:10.5px;">Category</th>'
-        for q in SH_QUARTERS:
-            header_html += f'<th style="background:#0a2540;color:white;padding:7px 10px;text-align:center;font-size:10.5px;">{q}</th>'
-        header_html += '<th style="background:#0a2540;color:white;padding:7px 10px;text-align:center;font-size:10.5px;">Trend</th>'
-        header_html += '</tr></thead>'
-
-        # Group entities
-        prom_ents = [e for e in named_ents if e.get('category') == 'Promoter']
-        fii_ents  = [e for e in named_ents if e.get('category') == 'FII']
-        dii_mf_ents  = [e for e in named_ents if e.get('category') == 'DII – MF']
-        dii_ins_ents = [e for e in named_ents if e.get('category') == 'DII – Insurance']
-        dii_pen_ents = [e for e in named_ents if e.get('category') == 'DII – Pension']
-        dii_oth_ents = [e for e in named_ents if e.get('category') == 'DII – Other']
-        pub_ents  = [e for e in named_ents if e.get('category') == 'Public']
-
-        body_html = '<tbody>'
-
-        def _group_hdr_full(label):
-            return (
-                f'<tr style="background:#f1f5f9;">'
-                f'<td style="font-size:10px;font-weight:700;text-transform:uppercase;color:#64748b;'
-                f'letter-spacing:0.06em;padding:5px 10px;" colspan="{n_total_cols}">{label}</td>'
-                f'</tr>'
-            )
+            st.markdown(sh_html(sh_sel, 'holders'), unsafe_allow_html=True)
 
-        # Promoter section
-        if prom_ents:
-            body_html += _group_hdr_full("Promoter")
-            body_html += _entity_rows("Promoter", prom_ents, n_q)
-        prom_totals = cat_pct.get('Promoter', [None] * n_q)
-        body_html += _total_row("Promoter Total", prom_totals, TOTAL_BG["Promoter"])
-
-        # FII section
-        if fii_ents:
-            body_html += _group_hdr_full("FII / FPI")
-            body_html += _entity_rows("FII", fii_ents, n_q)
-        fii_totals = cat_pct.get('FII', [None] * n_q)
-        body_html += _total_row("FII Total", fii_totals, TOTAL_BG["FII"])
-
-        # DII sub-categories
-        for dii_cat_label, dii_ents_list in [
-            ("DII – MF", dii_mf_ents),
-            ("DII – Insurance", dii_ins_ents),
-            ("DII – Pension", dii_pen_ents),
-            ("DII – Other", dii_oth_ents),
-        ]:
-            if dii_ents_list:
-                body_html += _group_hdr_full(dii_cat_label)
-                body_html += _entity_rows(dii_cat_label, dii_ents_list, n_q)
-        dii_totals = cat_pct.get('DII', [None] * n_q)
-        body_html += _total_row("DII Total", dii_totals, TOTAL_BG["DII"])
-
-        # Public section
-        if pub_ents:
-            body_html += _group_hdr_full("Public")
-            body_html += _entity_rows("Public", pub_ents, n_q)
-        pub_totals = cat_pct.get('Public', [None] * n_q)
-        body_html += _total_row("Public Total", pub_totals, TOTAL_BG["Public"])
-
-        body_html += '</tbody>'
-
-        table_html = f'<table class="sh-table">{header_html}{body_html}</table>'
-        st.markdown(table_html, unsafe_allow_html=True)
+            st.markdown("""
+            <div class="metric-note">
+              ● = new entry this window · ○ = position exited after this quarter ·
+              Cell colour = direction vs prior quarter ·
+              Shaded total rows include all holders (named + sub-1%)
+            </div>
+            """, unsafe_allow_html=True)
 
-        st.markdown("""
-        <div class="metric-note">
-          ● = new entry this window · ○ = position exited after this quarter ·
-          Cell colour = direction vs prior quarter ·
-          Shaded total rows include all holders (named + sub-1%)
-        </div>
-        """, unsafe_allow_html=True)
+    shareholding_section()
 
 
 # ── TAB 11 — ANNUAL TRENDS ─────────────────────────────────────────────────────
@@ -3212,34 +2698,39 @@ with tab11:
     </div>
     """, unsafe_allow_html=True)
 
-    sel11 = nbfc_selector('ann', default_on=['Bajaj Finance', 'Shriram Finance', 'L&T Finance'])
-    st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+    @fragment
+    def annual_section():
+        """NBFC selector and the full-year trend charts."""
+        sel11 = nbfc_selector('ann', default_on=['Bajaj Finance', 'Shriram Finance', 'L&T Finance'])
+        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
 
-    st.markdown('<div class="section-label">Scale</div>', unsafe_allow_html=True)
+        st.markdown('<div class="section-label">Scale</div>', unsafe_allow_html=True)
 
-    ann_aum = make_annual_chart('aum_cr', sel11, 'Assets Under Management (AUM)', '₹ Crore', fmt='cr', height=400)
-    st.plotly_chart(ann_aum, use_container_width=True, key="ann_aum")
+        ann_aum = make_annual_chart('aum_cr', sel11, 'Assets Under Management (AUM)', '₹ Crore', fmt='cr', height=400)
+        st.plotly_chart(ann_aum, use_container_width=True, key="ann_aum")
 
-    ann_pat = make_annual_chart('pat_cr', sel11, 'Profit After Tax (PAT)', '₹ Crore', fmt='cr', height=400)
-    st.plotly_chart(ann_pat, use_container_width=True, key="ann_pat")
+        ann_pat = make_annual_chart('pat_cr', sel11, 'Profit After Tax (PAT)', '₹ Crore', fmt='cr', height=400)
+        st.plotly_chart(ann_pat, use_container_width=True, key="ann_pat")
 
-    st.markdown('<div class="section-label">Returns</div>', unsafe_allow_html=True)
+        st.markdown('<div class="section-label">Returns</div>', unsafe_allow_html=True)
 
-    col_ann_a, col_ann_b = st.columns(2)
-    with col_ann_a:
-        ann_roa = make_annual_chart('roa_pct', sel11, 'Return on Assets (ROA)', 'ROA (%)', height=380)
-        st.plotly_chart(ann_roa, use_container_width=True, key="ann_roa")
-    with col_ann_b:
-        ann_roe = make_annual_chart('roe_pct', sel11, 'Return on Equity (ROE)', 'ROE (%)', height=380)
-        st.plotly_chart(ann_roe, use_container_width=True, key="ann_roe")
+        col_ann_a, col_ann_b = st.columns(2)
+        with col_ann_a:
+            ann_roa = make_annual_chart('roa_pct', sel11, 'Return on Assets (ROA)', 'ROA (%)', height=380)
+            st.plotly_chart(ann_roa, use_container_width=True, key="ann_roa")
+        with col_ann_b:
+            ann_roe = make_annual_chart('roe_pct', sel11, 'Return on Equity (ROE)', 'ROE (%)', height=380)
+            st.plotly_chart(ann_roe, use_container_width=True, key="ann_roe")
 
-    st.markdown("""
-    <div class="metric-note">
-      Full-year data (April–March). FY26 = FY2025-26.
-      Poonawalla FY25 PAT/ROA/ROE reflect one-time ₹666 Cr provision impact.
-      NBFCs without full-year data yet are hidden from charts — data will be added as received.
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("""
+        <div class="metric-note">
+          Full-year data (April–March). FY26 = FY2025-26.
+          Poonawalla FY25 PAT/ROA/ROE reflect one-time ₹666 Cr provision impact.
+          NBFCs without full-year data yet are hidden from charts — data will be added as received.
+        </div>
+        """, unsafe_allow_html=True)
+
+    annual_section()
 
 
 # ── TAB 12 — NBFC LENS ─────────────────────────────────────────────────────────
@@ -3254,175 +2745,257 @@ with tab12:
     </div>
     """, unsafe_allow_html=True)
 
-    lens_name = st.selectbox(
-        'Select NBFC',
-        DISPLAY_NAMES,
-        index=0,
-        key='lens_nbfc',
-        label_visibility='collapsed',
-    )
+    @fragment
+    def lens_section():
+        """NBFC picker and everything drawn for it: benchmark, radar, SWOT, commentary, movers."""
+        lens_name = st.selectbox(
+            'Select NBFC',
+            DISPLAY_NAMES,
+            index=0,
+            key='lens_nbfc',
+            label_visibility='collapsed',
+        )
 
-    seg_lbl_lens, roa_lo_lens, roa_hi_lens, seg_note_lens = SEGMENT_META[lens_name]
-    lens_color = COLORS[lens_name]
-    lens_td = TRANSCRIPT_DATA.get(lens_name, {})
-
-    st.markdown(f"""
-    <div style="display:flex;align-items:center;gap:12px;margin:10px 0 16px;">
-      <span style="width:14px;height:14px;border-radius:50%;background:{lens_color};display:inline-block;"></span>
-      <span style="font-size:17px;font-weight:700;color:#0a2540;">{lens_name}</span>
-      <span class="pulse-seg">{seg_lbl_lens}</span>
-      {"<span style='font-size:11px;color:#64748b;background:#f8fafc;padding:3px 10px;border-radius:4px;'>"+seg_note_lens+"</span>" if seg_note_lens else ""}
-      {"<span style='font-size:10px;color:#94a3b8;margin-left:8px;'>Q4FY26 earnings call: "+lens_td.get('call_date','')+"</span>" if lens_td.get('call_date') else ""}
-    </div>
-    """, unsafe_allow_html=True)
+        seg_lbl_lens, roa_lo_lens, roa_hi_lens, seg_note_lens = SEGMENT_META[lens_name]
+        lens_color = COLORS[lens_name]
+        lens_td = TRANSCRIPT_DATA.get(lens_name, {})
 
-    # ── 3-column layout: benchmark | radar+guidance | SWOT ─────────────────────
-    left_col, mid_col, right_col = st.columns([5, 4, 5])
+        st.markdown(f"""
+        <div style="display:flex;align-items:center;gap:12px;margin:10px 0 16px;">
+          <span style="width:14px;height:14px;border-radius:50%;background:{lens_color};display:inline-block;"></span>
+          <span style="font-size:17px;font-weight:700;color:#0a2540;">{lens_name}</span>
+          <span class="pulse-seg">{seg_lbl_lens}</span>
+          {"<span style='font-size:11px;color:#64748b;background:#f8fafc;padding:3px 10px;border-radius:4px;'>"+seg_note_lens+"</span>" if seg_note_lens else ""}
+          {"<span style='font-size:10px;color:#94a3b8;margin-left:8px;'>Q4FY26 earnings call: "+lens_td.get('call_date','')+"</span>" if lens_td.get('call_date') else ""}
+        </div>
+        """, unsafe_allow_html=True)
 
-    with left_col:
-        st.markdown('<div style="font-size:12px;font-weight:700;color:#0a2540;margin-bottom:8px;">Metric Benchmark vs Poonawalla</div>', unsafe_allow_html=True)
-        bm_html = _benchmark_table_html(lens_name)
-        st.markdown(bm_html, unsafe_allow_html=True)
-        if lens_name != POON_KEY:
+        # ── Search: commentary, guidance and SWOT across all NBFCs ─────────────────
+        lens_query = st.text_input(
+            "Search commentary",
+            placeholder="🔎  Search call commentary, FY27 guidance and SWOT across NBFCs — e.g. credit cost, gold, co-lending",
+            key="lens_search",
+            label_visibility="collapsed",
+        ).strip()
+        if lens_query:
+            LENS_KIND_LABELS = {'commentary': 'Commentary', 'guidance': 'Guidance', 'swot': 'SWOT'}
+            lens_hits = search_index().search(lens_query, limit=12, kinds=tuple(LENS_KIND_LABELS))
+            if lens_hits:
+                rows = ''.join(f"""
+                <div style="display:flex;gap:10px;align-items:baseline;padding:6px 0;border-bottom:1px solid #f1f5f9;">
+                  <span style="min-width:150px;font-size:11px;font-weight:600;color:#0a2540;">
+                    <span style="display:inline-block;width:8px;height:8px;border-radius:50%;background:{COLORS.get(h.doc.nbfc, '#0284c7')};margin-right:5px;"></span>{h.doc.nbfc}
+                  </span>
+                  <span style="min-width:130px;font-size:10px;color:#64748b;text-transform:uppercase;letter-spacing:0.04em;">
+                    {LENS_KIND_LABELS[h.doc.kind]} · {h.doc.label}
+                  </span>
+                  <span style="font-size:12px;color:#0a2540;line-height:1.6;">{nbfc_search.highlight(h.doc.text, lens_query)}</span>
+                </div>""" for h in lens_hits)
+                st.markdown(f'<div style="margin:4px 0 14px;">{rows}</div>', unsafe_allow_html=True)
+            else:
+                st.markdown(f'<div class="metric-note">No commentary, guidance or SWOT items match “{html.escape(lens_query)}”.</div>',
+                            unsafe_allow_html=True)
+
+        # ── 3-column layout: benchmark | radar+guidance | SWOT ─────────────────────
+        left_col, mid_col, right_col = st.columns([5, 4, 5])
+
+        with left_col:
+            st.markdown('<div style="font-size:12px;font-weight:700;color:#0a2540;margin-bottom:8px;">Metric Benchmark vs Poonawalla</div>', unsafe_allow_html=True)
+            bm_html = lens_insights()[lens_name]['benchmark']
+            st.markdown(bm_html, unsafe_allow_html=True)
+            if lens_name != POON_KEY:
+                st.markdown("""
+                <div style="font-size:10px;color:#94a3b8;margin-top:6px;">
+                  ✓ ahead = better than Poonawalla · ✗ behind = trails Poonawalla ·
+                  ⚠seg = segment structural difference · QoQ = Q4FY26 vs Q3FY26
+                </div>""", unsafe_allow_html=True)
+
+        with mid_col:
+            RADAR_METHOD_LABELS = {'Min-max': 'minmax', 'Z-score': 'zscore', 'Percentile': 'percentile'}
+            radar_norm = st.radio(
+                "Normalisation",
+                list(RADAR_METHOD_LABELS),
+                horizontal=True,
+                key='lens_radar_norm',
+                label_visibility='collapsed',
+            )
+            radar_overlay = st.multiselect(
+                "Overlay peers",
+                [n for n in DISPLAY_NAMES if n not in (POON_KEY, lens_name)],
+                key='lens_radar_overlay',
+                placeholder='Overlay peers…',
+                label_visibility='collapsed',
+            )
+            radar_fig = make_radar_chart(lens_name, radar_overlay, RADAR_METHOD_LABELS[radar_norm])
+            st.plotly_chart(radar_fig, use_container_width=True, key='lens_radar')
             st.markdown("""
-            <div style="font-size:10px;color:#94a3b8;margin-top:6px;">
-              ✓ ahead = better than Poonawalla · ✗ behind = trails Poonawalla ·
-              ⚠seg = segment structural difference · QoQ = Q4FY26 vs Q3FY26
+            <div style="font-size:10px;color:#94a3b8;text-align:center;margin-top:-8px;">
+              Scores normalised within peer group (0=worst · 1=best).
+              Lower-is-better metrics (GNPA, NNPA, CoB) inverted so outward = better.
             </div>""", unsafe_allow_html=True)
 
-    with mid_col:
-        radar_fig = make_radar_chart(lens_name)
-        st.plotly_chart(radar_fig, use_container_width=True, key='lens_radar')
-        st.markdown("""
-        <div style="font-size:10px;color:#94a3b8;text-align:center;margin-top:-8px;">
-          Scores normalised within peer group (0=worst · 1=best).
-          Lower-is-better metrics (GNPA, NNPA, CoB) inverted so outward = better.
-        </div>""", unsafe_allow_html=True)
-
-        # FY27 Guidance callout
-        if lens_td.get('guidance'):
-            guidance_items = ''.join(f'<li style="margin-bottom:3px;">{g}</li>' for g in lens_td['guidance'])
-            st.markdown(f"""
-            <div style="background:#f0fdf4;border-left:3px solid #16a34a;padding:10px 14px;
-                        border-radius:0 6px 6px 0;margin-top:14px;">
-              <div style="font-size:11px;font-weight:700;color:#16a34a;margin-bottom:6px;
-                          letter-spacing:0.03em;">FY27 MANAGEMENT GUIDANCE</div>
-              <ul style="margin:0;padding-left:16px;color:#0a2540;font-size:11px;line-height:1.75;">
-                {guidance_items}
-              </ul>
-              <div style="font-size:9px;color:#94a3b8;margin-top:6px;">
-                Source: {lens_td.get('call_date','Q4FY26 earnings call')}
-              </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-    with right_col:
-        sw_col, wk_col = st.columns(2)
-        S, W, O, T = generate_swot(lens_name)
-
-        def _swot_box(cls, title, icon, items):
-            bullets = ''.join(f'<div class="swot-item">{icon} {it}</div>' for it in items)
-            return f'<div class="swot-box {cls}"><div class="swot-hdr">{title}</div>{bullets}</div>'
-
-        sw_col.markdown(_swot_box('swot-s', 'Strengths',    '✓', S), unsafe_allow_html=True)
-        wk_col.markdown(_swot_box('swot-w', 'Weaknesses',   '✗', W), unsafe_allow_html=True)
-
-        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
-        ot_col_a, ot_col_b = st.columns(2)
-        ot_col_a.markdown(_swot_box('swot-o', 'Opportunities', '→', O), unsafe_allow_html=True)
-        ot_col_b.markdown(_swot_box('swot-t', 'Threats',       '⚠', T), unsafe_allow_html=True)
-
-    # ── Management Commentary (per-metric transcript quotes) ───────────────────
-    COMMENTARY_METRICS = [
-        ('aum_cr',               'AUM / Growth'),
-        ('roa_pct',              'ROA / Profitability'),
-        ('gnpa_pct',             'GNPA / Asset Quality'),
-        ('nim_pct',              'NIM / Margins'),
-        ('cost_of_borrowing_pct','Cost of Borrowing'),
-        ('car_pct',              'Capital Adequacy'),
-        ('pat_cr',               'PAT / Earnings'),
-    ]
-    mc = lens_td.get('metric_comments', {})
-    available = [(k, lbl) for k, lbl in COMMENTARY_METRICS if k in mc]
-
-    if available:
-        st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
-        with st.expander(
-            f'💬  Management Commentary by Metric — {lens_name} Q4FY26 Earnings Call',
-            expanded=False,
-        ):
-            mgmt_str = lens_td.get('management', '')
-            if mgmt_str:
-                st.markdown(
-                    f'<div style="font-size:10px;color:#64748b;margin-bottom:10px;">'
-                    f'Speakers: {mgmt_str}</div>',
-                    unsafe_allow_html=True,
-                )
-            for mk, mlbl in available:
+            # FY27 Guidance callout
+            if lens_td.get('guidance'):
+                guidance_items = ''.join(f'<li style="margin-bottom:3px;">{g}</li>' for g in lens_td['guidance'])
                 st.markdown(f"""
-                <div style="border-left:3px solid {lens_color};padding:7px 14px;margin-bottom:8px;
-                            background:#f8fafc;border-radius:0 4px 4px 0;">
-                  <span style="font-size:10px;font-weight:700;color:#64748b;
-                               text-transform:uppercase;letter-spacing:0.04em;">{mlbl}</span><br>
-                  <span style="font-size:12px;color:#0a2540;line-height:1.65;">{mc[mk]}</span>
+                <div style="background:#f0fdf4;border-left:3px solid #16a34a;padding:10px 14px;
+                            border-radius:0 6px 6px 0;margin-top:14px;">
+                  <div style="font-size:11px;font-weight:700;color:#16a34a;margin-bottom:6px;
+                              letter-spacing:0.03em;">FY27 MANAGEMENT GUIDANCE</div>
+                  <ul style="margin:0;padding-left:16px;color:#0a2540;font-size:11px;line-height:1.75;">
+                    {guidance_items}
+                  </ul>
+                  <div style="font-size:9px;color:#94a3b8;margin-top:6px;">
+                    Source: {lens_td.get('call_date','Q4FY26 earnings call')}
+                  </div>
                 </div>
                 """, unsafe_allow_html=True)
 
-    # ── Peer movers (QoQ) ──────────────────────────────────────────────────────
-    st.markdown('<div style="height:8px;"></div>', unsafe_allow_html=True)
-    with st.expander("📊  Peer Context — Quarter's Biggest Movers (QoQ)", expanded=False):
-        MOVER_METRICS = [
-            ('aum_cr',   'AUM',   'cr',   False),
-            ('pat_cr',   'PAT',   'cr',   False),
-            ('roa_pct',  'ROA',   'pct',  False),
-            ('gnpa_pct', 'GNPA',  'pct',  True ),
-            ('nnpa_pct', 'NNPA',  'pct',  True ),
-            ('nim_pct',  'NIM',   'pct',  False),
+        with right_col:
+            sw_col, wk_col = st.columns(2)
+            S, W, O, T = lens_insights()[lens_name]['swot']
+
+            def _swot_box(cls, title, icon, items):
+                bullets = ''.join(f'<div class="swot-item">{icon} {it}</div>' for it in items)
+                return f'<div class="swot-box {cls}"><div class="swot-hdr">{title}</div>{bullets}</div>'
+
+            sw_col.markdown(_swot_box('swot-s', 'Strengths',    '✓', S), unsafe_allow_html=True)
+            wk_col.markdown(_swot_box('swot-w', 'Weaknesses',   '✗', W), unsafe_allow_html=True)
+
+            st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+            ot_col_a, ot_col_b = st.columns(2)
+            ot_col_a.markdown(_swot_box('swot-o', 'Opportunities', '→', O), unsafe_allow_html=True)
+            ot_col_b.markdown(_swot_box('swot-t', 'Threats',       '⚠', T), unsafe_allow_html=True)
+
+        # ── Management Commentary (per-metric transcript quotes) ───────────────────
+        COMMENTARY_METRICS = [
+            ('aum_cr',               'AUM / Growth'),
+            ('roa_pct',              'ROA / Profitability'),
+            ('gnpa_pct',             'GNPA / Asset Quality'),
+            ('nim_pct',              'NIM / Margins'),
+            ('cost_of_borrowing_pct','Cost of Borrowing'),
+            ('car_pct',              'Capital Adequacy'),
+            ('pat_cr',               'PAT / Earnings'),
         ]
-        mv_col_a, mv_col_b = st.columns(2)
-        with mv_col_a:
-            st.markdown('<div style="font-size:12px;font-weight:700;color:#16a34a;margin-bottom:6px;">▲ Top Improvers</div>', unsafe_allow_html=True)
-            improvers = []
-            for key, lbl, fmt, lib in MOVER_METRICS:
-                for name in DISPLAY_NAMES:
-                    d = _qoq_diff(name, key)
-                    if d is None: continue
-                    improved = d < 0 if lib else d > 0
-                    if improved:
-                        if fmt == 'cr':
-                            ds = f'+₹{abs(d)/1000:.1f}k Cr' if abs(d) >= 1000 else f'+₹{abs(int(d))} Cr'
-                        else:
-                            ds = f'{abs(d*100):.0f} bps better'
-                        improvers.append((abs(d) if fmt != 'cr' else abs(d) / 1000000, name, lbl, ds))
-            improvers.sort(reverse=True)
-            rows = '<table class="rank-table"><tr><th>NBFC</th><th>Metric</th><th>Change</th></tr>'
-            for _, name, lbl, ds in improvers[:6]:
-                dot = f'<span style="display:inline-block;width:8px;height:8px;border-radius:50%;background:{COLORS[name]};margin-right:5px;"></span>'
-                rows += f'<tr><td>{dot}{name}</td><td>{lbl}</td><td style="color:#16a34a;font-weight:700;">{ds}</td></tr>'
-            rows += '</table>'
-            st.markdown(rows, unsafe_allow_html=True)
-
-        with mv_col_b:
-            st.markdown('<div style="font-size:12px;font-weight:700;color:#dc2626;margin-bottom:6px;">▼ Biggest Deteriorators</div>', unsafe_allow_html=True)
-            deters = []
-            for key, lbl, fmt, lib in MOVER_METRICS:
-                for name in DISPLAY_NAMES:
-                    d = _qoq_diff(name, key)
-                    if d is None: continue
-                    worsened = d > 0 if lib else d < 0
-                    if worsened:
-                        if fmt == 'cr':
-                            ds = f'-₹{abs(d)/1000:.1f}k Cr' if abs(d) >= 1000 else f'-₹{abs(int(d))} Cr'
-                        else:
-                            ds = f'{abs(d*100):.0f} bps worse'
-                        deters.append((abs(d) if fmt != 'cr' else abs(d) / 1000000, name, lbl, ds))
-            deters.sort(reverse=True)
-            rows = '<table class="rank-table"><tr><th>NBFC</th><th>Metric</th><th>Change</th></tr>'
-            for _, name, lbl, ds in deters[:6]:
-                dot = f'<span style="display:inline-block;width:8px;height:8px;border-radius:50%;background:{COLORS[name]};margin-right:5px;"></span>'
-                rows += f'<tr><td>{dot}{name}</td><td>{lbl}</td><td style="color:#dc2626;font-weight:700;">{ds}</td></tr>'
-            rows += '</table>'
-            st.markdown(rows, unsafe_allow_html=True)
+        mc = lens_td.get('metric_comments', {})
+        available = [(k, lbl) for k, lbl in COMMENTARY_METRICS if k in mc]
+
+        if available:
+            st.markdown('<div style="height:10px;"></div>', unsafe_allow_html=True)
+            with st.expander(
+                f'💬  Management Commentary by Metric — {lens_name} Q4FY26 Earnings Call',
+                expanded=False,
+            ):
+                mgmt_str = lens_td.get('management', '')
+                if mgmt_str:
+                    st.markdown(
+                        f'<div style="font-size:10px;color:#64748b;margin-bottom:10px;">'
+                        f'Speakers: {mgmt_str}</div>',
+                        unsafe_allow_html=True,
+                    )
+                for mk, mlbl in available:
+                    st.markdown(f"""
+                    <div style="border-left:3px solid {lens_color};padding:7px 14px;margin-bottom:8px;
+                                background:#f8fafc;border-radius:0 4px 4px 0;">
+                      <span style="font-size:10px;font-weight:700;color:#64748b;
+                                   text-transform:uppercase;letter-spacing:0.04em;">{mlbl}</span><br>
+                      <span style="font-size:12px;color:#0a2540;line-height:1.65;">{mc[mk]}</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+        # ── Peer movers (QoQ) ──────────────────────────────────────────────────────
+        st.markdown('<div style="height:8px;"></div>', unsafe_allow_html=True)
+        with st.expander("📊  Peer Context — Quarter's Biggest Movers (QoQ)", expanded=False):
+            MOVER_METRICS = [
+                ('aum_cr',   'AUM',   'cr',   False),
+                ('pat_cr',   'PAT',   'cr',   False),
+                ('roa_pct',  'ROA',   'pct',  False),
+                ('gnpa_pct', 'GNPA',  'pct',  True ),
+                ('nnpa_pct', 'NNPA',  'pct',  True ),
+                ('nim_pct',  'NIM',   'pct',  False),
+            ]
+            mv_frame = insight_frame()
+            mv_col_a, mv_col_b = st.columns(2)
+            with mv_col_a:
+                st.markdown('<div style="font-size:12px;font-weight:700;color:#16a34a;margin-bottom:6px;">▲ Top Improvers</div>', unsafe_allow_html=True)
+                improvers = []
+                for key, lbl, fmt, lib in MOVER_METRICS:
+                    for name in DISPLAY_NAMES:
+                        d = mv_frame[name][key].qoq_diff
+                        if d is None: continue
+                        improved = d < 0 if lib else d > 0
+                        if improved:
+                            if fmt == 'cr':
+                                ds = f'+₹{abs(d)/1000:.1f}k Cr' if abs(d) >= 1000 else f'+₹{abs(int(d))} Cr'
+                            else:
+                                ds = f'{abs(d*100):.0f} bps better'
+                            improvers.append((abs(d) if fmt != 'cr' else abs(d) / 1000000, name, lbl, ds))
+                improvers.sort(reverse=True)
+                rows = '<table class="rank-table"><tr><th>NBFC</th><th>Metric</th><th>Change</th></tr>'
+                for _, name, lbl, ds in improvers[:6]:
+                    dot = f'<span style="display:inline-block;width:8px;height:8px;border-radius:50%;background:{COLORS[name]};margin-right:5px;"></span>'
+                    rows += f'<tr><td>{dot}{name}</td><td>{lbl}</td><td style="color:#16a34a;font-weight:700;">{ds}</td></tr>'
+                rows += '</table>'
+                st.markdown(rows, unsafe_allow_html=True)
+
+            with mv_col_b:
+                st.markdown('<div style="font-size:12px;font-weight:700;color:#dc2626;margin-bottom:6px;">▼ Biggest Deteriorators</div>', unsafe_allow_html=True)
+                deters = []
+                for key, lbl, fmt, lib in MOVER_METRICS:
+                    for name in DISPLAY_NAMES:
+                        d = mv_frame[name][key].qoq_diff
+                        if d is None: continue
+                        worsened = d > 0 if lib else d < 0
+                        if worsened:
+                            if fmt == 'cr':
+                                ds = f'-₹{abs(d)/1000:.1f}k Cr' if abs(d) >= 1000 else f'-₹{abs(int(d))} Cr'
+                            else:
+                                ds = f'{abs(d*100):.0f} bps worse'
+                            deters.append((abs(d) if fmt != 'cr' else abs(d) / 1000000, name, lbl, ds))
+                deters.sort(reverse=True)
+                rows = '<table class="rank-table"><tr><th>NBFC</th><th>Metric</th><th>Change</th></tr>'
+                for _, name, lbl, ds in deters[:6]:
+                    dot = f'<span style="display:inline-block;width:8px;height:8px;border-radius:50%;background:{COLORS[name]};margin-right:5px;"></span>'
+                    rows += f'<tr><td>{dot}{name}</td><td>{lbl}</td><td style="color:#dc2626;font-weight:700;">{ds}</td></tr>'
+                rows += '</table>'
+                st.markdown(rows, unsafe_allow_html=True)
+
+            # Peer outliers: modified z-score against the peer median, per metric
+            ps = peer_stats()
+            q = INSIGHT_BASE_Q
+
+            def _ofmt(metric, v):
+                if metric.endswith('_cr'): return _scr(v, 'cr')
+                if metric == 'd_e_ratio':  return f'{v:.2f}x'
+                if metric == 'bvps_inr':   return f'₹{v:,.0f}'
+                return f'{v:.2f}%'
+
+            flagged = sorted(((-abs(ps.robust_z[i, j, q]), i, j) for i, j in zip(*ps.outlier[..., q].nonzero())))
+            st.markdown(f"""
+            <div style="font-size:12px;font-weight:700;color:#0a2540;margin:14px 0 6px;">⚑ Peer Outliers — {Q_LABELS[q]}
+              <span style="font-size:10px;font-weight:400;color:#94a3b8;margin-left:6px;">
+                |modified z| &gt; {nbfc_analytics.OUTLIER_Z:g} vs peer median · percentile 100 = best</span>
+            </div>""", unsafe_allow_html=True)
+            if flagged:
+                rows = ('<table class="rank-table"><tr><th>NBFC</th><th>Metric</th><th>Value</th>'
+                        '<th>Peer median</th><th>Percentile</th><th>Mod. z</th></tr>')
+                for _, i, j in flagged:
+                    name, metric = ps.names[i], ps.metrics[j]
+                    lbl = METRIC_LABELS.get(metric, (metric,))[0]
+                    seg = ps.segment[i, j, q]
+                    if seg == seg:
+                        lbl += f' <span style="color:#94a3b8;font-size:10px;">({seg:.2f} of segment band)</span>'
+                    dot = f'<span style="display:inline-block;width:8px;height:8px;border-radius:50%;background:{COLORS[name]};margin-right:5px;"></span>'
+                    rows += (f'<tr><td>{dot}{name}</td><td>{lbl}</td><td>{_ofmt(metric, ps.value[i, j, q])}</td>'
+                             f'<td>{_ofmt(metric, ps.median[j, q])}</td><td>{ps.pct[i, j, q]:.0f}</td>'
+                             f'<td style="font-weight:700;">{ps.robust_z[i, j, q]:+.1f}</td></tr>')
+                rows += '</table>'
+                st.markdown(rows, unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="metric-note">No metric sits far enough from the peer median to flag.</div>',
+                            unsafe_allow_html=True)
+
+    lens_section()
 
     st.markdown("""
     <div class="metric-note">
@@ -3434,6 +3007,9 @@ with tab12:
     """, unsafe_allow_html=True)
 
 
+draw_deferred()
+
+
 # ── FOOTER ─────────────────────────────────────────────────────────────────────
 st.markdown("""
 <div style="font-size:10px;color:#94a3b8;font-family:'JetBrains Mono',monospace;
@@ -3443,3 +3019,8 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+
+# Cache statistics for maintainers only: open the app with ?debug=1
+if st.query_params.get('debug') == '1':
+    with st.expander(f"Data v{DATA.version} · view cache", expanded=False):
+        st.code(VIEWS.report(), language=None)
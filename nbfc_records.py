@@ -0,0 +1,160 @@
+"""
+Record types for the list-of-dict datasets
+AI initiatives (NBFC_AI_INITIATIVES) and named shareholders
+(SHAREHOLDING[...]['named_entities']) as immutable slotted records, built
+once per data version. Categorical fields (NBFC, function tag, category,
+source) are interned, so every record shares one copy of each string and
+comparisons against them short-circuit on identity. AIIndex answers the AI
+Bulletin's filter + sort queries from prebuilt bitmaps and orderings.
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime, date
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _parse_date(d):
+    """'DD Mon YYYY' → date; unparseable dates sort first."""
+    try:
+        return datetime.strptime(d.strip(), '%d %b %Y').date()
+    except (AttributeError, ValueError):
+        return _EPOCH
+
+
+@dataclass(frozen=True, slots=True)
+class AIInitiative:
+    nbfc:        str
+    title:       str
+    description: str
+    impact:      str
+    functions:   tuple
+    source_name: str
+    source_url:  str
+    date:        str     # as published, e.g. '12 Feb 2026'
+    day:         date    # parsed once, for sorting
+
+
+@dataclass(frozen=True, slots=True)
+class ShareholderEntity:
+    nbfc:     str
+    name:     str
+    category: str
+    pct:      tuple      # % of capital per SH_QUARTERS period (None = not a ≥1% holder)
+
+
+def ai_records(initiatives):
+    """{nbfc: (AIInitiative, …)} from NBFC_AI_INITIATIVES, in source order."""
+    intern = sys.intern
+    return {
+        nbfc: tuple(
+            AIInitiative(
+                nbfc=intern(nbfc),
+                title=d.get('title', ''),
+                description=d.get('description', ''),
+                impact=d.get('impact', ''),
+                functions=tuple(intern(f) for f in d.get('functions', ())),
+                source_name=intern(d.get('source_name', '')),
+                source_url=d.get('source_url', ''),
+                date=d.get('date', ''),
+                day=_parse_date(d.get('date', '')),
+            )
+            for d in items)
+        for nbfc, items in initiatives.items()
+    }
+
+
+def entity_records(shareholding):
+    """{nbfc: (ShareholderEntity, …)} from SHAREHOLDING named_entities, in source order."""
+    intern = sys.intern
+    return {
+        nbfc: tuple(
+            ShareholderEntity(nbfc=intern(nbfc), name=e['name'],
+                              category=intern(e.get('category', '')), pct=tuple(e['pct']))
+            for e in data.get('named_entities', ()))
+        for nbfc, data in shareholding.items()
+    }
+
+
+# ── AI Bulletin index ─────────────────────────────────────────────────────────
+# Sort modes offered by tab9 → key over AIInitiative. Each ordering is a stable
+# sort of source order, so ties keep the order a filter-then-sort would give.
+AI_SORTS = {
+    'Newest first': (lambda r: r.day, True),
+    'Oldest first': (lambda r: r.day, False),
+    'NBFC':         (lambda r: r.nbfc, False),
+    'Title':        (lambda r: r.title, False),
+}
+
+
+def _bits(mask):
+    """Positions of the set bits of an int bitmap, ascending."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class AIIndex:
+    """
+    Prebuilt query index over ai_records(): initiatives in source order, an
+    int bitmap per NBFC and per function tag, and for every sort mode a rank
+    per initiative plus the presorted posting list of each NBFC and tag.
+    A single filter is a slice of its posting list; NBFC + function is a
+    bitmap intersection whose (few) matches are ordered by rank.
+    """
+
+    __slots__ = ('items', 'by_nbfc', 'by_function', 'ranks', 'orders')
+
+    def __init__(self, records):
+        self.items       = tuple(r for lst in records.values() for r in lst)
+        self.by_nbfc     = {}
+        self.by_function = {}
+        for i, r in enumerate(self.items):
+            self.by_nbfc[r.nbfc] = self.by_nbfc.get(r.nbfc, 0) | 1 << i
+            for f in r.functions:
+                self.by_function[f] = self.by_function.get(f, 0) | 1 << i
+        self.ranks, self.orders = {}, {}
+        for mode, (key, reverse) in AI_SORTS.items():
+            order = sorted(range(len(self.items)), key=lambda i: key(self.items[i]), reverse=reverse)
+            rank  = [0] * len(order)
+            for pos, i in enumerate(order):
+                rank[i] = pos
+            postings = {None: order}
+            for i in order:
+                r = self.items[i]
+                postings.setdefault(('nbfc', r.nbfc), []).append(i)
+                for f in r.functions:
+                    postings.setdefault(('function', f), []).append(i)
+            self.ranks[mode]  = rank
+            self.orders[mode] = {k: tuple(v) for k, v in postings.items()}
+
+    def mask(self, nbfc=None, function=None):
+        """Bitmap of initiatives matching the filters (None = no filter)."""
+        m = (1 << len(self.items)) - 1
+        if nbfc is not None:
+            m &= self.by_nbfc.get(nbfc, 0)
+        if function is not None:
+            m &= self.by_function.get(function, 0)
+        return m
+
+    def select(self, nbfc=None, function=None, sort='Newest first', offset=0, limit=None):
+        """Positions in `items` of the matches, in `sort` order, sliced [offset:offset+limit]."""
+        end = None if limit is None else offset + limit
+        if nbfc is not None and function is not None:
+            return sorted(_bits(self.mask(nbfc, function)), key=self.ranks[sort].__getitem__)[offset:end]
+        if nbfc is not None:
+            key = ('nbfc', nbfc)
+        elif function is not None:
+            key = ('function', function)
+        else:
+            key = None
+        return self.orders[sort].get(key, ())[offset:end]
+
+    def query(self, nbfc=None, function=None, sort='Newest first', offset=0, limit=None):
+        """Matching AIInitiative records in `sort` order, sliced [offset:offset+limit]."""
+        return [self.items[i] for i in self.select(nbfc, function, sort, offset, limit)]
+
+    def count(self, nbfc=None, function=None):
+        return self.mask(nbfc, function).bit_count()
@@ -0,0 +1,142 @@
+"""
+Full-text search
+In-memory inverted index over AI initiatives (title, description, impact),
+earnings-call commentary, FY27 guidance and SWOT items, ranked with BM25.
+Every query token must match (AND) — either exactly or, from PREFIX_MIN
+characters, as a prefix of an indexed term ('under' finds 'underwriting').
+Term weights are precomputed at build time, so a query only sums the
+postings of its tokens.
+
+Usage:
+    index = SearchIndex(documents(ai_items, TRANSCRIPT_DATA, swot))
+    for hit in index.search('collections ai', limit=10): hit.doc, hit.score
+"""
+
+import bisect, heapq, math, re
+from collections import Counter, namedtuple
+from dataclasses import dataclass
+
+PREFIX_MIN = 3          # shorter tokens match whole terms only
+K1, B      = 1.2, 0.75  # BM25 parameters
+
+_TOKEN = re.compile(r'[0-9]+(?:\.[0-9]+)?|[^\W\d_]+')
+
+SWOT_LABELS = {'S': 'Strength', 'W': 'Weakness', 'O': 'Opportunity', 'T': 'Threat'}
+
+COMMENT_LABELS = {
+    'aum_cr': 'AUM / Growth', 'roa_pct': 'ROA / Profitability', 'gnpa_pct': 'GNPA / Asset Quality',
+    'nim_pct': 'NIM / Margins', 'cost_of_borrowing_pct': 'Cost of Borrowing',
+    'car_pct': 'Capital Adequacy', 'pat_cr': 'PAT / Earnings',
+}
+
+
+def tokenize(text):
+    """Lower-cased word and number tokens ('4.65%' → '4.65')."""
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass(frozen=True, slots=True)
+class Doc:
+    kind:  str     # 'ai' | 'commentary' | 'guidance' | 'swot'
+    nbfc:  str
+    label: str     # initiative title, metric label, 'Guidance', 'Strength' …
+    text:  str
+    ref:   object = None   # kind-specific back-reference (AIIndex position for 'ai')
+
+
+Hit = namedtuple('Hit', 'score doc')
+
+
+def documents(ai_items=(), transcripts=None, swot=None):
+    """
+    Search documents from AIIndex.items (ref = position), TRANSCRIPT_DATA
+    (metric_comments, guidance) and {nbfc: (S, W, O, T)} SWOT lists.
+    """
+    docs = []
+    for i, r in enumerate(ai_items):
+        docs.append(Doc('ai', r.nbfc, r.title, f'{r.title}. {r.description} {r.impact}', i))
+    for nbfc, td in (transcripts or {}).items():
+        for metric, text in td.get('metric_comments', {}).items():
+            docs.append(Doc('commentary', nbfc, COMMENT_LABELS.get(metric, metric), text, metric))
+        for text in td.get('guidance', []):
+            docs.append(Doc('guidance', nbfc, 'Guidance', text))
+    for nbfc, quads in (swot or {}).items():
+        for key, items in zip('SWOT', quads):
+            for text in items:
+                docs.append(Doc('swot', nbfc, SWOT_LABELS[key], text, key))
+    return docs
+
+
+class SearchIndex:
+    """BM25 inverted index: term → {doc id: weight}, with a sorted vocabulary for prefixes."""
+
+    __slots__ = ('docs', 'postings', 'vocab')
+
+    def __init__(self, docs):
+        self.docs = tuple(docs)
+        counts    = [Counter(tokenize(d.text)) for d in self.docs]
+        n         = len(self.docs)
+        avgdl     = sum(sum(c.values()) for c in counts) / n if n else 0
+        df        = Counter(t for c in counts for t in c)
+        self.postings = {}
+        for i, c in enumerate(counts):
+            norm = K1 * (1 - B + B * sum(c.values()) / avgdl)
+            for term, tf in c.items():
+                idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                self.postings.setdefault(term, {})[i] = idf * tf * (K1 + 1) / (tf + norm)
+        self.vocab = sorted(self.postings)
+
+    def _terms(self, token):
+        if len(token) < PREFIX_MIN:
+            return [token] if token in self.postings else []
+        lo = bisect.bisect_left(self.vocab, token)
+        hi = bisect.bisect_left(self.vocab, token + '\U0010ffff')
+        return self.vocab[lo:hi]
+
+    def _matches(self, token):
+        """{doc id: weight} for one query token; a prefix scores its best-matching term."""
+        terms = self._terms(token)
+        if len(terms) == 1:
+            return self.postings[terms[0]]
+        out = {}
+        for t in terms:
+            for i, w in self.postings[t].items():
+                if w > out.get(i, 0):
+                    out[i] = w
+        return out
+
+    def search(self, query, limit=20, kinds=None, nbfc=None):
+        """Top `limit` Hits (None = all) for docs matching every token of `query`, best first."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        lists = sorted((self._matches(t) for t in tokens), key=len)
+        if not lists[0]:
+            return []
+        scores = dict(lists[0])
+        for m in lists[1:]:
+            scores = {i: s + m[i] for i, s in scores.items() if i in m}
+            if not scores:
+                return []
+        docs = self.docs
+        if kinds is not None or nbfc is not None:
+            scores = {i: s for i, s in scores.items()
+                      if (kinds is None or docs[i].kind in kinds) and (nbfc is None or docs[i].nbfc == nbfc)}
+        key = lambda kv: (kv[1], -kv[0])
+        top = sorted(scores.items(), key=key, reverse=True) if limit is None else \
+              heapq.nlargest(limit, scores.items(), key=key)
+        return [Hit(s, docs[i]) for i, s in top]
+
+
+def highlight(text, query, tag='mark'):
+    """Wrap words of `text` matched by `query` (as search() matches them) in <tag>."""
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return text
+
+    def hit(m):
+        w = m.group(0).lower()
+        if any(w == t or (len(t) >= PREFIX_MIN and w.startswith(t)) for t in tokens):
+            return f'<{tag}>{m.group(0)}</{tag}>'
+        return m.group(0)
+    return _TOKEN.sub(hit, text)
@@ -0,0 +1,239 @@
+"""
+Shareholding tab HTML
+Builders for the tab10 tables — the Q4FY26 cross-NBFC snapshot, the
+per-NBFC category summary cards and the ≥1% shareholders table. They are
+pure functions of the SHAREHOLDING data (no Streamlit), assemble their
+markup with list joins, and are memoised per (NBFC, view) and data version
+by the dashboard's view cache.
+
+Usage:
+    snapshot_table(SHAREHOLDING, SH_QUARTERS, names, COLORS)
+    summary_cards(SHAREHOLDING[nbfc], SH_QUARTERS, CATEGORY_COLORS)       # 4 cards
+    holders_table(SHAREHOLDING[nbfc], entities, SH_QUARTERS,
+                  ENTITY_CATEGORY_COLORS, ENTITY_BADGE_TEXT_COLORS)
+"""
+
+CATEGORIES = ['Promoter', 'FII', 'DII', 'Public']
+DII_CATS   = ['DII – MF', 'DII – Insurance', 'DII – Pension', 'DII – Other']
+
+TOTAL_BG = {
+    'Promoter': '#d1fae5',
+    'FII':      '#e0f2fe',
+    'DII':      '#ffedd5',
+    'Public':   '#f1f5f9',
+}
+
+SNAPSHOT_HEADER_COLORS = {
+    'Promoter': '#059669',
+    'FII':      '#0284c7',
+    'DII':      '#ea580c',
+    'Public':   '#64748b',
+}
+
+
+def latest(lst):
+    for v in reversed(lst):
+        if v is not None: return v
+    return None
+
+
+def first(lst):
+    for v in lst:
+        if v is not None: return v
+    return None
+
+
+def delta_html(lst):
+    """(change, badge) between the first and latest reported quarter."""
+    f, l = first(lst), latest(lst)
+    if f is None or l is None: return 0, ""
+    d = l - f
+    if abs(d) < 0.05:
+        return d, '<span style="color:#64748b;font-size:11px;">→ flat</span>'
+    arrow = "▲" if d > 0 else "▼"
+    col = "#16a34a" if d > 0 else "#dc2626"
+    return d, f'<span style="color:{col};font-size:11px;">{arrow} {abs(d):.2f}%</span>'
+
+
+def _move_cls(val, prev):
+    if prev is None:
+        return "sh-cell-flat"
+    if val > prev + 0.04:
+        return "sh-cell-up"
+    if val < prev - 0.04:
+        return "sh-cell-dn"
+    return "sh-cell-flat"
+
+
+def _cell(val, prev_val, is_first_app, is_last_app):
+    if val is None:
+        return '<td class="sh-cell-nil">—</td>'
+    marker = ""
+    if is_first_app:
+        marker = '<span class="sh-entry-dot">●</span>'
+    elif is_last_app:
+        marker = '<span class="sh-exit-dot">○</span>'
+    return f'<td class="{_move_cls(val, prev_val)}">{val:.2f}%{marker}</td>'
+
+
+def _group_hdr(label, n_cols):
+    return (f'<tr style="background:#f1f5f9;">'
+            f'<td style="font-size:10px;font-weight:700;text-transform:uppercase;color:#64748b;'
+            f'letter-spacing:0.06em;padding:5px 10px;" colspan="{n_cols}">{label}</td>'
+            f'</tr>')
+
+
+def _total_row(out, label, vals, bg):
+    out.append(f'<tr style="background:{bg};">'
+               f'<td class="sh-td-name" style="font-weight:700;color:#0a2540;">{label}</td><td></td>')
+    prev = None
+    for val in vals:
+        if val is None:
+            out.append('<td class="sh-cell-nil" style="font-weight:700;">—</td>')
+        else:
+            out.append(f'<td class="{_move_cls(val, prev)}" style="font-weight:700;background:{bg};">{val:.2f}%</td>')
+            prev = val
+    reported = [v for v in vals if v is not None]
+    if len(reported) >= 2:
+        d = reported[-1] - reported[-2]
+        if d > 0.04:
+            trend = f'<span class="sh-cell-up">▲ {abs(d):.2f}%</span>'
+        elif d < -0.04:
+            trend = f'<span class="sh-cell-dn">▼ {abs(d):.2f}%</span>'
+        else:
+            trend = '<span class="sh-cell-flat">→ flat</span>'
+    else:
+        trend = "—"
+    out.append(f'<td style="font-size:10.5px;text-align:center;">{trend}</td></tr>')
+
+
+def _entity_rows(out, cat, entities, n_q, badge_bg, badge_fg):
+    """Rows for one category group, largest latest holding first."""
+    badge = (f'<span class="sh-cat-badge" style="background:{badge_bg.get(cat, "#94a3b8")};'
+             f'color:{badge_fg.get(cat, "white")};">{cat}</span>')
+    for ent in sorted(entities, key=lambda e: (latest(e.pct) or 0), reverse=True):
+        pct = ent.pct
+        n   = len(pct)
+        first_i = next((i for i, v in enumerate(pct) if v is not None), None)
+        last_i  = next((n - 1 - i for i, v in enumerate(reversed(pct)) if v is not None), None)
+        exited  = last_i is not None and last_i < n - 1
+
+        out.append(f'<tr><td class="sh-td-name">{ent.name}</td>'
+                   f'<td style="padding:6px 10px;text-align:center;">{badge}</td>')
+        for qi in range(n_q):
+            val  = pct[qi] if qi < n else None
+            prev = pct[qi - 1] if qi > 0 and (qi - 1) < n else None
+            out.append(_cell(val, prev, qi == first_i, qi == last_i and exited))
+
+        # Trend: QoQ change between last two reported quarters
+        reported = [v for v in pct if v is not None]
+        if len(reported) >= 2:
+            d = reported[-1] - reported[-2]
+            suffix = " → exited" if exited else ""
+            if d > 0.04:
+                trend = f'<span class="sh-cell-up">▲ {abs(d):.2f}%{suffix}</span>'
+            elif d < -0.04:
+                trend = f'<span class="sh-cell-dn">▼ {abs(d):.2f}%{suffix}</span>'
+            else:
+                trend = f'<span class="sh-cell-flat">→ {"exited" if exited else "flat"}</span>'
+        elif exited:
+            trend = '<span class="sh-cell-flat">→ exited</span>'
+        else:
+            trend = "—"
+        out.append(f'<td style="font-size:10.5px;text-align:center;">{trend}</td></tr>')
+
+
+def snapshot_table(shareholding, quarters, names, colors):
+    """Latest-quarter category split for every NBFC, sorted by promoter stake, column-shaded."""
+    q_idx = len(quarters) - 1
+    rows = []
+    for name in names:
+        cat_pct = shareholding[name].get('category_pct', {})
+        row = {'name': name}
+        for cat in CATEGORIES:
+            vals = cat_pct.get(cat, [None] * len(quarters))
+            row[cat] = vals[q_idx] if q_idx < len(vals) else None
+        rows.append(row)
+    rows.sort(key=lambda r: (r['Promoter'] or 0), reverse=True)
+
+    col_stats = {}
+    for cat in CATEGORIES:
+        vals = [r[cat] for r in rows if r[cat] is not None]
+        col_stats[cat] = (min(vals), max(vals)) if vals else (0, 1)
+    rgb = {cat: tuple(int(hc[i:i + 2], 16) for i in (1, 3, 5)) for cat, hc in SNAPSHOT_HEADER_COLORS.items()}
+
+    out = ['<table style="border-collapse:collapse;width:100%;font-size:12px;"><thead><tr>',
+           '<th style="background:#0a2540;color:white;padding:8px 12px;text-align:left;font-size:11px;">NBFC</th>']
+    for cat in CATEGORIES:
+        out.append(f'<th style="background:{SNAPSHOT_HEADER_COLORS[cat]};color:white;padding:8px 12px;'
+                   f'text-align:right;font-size:11px;">{cat}</th>')
+    out.append('</tr></thead><tbody>')
+    for row in rows:
+        out.append(f'<tr><td style="padding:8px 12px;font-weight:600;color:#0a2540;">'
+                   f'<span style="display:inline-block;width:8px;height:8px;border-radius:50%;'
+                   f'background:{colors.get(row["name"], "#0284c7")};margin-right:6px;"></span>'
+                   f'{row["name"]}</td>')
+        for cat in CATEGORIES:
+            v = row[cat]
+            mn, mx = col_stats[cat]
+            intensity = (v - mn) / (mx - mn) if v is not None and mx > mn else 0
+            r0, g0, b0 = rgb[cat]
+            v_str = f"{v:.2f}%" if v is not None else "—"
+            out.append(f'<td style="padding:8px 12px;text-align:right;'
+                       f'background:rgba({r0},{g0},{b0},{0.07 + intensity * 0.23:.2f});'
+                       f'font-weight:{"700" if intensity > 0.65 else "400"};'
+                       f'font-family:JetBrains Mono,monospace;font-size:11.5px;">{v_str}</td>')
+        out.append('</tr>')
+    out.append('</tbody></table>')
+    return ''.join(out)
+
+
+def summary_cards(data, quarters, category_colors):
+    """One card per category (latest % and change over the window), in CATEGORIES order."""
+    cat_pct = data.get('category_pct', {})
+    cards = []
+    for cat in CATEGORIES:
+        vals = cat_pct.get(cat, [None] * len(quarters))
+        lv = latest(vals)
+        _, delta = delta_html(vals)
+        lv_str = f"{lv:.2f}%" if lv is not None else "—"
+        cards.append(f"""
+                <div class="sh-summary-card" style="border-top-color:{category_colors.get(cat, '#94a3b8')};">
+                  <div class="sh-summary-label">{cat}</div>
+                  <div class="sh-summary-num">{lv_str}</div>
+                  <div class="sh-summary-delta">{delta}</div>
+                </div>
+                """)
+    return tuple(cards)
+
+
+def holders_table(data, entities, quarters, badge_bg, badge_fg):
+    """≥1% named shareholders grouped by category, each group followed by its category total."""
+    n_q    = len(quarters)
+    n_cols = 2 + n_q + 1  # name + category + quarters + trend
+    cat_pct = data.get('category_pct', {})
+    by_cat  = {}
+    for e in entities:
+        by_cat.setdefault(e.category, []).append(e)
+
+    th  = '<th style="background:#0a2540;color:white;padding:7px 10px;text-align:{};font-size:10.5px;{}">{}</th>'
+    out = ['<table class="sh-table"><thead><tr>',
+           th.format('left', 'min-width:180px;', 'Shareholder'),
+           th.format('center', '', 'Category')]
+    out.extend(th.format('center', '', q) for q in quarters)
+    out.append(th.format('center', '', 'Trend'))
+    out.append('</tr></thead><tbody>')
+
+    groups = [('Promoter', [('Promoter', 'Promoter')]),
+              ('FII',      [('FII / FPI', 'FII')]),
+              ('DII',      [(c, c) for c in DII_CATS]),
+              ('Public',   [('Public', 'Public')])]
+    for total, sections in groups:
+        for label, cat in sections:
+            ents = by_cat.get(cat, [])
+            if ents:
+                out.append(_group_hdr(label, n_cols))
+                _entity_rows(out, cat, ents, n_q, badge_bg, badge_fg)
+        _total_row(out, f'{total} Total', cat_pct.get(total, [None] * n_q), TOTAL_BG[total])
+    out.append('</tbody></table>')
+    return ''.join(out)
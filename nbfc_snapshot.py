@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Static snapshot export of the Streamlit dashboard
+Pre-renders the quarterly-fundamentals tabs of nbfc_dashboard_v1.py to plain
+HTML pages, so read-only viewers can be served by a file server instead of
+each holding a Streamlit session and paying a full script rerun.
+
+Nothing is re-implemented: the dashboard script itself runs headless
+(streamlit AppTest) and each tab's element tree is serialised — markdown
+blocks as their HTML, columns and expanders as flex rows / <details>, and
+every chart as the Plotly figure JSON produced by the dashboard's own chart
+factories, drawn client-side by a local copy of plotly.js. NBFC selectors
+are exported with every NBFC ticked (traces can still be toggled from the
+legend); Deep Dive and NBFC Lens get one page per NBFC. The live-market and
+price-driven valuation tabs, the AI Bulletin and Shareholding explorers
+stay on the Streamlit app.
+
+AppTest's element tree and streamlit.proto are Streamlit internals with no
+compatibility promise, so requirements.txt pins the Streamlit minor version
+this was written against; re-run test_nbfc_snapshot.py when bumping it.
+
+  snapshot/index.html            → growth.html
+  snapshot/<tab>.html            growth, asset-quality, capital, profitability, rankings, annual
+  snapshot/<tab>/<nbfc>.html     deep-dive, lens — one page per NBFC
+  snapshot/assets/plotly-<v>.min.js
+
+Run with:
+    python3 nbfc_snapshot.py export                   # → snapshot/
+    python3 nbfc_snapshot.py export --out /srv/nbfc-snapshot
+"""
+
+import html, os, re, sys, time, warnings
+from streamlit.proto.Block_pb2 import Block
+
+ROOT    = os.path.dirname(os.path.abspath(__file__))
+SCRIPT  = os.path.join(ROOT, 'nbfc_dashboard_v1.py')
+OUT_DIR = os.path.join(ROOT, 'snapshot')
+sys.path.insert(0, ROOT)
+import nbfc_store
+
+# (page slug, dashboard tab label, nav label)
+PAGES = [
+    ('growth',        'Financials',           'Growth'),
+    ('asset-quality', 'Asset Quality',        'Asset Quality'),
+    ('capital',       'Capital & Leverage',   'Capital'),
+    ('profitability', 'Profitability Ratios', 'Profitability'),
+    ('rankings',      'Rankings',             'Rankings'),
+    ('annual',        'Annual Trends',        'Annual'),
+]
+# (page slug, dashboard tab label, nav label, selectbox key) — one page per NBFC
+NBFC_PAGES = [
+    ('deep-dive', 'Deep Dive', 'Deep Dive', 'deep_dive_nbfc'),
+    ('lens',      'NBFC Lens', 'NBFC Lens', 'lens_nbfc'),
+]
+WIDGETS = {'checkbox', 'selectbox', 'multiselect', 'text_input', 'number_input', 'button', 'radio', 'slider'}
+
+PAGE_CSS = """
+body { margin: 0; background: #eef0f4; }
+.snap-nav { position: sticky; top: 0; z-index: 10; background: #0a2540; padding: 8px 1.6rem;
+            display: flex; flex-wrap: wrap; gap: 4px 14px; align-items: center; }
+.snap-nav a { color: #cbd5e1; text-decoration: none; font-size: 12.5px; font-weight: 600; padding: 4px 2px; }
+.snap-nav a.on { color: white; border-bottom: 2px solid #38bdf8; }
+.snap-nav .snap-live { margin-left: auto; color: #94a3b8; font-size: 11px; font-weight: 400; }
+.snap-nbfcs { display: flex; flex-wrap: wrap; gap: 6px; margin-bottom: 14px; }
+.snap-nbfcs a { font-size: 11.5px; padding: 3px 10px; border-radius: 12px; background: white;
+                color: #0a2540; text-decoration: none; border: 1px solid #e2e8f0; }
+.snap-nbfcs a.on { background: #0a2540; color: white; }
+.block-container { margin: 0 auto; }
+.snap-row { display: flex; gap: 1rem; align-items: flex-start; }
+.snap-row > div { min-width: 0; }
+.snap-el { margin-bottom: 1rem; }
+details.snap-exp { background: white; border: 1px solid #e2e8f0; border-radius: 6px; padding: 8px 14px; margin-bottom: 1rem; }
+details.snap-exp summary { cursor: pointer; font-size: 13px; font-weight: 600; color: #0a2540; }
+.snap-footer { font-size: 10px; color: #94a3b8; border-top: 1px solid #e2e8f0; padding-top: 8px; margin-top: 14px; }
+"""
+
+CHART_INIT = """
+document.querySelectorAll('.snap-chart').forEach(function (el) {
+  var fig = JSON.parse(document.getElementById(el.id + '-spec').textContent);
+  Plotly.newPlot(el, fig.data, fig.layout, {responsive: true, displaylogo: false});
+});
+"""
+
+
+def slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+# ── Element tree → HTML ──────────────────────────────────────────────────────
+
+class Renderer:
+    """Serialises AppTest nodes; chart ids are numbered per page."""
+
+    def __init__(self):
+        self.n_charts = 0
+        self.skipped  = set()
+
+    def node(self, n):
+        t = n.type
+        if t in WIDGETS:
+            return ''
+        if t == 'markdown':
+            p = n.proto
+            body = p.body if p.allow_html else html.escape(p.body)
+            return f'<div class="snap-el">{body}</div>'
+        if t == 'plotly_chart':
+            self.n_charts += 1
+            cid = f'chart-{self.n_charts}'
+            spec = n.proto.spec.replace('</', '<\\/')
+            return (f'<div class="snap-el snap-chart" id="{cid}"></div>'
+                    f'<script type="application/json" id="{cid}-spec">{spec}</script>')
+        if t == 'flex_container' and n.proto.flex_container.direction == Block.FlexContainer.HORIZONTAL:
+            return f'<div class="snap-row">{self.children(n)}</div>'
+        if t == 'column':
+            return f'<div style="flex:{n.weight:g}">{self.children(n)}</div>'
+        if t == 'expander':
+            return (f'<details class="snap-exp"{" open" if n.proto.expanded else ""}>'
+                    f'<summary>{html.escape(n.label)}</summary>{self.children(n)}</details>')
+        if getattr(n, 'children', None):
+            return self.children(n)
+        self.skipped.add(t)
+        return ''
+
+    def children(self, n):
+        return ''.join(self.node(c) for c in n.children.values())
+
+
+def global_css(at):
+    """The dashboard's top-level <style>/<link> markdown blocks."""
+    return ''.join(e.proto.body for e in at.main.children.values()
+                   if e.type == 'markdown' and ('<style' in e.proto.body or '<link' in e.proto.body))
+
+
+# ── Pages ────────────────────────────────────────────────────────────────────
+
+def nav(current, depth, first_nbfc):
+    up = '../' * depth
+    links = [(f'{up}{s}.html', label, s) for s, _, label in PAGES]
+    links += [(f'{up}{s}/{slug(first_nbfc)}.html', label, s) for s, _, label, _ in NBFC_PAGES]
+    items = ''.join(f'<a href="{href}"{" class=on" if s == current else ""}>{label}</a>' for href, label, s in links)
+    return f'<nav class="snap-nav">{items}<span class="snap-live">Market &amp; valuation: live dashboard</span></nav>'
+
+
+def page(title, body, current, depth, site):
+    """One snapshot page; `site` holds what every page shares (css, plotly_src, first_nbfc, footer)."""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{html.escape(title)} — NBFC Dashboard</title>
+{site['css']}
+<style>{PAGE_CSS}</style>
+<script src="{'../' * depth}{site['plotly_src']}"></script>
+</head>
+<body>
+{nav(current, depth, site['first_nbfc'])}
+<div class="block-container">
+{body}
+<div class="snap-footer">{site['footer']}</div>
+</div>
+<script>{CHART_INIT}</script>
+</body>
+</html>
+"""
+
+
+def _tab(at, label):
+    for t in at.tabs:
+        if t.label == label:
+            return t
+    raise KeyError(f'dashboard has no tab {label!r}')
+
+
+def _render_tab(at, label):
+    r = Renderer()
+    body = r.children(_tab(at, label))
+    if r.skipped:
+        warnings.warn(f'{label}: element types not exported: {sorted(r.skipped)}')
+    return body
+
+
+def _write(out, rel, text):
+    path = os.path.join(out, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def export(out=None, script=SCRIPT, timeout=600):
+    """Render every snapshot page into `out`. Returns the site-relative paths written."""
+    import plotly
+    from plotly.offline import get_plotlyjs
+    from streamlit.testing.v1 import AppTest
+
+    out = out or OUT_DIR
+    at = AppTest.from_file(script, default_timeout=timeout).run()
+    if at.exception:
+        raise RuntimeError(f'dashboard raised: {at.exception}')
+
+    # Every NBFC on in the multi-NBFC tabs; Plotly legends still toggle traces
+    for _, label, _ in PAGES:
+        for cb in _tab(at, label).checkbox:
+            if not cb.disabled and not cb.value:
+                cb.check()
+    nbfcs = list(at.selectbox(key=NBFC_PAGES[0][3]).options)
+    for *_, key in NBFC_PAGES:
+        at.selectbox(key=key).set_value(nbfcs[0])
+    at.run()
+
+    snap = nbfc_store.get_registry().current()
+    footer = ('Static snapshot of the NBFC Dashboard · data ' +
+              ' · '.join(f'{ds} v{snap.versions[ds]}' for ds in ('timeseries', 'annual', 'transcripts')
+                         if ds in snap.versions))
+    site = {'css': global_css(at), 'plotly_src': f'assets/plotly-{plotly.__version__}.min.js',
+            'first_nbfc': nbfcs[0], 'footer': footer}
+    written = [site['plotly_src']]
+    _write(out, site['plotly_src'], get_plotlyjs())
+
+    for s, label, title in PAGES:
+        _write(out, f'{s}.html', page(title, _render_tab(at, label), s, 0, site))
+        written.append(f'{s}.html')
+
+    for i, name in enumerate(nbfcs):
+        if i:
+            for *_, key in NBFC_PAGES:
+                at.selectbox(key=key).set_value(name)
+            at.run()
+        if at.exception:
+            raise RuntimeError(f'dashboard raised for {name}: {at.exception}')
+        for s, label, title, _ in NBFC_PAGES:
+            picker = ''.join(f'<a href="{slug(n)}.html"{" class=on" if n == name else ""}>{html.escape(n)}</a>'
+                             for n in nbfcs)
+            body = f'<div class="snap-nbfcs">{picker}</div>' + _render_tab(at, label)
+            _write(out, f'{s}/{slug(name)}.html', page(f'{title} · {name}', body, s, 1, site))
+            written.append(f'{s}/{slug(name)}.html')
+
+    _write(out, 'index.html', f'<!DOCTYPE html><meta http-equiv="refresh" content="0; url={PAGES[0][0]}.html">')
+    written.append('index.html')
+    return written
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args or args[0] != 'export':
+        sys.exit(f'Usage: {sys.argv[0]} export [--out DIR]')
+    out = args[args.index('--out') + 1] if '--out' in args else OUT_DIR
+    t0 = time.perf_counter()
+    written = export(out)
+    size = sum(os.path.getsize(os.path.join(out, rel)) for rel in written)
+    print(f'{len(written)} files, {size / 1024:.0f} KB in {time.perf_counter() - t0:.1f}s → {out}')
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Static dashboard export
+Builds the standalone NBFC Intelligence page (the HTML/JS dashboard that used
+to be hand-maintained as nbfc_intelligence_dashboard.html) from the data
+store, so it always shows the same quarters and numbers as the Streamlit app.
+
+The page shell lives in static/ (index.html, style.css, app.js). Only the
+sector KPI banner is rendered into index.html; the rest of the data is not
+inlined: each tab group gets a compact JSON bundle that app.js fetches the
+first time one of its tabs is opened. Every asset and bundle is written
+under a content-hashed name and index.html carries the manifest mapping
+bundle → file, so the output can be served by any static file server / CDN
+with long-lived caching on everything except index.html.
+
+  site/index.html                     page + inline manifest
+  site/assets/{style,app}.<hash>.*    page assets
+  site/data/<bundle>.<hash>.json      per-tab data
+
+Files from earlier builds are left in place, so pages already open keep
+loading their tabs after a redeploy; remove the directory for a clean build.
+
+Run with:
+    python3 nbfc_static.py build                  # → site/
+    python3 nbfc_static.py build --out /srv/nbfc
+"""
+
+import hashlib, html, json, os, sys
+from string import Template
+
+ROOT       = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import nbfc_store
+import nbfc_records
+import nbfc_analytics as na
+
+STATIC_DIR = os.path.join(ROOT, 'static')
+OUT_DIR    = os.path.join(ROOT, 'site')
+HASH_LEN   = 10
+
+# Palette and NBFC_TIMESERIES key → display name, as the Streamlit dashboard uses them
+COLORS  = na.COLORS
+DISPLAY = {key: name for name, key in na.CACHE_KEY.items()}
+
+# tab → bundle it needs (the market and fundamentals tabs share one)
+TAB_BUNDLES = {
+    'market':        'timeseries',
+    'financials':    'timeseries',
+    'assetquality':  'timeseries',
+    'capital':       'timeseries',
+    'profitability': 'timeseries',
+    'valuation':     'timeseries',
+    'deepdive':      'timeseries',
+    'rankings':      'rankings',
+    'aibulletin':    'aibulletin',
+    'shareholding':  'shareholding',
+}
+
+
+def quarter_label(q):
+    """'Q4FY26' → 'Q4 FY26'."""
+    return q.replace('FY', ' FY', 1)
+
+
+def dumps(obj):
+    """Compact, byte-stable JSON (non-finite numbers are a data error)."""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LEN]
+
+
+# ── Bundles ──────────────────────────────────────────────────────────────────
+
+def timeseries_bundle(ts):
+    quarters = ts['QUARTERS']
+    latest   = {r['name']: r for r in ts['NBFC_' + quarters[-1]]}
+    nbfcs = []
+    for key in ts['NBFC_ORDER']:
+        name = DISPLAY.get(key, key)
+        row  = latest.get(key, {})
+        nbfcs.append({'key': key, 'name': name, 'color': COLORS.get(name, '#888888'),
+                      'ticker': row.get('ticker'), 'segment': row.get('segment')})
+    metrics = {m: list(lu) for m, lu in ts['METRIC_LABELS'].items()}
+    return {'quarters': quarters, 'metrics': metrics, 'nbfcs': nbfcs,
+            'series': {key: ts['NBFC_TIMESERIES'][key] for key in ts['NBFC_ORDER']}}
+
+
+def rankings_bundle(ts):
+    quarter = ts['QUARTERS'][-1]
+    rows = []
+    for r in ts['NBFC_' + quarter]:
+        name = DISPLAY.get(r['name'], r['name'])
+        rows.append(dict(r, name=name, color=COLORS.get(name, '#888888')))
+    return {'quarter': quarter, 'rows': rows}
+
+
+def aibulletin_bundle(ai):
+    """Initiatives in AIIndex order plus each sort mode's presorted positions."""
+    index = nbfc_records.AIIndex(nbfc_records.ai_records(ai['NBFC_AI_INITIATIVES']))
+    items = [{'nbfc': r.nbfc, 'title': r.title, 'description': r.description, 'impact': r.impact,
+              'functions': list(r.functions), 'source_name': r.source_name,
+              'source_url': r.source_url, 'date': r.date} for r in index.items]
+    nbfcs = list(ai['NBFC_AI_INITIATIVES'])
+    return {'functions': ai['FUNCTION_TAXONOMY'], 'nbfcs': nbfcs,
+            'colors': {n: COLORS.get(n, '#888888') for n in nbfcs},
+            'sorts': {mode: list(index.orders[mode][None]) for mode in nbfc_records.AI_SORTS},
+            'items': items}
+
+
+def shareholding_bundle(sh):
+    data = sh['SHAREHOLDING']
+    return {'quarters': sh['SH_QUARTERS'],
+            'nbfcs': [{'name': n, 'color': COLORS.get(n, '#888888')} for n in data],
+            'data': data,
+            'category_colors': sh['CATEGORY_COLORS'],
+            'entity_colors': sh['ENTITY_CATEGORY_COLORS'],
+            'entity_text': sh['ENTITY_BADGE_TEXT_COLORS']}
+
+
+# ── Sector banner ────────────────────────────────────────────────────────────
+# KPI strip under the nav, rendered into index.html: summed AUM / PAT with
+# growth over the NBFCs that reported both quarters, and peer-average ratios.
+SECTOR_AVERAGES = [('gnpa_pct', 'Avg GNPA'), ('nim_pct', 'Avg NIM'), ('roa_pct', 'Avg ROA'), ('roe_pct', 'Avg ROE')]
+
+
+def _sector_growth(ts, metric, lag):
+    pairs = [(s[-1], s[-1 - lag]) for s in (row.get(metric, []) for row in ts['NBFC_TIMESERIES'].values())
+             if len(s) > lag and s[-1] is not None and s[-1 - lag] is not None]
+    base = sum(p for _, p in pairs)
+    return (sum(c for c, _ in pairs) - base) / base * 100 if base else None
+
+
+def sector_stats(ts):
+    """[(label, value, sub, tone)] for the latest quarter; tone is 'pos', 'neg' or ''."""
+    quarter = quarter_label(ts['QUARTERS'][-1])
+    pct  = lambda v: '—' if v is None else f'{v:+.1f}%'
+    tone = lambda v: '' if v is None else 'pos' if v >= 0 else 'neg'
+    stats = []
+    for metric, name, fmt in (('aum_cr', 'AUM', lambda v: f'₹{v / 1e5:.1f}L Cr'),
+                              ('pat_cr', 'PAT', lambda v: f'₹{v:,.0f} Cr')):
+        latest = [row[metric][-1] for row in ts['NBFC_TIMESERIES'].values() if (row.get(metric) or [None])[-1] is not None]
+        qoq, yoy = _sector_growth(ts, metric, 1), _sector_growth(ts, metric, 4)
+        stats.append((f'Sector {name}', fmt(sum(latest)) if latest else '—', quarter, ''))
+        stats.append((f'{name} Growth', f'{pct(qoq)} QoQ', f'{pct(yoy)} YoY', tone(qoq)))
+    for metric, label in SECTOR_AVERAGES:
+        vals = [row[metric][-1] for row in ts['NBFC_TIMESERIES'].values() if (row.get(metric) or [None])[-1] is not None]
+        stats.append((label, f'{sum(vals) / len(vals):.2f}%' if vals else '—', f'{len(vals)}-NBFC avg', ''))
+    return stats
+
+
+def sector_banner(ts):
+    return ''.join(f'<div class="sector-stat"><div class="sector-label">{html.escape(label)}</div>'
+                   f'<div class="sector-value {tone}">{html.escape(value)}</div>'
+                   f'<div class="sector-sub">{html.escape(sub)}</div></div>'
+                   for label, value, sub, tone in sector_stats(ts))
+
+
+def bundles(snapshot):
+    ts = snapshot['timeseries']
+    return {'timeseries':   timeseries_bundle(ts),
+            'rankings':     rankings_bundle(ts),
+            'aibulletin':   aibulletin_bundle(snapshot['ai']),
+            'shareholding': shareholding_bundle(snapshot['shareholding'])}
+
+
+# ── Build ────────────────────────────────────────────────────────────────────
+
+def _write(out, rel, data):
+    path = os.path.join(out, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _emit(out, subdir, stem, ext, data):
+    """Write data under its content-hashed name; return the site-relative path."""
+    rel = f'{subdir}/{stem}.{content_hash(data)}.{ext}'
+    _write(out, rel, data)
+    return rel
+
+
+def build(out=None, path=None):
+    """Render the static site into `out` from the store at `path`. Returns the manifest."""
+    out = out or OUT_DIR
+    snapshot = nbfc_store.get_registry(path).current()
+
+    files = {name: _emit(out, 'data', name, 'json', dumps(obj).encode())
+             for name, obj in bundles(snapshot).items()}
+    assets = {}
+    for stem, ext in (('style', 'css'), ('app', 'js')):
+        with open(os.path.join(STATIC_DIR, f'{stem}.{ext}'), 'rb') as f:
+            assets[stem] = _emit(out, 'assets', stem, ext, f.read())
+
+    manifest = {'data': files, 'tabs': TAB_BUNDLES,
+                'versions': {ds: snapshot.versions[ds] for ds in ('timeseries', 'ai', 'shareholding')}}
+    ts = snapshot['timeseries']
+    with open(os.path.join(STATIC_DIR, 'index.html'), encoding='utf-8') as f:
+        page = Template(f.read()).substitute(
+            quarter=quarter_label(ts['QUARTERS'][-1]),
+            n_nbfcs=len(ts['NBFC_ORDER']),
+            sector_banner=sector_banner(ts),
+            style=assets['style'],
+            app=assets['app'],
+            # '</' would end the inline <script> early
+            manifest=dumps(manifest).replace('</', '<\\/'))
+    _write(out, 'index.html', page.encode('utf-8'))
+    return manifest
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args or args[0] != 'build':
+        sys.exit(f'Usage: {sys.argv[0]} build [--out DIR]')
+    out = args[args.index('--out') + 1] if '--out' in args else OUT_DIR
+    manifest = build(out)
+    for rel in manifest['data'].values():
+        print(f'{rel:<40} {os.path.getsize(os.path.join(out, rel)) / 1024:>7.1f} KB')
+    print(f'→ {os.path.join(out, "index.html")}')
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+NBFC data store
+Single versioned SQLite file (data/nbfc_store.sqlite) holding every dataset the
+dashboard reads, so numbers can be refreshed without editing Python literals.
+
+  - quarterly / annual series (entity → metric → [values]) are stored
+    columnar, one row per value, so a single cell can be updated in place;
+  - everything else (shareholding, transcripts, AI initiatives, labels) is
+    stored as one JSON document per constant.
+
+Each dataset carries its own version number, bumped on every write, and a
+build id that changes on every full rebuild (versions restart at 1 if the file
+is deleted; build ids do not repeat). load() is lazy per dataset and returns the
+same names and shapes the original modules export (e.g.
+load('timeseries')['NBFC_TIMESERIES']). A dataset whose source module has
+changed since it was built (by content hash) is rebuilt on the next load.
+Long-running processes use get_registry().current() instead, which hot-reloads
+changed datasets into immutable, versioned snapshots.
+
+Run with:
+    python3 nbfc_store.py build    # (re)build the store from the data modules
+    python3 nbfc_store.py info     # dataset versions and sizes
+"""
+
+import hashlib, importlib, importlib.util, json, os, sqlite3, sys, threading, time, uuid, warnings
+from datetime import datetime
+from types import MappingProxyType
+
+ROOT       = os.path.dirname(os.path.abspath(__file__))
+STORE_PATH = os.path.join(ROOT, 'data', 'nbfc_store.sqlite')
+
+# Dataset name → source module it is built from
+DATASETS = {
+    'timeseries':   'nbfc_data_cache',
+    'annual':       'nbfc_annual_data',
+    'shareholding': 'shareholding_data',
+    'transcripts':  'nbfc_transcript_data',
+    'ai':           'nbfc_ai_data',
+}
+
+# Constants shaped entity → metric → [value per period]; stored columnar
+SERIES = {'NBFC_TIMESERIES', 'NBFC_ANNUAL'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    dataset     TEXT PRIMARY KEY,
+    version     INTEGER NOT NULL,
+    updated_at  TEXT NOT NULL,
+    source      TEXT,
+    build       TEXT,
+    source_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS series (
+    dataset TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    entity  TEXT NOT NULL,
+    metric  TEXT NOT NULL,
+    idx     INTEGER NOT NULL,
+    value,
+    PRIMARY KEY (dataset, name, entity, metric, idx)
+);
+CREATE TABLE IF NOT EXISTS objects (
+    dataset TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    json    TEXT NOT NULL,
+    PRIMARY KEY (dataset, name)
+);
+CREATE TABLE IF NOT EXISTS ingest_log (
+    dataset TEXT NOT NULL,
+    source  TEXT NOT NULL,
+    mtime   REAL NOT NULL,
+    PRIMARY KEY (dataset, source)
+);
+"""
+
+# Columns added to meta after the first release; connect() migrates older files
+_META_COLUMNS = {'build': 'TEXT', 'source_hash': 'TEXT'}
+
+_cache  = {}   # (path, dataset) → ((build, version), {NAME: value})
+_hashes = {}   # source file → (file stamp, sha1)
+
+
+# ── Encoding ─────────────────────────────────────────────────────────────────
+# JSON has no tuple; METRIC_LABELS values are (label, unit) tuples.
+
+def _encode(obj):
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_encode(v) for v in obj]}
+    if isinstance(obj, list):
+        return [_encode(v) for v in obj]
+    if isinstance(obj, dict):
+        return {k: _encode(v) for k, v in obj.items()}
+    return obj
+
+
+def _decode(obj):
+    if '__tuple__' in obj and len(obj) == 1:
+        return tuple(obj['__tuple__'])
+    return obj
+
+
+def _series_rows(dataset, name, value):
+    for entity, metrics in value.items():
+        for metric, vals in metrics.items():
+            for i, v in enumerate(vals):
+                yield dataset, name, entity, metric, i, v
+
+
+def module_constants(module_name, reload=False):
+    """UPPERCASE module-level constants of a data module (re-imported from disk if reload)."""
+    mod = importlib.import_module(module_name)
+    if reload:
+        mod = importlib.reload(mod)
+    return {k: v for k, v in vars(mod).items() if k.isupper() and not k.startswith('_')}
+
+
+def source_path(module_name):
+    """File a data module is loaded from, or None if it cannot be found."""
+    spec = importlib.util.find_spec(module_name)
+    return spec.origin if spec and spec.origin and os.path.exists(spec.origin) else None
+
+
+def source_hash(module_name):
+    """sha1 of a data module's source; re-hashed only when the file's mtime/size change."""
+    path = source_path(module_name)
+    if path is None:
+        return None
+    stamp = _file_stamp(path)
+    hit = _hashes.get(path)
+    if hit is None or hit[0] != stamp:
+        with open(path, 'rb') as f:
+            hit = _hashes[path] = (stamp, hashlib.sha1(f.read()).hexdigest())
+    return hit[1]
+
+
+# ── Read / write ─────────────────────────────────────────────────────────────
+
+def connect(path=None):
+    path = path or STORE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    have = {row[1] for row in conn.execute('PRAGMA table_info(meta)')}
+    for col, kind in _META_COLUMNS.items():
+        if col not in have:
+            conn.execute(f'ALTER TABLE meta ADD COLUMN {col} {kind}')
+    return conn
+
+
+def write_dataset(dataset, constants, path=None, source=None, source_hash=None):
+    """
+    Replace a dataset's contents, bump its version and give it a new build id.
+    source_hash records the source module it was built from (see stale()).
+    Returns the new version.
+    """
+    conn = connect(path)
+    try:
+        with conn:
+            row = conn.execute('SELECT version FROM meta WHERE dataset = ?', (dataset,)).fetchone()
+            version = (row[0] if row else 0) + 1
+            conn.execute('DELETE FROM series WHERE dataset = ?', (dataset,))
+            conn.execute('DELETE FROM objects WHERE dataset = ?', (dataset,))
+            # a full rewrite drops anything merged in since, so forget those sources
+            conn.execute('DELETE FROM ingest_log WHERE dataset = ?', (dataset,))
+            for name, value in constants.items():
+                if name in SERIES:
+                    conn.executemany('INSERT INTO series VALUES (?, ?, ?, ?, ?, ?)',
+                                     _series_rows(dataset, name, value))
+                else:
+                    conn.execute('INSERT INTO objects VALUES (?, ?, ?)',
+                                 (dataset, name, json.dumps(_encode(value), ensure_ascii=False)))
+            conn.execute('INSERT OR REPLACE INTO meta (dataset, version, updated_at, source, build, source_hash) '
+                         'VALUES (?, ?, ?, ?, ?, ?)',
+                         (dataset, version, datetime.now().isoformat(timespec='seconds'), source,
+                          uuid.uuid4().hex, source_hash))
+    finally:
+        conn.close()
+    return version
+
+
+def update_series(dataset, name, cells, path=None, source=None, ingested=None):
+    """
+    Set individual series values in place and bump the dataset's version.
+    `cells` is an iterable of (entity, metric, idx, value); a new metric must
+    be given every idx so its list comes back complete. `ingested` maps input
+    files to the mtimes they were read at and is logged in the same
+    transaction (see ingested_sources). Returns the new version, or the
+    current one when `cells` is empty.
+    """
+    cells = list(cells)
+    conn = connect(path)
+    try:
+        with conn:
+            row = conn.execute('SELECT version FROM meta WHERE dataset = ?', (dataset,)).fetchone()
+            if row is None:
+                raise KeyError(f'Dataset {dataset!r} is not in the store; build it first')
+            conn.executemany('INSERT OR REPLACE INTO ingest_log VALUES (?, ?, ?)',
+                             [(dataset, src, mt) for src, mt in (ingested or {}).items()])
+            if not cells:
+                return row[0]
+            # upsert keeps the rowid, so list order within a metric is preserved
+            conn.executemany(
+                'INSERT INTO series VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (dataset, name, entity, metric, idx) DO UPDATE SET value = excluded.value',
+                [(dataset, name, e, m, i, v) for e, m, i, v in cells])
+            conn.execute('UPDATE meta SET version = ?, updated_at = ?, source = ? WHERE dataset = ?',
+                         (row[0] + 1, datetime.now().isoformat(timespec='seconds'), source, dataset))
+    finally:
+        conn.close()
+    return row[0] + 1
+
+
+def ingested_sources(dataset, path=None):
+    """{source file: mtime} merged into a dataset since it was last rebuilt."""
+    conn = connect(path)
+    try:
+        return dict(conn.execute('SELECT source, mtime FROM ingest_log WHERE dataset = ?', (dataset,)))
+    finally:
+        conn.close()
+
+
+def _series_cells(conn, dataset):
+    return {(name, entity, metric, idx): value for name, entity, metric, idx, value in conn.execute(
+        'SELECT name, entity, metric, idx, value FROM series WHERE dataset = ?', (dataset,))}
+
+
+def build(path=None, datasets=None, reload=False):
+    """
+    Load datasets from their source modules into the store. Returns {dataset: version}.
+    Rebuilding a dataset that has ingested cells merged in discards them; the
+    cells whose value the rebuild changed are reported in a warning, together
+    with the ingested files to re-run.
+    """
+    out = {}
+    for ds in (datasets or DATASETS):
+        conn = connect(path)
+        try:
+            sources = dict(conn.execute('SELECT source, mtime FROM ingest_log WHERE dataset = ?', (ds,)))
+            before  = _series_cells(conn, ds) if sources else {}
+        finally:
+            conn.close()
+        out[ds] = write_dataset(ds, module_constants(DATASETS[ds], reload), path, source=DATASETS[ds],
+                                source_hash=source_hash(DATASETS[ds]))
+        if not sources:
+            continue
+        conn = connect(path)
+        try:
+            after = _series_cells(conn, ds)
+        finally:
+            conn.close()
+        dropped = sorted(cell for cell, value in before.items() if cell not in after or after[cell] != value)
+        if dropped:
+            shown = ', '.join(f'{e}/{m}[{i}]' for _, e, m, i in dropped[:10])
+            more  = f' and {len(dropped) - 10} more' if len(dropped) > 10 else ''
+            warnings.warn(f'{ds}: rebuilt from {DATASETS[ds]}, discarding {len(dropped)} ingested '
+                          f'cell(s): {shown}{more}; re-run the ingest for {", ".join(sorted(sources))} '
+                          f'to merge them again')
+    return out
+
+
+def stale(path=None, datasets=None):
+    """
+    Datasets that are not in the store, or were built from a source module
+    that has changed since (hash mismatch; a build from before hashes were
+    recorded counts as changed). Datasets written directly with
+    write_dataset() have no hash and are left alone. Ingested cells are
+    dropped when a dataset is rebuilt; build() warns which ones, and the
+    ingest has to be re-run to merge them again.
+    """
+    conn = connect(path)
+    try:
+        built = {ds: (src, h) for ds, src, h in conn.execute('SELECT dataset, source, source_hash FROM meta')}
+    finally:
+        conn.close()
+    out = []
+    for ds in (datasets or DATASETS):
+        if ds not in built:
+            out.append(ds)
+            continue
+        src, built_hash = built[ds]
+        current = source_hash(DATASETS[ds])
+        if built_hash is None:
+            if src == DATASETS[ds] and current is not None:
+                out.append(ds)
+        elif current is not None and built_hash != current:
+            out.append(ds)
+    return out
+
+
+def versions(path=None):
+    """{dataset: version} for every dataset in the store."""
+    conn = connect(path)
+    try:
+        return dict(conn.execute('SELECT dataset, version FROM meta'))
+    finally:
+        conn.close()
+
+
+def _read(conn, dataset):
+    out = {}
+    for name, text in conn.execute('SELECT name, json FROM objects WHERE dataset = ?', (dataset,)):
+        out[name] = json.loads(text, object_hook=_decode)
+    # each list in idx order; lists (and so entities / metrics) in the order first written
+    rows = conn.execute('SELECT name, entity, metric, value FROM series WHERE dataset = ? '
+                        'ORDER BY MIN(rowid) OVER (PARTITION BY name, entity, metric), idx', (dataset,))
+    for name, entity, metric, value in rows:
+        out.setdefault(name, {}).setdefault(entity, {}).setdefault(metric, []).append(value)
+    return out
+
+
+def _fetch(path, datasets):
+    """
+    {dataset: (version, build, values)} read in a single transaction, so every
+    dataset comes from the same committed state. Values whose build and
+    version are unchanged come from the process cache; missing datasets, and
+    those whose source module changed, are (re)built first.
+    """
+    # check-and-rebuild under the path's registry lock, so concurrent loads
+    # (or a load racing a registry refresh) rebuild a stale dataset only once
+    with get_registry(path)._lock:
+        rebuild = stale(path, datasets)
+        if rebuild:
+            build(path, rebuild, reload=True)
+
+    out  = {}
+    conn = connect(path)
+    try:
+        conn.execute('BEGIN')
+        have = {ds: (build_id, v) for ds, v, build_id in conn.execute('SELECT dataset, version, build FROM meta')}
+        for ds in datasets:
+            hit = _cache.get((path, ds))
+            if hit is None or hit[0] != have[ds]:
+                hit = _cache[(path, ds)] = (have[ds], _read(conn, ds))
+            (build_id, version), values = hit
+            out[ds] = (version, build_id, values)
+        conn.rollback()
+    finally:
+        conn.close()
+    return out
+
+
+def load(dataset, path=None):
+    """
+    {NAME: value} for one dataset, in the shapes the source module exports.
+    Cached per process until the dataset's version changes; a missing store
+    or dataset is built from its source module on first use. Treat the
+    returned values as read-only — they are shared between callers.
+    """
+    if dataset not in DATASETS:
+        raise KeyError(f'Unknown dataset {dataset!r}; expected one of {list(DATASETS)}')
+    return _fetch(path or STORE_PATH, [dataset])[dataset][2]
+
+
+def clear_cache():
+    _cache.clear()
+
+
+# ── Hot-reload registry ──────────────────────────────────────────────────────
+# A long-running process (the Streamlit server) holds one Registry. Each rerun
+# takes registry.current() once and reads everything from that snapshot, so
+# a write landing mid-rerun never mixes old and new numbers; the next rerun
+# sees the new snapshot. Nothing is restarted and session state survives.
+
+class Snapshot:
+    """
+    Immutable view of every dataset at one store state: snap['timeseries']['QUARTERS'].
+    stamp() gives the snapshot version at which a dataset, constant or series
+    metric last changed, so caches can depend on just the parts they read.
+    """
+    __slots__ = ('version', 'versions', 'builds', '_data', '_stamps')
+
+    def __init__(self, version, versions, data, stamps=None, builds=None):
+        object.__setattr__(self, 'version', version)                    # registry-wide counter
+        object.__setattr__(self, 'versions', MappingProxyType(versions))  # dataset → store version
+        object.__setattr__(self, 'builds', MappingProxyType(builds or {}))  # dataset → build id
+        object.__setattr__(self, '_data', MappingProxyType(
+            {ds: MappingProxyType(v) for ds, v in data.items()}))
+        object.__setattr__(self, '_stamps', MappingProxyType(
+            stamps if stamps is not None else {(ds,): version for ds in data}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Snapshot is immutable')
+
+    def __getitem__(self, dataset):
+        return self._data[dataset]
+
+    def __contains__(self, dataset):
+        return dataset in self._data
+
+    def stamp(self, dataset, name=None, metric=None):
+        """Version at which (dataset[, NAME[, metric]]) last changed; unknown parts fall back to their parent."""
+        key = tuple(k for k in (dataset, name, metric) if k is not None)
+        while key not in self._stamps and len(key) > 1:
+            key = key[:-1]
+        return self._stamps[key]
+
+    def changed_since(self, other):
+        """Datasets whose store version or build differs from `other` (all of them if other is None)."""
+        if other is None:
+            return set(self.versions)
+        return {ds for ds, v in self.versions.items()
+                if other.versions.get(ds) != v or other.builds.get(ds) != self.builds.get(ds)}
+
+    def __repr__(self):
+        return f'Snapshot(v{self.version}, {dict(self.versions)})'
+
+
+def _series_columns(value):
+    """{metric: [(entity, values), …]} for an entity → metric → [values] constant."""
+    cols = {}
+    for entity, metrics in value.items():
+        for metric, vals in metrics.items():
+            cols.setdefault(metric, []).append((entity, vals))
+    return cols
+
+
+def _diff_stamps(stamps, version, changed, old, fetched):
+    """Stamp every dataset / constant / series metric in `changed` that differs from `old`."""
+    for ds in changed:
+        stamps[(ds,)] = version
+        before = dict(old[ds]) if old is not None and ds in old else {}
+        for name, value in fetched[ds][-1].items():
+            prev = before.get(name)
+            if name not in before or prev != value:
+                stamps[(ds, name)] = version
+            if name in SERIES:
+                prev_cols = _series_columns(prev) if name in before else {}
+                for metric, col in _series_columns(value).items():
+                    if prev_cols.get(metric) != col:
+                        stamps[(ds, name, metric)] = version
+    return stamps
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _watch_stamp(path):
+    """The store file's stamp plus each source module's, so an edited module triggers a reload too."""
+    return _file_stamp(path), tuple(_file_stamp(p) for p in map(source_path, DATASETS.values()) if p)
+
+
+class Registry:
+    """
+    Watches the store file (and the data modules it is built from) and swaps
+    in a new Snapshot when either changes.
+    Their mtime/size is checked at most every `poll_interval` seconds,
+    on access; only datasets whose version moved are re-read, the rest are
+    shared with the previous snapshot. Listeners registered with on_change()
+    are called as fn(changed_datasets, snapshot) after each swap.
+    """
+
+    def __init__(self, path=None, poll_interval=1.0):
+        self.path          = path or STORE_PATH
+        self.poll_interval = poll_interval
+        self._lock      = threading.RLock()   # re-entered by _fetch's rebuild check
+        self._snapshot  = None
+        self._stamp     = None
+        self._checked   = 0.0
+        self._listeners = []
+
+    def current(self):
+        """Latest snapshot; re-checks the store only once the poll interval has passed."""
+        snap = self._snapshot
+        if snap is not None and time.monotonic() - self._checked < self.poll_interval:
+            return snap
+        return self.refresh()
+
+    def refresh(self, force=False):
+        """Check the store now and swap in a new snapshot if any dataset changed."""
+        with self._lock:
+            self._checked = time.monotonic()
+            old   = self._snapshot
+            stamp = _watch_stamp(self.path)
+            if old is not None and stamp == self._stamp and not force:
+                return old
+            # stamp taken before reading: a write racing the read just triggers another reload
+            fetched  = _fetch(self.path, list(DATASETS))
+            versions = {ds: v for ds, (v, _, _) in fetched.items()}
+            builds   = {ds: b for ds, (_, b, _) in fetched.items()}
+            self._stamp = stamp
+            if old is not None and (versions, builds) == (dict(old.versions), dict(old.builds)):
+                return old
+            version = (old.version + 1) if old else 1
+            changed = {ds for ds in versions
+                       if old is None or (old.versions.get(ds), old.builds.get(ds)) != (versions[ds], builds[ds])}
+            stamps  = _diff_stamps(dict(old._stamps) if old else {}, version, changed, old, fetched)
+            new = Snapshot(version, versions, {ds: values for ds, (_, _, values) in fetched.items()},
+                           stamps, builds)
+            self._snapshot = new
+            listeners = list(self._listeners)
+        for fn in listeners:
+            fn(changed, new)
+        return new
+
+    def on_change(self, fn):
+        """Register fn(changed_datasets, snapshot); usable as a decorator."""
+        with self._lock:
+            self._listeners.append(fn)
+        return fn
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path=None):
+    """The process-wide Registry for a store path (created on first call)."""
+    path = path or STORE_PATH
+    with _registries_lock:
+        if path not in _registries:
+            _registries[path] = Registry(path)
+        return _registries[path]
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def info(path=None):
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            'SELECT m.dataset, m.version, m.updated_at, '
+            '(SELECT COUNT(*) FROM series s WHERE s.dataset = m.dataset), '
+            '(SELECT COUNT(*) FROM objects o WHERE o.dataset = m.dataset) '
+            'FROM meta m ORDER BY m.dataset').fetchall()
+    finally:
+        conn.close()
+    print(f"{'Dataset':<14} {'Version':>7}  {'Updated':<20} {'Cells':>7} {'Docs':>5}")
+    for dataset, version, updated, cells, docs in rows:
+        print(f'{dataset:<14} {version:>7}  {updated:<20} {cells:>7} {docs:>5}')
+
+
+if __name__ == '__main__':
+    cmd = sys.argv[1] if len(sys.argv) > 1 else 'info'
+    if cmd == 'build':
+        for ds, v in build().items():
+            print(f'{ds:<14} → v{v}')
+    elif cmd == 'info':
+        info()
+    else:
+        sys.exit(f'Usage: {sys.argv[0]} build|info')
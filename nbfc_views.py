@@ -0,0 +1,204 @@
+"""
+Derived-view cache
+Memoises dashboard views (rankings table, radar bounds, SWOT, shareholding
+snapshot …) across reruns and sessions. Each view declares the parts of the
+data store it reads — a whole dataset, one constant, or single series
+metrics — and its results are dropped only when one of those parts changes.
+Updating SHAREHOLDING therefore recomputes the tab10 views while the
+Rankings and Lens caches stay warm.
+
+Usage (dashboard):
+    VIEWS = nbfc_views.get_graph()
+    VIEWS.use(DATA)          # the snapshot this rerun reads
+
+    @st.fragment
+    @VIEWS.pinned(DATA)      # fragment reruns run on their own thread
+    def section(): ...
+
+    @VIEWS.view('rankings_table', metrics('aum_cr', 'pat_cr'))
+    def build_rankings_table(): ...
+
+Results are shared between sessions; treat them as read-only.
+"""
+
+import functools
+import threading
+
+import nbfc_analytics as na
+import nbfc_store
+
+
+def metrics(*names, dataset='timeseries', constant='NBFC_TIMESERIES'):
+    """Dependencies on individual series metrics (default: NBFC_TIMESERIES)."""
+    return [(dataset, constant, m) for m in names]
+
+
+def constants(dataset, *names):
+    """Dependencies on whole constants of a dataset, e.g. constants('shareholding', 'SHAREHOLDING')."""
+    return [(dataset, n) for n in names]
+
+
+class _View:
+    __slots__ = ('deps', 'entries', 'hits', 'recomputes', 'invalidations')
+
+    def __init__(self, deps):
+        self.deps          = deps
+        self.entries       = {}   # (args, stamps) → result
+        self.hits          = 0
+        self.recomputes    = 0
+        self.invalidations = 0
+
+
+class ViewGraph:
+    """Views keyed by name, each with its declared dependencies and its cache."""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._views   = {}
+        self._lock    = threading.Lock()
+        self._local   = threading.local()   # Streamlit runs each session's rerun on its own thread
+        registry.on_change(self._on_change)
+
+    def use(self, snapshot):
+        """Pin the snapshot views on this thread are computed against."""
+        self._local.snapshot = snapshot
+
+    def snapshot(self):
+        """The snapshot views on this thread read: the pinned one, else the registry's latest."""
+        return getattr(self._local, 'snapshot', None) or self.registry.current()
+
+    def pinned(self, snapshot):
+        """
+        Decorator pinning `snapshot` on whichever thread runs fn. Streamlit
+        reruns a fragment on a fresh thread, so the fragment must re-pin the
+        snapshot of the full run that defined it.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                self.use(snapshot)
+                return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def view(self, name, deps):
+        """
+        Decorator caching fn(*args) under `name` until a dependency changes.
+        Re-decorating the same name (every Streamlit rerun does) keeps the
+        existing cache unless the declared dependencies differ.
+        """
+        deps = tuple(deps)
+        with self._lock:
+            if name not in self._views or self._views[name].deps != deps:
+                self._views[name] = _View(deps)
+            v = self._views[name]
+
+        def decorator(fn):
+            def wrapper(*args):
+                snap = self.snapshot()
+                key  = (args, tuple(snap.stamp(*d) for d in deps))
+                with self._lock:
+                    if key in v.entries:
+                        v.hits += 1
+                        return v.entries[key]
+                result = fn(*args)
+                with self._lock:
+                    v.entries[key] = result
+                    v.recomputes += 1
+                return result
+            wrapper.__name__ = fn.__name__
+            wrapper.__doc__  = fn.__doc__
+            wrapper.__wrapped__ = fn
+            return wrapper
+        return decorator
+
+    def _on_change(self, changed, snap):
+        with self._lock:
+            for v in self._views.values():
+                if not any(d[0] in changed for d in v.deps):
+                    continue
+                live  = tuple(snap.stamp(*d) for d in v.deps)
+                stale = [k for k in v.entries if k[1] != live]
+                for k in stale:
+                    del v.entries[k]
+                if stale:
+                    v.invalidations += 1
+
+    def stats(self):
+        """{view: {'hits', 'recomputes', 'invalidations', 'entries'}}"""
+        with self._lock:
+            return {name: {'hits': v.hits, 'recomputes': v.recomputes,
+                           'invalidations': v.invalidations, 'entries': len(v.entries)}
+                    for name, v in self._views.items()}
+
+    def report(self):
+        lines = [f"{'View':<24} {'Hits':>6} {'Recomputes':>10} {'Invalidated':>11} {'Entries':>7}"]
+        for name, s in self.stats().items():
+            lines.append(f"{name:<24} {s['hits']:>6} {s['recomputes']:>10} "
+                         f"{s['invalidations']:>11} {s['entries']:>7}")
+        return '\n'.join(lines)
+
+
+# ── Shared timeseries views ──────────────────────────────────────────────────
+# Dependencies of the views below, for them and for the views built on them:
+# the metrics read, plus the quarter list the cubes are laid out on.
+QUARTER_AXIS  = constants('timeseries', 'QUARTERS')
+RANKINGS_DEPS = metrics(*[m[0] for m in na.RANKINGS_METRICS]) + QUARTER_AXIS
+RADAR_DEPS    = metrics(*[m[0] for m in na.RADAR_METRICS]) + QUARTER_AXIS
+INSIGHT_DEPS  = metrics(*na.INSIGHT_METRICS) + QUARTER_AXIS
+
+
+class SeriesViews:
+    """
+    Metric cubes, rank / percentile matrices, radar scores and the insight
+    frame, registered on `graph` and computed against graph.snapshot(). The
+    dashboard and the JSON API both read these, so they share one
+    implementation and one dependency declaration.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        view = graph.view
+        self.rankings_cube = view('rankings_cube', RANKINGS_DEPS)(self._rankings_cube)
+        self.rank_matrices = view('rank_matrices', RANKINGS_DEPS)(self._rank_matrices)
+        self.radar_cube    = view('radar_cube', RADAR_DEPS)(self._radar_cube)
+        self.radar_matrix  = view('radar_matrix', RADAR_DEPS)(self._radar_matrix)
+        self.insight_frame = view('insight_frame', INSIGHT_DEPS)(self._insight_frame)
+
+    def _cube(self, metric_defs):
+        ts = self.graph.snapshot()['timeseries']
+        return na.metric_cube(ts['NBFC_TIMESERIES'], [m[0] for m in metric_defs], len(ts['QUARTERS']))
+
+    def _rankings_cube(self):
+        """(NBFC × rankings metric × quarter) float array, NaN where not reported."""
+        return self._cube(na.RANKINGS_METRICS)
+
+    def _rank_matrices(self):
+        """(ranks, percentiles) for every NBFC × rankings metric × quarter."""
+        return na.rank_matrices(self.rankings_cube(), [m[3] for m in na.RANKINGS_METRICS])
+
+    def _radar_cube(self):
+        """(NBFC × radar metric × quarter) float array, NaN where not reported."""
+        return self._cube(na.RADAR_METRICS)
+
+    def _radar_matrix(self, method='minmax'):
+        """Peer-normalised radar scores for every NBFC × metric × quarter."""
+        return na.radar_matrix(self.radar_cube(), method)
+
+    def _insight_frame(self):
+        """Every NBFC's INSIGHT_METRICS moves at the insight quarters."""
+        ts = self.graph.snapshot()['timeseries']['NBFC_TIMESERIES']
+        return na.insight_frame(na.peer_stats(ts, metrics=na.INSIGHT_METRICS))
+
+
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def get_graph(path=None):
+    """The process-wide ViewGraph over get_registry(path)."""
+    registry = nbfc_store.get_registry(path)
+    with _graphs_lock:
+        if registry.path not in _graphs:
+            _graphs[registry.path] = ViewGraph(registry)
+        return _graphs[registry.path]
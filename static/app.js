@@ -0,0 +1,644 @@
+// NBFC Intelligence — static dashboard
+// Page logic for the site built by nbfc_static.py. Data is not embedded: the
+// inline manifest maps each tab to a content-hashed JSON bundle, fetched the
+// first time one of its tabs is opened and shared by every tab that needs it.
+
+'use strict';
+
+const MANIFEST = JSON.parse(document.getElementById('manifest').textContent);
+
+// ── DATA LOADING ──────────────────────────────────────────────────────────────
+const bundleCache = {};
+function loadBundle(name) {
+  if (!bundleCache[name]) {
+    bundleCache[name] = fetch(MANIFEST.data[name]).then(resp => {
+      if (!resp.ok) throw new Error(`${MANIFEST.data[name]}: HTTP ${resp.status}`);
+      return resp.json();
+    });
+    bundleCache[name].catch(() => delete bundleCache[name]);   // allow a retry on the next visit
+  }
+  return bundleCache[name];
+}
+
+// ── CHART DEFAULTS ────────────────────────────────────────────────────────────
+Chart.defaults.color = '#8B9EC7';
+Chart.defaults.borderColor = 'rgba(255,255,255,0.06)';
+const DARK_GRID = { color: 'rgba(255,255,255,0.05)' };
+const DARK_TICK = { color: '#4A5980', font: { size: 10, family: 'Space Mono' } };
+const TOOLTIP = {
+  backgroundColor: 'rgba(13,21,38,0.95)', titleColor: '#F0F4FF', bodyColor: '#8B9EC7',
+  borderColor: 'rgba(212,175,55,0.2)', borderWidth: 1,
+};
+
+const chartRegistry = {};
+function makeChart(canvasId, config) {
+  if (chartRegistry[canvasId]) chartRegistry[canvasId].destroy();
+  const canvas = document.getElementById(canvasId);
+  if (!canvas) return;
+  chartRegistry[canvasId] = new Chart(canvas.getContext('2d'), config);
+}
+
+function hexToRgba(hex, alpha) {
+  if (!/^#[0-9a-f]{6}$/i.test(hex)) hex = '#888888';
+  const [r, g, b] = [1, 3, 5].map(i => parseInt(hex.slice(i, i + 2), 16));
+  return `rgba(${r},${g},${b},${alpha})`;
+}
+
+function escapeHtml(s) {
+  return String(s).replace(/[&<>"']/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' })[c]);
+}
+
+function dot(color, size = 8) {
+  return `<span style="display:inline-block;width:${size}px;height:${size}px;border-radius:50%;background:${color};margin-right:6px"></span>`;
+}
+
+function baseOptions(yLabel) {
+  return {
+    responsive: true,
+    maintainAspectRatio: false,
+    interaction: { mode: 'index', intersect: false },
+    plugins: {
+      legend: { labels: { color: '#8B9EC7', font: { size: 11, family: 'Sora' }, boxWidth: 12, padding: 12 } },
+      tooltip: TOOLTIP,
+    },
+    scales: {
+      x: { grid: DARK_GRID, ticks: DARK_TICK, border: { color: 'rgba(255,255,255,0.06)' } },
+      y: {
+        grid: DARK_GRID, ticks: DARK_TICK, border: { color: 'rgba(255,255,255,0.06)' },
+        title: yLabel ? { display: true, text: yLabel, color: '#4A5980', font: { size: 10 } } : undefined,
+      },
+    },
+  };
+}
+
+// ── TIME SERIES TABS ──────────────────────────────────────────────────────────
+function lastValid(series) {
+  for (let i = series.length - 1; i >= 0; i--) if (series[i] != null) return [series[i], i];
+  return [null, -1];
+}
+
+function growth(series, lag) {
+  return series.map((v, i) => {
+    const base = series[i - lag];
+    if (i < lag || v == null || base == null || base === 0) return null;
+    return +((v - base) / Math.abs(base) * 100).toFixed(2);
+  });
+}
+
+function seriesChart(ts, canvasId, metric, { type = 'line', unit = '', transform = null } = {}) {
+  const datasets = ts.nbfcs.map(n => {
+    const raw = ts.series[n.key][metric] || [];
+    const data = transform ? transform(raw) : raw;
+    return type === 'bar'
+      ? { label: n.name, data, backgroundColor: hexToRgba(n.color, 0.75), borderColor: n.color, borderWidth: 1, borderRadius: 3 }
+      : { label: n.name, data, borderColor: n.color, backgroundColor: hexToRgba(n.color, 0.08),
+          borderWidth: transform ? 1.5 : 2, pointRadius: transform ? 2 : 3, pointHoverRadius: 5, tension: 0.2, spanGaps: false };
+  });
+  makeChart(canvasId, { type, data: { labels: ts.quarters, datasets }, options: baseOptions(unit) });
+  notReportedNote(ts, canvasId, metric);
+}
+
+// "Not reported for <latest quarter>: …" under a chart, from the data itself
+function notReportedNote(ts, canvasId, metric) {
+  const wrap = document.getElementById(canvasId)?.closest('.chart-wrap');
+  if (!wrap) return;
+  const q = ts.quarters.length - 1;
+  const missing = ts.nbfcs.filter(n => (ts.series[n.key][metric] || [])[q] == null).map(n => n.name);
+  let note = wrap.nextElementSibling;
+  if (!note || !note.classList.contains('not-reported')) {
+    if (!missing.length) return;
+    note = document.createElement('div');
+    note.className = 'section-note not-reported';
+    wrap.after(note);
+  }
+  note.textContent = missing.length ? `Not reported for ${ts.quarters[q]}: ${missing.join(', ')}.` : '';
+}
+
+function kpiCards(ts, tabId, metric, unit, fmt) {
+  const section = document.querySelector(`#tab-${tabId} .section`);
+  if (!section) return;
+  const cards = ts.nbfcs.map(n => {
+    const series = ts.series[n.key][metric] || [];
+    const [latest, i] = lastValid(series);
+    const [prev] = lastValid(series.slice(0, Math.max(i, 0)));
+    const change = latest != null && prev != null && prev !== 0 ? (latest - prev) / Math.abs(prev) * 100 : null;
+    const changeHtml = change == null ? '' :
+      `<span class="kpi-change" style="color:${change >= 0 ? 'var(--success)' : 'var(--danger)'}">${change >= 0 ? '+' : ''}${change.toFixed(1)}%</span>`;
+    return `<div class="kpi-card" style="border-top-color:${n.color}">
+      <div class="kpi-name">${escapeHtml(n.name)}</div>
+      <div class="kpi-value">${latest != null ? fmt(latest) : '—'}<span class="kpi-unit">${unit}</span></div>
+      ${changeHtml}<div class="kpi-note">vs prev qtr</div></div>`;
+  });
+  const grid = document.createElement('div');
+  grid.className = 'kpi-grid';
+  grid.innerHTML = cards.join('');
+  section.prepend(grid);
+}
+
+function growthTable(ts) {
+  const q = ts.quarters.length - 1, label = ts.quarters[q];
+  const pct = (a, b) => (a != null && b) ? (a - b) / Math.abs(b) * 100 : null;
+  const fmtPct = v => v == null ? '<td style="font-family:var(--font-mono)">—</td>'
+    : `<td style="color:${v < 0 ? 'var(--danger)' : 'var(--success)'};font-family:var(--font-mono)">${v.toFixed(1)}%</td>`;
+  const fmtNum = v => `<td style="font-family:var(--font-mono)">${v != null ? v.toLocaleString('en-IN') : '—'}</td>`;
+  const rows = ts.nbfcs.map(n => {
+    const { aum_cr: aum, pat_cr: pat } = ts.series[n.key];
+    return `<tr><td>${dot(n.color)}${escapeHtml(n.name)}</td>
+      ${fmtNum(aum[q])}${fmtPct(pct(aum[q], aum[q - 1]))}${fmtPct(pct(aum[q], aum[q - 4]))}
+      ${fmtNum(pat[q])}${fmtPct(pct(pat[q], pat[q - 1]))}${fmtPct(pct(pat[q], pat[q - 4]))}</tr>`;
+  });
+  const section = document.createElement('div');
+  section.className = 'section';
+  section.innerHTML = `<div class="section-title">Growth Rate Summary — ${label}</div>
+    <div class="rank-table-wrap"><table class="rank-table">
+      <thead><tr><th>NBFC</th><th>AUM ${label} (₹Cr)</th><th>AUM QoQ %</th><th>AUM YoY %</th>
+        <th>PAT ${label} (₹Cr)</th><th>PAT QoQ %</th><th>PAT YoY %</th></tr></thead>
+      <tbody>${rows.join('')}</tbody></table></div>`;
+  document.getElementById('tab-financials').appendChild(section);
+}
+
+const fmt2 = v => v.toFixed(2);
+
+const TAB_INIT = {
+  market(ts) {
+    document.getElementById('ticker-list').textContent = 'Tickers: ' + ts.nbfcs.map(n => n.ticker).filter(Boolean).join(' · ');
+    const grid = document.getElementById('ticker-grid');
+    grid.innerHTML = ts.nbfcs.filter(n => n.ticker).map(n => `
+      <div class="ticker-card" style="border-top-color:${n.color}">
+        <div class="ticker-name">${escapeHtml(n.name)}</div>
+        <div class="ticker-symbol">${escapeHtml(n.ticker)}.NS</div>
+        <div style="display:flex;align-items:baseline">
+          <span class="ticker-price" data-price="${escapeHtml(n.ticker)}"><span class="loading-pulse"></span></span>
+          <span class="ticker-change" data-change="${escapeHtml(n.ticker)}"></span>
+        </div>
+        <div class="ticker-meta"><div class="ticker-meta-item">${escapeHtml(n.segment || '')}</div></div>
+      </div>`).join('');
+    fetchPrices(ts.nbfcs.filter(n => n.ticker));
+  },
+  financials(ts) {
+    seriesChart(ts, 'chart-aum-bar', 'aum_cr', { type: 'bar', unit: '₹ Crore' });
+    seriesChart(ts, 'chart-aum-qoq', 'aum_cr', { unit: '%', transform: s => growth(s, 1) });
+    seriesChart(ts, 'chart-aum-yoy', 'aum_cr', { unit: '%', transform: s => growth(s, 4) });
+    seriesChart(ts, 'chart-pat-bar', 'pat_cr', { type: 'bar', unit: '₹ Crore' });
+    seriesChart(ts, 'chart-pat-qoq', 'pat_cr', { unit: '%', transform: s => growth(s, 1) });
+    seriesChart(ts, 'chart-pat-yoy', 'pat_cr', { unit: '%', transform: s => growth(s, 4) });
+    seriesChart(ts, 'chart-nim', 'nim_pct', { unit: '%' });
+    kpiCards(ts, 'financials', 'aum_cr', '₹Cr', v => v >= 100000 ? (v / 100000).toFixed(1) + 'L' : v.toLocaleString('en-IN'));
+    growthTable(ts);
+  },
+  assetquality(ts) {
+    seriesChart(ts, 'chart-gnpa', 'gnpa_pct', { unit: '%' });
+    seriesChart(ts, 'chart-nnpa', 'nnpa_pct', { unit: '%' });
+    seriesChart(ts, 'chart-pcr', 'pcr_pct', { unit: '%' });
+    kpiCards(ts, 'assetquality', 'gnpa_pct', '%', fmt2);
+  },
+  capital(ts) {
+    seriesChart(ts, 'chart-cob', 'cost_of_borrowing_pct', { unit: '%' });
+    seriesChart(ts, 'chart-de', 'd_e_ratio', { unit: 'x' });
+    seriesChart(ts, 'chart-car', 'car_pct', { unit: '%' });
+    seriesChart(ts, 'chart-t1', 't1_pct', { unit: '%' });
+    seriesChart(ts, 'chart-t2', 't2_pct', { unit: '%' });
+  },
+  profitability(ts) {
+    seriesChart(ts, 'chart-roa', 'roa_pct', { unit: '%' });
+    seriesChart(ts, 'chart-roe', 'roe_pct', { unit: '%' });
+    kpiCards(ts, 'profitability', 'roa_pct', '%', fmt2);
+  },
+  valuation(ts) {
+    seriesChart(ts, 'chart-bvps-bar', 'bvps_inr', { type: 'bar', unit: '₹' });
+    seriesChart(ts, 'chart-bvps-line', 'bvps_inr', { unit: '₹' });
+  },
+  deepdive: renderDeepDive,
+  rankings: renderRankings,
+  aibulletin: initAIBulletin,
+  shareholding: renderShareholding,
+};
+
+// Live quotes: only works where the browser is allowed to reach Yahoo (CORS)
+async function fetchPrices(nbfcs) {
+  for (const n of nbfcs) {
+    const priceEl = document.querySelector(`[data-price="${CSS.escape(n.ticker)}"]`);
+    const changeEl = document.querySelector(`[data-change="${CSS.escape(n.ticker)}"]`);
+    try {
+      const url = `https://query2.finance.yahoo.com/v8/finance/chart/${encodeURIComponent(n.ticker)}.NS?range=1d&interval=1d`;
+      const resp = await fetch(url, { signal: AbortSignal.timeout(5000) });
+      if (!resp.ok) throw new Error('HTTP ' + resp.status);
+      const meta = (await resp.json())?.chart?.result?.[0]?.meta;
+      if (!meta) throw new Error('No meta');
+      const price = meta.regularMarketPrice, prev = meta.previousClose || meta.chartPreviousClose;
+      const change = price - prev;
+      priceEl.textContent = '₹' + price.toLocaleString('en-IN', { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+      changeEl.textContent = `${change >= 0 ? '+' : ''}${(change / prev * 100).toFixed(2)}%`;
+      changeEl.className = 'ticker-change ' + (change >= 0 ? 'pos' : 'neg');
+    } catch (e) {
+      priceEl.textContent = '—';
+    }
+  }
+}
+
+// ── DEEP DIVE ─────────────────────────────────────────────────────────────────
+const DEEP_DIVE_METRICS = ['aum_cr', 'pat_cr', 'nim_pct', 'roa_pct', 'roe_pct', 'gnpa_pct', 'nnpa_pct', 'pcr_pct',
+                           'cost_of_borrowing_pct', 'd_e_ratio', 'car_pct', 't1_pct', 't2_pct', 'bvps_inr'];
+const SHORT_LABELS = { cost_of_borrowing_pct: 'CoB', d_e_ratio: 'D/E', t1_pct: 'Tier 1', t2_pct: 'Tier 2' };
+
+// Company profile shown under each NBFC's sparklines, keyed by NBFC_TIMESERIES key
+const NBFC_SEGMENT_DETAIL = {
+  "Bajaj Finance": {
+    hq: "Pune, Maharashtra",
+    founded: 2007,
+    parentGroup: "Bajaj Finserv / Bajaj Group",
+    primarySegments: ["Consumer B2C EMI", "SME Lending", "Commercial Lending", "Rural B2C/B2B"],
+    rbiClassification: "Investment and Credit Company (ICC)",
+    depositTaking: "Yes (Fixed Deposits accepted)",
+    listedSince: 2010,
+    employees_approx: 45000,
+    branches_approx: 1800,
+    keyRisk: "Rising GNPA trend in H1FY26; credit cost pressure in unsecured consumer",
+    keyStrength: "Scale, multi-product cross-sell, FinAI transformation, strong CAR",
+  },
+  "Shriram Finance": {
+    hq: "Chennai, Tamil Nadu",
+    founded: 1974,
+    parentGroup: "Shriram Group",
+    primarySegments: ["Commercial Vehicle Finance", "Passenger Vehicle Finance", "MSME/SME Loans", "Gold Loans", "Fixed Deposits"],
+    rbiClassification: "Deposit-Taking NBFC (NBFC-D)",
+    depositTaking: "Yes (Public deposits accepted)",
+    listedSince: 2005,
+    employees_approx: 76000,
+    branches_approx: 3200,
+    keyRisk: "High GNPA (4.5%) due to CV/rural borrower profile; FII selling",
+    keyStrength: "Rural India deep distribution, vehicle finance expertise, high NIM, Shriram One app",
+  },
+  "Chola Finance": {
+    hq: "Chennai, Tamil Nadu",
+    founded: 1978,
+    parentGroup: "Murugappa Group",
+    primarySegments: ["Vehicle Finance", "Home Equity Loans", "SME Loans", "Secured Business Loans"],
+    rbiClassification: "Non-Deposit Taking NBFC (NBFC-ND)",
+    depositTaking: "No",
+    listedSince: 1992,
+    employees_approx: 54000,
+    branches_approx: 1387,
+    keyRisk: "Rapid AUM growth → elevated D/E; GNPA rising in newer segments",
+    keyStrength: "Strong promoter backing, diversified secured lending, tech modernization",
+  },
+  "Muthoot Finance": {
+    hq: "Ernakulam, Kerala",
+    founded: 1939,
+    parentGroup: "Muthoot Group",
+    primarySegments: ["Gold Loans (>90% AUM)", "Insurance Distribution", "Housing Finance", "Microfinance"],
+    rbiClassification: "Non-Deposit Taking NBFC (NBFC-ND), Systemically Important",
+    depositTaking: "No",
+    listedSince: 2011,
+    employees_approx: 27000,
+    branches_approx: 5000,
+    keyRisk: "Concentration in gold loans; regulatory risk on gold loan-to-value norms",
+    keyStrength: "Highest ROA+ROE in peer group, improving GNPA, Google Pay partnership",
+  },
+  "Aditya Birla Capital": {
+    hq: "Mumbai, Maharashtra",
+    founded: 2015,
+    parentGroup: "Aditya Birla Group",
+    primarySegments: ["NBFC Lending", "Housing Finance", "Life Insurance", "Health Insurance", "Asset Management", "Broking"],
+    rbiClassification: "Core Investment Company (CIC) + NBFC",
+    depositTaking: "No",
+    listedSince: 2017,
+    employees_approx: 27000,
+    branches_approx: 1000,
+    keyRisk: "Conglomerate discount; NIM compression to ~6%; limited BVPS history",
+    keyStrength: "Diversified financial services, 40M customers, GenAI CoE leadership, Birla AI Labs",
+  },
+  "Mahindra Finance": {
+    hq: "Mumbai, Maharashtra",
+    founded: 1991,
+    parentGroup: "Mahindra & Mahindra Group",
+    primarySegments: ["Vehicle Finance (M&M vehicles priority)", "MSME Loans", "Housing Finance", "Rural Finance"],
+    rbiClassification: "Non-Deposit Taking NBFC (NBFC-ND), Systemically Important",
+    depositTaking: "No",
+    listedSince: 2006,
+    employees_approx: 26000,
+    branches_approx: 1400,
+    keyRisk: "Elevated GNPA (3.8%); ROA/ROE lowest in peer group; rural credit cycle sensitivity",
+    keyStrength: "M&M parent ecosystem, Mahindra AI platform, rural distribution network",
+  },
+  "L&T Finance": {
+    hq: "Mumbai, Maharashtra",
+    founded: 1994,
+    parentGroup: "Larsen & Toubro Group",
+    primarySegments: ["Two-Wheeler Loans", "Rural Finance", "Consumer Finance", "SME Finance", "Home Loans"],
+    rbiClassification: "Non-Deposit Taking NBFC (NBFC-ND), Systemically Important",
+    depositTaking: "No",
+    listedSince: 2011,
+    employees_approx: 34000,
+    branches_approx: 2400,
+    keyRisk: "CAR declining from 22.8% to 19.1%; SME book quality; AUM growth moderating",
+    keyStrength: "Cyclops/Helios/Orion AI stack; highest PCR (72%); Lakshya retail transformation complete",
+  },
+  "Piramal Finance": {
+    hq: "Mumbai, Maharashtra",
+    founded: 1988,
+    parentGroup: "Piramal Enterprises",
+    primarySegments: ["Retail Mortgage Loans", "Emerging Business Loans", "Construction Finance", "MSME Loans"],
+    rbiClassification: "Non-Deposit Taking NBFC (NBFC-ND)",
+    depositTaking: "No",
+    listedSince: 1994,
+    employees_approx: 20000,
+    branches_approx: 600,
+    keyRisk: "Wholesale legacy book stress; limited historical disclosure; PCR lowest at 27.9%",
+    keyStrength: "Rapid retail AUM build, piramal.ai identity, Claude AI adoption, lowest D/E (2.7x)",
+  },
+  "Poonawalla Fincorp": {
+    hq: "Pune, Maharashtra",
+    founded: 1998,
+    parentGroup: "Cyrus Poonawalla Group (Rising Sun Holdings 63.95%)",
+    primarySegments: ["Personal Loans", "Business Loans", "Consumer Durable Loans", "Loan Against Securities", "Pre-owned Car Loans"],
+    rbiClassification: "Non-Deposit Taking NBFC (NBFC-ND)",
+    depositTaking: "No",
+    listedSince: 2000,
+    employees_approx: 8000,
+    branches_approx: 300,
+    keyRisk: "Rapid AUM growth → declining CAR (18.2%); Q2FY25 PAT loss; ROA recovery ongoing",
+    keyStrength: "Fastest growing NBFC, AI-first culture, IIT Bombay partnership, strong promoter",
+  },
+};
+
+function referencePanel(n) {
+  const info = NBFC_SEGMENT_DETAIL[n.key];
+  if (!info) return '';
+  const num = v => v?.toLocaleString('en-IN') ?? '—';
+  return `<div class="dd-reference" style="border-left-color:${n.color}">
+    <div>
+      <div class="dd-ref-title">Company Profile</div>
+      <div class="dd-ref-line">HQ: ${escapeHtml(info.hq)} · Founded: ${info.founded}</div>
+      <div class="dd-ref-line">Group: ${escapeHtml(info.parentGroup)}</div>
+      <div class="dd-ref-line">Listed: ${info.listedSince} · Employees: ~${num(info.employees_approx)}</div>
+      <div class="dd-ref-line">Branches: ~${num(info.branches_approx)}</div>
+      <div class="dd-ref-note">RBI Classification: ${escapeHtml(info.rbiClassification)}</div>
+      <div class="dd-ref-note${info.depositTaking.startsWith('Yes') ? ' val-up' : ''}">Deposit Taking: ${escapeHtml(info.depositTaking)}</div>
+    </div>
+    <div>
+      <div class="dd-ref-title">Segments</div>
+      <div class="dd-ref-segments">${info.primarySegments.map(s => `<span class="dd-ref-chip">${escapeHtml(s)}</span>`).join('')}</div>
+      <div class="dd-ref-note" style="color:var(--danger)"><b>Risk:</b> ${escapeHtml(info.keyRisk)}</div>
+      <div class="dd-ref-note" style="color:var(--success)"><b>Strength:</b> ${escapeHtml(info.keyStrength)}</div>
+    </div></div>`;
+}
+
+function renderDeepDive(ts) {
+  const container = document.getElementById('sparkline-all-nbfcs');
+  const sparks = [];
+  container.innerHTML = ts.nbfcs.map(n => {
+    const cards = DEEP_DIVE_METRICS.map(m => {
+      const data = ts.series[n.key][m] || [];
+      const [label, unit] = ts.metrics[m] || [m, ''];
+      const [latest, i] = lastValid(data);
+      const [prev] = lastValid(data.slice(0, Math.max(i, 0)));
+      const value = latest == null ? '—' : unit.includes('Cr') ? latest.toLocaleString('en-IN')
+        : latest.toFixed(unit === '₹' && latest >= 100 ? 0 : 2);
+      const badge = latest == null || prev == null || latest === prev ? ''
+        : `<span class="${latest > prev ? 'val-up' : 'val-down'}" style="font-size:10px">${latest > prev ? '▲' : '▼'}</span>`;
+      const canvasId = `spark-${n.key.replace(/\W/g, '')}-${m}`;
+      sparks.push([canvasId, data, n.color]);
+      return `<div class="spark-card">
+        <div class="spark-metric">${escapeHtml(SHORT_LABELS[m] || label)}</div>
+        <div style="display:flex;align-items:baseline;gap:4px">
+          <span class="spark-value">${value}</span><span class="spark-unit">${escapeHtml(unit.replace(' ', ''))}</span>${badge}
+        </div>
+        <div class="spark-canvas-wrap"><canvas id="${canvasId}"></canvas></div></div>`;
+    });
+    return `<div class="section">
+      <div class="section-title" style="display:flex;align-items:center;gap:8px">${dot(n.color, 10)}${escapeHtml(n.name)}</div>
+      <div class="sparkline-grid">${cards.join('')}</div>${referencePanel(n)}</div>`;
+  }).join('');
+  requestAnimationFrame(() => sparks.forEach(([id, data, color]) => makeChart(id, {
+    type: 'line',
+    data: { labels: ts.quarters, datasets: [{ data, borderColor: color, backgroundColor: hexToRgba(color, 0.15),
+      borderWidth: 1.5, pointRadius: 0, tension: 0.3, fill: true, spanGaps: false }] },
+    options: { responsive: true, maintainAspectRatio: false, animation: false,
+      plugins: { legend: { display: false }, tooltip: { enabled: false } },
+      scales: { x: { display: false }, y: { display: false } } },
+  })));
+}
+
+// ── RANKINGS ──────────────────────────────────────────────────────────────────
+const pctFmt = d => v => v != null ? v.toFixed(d) + '%' : '—';
+const RANK_COLS = [
+  { key: 'aum_cr',                fmt: v => v ? v.toLocaleString('en-IN') : '—', higherBetter: true },
+  { key: 'pat_cr',                fmt: v => v ? v.toLocaleString('en-IN') : '—', higherBetter: true },
+  { key: 'nim_pct',               fmt: pctFmt(2), higherBetter: true },
+  { key: 'roa_pct',               fmt: pctFmt(2), higherBetter: true },
+  { key: 'roe_pct',               fmt: pctFmt(2), higherBetter: true },
+  { key: 'gnpa_pct',              fmt: pctFmt(2), higherBetter: false },
+  { key: 'nnpa_pct',              fmt: pctFmt(2), higherBetter: false },
+  { key: 'pcr_pct',               fmt: pctFmt(1), higherBetter: true },
+  { key: 'cost_of_borrowing_pct', fmt: pctFmt(2), higherBetter: false },
+  { key: 'd_e_ratio',             fmt: v => v != null ? v.toFixed(2) + 'x' : '—', higherBetter: false },
+  { key: 'car_pct',               fmt: pctFmt(2), higherBetter: true },
+];
+
+function rankClasses(values, higherBetter) {
+  const valid = values.filter(v => v != null).sort((a, b) => higherBetter ? b - a : a - b);
+  const n = valid.length;
+  return values.map(v => {
+    if (v == null) return '';
+    const rank = valid.indexOf(v);
+    if (rank === 0) return 'cell-best';
+    if (rank === 1) return 'cell-good';
+    if (rank === n - 1) return 'cell-worst';
+    if (rank === n - 2) return 'cell-poor';
+    return 'cell-mid';
+  });
+}
+
+function renderRankings(rk) {
+  const rows = [...rk.rows].sort((a, b) => (b.aum_cr || 0) - (a.aum_cr || 0));
+  const classes = RANK_COLS.map(c => rankClasses(rows.map(r => r[c.key]), c.higherBetter));
+  document.getElementById('rank-tbody').innerHTML = rows.map((r, ri) =>
+    `<tr><td>${dot(r.color)}${escapeHtml(r.name)}</td>` +
+    RANK_COLS.map((c, ci) => `<td class="${classes[ci][ri]}">${c.fmt(r[c.key])}</td>`).join('') + '</tr>').join('');
+
+  const best = (key, higher) => rows.filter(r => r[key] != null).sort((a, b) => higher ? b[key] - a[key] : a[key] - b[key])[0];
+  const cards = [
+    ['Largest AUM', best('aum_cr', true), r => '₹' + r.aum_cr.toLocaleString('en-IN') + ' Cr'],
+    ['Highest PAT', best('pat_cr', true), r => '₹' + r.pat_cr.toLocaleString('en-IN') + ' Cr'],
+    ['Best ROA', best('roa_pct', true), r => r.roa_pct.toFixed(2) + '%'],
+    ['Cleanest Book (GNPA)', best('gnpa_pct', false), r => r.gnpa_pct.toFixed(2) + '%'],
+  ];
+  document.getElementById('highlight-grid').innerHTML = cards.map(([label, r, fmt]) => `
+    <div class="highlight-card">
+      <div class="highlight-label">${label}</div>
+      <div class="highlight-name">${r ? escapeHtml(r.name) : '—'}</div>
+      <div class="highlight-value">${r ? fmt(r) : '—'}</div>
+    </div>`).join('');
+}
+
+// Every metric × NBFC × quarter, from the time-series bundle
+async function exportCSV() {
+  const ts = await loadBundle('timeseries');
+  const rows = [['NBFC', 'Metric', ...ts.quarters]];
+  ts.nbfcs.forEach(n => Object.entries(ts.series[n.key]).forEach(([m, vals]) => rows.push([n.name, m, ...vals])));
+  const csv = rows.map(r => r.map(v => JSON.stringify(v == null ? '' : v)).join(',')).join('\n');
+  const a = document.createElement('a');
+  a.href = URL.createObjectURL(new Blob([csv], { type: 'text/csv' }));
+  a.download = `nbfc_intelligence_${ts.quarters[ts.quarters.length - 1].toLowerCase()}.csv`;
+  a.click();
+}
+
+// ── AI BULLETIN ───────────────────────────────────────────────────────────────
+let aiData = null;
+
+function initAIBulletin(ai) {
+  aiData = ai;
+  const fill = (id, values) => document.getElementById(id).insertAdjacentHTML('beforeend',
+    values.map(v => `<option value="${escapeHtml(v)}">${escapeHtml(v)}</option>`).join(''));
+  fill('ai-nbfc-filter', ai.nbfcs);
+  fill('ai-func-filter', ai.functions);
+  // Sort modes and their presorted orderings come from the bundle
+  document.getElementById('ai-sort').innerHTML = Object.keys(ai.sorts)
+    .map(s => `<option value="${escapeHtml(s)}">Sort: ${escapeHtml(s)}</option>`).join('');
+  ['ai-nbfc-filter', 'ai-func-filter', 'ai-sort'].forEach(id =>
+    document.getElementById(id).addEventListener('change', renderAIBulletin));
+  document.getElementById('ai-search').addEventListener('input', debounce(renderAIBulletin, 300));
+  renderAIBulletin();
+}
+
+function debounce(fn, ms) {
+  let timer;
+  return (...args) => { clearTimeout(timer); timer = setTimeout(() => fn(...args), ms); };
+}
+
+function renderAIBulletin() {
+  if (!aiData) return;
+  const query = document.getElementById('ai-search').value.toLowerCase().trim();
+  const nbfc = document.getElementById('ai-nbfc-filter').value;
+  const func = document.getElementById('ai-func-filter').value;
+  const order = aiData.sorts[document.getElementById('ai-sort').value];
+  const matches = order.map(i => aiData.items[i]).filter(it =>
+    (!nbfc || it.nbfc === nbfc) && (!func || it.functions.includes(func)) &&
+    (!query || [it.title, it.description, it.impact, it.nbfc].some(t => t.toLowerCase().includes(query))));
+
+  document.getElementById('bulletin-count').textContent = `Showing ${matches.length} of ${aiData.items.length} initiatives`;
+  const container = document.getElementById('initiative-cards');
+  if (!matches.length) {
+    container.innerHTML = '<div class="placeholder-note">No initiatives match the selected filters.</div>';
+    return;
+  }
+  const pattern = query ? new RegExp('(' + escapeHtml(query).replace(/[.*+?^${}()|[\]\\]/g, '\\$&') + ')', 'gi') : null;
+  const hl = text => pattern ? escapeHtml(text).replace(pattern, '<mark>$1</mark>') : escapeHtml(text);
+  container.innerHTML = matches.map(it => {
+    const color = aiData.colors[it.nbfc] || '#888';
+    const tags = it.functions.map(f => `<span class="func-tag">${escapeHtml(f)}</span>`).join('');
+    return `<div class="init-card" style="border-left-color:${color}">
+      <div class="init-card-header">
+        <span class="nbfc-badge" style="background:${color}">${escapeHtml(it.nbfc)}</span>
+        <span class="date-badge">${escapeHtml(it.date)}</span>
+      </div>
+      <div class="init-title">${hl(it.title)}</div>
+      <div class="init-impact">⚡ ${hl(it.impact)}</div>
+      <div class="init-desc">${hl(it.description)}</div>
+      <div class="init-footer">${tags}<a class="init-source" href="${escapeHtml(it.source_url)}" target="_blank" rel="noopener">↗ ${escapeHtml(it.source_name)}</a></div>
+    </div>`;
+  }).join('');
+}
+
+// ── SHAREHOLDING ──────────────────────────────────────────────────────────────
+const SH_CATEGORIES = ['Promoter', 'FII', 'DII', 'Public'];
+
+function renderShareholding(sh) {
+  const q = sh.quarters.length - 1;
+  const pctCell = (cls, v) => `<td class="${cls}">${v != null ? v.toFixed(2) + '%' : '—'}</td>`;
+  document.getElementById('sh-snapshot-title').textContent = `${sh.quarters[q]} Snapshot — Category %`;
+  document.getElementById('sh-detail-title').textContent = `Detailed View — ${sh.quarters.length}-Quarter Trend`;
+  document.getElementById('sh-snapshot-tbody').innerHTML = sh.nbfcs.map(({ name }) => {
+    const cp = sh.data[name].category_pct || {};
+    return `<tr><td>${escapeHtml(name)}</td>` +
+      SH_CATEGORIES.map(c => pctCell('sh-cell-' + c.toLowerCase(), (cp[c] || [])[q])).join('') + '</tr>';
+  }).join('');
+
+  const container = document.getElementById('sh-detail-all');
+  const charts = [];
+  container.innerHTML = sh.nbfcs.map(({ name, color }) => {
+    const canvasId = 'chart-sh-stacked-' + name.replace(/\W/g, '');
+    charts.push([canvasId, sh.data[name].category_pct || {}]);
+    return `<div style="margin-bottom:32px">
+      <div style="font-family:var(--font-mono);font-size:12px;color:${color};letter-spacing:0.06em;margin-bottom:12px;display:flex;align-items:center;gap:8px">${dot(color)}${escapeHtml(name)}</div>
+      <div class="chart-wrap" style="margin-bottom:12px"><canvas id="${canvasId}" height="260"></canvas></div>
+      <div class="entity-table-wrap"><table class="entity-table">
+        <thead><tr><th>Shareholder</th><th>Category</th>${sh.quarters.map(x => `<th>${escapeHtml(x)}</th>`).join('')}<th>Trend</th></tr></thead>
+        <tbody>${(sh.data[name].named_entities || []).map(ent => entityRow(sh, ent)).join('')}</tbody>
+      </table></div></div>`;
+  }).join('');
+
+  requestAnimationFrame(() => charts.forEach(([id, cp]) => {
+    const opts = baseOptions();
+    opts.interaction = undefined;
+    opts.scales.x.stacked = true;
+    Object.assign(opts.scales.y, { stacked: true, max: 100, ticks: { ...DARK_TICK, callback: v => v + '%' } });
+    opts.plugins.tooltip = { ...TOOLTIP, callbacks: { label: ctx => ` ${ctx.dataset.label}: ${ctx.parsed.y.toFixed(2)}%` } };
+    makeChart(id, {
+      type: 'bar',
+      data: {
+        labels: sh.quarters,
+        datasets: SH_CATEGORIES.map(c => {
+          const col = sh.category_colors[c] || '#94a3b8';
+          return { label: c, data: cp[c] || [], backgroundColor: hexToRgba(col, c === 'Public' ? 0.5 : 0.7),
+                   borderColor: col, borderWidth: 1, borderRadius: 2 };
+        }),
+      },
+      options: opts,
+    });
+  }));
+}
+
+function entityRow(sh, ent) {
+  const bg = sh.entity_colors[ent.category] || '#888', fg = sh.entity_text[ent.category] || '#fff';
+  const reported = ent.pct.filter(v => v != null);
+  const first = reported[0], last = reported[reported.length - 1];
+  const trend = first == null ? '' : last > first ? '▲' : last < first ? '▼' : '→';
+  const trendCls = last > first ? 'val-up' : last < first ? 'val-down' : 'val-flat';
+  let prev = null;
+  const cells = sh.quarters.map((_, i) => {
+    const v = ent.pct[i];
+    if (v == null) return '<td style="color:var(--text-muted)">—</td>';
+    const cls = prev == null ? '' : v > prev ? 'val-up' : v < prev ? 'val-down' : '';
+    prev = v;
+    return `<td class="${cls}">${v.toFixed(2)}%</td>`;
+  }).join('');
+  return `<tr><td>${escapeHtml(ent.name)}</td>
+    <td><span class="cat-badge" style="background:${bg};color:${fg}">${escapeHtml(ent.category)}</span></td>
+    ${cells}<td class="${trendCls}" style="font-weight:700">${trend}</td></tr>`;
+}
+
+// ── TABS ──────────────────────────────────────────────────────────────────────
+const TAB_IDS = [...document.querySelectorAll('.tab-btn')].map(b => b.dataset.tab);
+const tabLoaded = {};
+
+function switchTab(tabId) {
+  document.querySelectorAll('.tab-content').forEach(t => t.classList.toggle('active', t.id === 'tab-' + tabId));
+  document.querySelectorAll('.tab-btn').forEach(b => b.classList.toggle('active', b.dataset.tab === tabId));
+  if (tabLoaded[tabId]) return;
+  tabLoaded[tabId] = true;
+  const tab = document.getElementById('tab-' + tabId);
+  tab.querySelector('.load-error')?.remove();
+  const spinner = document.createElement('div');
+  spinner.className = 'spinner-wrap';
+  spinner.innerHTML = '<div class="spinner"></div>';
+  tab.prepend(spinner);
+  loadBundle(MANIFEST.tabs[tabId])
+    .then(data => TAB_INIT[tabId](data))
+    .catch(err => {
+      tabLoaded[tabId] = false;
+      tab.insertAdjacentHTML('afterbegin', `<div class="placeholder-note load-error">Could not load data: ${escapeHtml(err.message)}</div>`);
+    })
+    .finally(() => spinner.remove());
+}
+
+document.querySelectorAll('.tab-btn').forEach(btn => btn.addEventListener('click', () => switchTab(btn.dataset.tab)));
+document.getElementById('export-btn').addEventListener('click', exportCSV);
+// Alt+1 … Alt+0 jump to a tab
+document.addEventListener('keydown', e => {
+  if (!e.altKey || !/^[0-9]$/.test(e.key)) return;
+  const tabId = TAB_IDS[(+e.key + 9) % 10];
+  if (tabId) switchTab(tabId);
+});
+switchTab(TAB_IDS[0]);
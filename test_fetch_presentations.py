@@ -0,0 +1,313 @@
+"""
+PDF parser test suite
+Builds small synthetic investor decks with PyMuPDF and checks parse_pdf.
+Run with: python3 test_fetch_presentations.py
+"""
+
+import os, sys, tempfile, unittest
+from unittest.mock import patch
+
+import fitz  # PyMuPDF
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fetch_presentations as fp
+
+
+# ── Synthetic deck builder ───────────────────────────────────────────────────
+# Each page is a list of (x, y, text) placements; one placement per word/cell
+# so get_text("words") sees the same layout a real table slide would produce.
+
+def _table(y0, header, rows, x0=60, col_w=110, label_w=200):
+    cells = [(x0 + label_w + i * col_w, y0, h) for i, h in enumerate(header)]
+    for r, (label, vals) in enumerate(rows, start=1):
+        y = y0 + r * 22
+        cells.append((x0, y, label))
+        cells += [(x0 + label_w + i * col_w, y, v) for i, v in enumerate(vals)]
+    return cells
+
+
+FILLER_PAGE = [(60, 80, 'Notice to Stock Exchange'), (60, 110, 'Regulation 30 disclosure')]
+
+HIGHLIGHTS_PAGE = [
+    (60, 60,  'Key Highlights'),
+    (60, 100, 'AUM'), (200, 100, 'Rs. 55,017 Cr'),
+    (60, 130, 'Disbursement of Rs. 12,345 crore in the quarter'),
+]
+
+PL_PAGE = [(60, 50, 'Profit and Loss Statement')] + _table(90, ['Q2FY26', 'Q3FY26'], [
+    ('Net Interest Income', ['1,100', '1,245']),
+    ('Profit after Tax',    ['74',    '150']),
+])
+
+RATIOS_PAGE = [(60, 50, 'Key Ratios')] + _table(90, ['Q2FY26', 'Q3FY26'], [
+    ('NIM',         ['8.40', '8.62']),
+    ('GNPA (%)',    ['1.59', '1.51']),
+    ('NNPA (%)',    ['0.81', '0.80']),
+    ('RoA',         ['0.69', '1.20']),
+    ('RoE',         ['3.30', '6.10']),
+    ('CRAR',        ['20.85', '18.17']),
+])
+
+BALANCE_SHEET_PAGE = [(60, 50, 'Balance Sheet')] + _table(90, ['Sep-25', 'Dec-25'], [
+    ('Equity Share Capital',  ['161', '162']),
+    ('Reserves and Surplus',  ['9,661', '9,834']),
+])
+
+
+def build_pdf(path, pages):
+    doc = fitz.open()
+    for placements in pages:
+        page = doc.new_page()
+        for x, y, text in placements:
+            page.insert_text((x, y), text, fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+class _DeckTestCase(unittest.TestCase):
+    PAGES = []
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self._tmp.name, 'deck.pdf')
+        build_pdf(self.pdf_path, self.PAGES)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+
+class TestParseSyntheticDeck(_DeckTestCase):
+    PAGES = [FILLER_PAGE, HIGHLIGHTS_PAGE, PL_PAGE, RATIOS_PAGE, BALANCE_SHEET_PAGE]
+
+    def test_extracts_all_metrics(self):
+        data = fp.parse_pdf(self.pdf_path, face_value=2)
+        self.assertEqual(data['aum_cr'], 55017)
+        self.assertEqual(data['disbursements_cr'], 12345)
+        self.assertEqual(data['nii_cr'], 1245)
+        self.assertEqual(data['pat_cr'], 150)
+        self.assertEqual(data['nim_pct'], 8.62)
+        self.assertEqual(data['gnpa_pct'], 1.51)
+        self.assertEqual(data['nnpa_pct'], 0.80)
+        self.assertEqual(data['roa_pct'], 1.20)
+        self.assertEqual(data['roe_pct'], 6.10)
+        self.assertEqual(data['car_pct'], 18.17)
+        self.assertEqual(data['share_capital_cr'], 162)
+        self.assertEqual(data['reserves_cr'], 9834)
+        self.assertEqual(data['book_value_per_share'], 123.41)
+
+
+class TestPageIndex(_DeckTestCase):
+    PAGES = [HIGHLIGHTS_PAGE, FILLER_PAGE, PL_PAGE, FILLER_PAGE, RATIOS_PAGE,
+             BALANCE_SHEET_PAGE, RATIOS_PAGE, FILLER_PAGE]
+
+    def test_index_maps_groups_to_pages(self):
+        doc = fitz.open(self.pdf_path)
+        pages = [(i, doc[i], doc[i].get_text()) for i in range(len(doc))]
+        index = fp.build_page_index(pages)
+        doc.close()
+        self.assertEqual(index['aum'], {0})
+        self.assertEqual(index['pl'], {2})
+        self.assertEqual(index['car'], {4, 6})
+        self.assertEqual(index['bs'], {5})
+        self.assertFalse(any(1 in hits or 3 in hits or 7 in hits for hits in index.values()))
+
+    def test_word_extraction_skips_irrelevant_pages_and_stops_early(self):
+        seen = []
+        real_page_rows = fp.page_rows
+
+        def _spy(page, *a, **kw):
+            seen.append(page.number)
+            return real_page_rows(page, *a, **kw)
+
+        with patch.object(fp, 'page_rows', side_effect=_spy):
+            data = fp.parse_pdf(self.pdf_path)
+        # Filler pages never word-extracted; the repeated ratios page (6) is
+        # skipped because every metric was already found on page 5.
+        self.assertEqual(seen, [0, 2, 4, 5])
+        self.assertTrue(fp._all_metrics_found(data))
+
+
+class TestRowClustering(unittest.TestCase):
+    @staticmethod
+    def _word(text, x, y_mid):
+        return (x, y_mid - 4, x + 30, y_mid + 4, text, 0, 0, 0)
+
+    def test_row_straddling_bucket_edge_stays_together(self):
+        # y-mids 11.9 / 12.1 used to round into different 8pt buckets
+        words = [self._word('NIM', 60, 11.9), self._word('8.62', 260, 12.1),
+                 self._word('RoA', 60, 34.0), self._word('1.20', 260, 34.4)]
+        rows = fp.cluster_rows(words)
+        self.assertEqual([list(ws) for ws, _, _ in rows], [['NIM', '8.62'], ['RoA', '1.20']])
+        self.assertEqual([round(y, 1) for y in rows[0][2]], [11.9, 12.1])
+
+    def _staggered(self, n_lines, per_line=8):
+        # Baselines alternate 0 / 3 / 6 pt within a line and lines are 10 pt
+        # apart, so each word is at most 4 pt below the previous one
+        return [self._word(f'l{r}w{c}', 40 + c * 45, 20 + r * 10 + 3 * (c % 3))
+                for r in range(n_lines) for c in range(per_line)]
+
+    def test_staggered_lines_do_not_chain(self):
+        # Comparing with the previous word instead of the row's top merged all 24 words
+        words = self._staggered(3)
+        for threshold in (10**9, 0):
+            with patch.object(fp, '_NUMPY_MIN_WORDS', threshold):
+                rows = fp.cluster_rows(words)
+            self.assertEqual([len(ws) for ws, _, _ in rows], [8, 8, 8])
+            self.assertEqual([list(ws)[0] for ws, _, _ in rows], ['l0w0', 'l1w0', 'l2w0'])
+
+    def test_numpy_and_python_sweeps_agree(self):
+        import random
+        rnd = random.Random(7)
+        row_ids = [rnd.randrange(60) for _ in range(600)]
+        jittered = [self._word(f'w{i}', rnd.uniform(0, 500), r * 14 + rnd.uniform(-2, 2))
+                    for i, r in enumerate(row_ids)]
+        staggered = self._staggered(fp._NUMPY_MIN_WORDS // 8 + 1)
+        for words, n_rows in ((jittered, len(set(row_ids))), (staggered, len(staggered) // 8)):
+            self.assertGreaterEqual(len(words), fp._NUMPY_MIN_WORDS)
+            np_rows = fp.cluster_rows(words)
+            with patch.object(fp, '_NUMPY_MIN_WORDS', 10**9):
+                py_rows = fp.cluster_rows(words)
+            self.assertIsInstance(np_rows[0][0], np.ndarray)
+            self.assertEqual([list(ws) for ws, _, _ in py_rows], [ws.tolist() for ws, _, _ in np_rows])
+            self.assertEqual(len(np_rows), n_rows)
+
+
+class TestTokenizer(unittest.TestCase):
+    TEXT = ('AUM of ₹ 55,017 crore; Rs.2.1 lakh crore milestone. NIM up 35 bps to 8.62%. '
+            'Borrowers 1,234 Cr. Disbursement Rs 12,345 Crores')
+
+    def test_amount_tokens_are_typed(self):
+        toks = fp.tokenize_amounts(self.TEXT)
+        self.assertEqual([(t.kind, t.value, t.cur) for t in toks], [
+            ('cr',      55017.0, '₹'),
+            ('lakh_cr', 2.1,     'Rs.'),
+            ('cr',      1234.0,  None),     # "rs" inside "Borrowers" is not a prefix
+            ('cr',      12345.0, 'Rs'),
+        ])
+        self.assertEqual(self.TEXT[toks[0].start:toks[0].end], '₹ 55,017 crore')
+
+    def test_narrative_value_uses_keyword_window(self):
+        tok = fp.tokenize_page(self.TEXT)
+        self.assertEqual(fp._find_narrative_value(tok, fp._DISB_KW, 500, 500_000), 12345)
+        self.assertEqual(fp._parse_amount('Rs.2.1 lakh crore'), 210000)
+        self.assertIsNone(fp._find_narrative_value(tok, fp._DISB_KW, 500, 500_000, window=20))
+
+
+LATEST_FIRST_PL_PAGE = [(60, 50, 'Profit and Loss Statement')] + _table(
+    90, ['Q3FY26', 'Q2FY26', 'Q3FY25'], [
+        ('Net Interest Income', ['1,245', '1,100', '980']),
+        ('Profit after Tax',    ['150',   '74',    '120']),
+    ], col_w=90)
+
+
+class TestTableEngine(_DeckTestCase):
+    PAGES = [HIGHLIGHTS_PAGE, LATEST_FIRST_PL_PAGE, RATIOS_PAGE, BALANCE_SHEET_PAGE]
+
+    def setUp(self):
+        super().setUp()
+        fp._TABLE_CACHE.clear()
+
+    def test_period_keys_order_quarters_and_dates(self):
+        keys = [fp._period_key(c) for c in ['Q4FY25', 'Q1FY26', 'Sep-25', 'Q3FY26', 'Mar-26']]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(fp._period_key('Q2FY26'), fp._period_key('Sep-25'))
+        self.assertIsNone(fp._period_key('9MFY26'))
+
+    def test_find_tables_reads_latest_quarter_column(self):
+        heuristic = fp.parse_pdf(self.pdf_path)
+        tables    = fp.parse_pdf(self.pdf_path, engine='find_tables')
+        self.assertEqual(heuristic['nii_cr'], 980)       # positional: last column
+        self.assertEqual(tables['nii_cr'], 1245)         # header-mapped: Q3FY26
+        self.assertEqual(tables['pat_cr'], 150)
+        for key in ('aum_cr', 'nim_pct', 'gnpa_pct', 'car_pct', 'book_value_per_share'):
+            self.assertEqual(tables[key], heuristic[key], key)
+
+    def test_tables_detected_once_per_page(self):
+        calls = []
+        real = fitz.Page.find_tables
+
+        def _spy(page, *a, **kw):
+            calls.append(page.number)
+            return real(page, *a, **kw)
+
+        with patch.object(fitz.Page, 'find_tables', _spy):
+            first  = fp.parse_pdf(self.pdf_path, engine='find_tables')
+            n      = len(calls)
+            second = fp.parse_pdf(self.pdf_path, engine='find_tables')
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), n)
+
+    def test_table_cache_is_lru_bounded(self):
+        doc = fitz.open(self.pdf_path)
+        with patch.object(fp, '_TABLE_CACHE_MAX', 2):
+            for n in (0, 1, 0, 2, 3):
+                fp.page_tables(doc[n])
+        doc.close()
+        # page 0 was refreshed by its second lookup, so page 1 went first
+        self.assertEqual([k[2] for k in fp._TABLE_CACHE], [2, 3])
+
+    def test_unknown_engine_rejected(self):
+        with self.assertRaises(ValueError):
+            fp.parse_pdf(self.pdf_path, engine='camelot')
+
+
+class TestParallelExtraction(unittest.TestCase):
+    """workers > 1 must return exactly what the serial parser returns."""
+
+    DECKS = {
+        'standard':  [FILLER_PAGE, HIGHLIGHTS_PAGE, PL_PAGE, RATIOS_PAGE, BALANCE_SHEET_PAGE],
+        'repeated':  [HIGHLIGHTS_PAGE, FILLER_PAGE, PL_PAGE, FILLER_PAGE, RATIOS_PAGE,
+                      BALANCE_SHEET_PAGE, RATIOS_PAGE, FILLER_PAGE],
+        'reversed':  [BALANCE_SHEET_PAGE, RATIOS_PAGE, PL_PAGE, HIGHLIGHTS_PAGE, PL_PAGE],
+        'partial':   [FILLER_PAGE, RATIOS_PAGE, FILLER_PAGE],
+        'text_only': [FILLER_PAGE, FILLER_PAGE],
+    }
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_parallel_matches_serial(self):
+        for name, pages in self.DECKS.items():
+            path = os.path.join(self._tmp.name, f'{name}.pdf')
+            build_pdf(path, pages)
+            for lending_only in (False, True):
+                for engine in fp.TABLE_ENGINES:
+                    with self.subTest(deck=name, lending_only=lending_only, engine=engine):
+                        kw       = dict(lending_only=lending_only, engine=engine)
+                        serial   = fp.parse_pdf(path, **kw)
+                        parallel = fp.parse_pdf(path, workers=3, **kw)
+                        self.assertEqual(parallel, serial)
+
+    def test_merge_keeps_earliest_page_and_linked_note(self):
+        merged = fp.merge_page_results([
+            (4, {'gnpa_pct': 1.2, 'gnpa_note': 'Stage 3 ratio', 'nim_pct': 9.0}),
+            (1, {'gnpa_pct': 1.5, 'nnpa_pct': 0.7}),
+            (2, {'nim_pct': 8.5}),
+        ])
+        self.assertEqual(merged, {'gnpa_pct': 1.5, 'nnpa_pct': 0.7, 'nim_pct': 8.5})
+
+
+class TestRunIngest(unittest.TestCase):
+    """run() only reports against the store unless --ingest is given."""
+
+    def _run(self, **kw):
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(fp, 'DATA_DIR', tmp), patch.object(fp, 'PDF_DIR', tmp), \
+                patch.object(fp, 'fetch_presentation_list', return_value=[]), \
+                patch.object(fp.ingest_presentations, 'ingest', return_value=[]) as ingest:
+            fp.run('poonawalla', **kw)
+        return ingest.call_args
+
+    def test_default_is_a_dry_run(self):
+        self.assertEqual(self._run().kwargs, {'dry_run': True})
+
+    def test_ingest_flag_writes(self):
+        self.assertEqual(self._run(ingest=True).kwargs, {'dry_run': False})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
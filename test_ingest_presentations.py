@@ -0,0 +1,111 @@
+"""
+Ingest test suite
+Writes small data/<company>.json files into a temp dir and checks they are
+mapped to quarters, reconciled and merged into a temp data store.
+Run with: python3 test_ingest_presentations.py
+"""
+
+import json, os, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_store
+import ingest_presentations as ip
+
+QUARTERS = ['Q2FY26', 'Q3FY26']
+SERIES   = {'Bajaj Finance': {'aum_cr': [462261, None], 'pat_cr': [4948, 5317]}}
+
+
+class TestFilingQuarter(unittest.TestCase):
+    def test_month_windows(self):
+        cases = {'2026-02-03': 'Q3FY26', '2025-04-29': 'Q4FY25', '2025-07-24': 'Q1FY26',
+                 '2025-11-10': 'Q2FY26', '202512': 'Q2FY26', '2099-12-31': 'Q2FY00'}
+        for date, q in cases.items():
+            with self.subTest(date=date):
+                self.assertEqual(ip.filing_quarter(date), q)
+
+
+class TestReconcile(unittest.TestCase):
+    def _status(self, changes):
+        return {(c.quarter, c.metric): c.status for c in changes}
+
+    def test_fill_match_conflict(self):
+        doc = {'company': 'Bajaj Finance', 'quarters': [
+            {'filing_date': '2026-02-03', 'aum_cr': 485883.0, 'pat_cr': 4066.0},
+            {'filing_date': '2025-11-10', 'aum_cr': 462300.0, 'nii_cr': 10785.0},
+        ]}
+        status = self._status(ip.reconcile('bajaj', doc, SERIES, QUARTERS))
+        self.assertEqual(status[('Q3FY26', 'aum_cr')], 'added')
+        self.assertEqual(status[('Q3FY26', 'pat_cr')], 'conflict')
+        self.assertEqual(status[('Q2FY26', 'aum_cr')], 'match')
+        self.assertEqual(status[('Q2FY26', 'nii_cr')], 'added')
+
+        status = self._status(ip.reconcile('bajaj', doc, SERIES, QUARTERS, overwrite=True))
+        self.assertEqual(status[('Q3FY26', 'pat_cr')], 'overwritten')
+
+    def test_earliest_filing_in_quarter_wins(self):
+        doc = {'company': 'Bajaj Finance', 'quarters': [
+            {'filing_date': '2025-12-05', 'aum_cr': 16340.0},
+            {'filing_date': '2025-11-10', 'aum_cr': 462261.0},
+        ]}
+        changes = ip.reconcile('bajaj', doc, SERIES, QUARTERS)
+        self.assertEqual([(c.filing, c.status) for c in changes],
+                         [('2025-12-05', 'duplicate'), ('2025-11-10', 'match')])
+
+    def test_out_of_range_and_unknown_company(self):
+        doc = {'company': 'Bajaj Finance', 'quarters': [{'filing_date': '2026-05-01', 'aum_cr': 1.0}]}
+        self.assertEqual([c.status for c in ip.reconcile('bajaj', doc, SERIES, QUARTERS)],
+                         ['out_of_range'])
+        doc['company'] = 'Unlisted Finance'
+        self.assertEqual([c.status for c in ip.reconcile('x', doc, SERIES, QUARTERS)],
+                         ['unknown_company'])
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        self._tmp  = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self._tmp.name, 'store.sqlite')
+        self.json  = os.path.join(self._tmp.name, 'bajaj.json')
+        nbfc_store.clear_cache()
+        nbfc_store.write_dataset('timeseries', {'QUARTERS': QUARTERS, 'NBFC_TIMESERIES': SERIES},
+                                 self.store)
+        self._write({'company': 'Bajaj Finance', 'quarters': [
+            {'filing_date': '2026-02-03', 'aum_cr': 485883.0, 'pat_cr': 4066.0,
+             'disbursements_cr': 4600.0}]})
+
+    def tearDown(self):
+        nbfc_store.clear_cache()
+        self._tmp.cleanup()
+
+    def _write(self, doc):
+        with open(self.json, 'w') as f:
+            json.dump(doc, f)
+
+    def _series(self):
+        return nbfc_store.load('timeseries', self.store)['NBFC_TIMESERIES']['Bajaj Finance']
+
+    def test_merge_is_incremental(self):
+        ip.ingest([self.json], self.store)
+        series = self._series()
+        self.assertEqual(series['aum_cr'], [462261, 485883.0])
+        self.assertEqual(series['pat_cr'], [4948, 5317])             # conflict keeps stored value
+        self.assertEqual(series['disbursements_cr'], [None, 4600.0])  # new metric, padded
+        self.assertEqual(list(series), ['aum_cr', 'pat_cr', 'disbursements_cr'])
+        version = nbfc_store.versions(self.store)['timeseries']
+
+        # unchanged file: skipped, no new version
+        self.assertEqual(ip.ingest([self.json], self.store), [])
+        self.assertEqual(nbfc_store.versions(self.store)['timeseries'], version)
+
+        # --force re-reads it; --overwrite lets the parsed value win
+        ip.ingest([self.json], self.store, overwrite=True, force=True)
+        self.assertEqual(self._series()['pat_cr'], [4948, 4066.0])
+
+    def test_dry_run_writes_nothing(self):
+        changes = ip.ingest([self.json], self.store, dry_run=True)
+        self.assertTrue(any(c.status == 'added' for c in changes))
+        self.assertEqual(self._series(), SERIES['Bajaj Finance'])
+        self.assertEqual(nbfc_store.ingested_sources('timeseries', self.store), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Analytics test suite
+Checks the pure computations behind the charts and API: growth alignment,
+peer ranks with ties and gaps, the metric cube with its heat-map colours
+(vectorised and per column) and rank / percentile matrices, fiscal quarter
+ends, daily P/B against the latest reported BVPS, indexed returns,
+comparison periods, end-label layout, radar normalisation (per NBFC and
+vectorised, three methods), cross-sectional peer statistics and the insight
+frame behind batch SWOT.
+Run with: python3 test_nbfc_analytics.py
+"""
+
+import os, sys, unittest
+from datetime import date, datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_analytics as na
+
+
+def series(**by_name):
+    """NBFC_TIMESERIES-shaped dict from {display name: {metric: values}}."""
+    return {na.CACHE_KEY[n]: m for n, m in by_name.items()}
+
+
+class TestAnalytics(unittest.TestCase):
+    def test_growth(self):
+        self.assertEqual(na.growth([100, 110, None, 121, 0, 5], 1), [None, 10.0, None, None, -100.0, 0.0])
+        self.assertEqual(na.growth([100, 200, 300], 4), [None, None, None])
+        self.assertEqual(na.growth([50, 1, 1, 1, 75], 4), [None, None, None, None, 50.0])
+
+    def test_rankings(self):
+        ts = series(**{'Bajaj Finance':   {'aum_cr': [5], 'gnpa_pct': [2.0]},
+                       'Shriram Finance': {'aum_cr': [9], 'gnpa_pct': [1.0]},
+                       'L&T Finance':     {'aum_cr': [9], 'gnpa_pct': [None]}})
+        r = na.rankings(ts, 0, [('aum_cr', '', 'cr', False), ('gnpa_pct', '', 'pct', True)])
+        self.assertEqual(r['Shriram Finance'], {'aum_cr': (9, 1), 'gnpa_pct': (1.0, 1)})
+        self.assertEqual(r['L&T Finance'], {'aum_cr': (9, 1), 'gnpa_pct': (None, None)})
+        self.assertEqual(r['Bajaj Finance'], {'aum_cr': (5, 3), 'gnpa_pct': (2.0, 2)})
+        self.assertEqual(r['Muthoot Finance']['aum_cr'], (None, None))
+
+    def test_heat_colors(self):
+        self.assertEqual(na.heat_colors([1.0, None, 2.0, 3.0], False),
+                         ['rgba(220,60,60,0.35)', na.HEAT_NONE, 'rgba(255,215,50,0.35)', 'rgba(60,190,80,0.35)'])
+        self.assertEqual(na.heat_colors([1.0, 3.0], True), ['rgba(60,190,80,0.35)', 'rgba(220,60,60,0.35)'])
+        self.assertEqual(na.heat_colors([2, 2, None], False), [na.HEAT_FLAT, na.HEAT_FLAT, na.HEAT_NONE])
+        self.assertEqual(na.heat_colors([None], False), [na.HEAT_NONE])
+        self.assertEqual([na.fmt_cell(v, f) for v, f in ((509975.6, 'cr'), (1.014, 'pct'), (4.8, 'ratio'), (None, 'pct'))],
+                         ['₹509,975', '1.01%', '4.80x', '—'])
+
+    def test_heat_matrix_matches_columns(self):
+        cols = [[1.0, None, 2.0, 3.0], [4.0, 4.0, None, 4.0], [None] * 4, [0.5, 9.0, -3.0, 2.25]]
+        lower = [False, True, False, True]
+        rows = [list(r) for r in zip(*[[float('nan') if v is None else v for v in c] for c in cols])]
+        self.assertEqual(na.heat_matrix(rows, lower), [na.heat_colors(c, l) for c, l in zip(cols, lower)])
+
+    def test_metric_cube_and_cells(self):
+        ts = series(**{'Bajaj Finance':   {'aum_cr': [5, 7], 'gnpa_pct': [2.0, None]},
+                       'Shriram Finance': {'aum_cr': [9], 'gnpa_pct': [1.0, 1.5]}})
+        defs = [('aum_cr', '', 'cr', False), ('gnpa_pct', '', 'pct', True)]
+        cube = na.metric_cube(ts, [d[0] for d in defs], 2, ['Bajaj Finance', 'Shriram Finance', 'Muthoot Finance'])
+        self.assertEqual(cube.shape, (3, 2, 2))
+        self.assertEqual(cube[0, 0].tolist(), [5.0, 7.0])
+        self.assertTrue(all(v != v for v in (cube[1, 0, 1], cube[0, 1, 1], *cube[2].ravel())))
+        text, fills = na.rankings_cells(cube[:, :, 0], defs)
+        self.assertEqual(text, [['₹5', '₹9', '—'], ['2.00%', '1.00%', '—']])
+        self.assertEqual(fills, [na.heat_colors([5, 9, None], False), na.heat_colors([2.0, 1.0, None], True)])
+
+    def test_rank_matrices(self):
+        ts = series(**{'Bajaj Finance':   {'aum_cr': [5, 7], 'gnpa_pct': [2.0, None]},
+                       'Shriram Finance': {'aum_cr': [9, 7], 'gnpa_pct': [1.0, 1.5]},
+                       'L&T Finance':     {'aum_cr': [9, 6], 'gnpa_pct': [None, 1.5]}})
+        defs = [('aum_cr', '', 'cr', False), ('gnpa_pct', '', 'pct', True)]
+        names = ['Bajaj Finance', 'Shriram Finance', 'L&T Finance', 'Muthoot Finance']
+        cube = na.metric_cube(ts, ['aum_cr', 'gnpa_pct'], 2, names)
+        ranks, pct = na.rank_matrices(cube, [False, True])
+        for q in (0, 1):
+            expected = na.rankings(ts, q, defs)
+            for i, n in enumerate(names):
+                for j, (m, *_) in enumerate(defs):
+                    r = ranks[i, j, q]
+                    self.assertEqual(None if r != r else int(r), expected[n][m][1], (n, m, q))
+        self.assertEqual(pct[:3, 0, 0].tolist(), [0.0, 100.0, 100.0])    # 9, 9 tie for best
+        self.assertEqual(pct[:3, 0, 1].tolist(), [100.0, 100.0, 0.0])
+        self.assertEqual(pct[1:3, 1, 1].tolist(), [100.0, 100.0])        # only two report, tied
+        self.assertTrue(pct[3, 0, 0] != pct[3, 0, 0])
+        self.assertEqual(na.leaders(ranks, cube, 0), [(1, 9.0), (1, 1.0)])
+        self.assertEqual(na.leaders(ranks[:1, :, :], cube[:1], 1), [(0, 7.0), (None, None)])
+
+    def test_quarter_end(self):
+        self.assertEqual([na.quarter_end(q) for q in ('Q4FY24', 'Q1FY25', 'Q2FY25', 'Q3FY25', 'Q4FY25')],
+                         [date(2024, 3, 31), date(2024, 6, 30), date(2024, 9, 30), date(2024, 12, 31),
+                          date(2025, 3, 31)])
+
+    def test_pb_series(self):
+        days = [datetime(2024, 3, 29), datetime(2024, 4, 1), datetime(2024, 7, 1), datetime(2024, 7, 2)]
+        out = na.pb_series([100, 0, 50], ['Q3FY24', 'Q4FY24', 'Q1FY25'], days, [200, 210, 300, 310])
+        self.assertEqual(out, ([days[0], days[2], days[3]], [2.0, 6.0, 6.2], [200.0, 300.0, 310.0], [100, 50, 50]))
+        self.assertEqual(na.pb_series([100], ['Q1FY25'], [date(2024, 1, 1)], [1.0]), ([], [], [], []))
+
+    def test_prices(self):
+        closes = pd.Series([50.0, 75.0, 40.0], index=pd.date_range('2026-01-01', periods=3))
+        idx, first, last = na.indexed(closes)
+        self.assertEqual((list(idx), first, last), ([100.0, 150.0, 80.0], 50.0, 40.0))
+        self.assertEqual(list(na.market_cap_lcr(closes, 2e10)), [1.0, 1.5, 0.8])
+        self.assertEqual(na.comparison_window('1M', date(2026, 3, 31)), (date(2026, 3, 1), date(2026, 3, 31)))
+        self.assertEqual(na.comparison_window('??', date(2026, 3, 31))[0], date(2025, 10, 2))
+        self.assertEqual([na.fallback_period(p) for p in ('1W', '1M', '3M', '6M', '1Y', '3Y', '5Y', '??')],
+                         ['5d', '1mo', '3mo', '6mo', '1y', '3y', '5y', '6mo'])
+
+    def test_label_layout(self):
+        self.assertEqual(na.label_gap([1.0, 3.0], 0.1, 0.05), 0.2)
+        self.assertEqual(na.label_gap([2.0, 2.0], 0.1, 0.05), 0.1)
+        self.assertEqual(na.label_gap([], 0.1, 0.5), 0.5)
+        self.assertEqual(na.label_slots([10.0, 9.5, 9.4, 5.0], 1.0), [10.0, 9.0, 8.0, 5.0])
+
+    def test_radar(self):
+        ts = series(**{'Poonawalla Fincorp': {'roa_pct': [1.0], 'gnpa_pct': [1.0]},
+                       'Bajaj Finance':      {'roa_pct': [3.0], 'gnpa_pct': [3.0]},
+                       'Shriram Finance':    {'roa_pct': [2.0], 'gnpa_pct': [None]}})
+        bounds = na.radar_bounds(ts, 0)
+        self.assertEqual((bounds['roa_pct'], bounds['gnpa_pct'], bounds['nim_pct']), ((1.0, 3.0), (1.0, 3.0), (0, 1)))
+        keys = [m[0] for m in na.RADAR_METRICS]
+        scores = dict(zip(keys, na.radar_scores(ts, 'Bajaj Finance', bounds, 0)))
+        self.assertEqual((scores['roa_pct'], scores['gnpa_pct'], scores['nim_pct']), (1.0, 0.0, 0.5))
+        self.assertEqual(na.radar_scores(ts, 'Shriram Finance', bounds, 0)[keys.index('gnpa_pct')], 0.5)
+
+    def test_insight_frame_and_batch_swot(self):
+        ts = series(**{'Poonawalla Fincorp': {'roa_pct': [1.0] * 9, 'gnpa_pct': [2.0] * 8 + [1.2]},
+                       'Bajaj Finance':      {'roa_pct': [4.0] * 8 + [4.6], 'aum_cr': [100] * 4 + [80] * 4 + [130]},
+                       'Muthoot Finance':    {'roa_pct': [5.0, None]}})
+        frame = na.insight_frame(na.peer_stats(ts, ['Bajaj Finance', 'Muthoot Finance']))
+        self.assertEqual(list(frame), ['Poonawalla Fincorp', 'Bajaj Finance', 'Muthoot Finance'])
+        for n in frame:
+            for m in ('roa_pct', 'gnpa_pct', 'aum_cr'):
+                mv = frame[n][m]
+                c, p, y = (na.value(ts, n, m, q) for q in (8, 7, 4))
+                self.assertEqual((mv.base, mv.prev, mv.yoy), (c, p, y))
+                pct = lambda base: (c - base) / abs(base) * 100 if None not in (c, base) and base else None
+                self.assertEqual((mv.qoq_diff, mv.qoq_pct, mv.yoy_pct),
+                                 (None if None in (c, p) else c - p, pct(p), pct(y)))
+        self.assertEqual(frame['Muthoot Finance']['aum_cr'], na.NO_MOVES)
+        batch = na.swot_all(frame, {})
+        self.assertEqual(batch, {n: na.swot(ts, {}, n) for n in frame})
+        self.assertIn('AUM +62.5% QoQ — one of the stronger sequential expansions in the peer set',
+                      batch['Bajaj Finance'][0])
+
+    def test_radar_matrix(self):
+        ts = series(**{'Poonawalla Fincorp': {'roa_pct': [1.0], 'gnpa_pct': [1.0]},
+                       'Bajaj Finance':      {'roa_pct': [3.0], 'gnpa_pct': [3.0]},
+                       'Shriram Finance':    {'roa_pct': [2.0], 'gnpa_pct': [None]}})
+        keys = [m[0] for m in na.RADAR_METRICS]
+        cube = na.metric_cube(ts, keys, 1)
+        minmax = na.radar_matrix(cube)
+        bounds = na.radar_bounds(ts, 0)
+        for i, n in enumerate(na.DISPLAY_NAMES):
+            self.assertEqual(minmax[i, :, 0].tolist(), na.radar_scores(ts, n, bounds, 0))
+
+        roa, gnpa = keys.index('roa_pct'), keys.index('gnpa_pct')
+        z = na.radar_matrix(cube, 'zscore')
+        sd = (2 / 3) ** 0.5                          # population sd of 1, 2, 3
+        self.assertAlmostEqual(z[1, roa, 0], 0.5 + 1 / sd / 4)
+        self.assertEqual((z[2, roa, 0], z[0, gnpa, 0], z[1, gnpa, 0]), (0.5, 0.75, 0.25))
+        p = na.radar_matrix(cube, 'percentile')
+        self.assertEqual(p[:3, roa, 0].tolist(), [0.0, 1.0, 0.5])
+        self.assertEqual(p[:3, gnpa, 0].tolist(), [1.0, 0.0, 0.5])
+        with self.assertRaises(ValueError):
+            na.radar_matrix(cube, 'rank')
+
+    def test_peer_stats(self):
+        ts = series(**{'Poonawalla Fincorp': {'roa_pct': [1.0, 2.0], 'gnpa_pct': [2.0, 2.0]},
+                       'Bajaj Finance':      {'roa_pct': [4.0, 5.5], 'gnpa_pct': [1.0, 1.0]},
+                       'Shriram Finance':    {'roa_pct': [3.0, 3.0], 'gnpa_pct': [3.0, 2.1]},
+                       'L&T Finance':        {'roa_pct': [2.0, 2.2], 'gnpa_pct': [2.5, 2.0]},
+                       'Muthoot Finance':    {'roa_pct': [0.0, 2.1], 'gnpa_pct': [2.2, 40.0]}})
+        names = ['Bajaj Finance', 'Shriram Finance', 'L&T Finance', 'Muthoot Finance']
+        ps = na.peer_stats(ts, names)
+        self.assertEqual(ps.names, ['Poonawalla Fincorp'] + names)
+        self.assertEqual((ps.metrics, ps.value.shape), (['roa_pct', 'gnpa_pct'], (5, 2, 2)))
+        roa, gnpa = 0, 1
+        self.assertEqual(ps.median[:, 1].tolist(), [2.2, 2.0])
+        self.assertEqual(ps.qoq_diff[1, roa].tolist()[1], 1.5)
+        self.assertTrue(ps.qoq_pct[4, roa, 1] != ps.qoq_pct[4, roa, 1])    # zero base
+        self.assertEqual(ps.pct[:, gnpa, 0].tolist(), [75.0, 100.0, 0.0, 25.0, 50.0])   # lower is better
+        self.assertAlmostEqual(ps.z[1, roa, 0], (4.0 - 2.0) / 2 ** 0.5)
+        self.assertEqual(ps.outlier[:, gnpa, 1].tolist(), [False, True, False, False, True])
+        self.assertFalse(ps.outlier[..., 0].any())
+        self.assertEqual(ps.segment[1, roa].tolist(), [0.25, 1.0])          # Bajaj band 3.5–5.5
+        self.assertTrue(all(v != v for v in ps.segment[:, gnpa].ravel()))
+
+    def test_peer_stats_zero_mad(self):
+        # four peers at a common CAR floor: MAD is 0, the mean absolute deviation stands in
+        ts = series(**{n: {'car_pct': [15.0, 15.0]} for n in ('Poonawalla Fincorp', 'Bajaj Finance',
+                                                            'Shriram Finance', 'L&T Finance')},
+                    **{'Muthoot Finance': {'car_pct': [18.0, 15.0]}})
+        ps = na.peer_stats(ts, ['Bajaj Finance', 'Shriram Finance', 'L&T Finance', 'Muthoot Finance'])
+        z = ps.robust_z[:, 0, 0]
+        self.assertEqual(z[:4].tolist(), [0.0] * 4)
+        self.assertAlmostEqual(z[4], 3.0 / (1.253314 * 0.6))
+        self.assertEqual(ps.outlier[:, 0, 0].tolist(), [False, False, False, False, True])
+        # every peer level: no score, nothing flagged
+        self.assertTrue(all(v != v for v in ps.robust_z[:, 0, 1]))
+        self.assertFalse(ps.outlier[..., 1].any())
+
+    def test_registry_consistent(self):
+        self.assertEqual(set(na.NBFCS), set(na.CACHE_KEY))
+        self.assertEqual(set(na.NBFCS), set(na.SEGMENT_META))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Analytics API test suite
+Drives the ASGI app directly against a temp copy of the data store: bodies
+match nbfc_analytics, ETags answer If-None-Match with 304 and change only
+when the data a route reads changes, NBFC aliases resolve, and concurrent
+P/B requests share one price download.
+Run with: python3 test_nbfc_api.py
+"""
+
+import asyncio, json, os, sys, tempfile, threading, unittest
+from datetime import date, timedelta
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_store
+import nbfc_analytics as na
+import nbfc_api
+
+
+async def _get(app, path, headers=()):
+    raw, _, query = path.partition('?')
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+             'scheme': 'http', 'path': unquote(raw), 'raw_path': raw.encode(), 'root_path': '',
+             'query_string': query.encode(), 'server': ('test', 80), 'client': ('test', 1),
+             'headers': [(k.lower().encode(), v.encode()) for k, v in headers]}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = sent[0]
+    body  = b''.join(m.get('body', b'') for m in sent[1:])
+    return start['status'], {k.decode(): v.decode() for k, v in start['headers']}, body
+
+
+def get(app, path, headers=()):
+    return asyncio.run(_get(app, path, headers))
+
+
+class TestAPI(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'store.sqlite')
+        nbfc_store.clear_cache()
+        nbfc_store.build(self.path)
+        self.registry = nbfc_store.Registry(self.path, poll_interval=0)
+        self.downloads = []
+        self.app = nbfc_api.create_app(self.registry, self._prices)
+        snap = self.registry.current()
+        self.ts, self.td = snap['timeseries'], snap['transcripts']['TRANSCRIPT_DATA']
+
+    def tearDown(self):
+        nbfc_store.clear_cache()
+        self._tmp.cleanup()
+
+    def _prices(self, symbol):
+        self.downloads.append((symbol, threading.current_thread().name))
+        days = [date(2025, 3, 28) + timedelta(days=i) for i in range(6)]   # straddles the Q4FY25 quarter end
+        return days, [100.0 + i for i in range(6)]
+
+    def json(self, path):
+        status, headers, body = get(self.app, path)
+        self.assertEqual(status, 200, body)
+        return json.loads(body)
+
+    def test_rankings_match_analytics(self):
+        out = self.json('/v1/rankings')
+        self.assertEqual(out['quarter'], self.ts['QUARTERS'][-1])
+        ranks = na.rankings(self.ts['NBFC_TIMESERIES'], len(self.ts['QUARTERS']) - 1)
+        for row in out['rows']:
+            for m, (v, r) in ranks[row['nbfc']].items():
+                self.assertEqual((row['values'][m], row['ranks'][m]), (v, r))
+        best_gnpa = min((row for row in out['rows'] if row['values']['gnpa_pct'] is not None),
+                        key=lambda row: row['values']['gnpa_pct'])
+        self.assertEqual(best_gnpa['ranks']['gnpa_pct'], 1)
+        self.assertEqual(self.json('/v1/rankings?quarter=Q4FY25')['quarter'], 'Q4FY25')
+
+    def test_deltas_radar_swot(self):
+        d = self.json('/v1/deltas/aum_cr')
+        bajaj = self.ts['NBFC_TIMESERIES']['Bajaj Finance']['aum_cr']
+        self.assertEqual(d['nbfcs']['Bajaj Finance']['qoq_pct'], na.growth(bajaj, 1))
+        self.assertEqual(d['nbfcs']['Bajaj Finance']['yoy_pct'][4], (bajaj[4] - bajaj[0]) / bajaj[0] * 100)
+
+        r = self.json('/v1/radar')
+        bounds = na.radar_bounds(self.ts['NBFC_TIMESERIES'])
+        self.assertEqual(r['scores']['Muthoot Finance'], na.radar_scores(self.ts['NBFC_TIMESERIES'], 'Muthoot Finance', bounds))
+
+        s = self.json('/v1/swot/BAJFINANCE')
+        self.assertEqual(s['nbfc'], 'Bajaj Finance')
+        S, W, O, T = na.swot(self.ts['NBFC_TIMESERIES'], self.td, 'Bajaj Finance')
+        self.assertEqual([s['strengths'], s['weaknesses'], s['opportunities'], s['threats']], [S, W, O, T])
+        self.assertEqual(self.json('/v1/swot/L%26T%20Finance')['nbfc'], 'L&T Finance')
+        self.assertEqual(self.json('/v1/swot/chola%20finance')['nbfc'], 'Cholamandalam Finance')
+
+    def test_not_found_is_json(self):
+        for path in ('/v1/swot/Nope', '/v1/rankings?quarter=Q9FY99', '/v1/deltas/nope'):
+            with self.subTest(path=path):
+                status, _, body = get(self.app, path)
+                self.assertEqual(status, 404)
+                self.assertIn('error', json.loads(body))
+
+    def test_etag_revalidation(self):
+        status, headers, body = get(self.app, '/v1/radar')
+        etag = headers['etag']
+        status, headers, body = get(self.app, '/v1/radar', [('If-None-Match', etag)])
+        self.assertEqual((status, body, headers['etag']), (304, b'', etag))
+        self.assertEqual(get(self.app, '/v1/radar', [('If-None-Match', '"stale"')])[0], 200)
+
+    def test_body_rebuilt_only_when_its_data_changes(self):
+        api  = self.app.state.api
+        tags = {p: get(self.app, p)[1]['etag'] for p in ('/v1/rankings', '/v1/deltas/pat_cr')}
+        get(self.app, '/v1/rankings')
+        self.assertEqual(api.graph.stats()['api_rankings']['recomputes'], 1)
+
+        # t1_pct is not a rankings metric: cached body, same ETag
+        nbfc_store.update_series('timeseries', 'NBFC_TIMESERIES', [('Bajaj Finance', 't1_pct', 8, 99.0)], self.path)
+        self.registry.refresh(force=True)
+        self.assertEqual(get(self.app, '/v1/rankings')[1]['etag'], tags['/v1/rankings'])
+        self.assertEqual(api.graph.stats()['api_rankings']['recomputes'], 1)
+
+        nbfc_store.update_series('timeseries', 'NBFC_TIMESERIES', [('Bajaj Finance', 'pat_cr', 8, 1.0)], self.path)
+        self.registry.refresh(force=True)
+        self.assertNotEqual(get(self.app, '/v1/rankings')[1]['etag'], tags['/v1/rankings'])
+        self.assertNotEqual(get(self.app, '/v1/deltas/pat_cr')[1]['etag'], tags['/v1/deltas/pat_cr'])
+
+    def test_quarter_relabel_rebuilds_swot(self):
+        api  = self.app.state.api
+        tag  = get(self.app, '/v1/swot/BAJFINANCE')[1]['etag']
+        consts = dict(self.ts)
+        consts['QUARTERS'] = consts['QUARTERS'][:-1] + ['Q4FY26 (restated)']
+        nbfc_store.write_dataset('timeseries', consts, self.path)
+        self.registry.refresh(force=True)
+        status, headers, body = get(self.app, '/v1/swot/BAJFINANCE')
+        self.assertNotEqual(headers['etag'], tag)
+        self.assertEqual(json.loads(body)['quarter'], 'Q4FY26 (restated)')
+        self.assertEqual(api.graph.stats()['api_swot']['recomputes'], 2)
+
+    def test_rankings_and_radar_read_the_shared_matrices(self):
+        api = self.app.state.api
+        self.json('/v1/rankings'), self.json('/v1/radar')
+        stats = api.graph.stats()
+        self.assertEqual((stats['rank_matrices']['recomputes'], stats['radar_matrix']['recomputes']), (1, 1))
+
+    def test_pb_shares_one_download(self):
+        async def burst():
+            return await asyncio.gather(*[_get(self.app, '/v1/pb/Bajaj%20Finance') for _ in range(20)])
+        results = asyncio.run(burst())
+        self.assertEqual(len(self.downloads), 1)
+        self.assertNotEqual(self.downloads[0][1], threading.current_thread().name)   # off the event loop
+        self.assertEqual(len({r[2] for r in results}), 1)
+
+        pb = json.loads(results[0][2])
+        bvps = self.ts['NBFC_TIMESERIES']['Bajaj Finance']['bvps_inr']
+        self.assertEqual(pb['dates'][:2], ['2025-03-28', '2025-03-29'])
+        self.assertEqual(pb['bvps'][0], bvps[self.ts['QUARTERS'].index('Q3FY25')])
+        self.assertEqual(pb['bvps'][-1], bvps[self.ts['QUARTERS'].index('Q4FY25')])
+        self.assertEqual(pb['pb'][0], 100.0 / pb['bvps'][0])
+
+    def test_store_reads_run_off_the_event_loop(self):
+        current, threads = self.registry.current, []
+
+        def spy():
+            threads.append(threading.current_thread().name)
+            return current()
+        self.registry.current = spy
+        for path in ('/v1/meta', '/v1/rankings', '/v1/deltas/aum_cr', '/v1/radar',
+                     '/v1/swot/BAJFINANCE', '/v1/pb/BAJFINANCE'):
+            self.json(path)
+        self.assertEqual(len(threads), 6)
+        self.assertNotIn(threading.current_thread().name, threads)   # asyncio.run() drives the loop here
+
+    def test_pb_unavailable(self):
+        app = nbfc_api.create_app(self.registry, lambda symbol: None)
+        status, _, body = get(app, '/v1/pb/Bajaj%20Finance')
+        self.assertEqual(status, 503)
+        self.assertIn('unavailable', json.loads(body)['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
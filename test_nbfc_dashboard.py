@@ -0,0 +1,43 @@
+"""
+Dashboard test suite
+Runs nbfc_dashboard_v1.py through Streamlit's AppTest and checks that
+free-text search queries are escaped before they reach unsafe_allow_html
+markdown.
+Run with: python3 test_nbfc_dashboard.py
+"""
+
+import os, sys, unittest, warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+warnings.filterwarnings('ignore')
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nbfc_dashboard_v1.py')
+QUERY  = '<b>x</b>'
+
+
+class TestSearchEscaping(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from streamlit.testing.v1 import AppTest
+        cls.at = AppTest.from_file(SCRIPT, default_timeout=600).run()
+        assert not cls.at.exception, cls.at.exception
+
+    def _search(self, key):
+        self.at.text_input(key=key).set_value(QUERY).run()
+        self.assertFalse(self.at.exception)
+        return [m.value for m in self.at.markdown]
+
+    def test_lens_query_is_escaped(self):
+        bodies = self._search('lens_search')
+        self.assertTrue(any('items match “&lt;b&gt;x&lt;/b&gt;”' in b for b in bodies))
+        self.assertFalse(any(f'“{QUERY}”' in b for b in bodies))
+
+    def test_ai_query_is_escaped(self):
+        bodies = self._search('ai_search')
+        self.assertTrue(any('initiatives matching “&lt;b&gt;x&lt;/b&gt;”' in b for b in bodies))
+        self.assertFalse(any(f'“{QUERY}”' in b for b in bodies))
+
+
+if __name__ == '__main__':
+    unittest.main()
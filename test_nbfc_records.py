@@ -0,0 +1,95 @@
+"""
+Record types test suite
+Checks the AI initiative and shareholder records against the store's dict
+form: same values, parsed dates, interned categoricals, immutability, and
+AIIndex queries against a plain filter + sort.
+Run with: python3 test_nbfc_records.py
+"""
+
+import dataclasses, os, sys, unittest
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_records
+from nbfc_ai_data import NBFC_AI_INITIATIVES
+from shareholding_data import SHAREHOLDING
+
+
+class TestAIRecords(unittest.TestCase):
+    def setUp(self):
+        self.records = nbfc_records.ai_records(NBFC_AI_INITIATIVES)
+
+    def test_matches_dicts(self):
+        self.assertEqual(list(self.records), list(NBFC_AI_INITIATIVES))
+        for nbfc, items in NBFC_AI_INITIATIVES.items():
+            self.assertEqual(len(self.records[nbfc]), len(items))
+            for r, d in zip(self.records[nbfc], items):
+                self.assertEqual(r.nbfc, nbfc)
+                self.assertEqual(r.title, d['title'])
+                self.assertEqual(r.functions, tuple(d['functions']))
+                self.assertEqual(r.source_url, d['source_url'])
+
+    def test_dates_parsed(self):
+        r = nbfc_records.ai_records({'X': [{'date': '12 Feb 2026'}, {'date': 'n/a'}]})['X']
+        self.assertEqual(r[0].day, date(2026, 2, 12))
+        self.assertEqual(r[1].day, date(1970, 1, 1))
+
+    def test_categoricals_interned(self):
+        fns = {}
+        for lst in self.records.values():
+            for r in lst:
+                for f in r.functions:
+                    self.assertIs(fns.setdefault(f, f), f)
+
+    def test_frozen(self):
+        r = next(iter(self.records.values()))[0]
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            r.title = 'x'
+        self.assertFalse(hasattr(r, '__dict__'))
+
+
+class TestEntityRecords(unittest.TestCase):
+    def test_matches_dicts(self):
+        records = nbfc_records.entity_records(SHAREHOLDING)
+        for nbfc, data in SHAREHOLDING.items():
+            ents = data.get('named_entities', [])
+            self.assertEqual([(e.name, e.category, list(e.pct)) for e in records[nbfc]],
+                             [(e['name'], e['category'], e['pct']) for e in ents])
+
+    def test_categories_interned(self):
+        cats = {}
+        for ents in nbfc_records.entity_records(SHAREHOLDING).values():
+            for e in ents:
+                self.assertIs(cats.setdefault(e.category, e.category), e.category)
+
+
+class TestAIIndex(unittest.TestCase):
+    def setUp(self):
+        self.records = nbfc_records.ai_records(NBFC_AI_INITIATIVES)
+        self.index   = nbfc_records.AIIndex(self.records)
+
+    def _scan(self, nbfc, function, sort):
+        items = [r for lst in self.records.values() for r in lst
+                 if (nbfc is None or r.nbfc == nbfc) and (function is None or function in r.functions)]
+        key, reverse = nbfc_records.AI_SORTS[sort]
+        return sorted(items, key=key, reverse=reverse)
+
+    def test_matches_scan(self):
+        functions = sorted({f for lst in self.records.values() for r in lst for f in r.functions})
+        for sort in nbfc_records.AI_SORTS:
+            for nbfc in [None, *self.records, 'Nobody']:
+                for function in [None, *functions]:
+                    with self.subTest(sort=sort, nbfc=nbfc, function=function):
+                        expected = self._scan(nbfc, function, sort)
+                        self.assertEqual(self.index.query(nbfc, function, sort), expected)
+                        self.assertEqual(self.index.count(nbfc, function), len(expected))
+
+    def test_slice(self):
+        full = self.index.query(sort='Title')
+        self.assertEqual(self.index.query(sort='Title', offset=5, limit=10), full[5:15])
+        self.assertEqual(self.index.query(function='Collections', offset=1, limit=2),
+                         self._scan(None, 'Collections', 'Newest first')[1:3])
+
+
+if __name__ == '__main__':
+    unittest.main()
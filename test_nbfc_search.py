@@ -0,0 +1,75 @@
+"""
+Full-text search test suite
+Checks tokenization, prefix matching, AND semantics, BM25 ordering and
+filters of nbfc_search over small hand-made corpora and the real data.
+Run with: python3 test_nbfc_search.py
+"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_records
+import nbfc_search
+from nbfc_search import Doc, SearchIndex
+from nbfc_ai_data import NBFC_AI_INITIATIVES
+from nbfc_transcript_data import TRANSCRIPT_DATA
+
+DOCS = [
+    Doc('guidance', 'A', 'Guidance', 'Credit cost 145–160 bps for FY27'),
+    Doc('swot',     'A', 'Strength', 'Underwriting tightened; credit cost credit cost falling'),
+    Doc('swot',     'B', 'Threat',   'Gold price volatility'),
+    Doc('ai',       'B', 'Bot',      'Voice bot for collections and credit reminders', 0),
+]
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokens(self):
+        self.assertEqual(nbfc_search.tokenize('ROA 4.65% — FY27 co-lending'),
+                         ['roa', '4.65', 'fy', '27', 'co', 'lending'])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex(DOCS)
+
+    def _labels(self, query, **kw):
+        return [h.doc.label for h in self.index.search(query, **kw)]
+
+    def test_and_semantics(self):
+        self.assertEqual(sorted(self._labels('credit cost')), ['Guidance', 'Strength'])
+        self.assertEqual(self._labels('credit gold'), [])
+
+    def test_bm25_prefers_higher_term_frequency(self):
+        self.assertEqual(self._labels('cost')[0], 'Strength')
+
+    def test_prefix(self):
+        self.assertEqual(self._labels('underw'), ['Strength'])
+        self.assertEqual(self._labels('colle'), ['Bot'])
+        self.assertEqual(self._labels('co'), [])          # below PREFIX_MIN: whole terms only
+
+    def test_filters_and_limit(self):
+        self.assertEqual(self._labels('credit', kinds=('ai',)), ['Bot'])
+        self.assertEqual(self._labels('credit', nbfc='B'), ['Bot'])
+        self.assertEqual(len(self.index.search('credit', limit=1)), 1)
+        self.assertEqual(len(self.index.search('credit', limit=None)), 3)
+        self.assertEqual(self.index.search('   '), [])
+
+    def test_highlight(self):
+        self.assertEqual(nbfc_search.highlight('Underwriting and credit costs', 'underw cost'),
+                         '<mark>Underwriting</mark> and credit <mark>costs</mark>')
+
+
+class TestRealCorpus(unittest.TestCase):
+    def test_ai_refs_point_at_index_items(self):
+        ai = nbfc_records.AIIndex(nbfc_records.ai_records(NBFC_AI_INITIATIVES))
+        index = SearchIndex(nbfc_search.documents(ai.items, TRANSCRIPT_DATA))
+        hits = index.search('collections', limit=None, kinds=('ai',))
+        self.assertTrue(hits)
+        for h in hits:
+            self.assertIs(ai.items[h.doc.ref].title, h.doc.label)
+        kinds = {h.doc.kind for h in index.search('fy27', limit=None)}
+        self.assertLessEqual({'commentary', 'guidance'}, kinds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Shareholding HTML test suite
+Checks the tab10 builders on a small hand-made NBFC: group and row order,
+entry / exit markers, QoQ trend, category totals and snapshot ordering.
+Run with: python3 test_nbfc_shareholding.py
+"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_records
+import nbfc_shareholding as sh
+
+QUARTERS = ['Q1', 'Q2', 'Q3']
+DATA = {
+    'X': {'category_pct': {'Promoter': [50.0, 50.0, 51.0], 'FII': [20.0, 19.0, 19.0],
+                           'DII': [10.0, 10.0, 10.0], 'Public': [20.0, 21.0, 20.0]},
+          'named_entities': [
+              {'name': 'Small Fund',  'category': 'DII – MF', 'pct': [1.0, 1.2, 1.5]},
+              {'name': 'Big Fund',    'category': 'DII – MF', 'pct': [None, 2.0, 3.0]},
+              {'name': 'Leaver Inc',  'category': 'FII',      'pct': [2.0, 1.5, None]},
+              {'name': 'Holdco',      'category': 'Promoter', 'pct': [50.0, 50.0, 51.0]},
+          ]},
+    'Y': {'category_pct': {'Promoter': [70.0, 70.0, 70.0]}, 'named_entities': []},
+}
+
+
+class TestHoldersTable(unittest.TestCase):
+    def setUp(self):
+        ents = nbfc_records.entity_records(DATA)['X']
+        self.html = sh.holders_table(DATA['X'], ents, QUARTERS, {}, {})
+
+    def test_group_order(self):
+        order = [self.html.index(s) for s in ('>Promoter</td>', 'Promoter Total', '>FII / FPI</td>',
+                                              'FII Total', '>DII – MF</td>', 'DII Total', 'Public Total')]
+        self.assertEqual(order, sorted(order))
+        self.assertNotIn('>Public</td></tr>', self.html)      # no named public holders → no group header
+
+    def test_rows_sorted_by_latest_holding(self):
+        self.assertLess(self.html.index('Big Fund'), self.html.index('Small Fund'))
+
+    def test_markers_and_trend(self):
+        big = self.html[self.html.index('Big Fund'):]
+        self.assertIn('2.00%<span class="sh-entry-dot">●</span>', big[:big.index('</tr>')])
+        leaver = self.html[self.html.index('Leaver Inc'):]
+        row = leaver[:leaver.index('</tr>')]
+        self.assertIn('1.50%<span class="sh-exit-dot">○</span>', row)
+        self.assertIn('▼ 0.50% → exited', row)
+
+    def test_table_shape(self):
+        self.assertTrue(self.html.startswith('<table class="sh-table"><thead><tr>'))
+        self.assertEqual(self.html.count('<th '), 2 + len(QUARTERS) + 1)
+        self.assertTrue(self.html.endswith('</tbody></table>'))
+
+
+class TestSummaryAndSnapshot(unittest.TestCase):
+    def test_summary_cards(self):
+        cards = sh.summary_cards(DATA['X'], QUARTERS, {})
+        self.assertEqual(len(cards), 4)
+        self.assertIn('51.00%', cards[0])
+        self.assertIn('▲ 1.00%', cards[0])
+        self.assertIn('→ flat', cards[2])
+
+    def test_snapshot_sorted_by_promoter(self):
+        html = sh.snapshot_table(DATA, QUARTERS, ['X', 'Y'], {})
+        self.assertLess(html.index('Y</td>'), html.index('X</td>'))
+        self.assertIn('—', html)      # Y has no FII / DII / Public split
+
+
+if __name__ == '__main__':
+    unittest.main()
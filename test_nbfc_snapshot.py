@@ -0,0 +1,84 @@
+"""
+Snapshot export test suite
+Renders a small Streamlit script through AppTest and checks the element
+tree → HTML serialisation used by nbfc_snapshot: markdown passthrough,
+column rows with their (normalised) weights, expanders, embedded Plotly
+JSON and dropped widgets.
+Run with: python3 test_nbfc_snapshot.py
+"""
+
+import json, os, re, shutil, sys, tempfile, unittest, warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_snapshot
+
+warnings.filterwarnings('ignore')
+
+APP = '''
+import streamlit as st
+import plotly.graph_objects as go
+st.markdown('<style>.x { color: red; }</style>', unsafe_allow_html=True)
+tab_a, tab_b = st.tabs(['A', 'B'])
+with tab_a:
+    st.markdown('<div class="tab-intro">Intro &amp; more</div>', unsafe_allow_html=True)
+    st.checkbox('Pick', key='pick')
+    left, right = st.columns([3, 1])
+    with left:
+        st.plotly_chart(go.Figure(go.Scatter(x=[1, 2], y=[3, 4], name='</script>')), key='c1')
+    with right:
+        st.markdown('<b>right</b>', unsafe_allow_html=True)
+    with st.expander('More', expanded=False):
+        st.markdown('plain <b>text</b>')
+with tab_b:
+    st.selectbox('NBFC', ['One', 'Two'], key='nbfc')
+'''
+
+
+class TestRenderer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from streamlit.testing.v1 import AppTest
+        cls.tmp = tempfile.mkdtemp()
+        path = os.path.join(cls.tmp, 'app.py')
+        with open(path, 'w') as f:
+            f.write(APP)
+        cls.at = AppTest.from_file(path, default_timeout=60).run()
+        assert not cls.at.exception, cls.at.exception
+        cls.renderer = nbfc_snapshot.Renderer()
+        cls.html = cls.renderer.children(nbfc_snapshot._tab(cls.at, 'A'))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def test_markdown_passthrough_and_escaping(self):
+        self.assertIn('<div class="tab-intro">Intro &amp; more</div>', self.html)
+        self.assertIn('plain &lt;b&gt;text&lt;/b&gt;', self.html)     # no unsafe_allow_html → escaped
+
+    def test_columns_and_expander(self):
+        row = self.html[self.html.index('<div class="snap-row">'):]
+        self.assertLess(row.index('style="flex:0.75"'), row.index('style="flex:0.25"'))
+        self.assertIn('<details class="snap-exp"><summary>More</summary>', self.html)
+
+    def test_chart_json_embedded(self):
+        self.assertEqual(self.renderer.n_charts, 1)
+        spec = re.search(r'<script type="application/json" id="chart-1-spec">(.*?)</script>', self.html, re.S)
+        fig = json.loads(spec.group(1).replace('<\\/', '</'))
+        self.assertEqual(fig['data'][0]['y'], [3, 4])
+        self.assertEqual(fig['data'][0]['name'], '</script>')
+        self.assertIn('id="chart-1"', self.html)
+
+    def test_widgets_dropped(self):
+        self.assertNotIn('Pick', self.html)
+        self.assertEqual(nbfc_snapshot.Renderer().children(nbfc_snapshot._tab(self.at, 'B')), '')
+        self.assertFalse(self.renderer.skipped)
+
+    def test_global_css(self):
+        self.assertEqual(nbfc_snapshot.global_css(self.at), '<style>.x { color: red; }</style>')
+
+    def test_slug(self):
+        self.assertEqual(nbfc_snapshot.slug('L&T Finance'), 'l-t-finance')
+
+
+if __name__ == '__main__':
+    unittest.main()
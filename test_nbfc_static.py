@@ -0,0 +1,109 @@
+"""
+Static export test suite
+Builds the static site into a temp dir and checks the content-hashed file
+names, the manifest inlined in index.html, that every bundle round-trips
+the data store, and that rebuilding is byte-for-byte deterministic.
+Run with: python3 test_nbfc_static.py
+"""
+
+import html, json, os, re, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_store
+import nbfc_static
+
+
+def read_manifest(out):
+    with open(os.path.join(out, 'index.html'), encoding='utf-8') as f:
+        page = f.read()
+    m = re.search(r'<script id="manifest" type="application/json">(.*?)</script>', page, re.S)
+    return page, json.loads(m.group(1))
+
+
+class TestStaticBuild(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.out = tempfile.mkdtemp()
+        cls.manifest = nbfc_static.build(cls.out)
+        cls.page, cls.inlined = read_manifest(cls.out)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.out, ignore_errors=True)
+
+    def load(self, name):
+        with open(os.path.join(self.out, self.manifest['data'][name]), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_manifest_inlined(self):
+        self.assertEqual(self.inlined, self.manifest)
+        self.assertEqual(set(self.manifest['tabs'].values()), set(self.manifest['data']))
+        self.assertEqual(len(self.manifest['tabs']), self.page.count('data-tab="'))
+
+    def test_hashed_names_match_content(self):
+        rels = list(self.manifest['data'].values())
+        rels += re.findall(r'(?:href|src)="(assets/[^"]+)"', self.page)
+        self.assertEqual(len(rels), len(self.manifest['data']) + 2)
+        for rel in rels:
+            with self.subTest(rel=rel):
+                with open(os.path.join(self.out, rel), 'rb') as f:
+                    digest = nbfc_static.content_hash(f.read())
+                self.assertEqual(rel.rsplit('.', 2)[1], digest)
+
+    def test_no_template_placeholders_left(self):
+        self.assertNotIn('${', self.page)
+        ts = nbfc_store.load('timeseries')
+        self.assertIn(nbfc_static.quarter_label(ts['QUARTERS'][-1]) + ' Peer Scorecard', self.page)
+
+    def test_sector_banner_from_store(self):
+        ts = nbfc_store.load('timeseries')
+        stats = nbfc_static.sector_stats(ts)
+        self.assertEqual([label for label, *_ in stats][:4], ['Sector AUM', 'AUM Growth', 'Sector PAT', 'PAT Growth'])
+        pat = sum(row['pat_cr'][-1] for row in ts['NBFC_TIMESERIES'].values() if row['pat_cr'][-1] is not None)
+        self.assertEqual(stats[2][1], f'₹{pat:,.0f} Cr')
+        banner = re.search(r'<div id="sector-banner">(.*?)</div>\n', self.page).group(1)
+        self.assertEqual(banner.count('class="sector-stat"'), len(stats))
+        self.assertIn(html.escape(stats[2][1]), banner)
+
+    def test_bundles_round_trip_store(self):
+        ts, ai, sh = (nbfc_store.load(ds) for ds in ('timeseries', 'ai', 'shareholding'))
+        t = self.load('timeseries')
+        self.assertEqual(t['quarters'], ts['QUARTERS'])
+        self.assertEqual(t['series'], json.loads(json.dumps(ts['NBFC_TIMESERIES'])))
+        self.assertEqual([n['key'] for n in t['nbfcs']], ts['NBFC_ORDER'])
+        self.assertTrue(all(n['ticker'] and n['color'] != '#888888' for n in t['nbfcs']))
+
+        r = self.load('rankings')
+        self.assertEqual(r['quarter'], ts['QUARTERS'][-1])
+        latest = ts['NBFC_' + ts['QUARTERS'][-1]]
+        self.assertEqual([dict(row, name=nbfc_static.DISPLAY.get(row['name'], row['name'])) for row in latest],
+                         [{k: v for k, v in row.items() if k != 'color'} for row in r['rows']])
+        self.assertNotIn('#888888', [row['color'] for row in r['rows']])
+
+        s = self.load('shareholding')
+        self.assertEqual(s['quarters'], sh['SH_QUARTERS'])
+        self.assertEqual(s['data'], json.loads(json.dumps(sh['SHAREHOLDING'])))
+
+    def test_ai_sorts_are_permutations(self):
+        a = self.load('aibulletin')
+        ai = nbfc_store.load('ai')['NBFC_AI_INITIATIVES']
+        self.assertEqual(len(a['items']), sum(map(len, ai.values())))
+        for mode, order in a['sorts'].items():
+            with self.subTest(mode=mode):
+                self.assertEqual(sorted(order), list(range(len(a['items']))))
+        newest = [a['items'][i]['title'] for i in a['sorts']['Newest first']]
+        oldest = [a['items'][i]['title'] for i in a['sorts']['Oldest first']]
+        self.assertNotEqual(newest, oldest)
+
+    def test_deterministic(self):
+        other = tempfile.mkdtemp()
+        try:
+            self.assertEqual(nbfc_static.build(other), self.manifest)
+            with open(os.path.join(other, 'index.html'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), self.page)
+        finally:
+            shutil.rmtree(other, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+"""
+Data store test suite
+Builds the SQLite store into a temp file and checks every dataset loads back
+exactly as its source module defines it, is rebuilt when that module changes,
+and is never served from a cache left over from a deleted store.
+Run with: python3 test_nbfc_store.py
+"""
+
+import importlib, os, sys, tempfile, threading, time, unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_store
+
+
+def _same(a, b):
+    """Deep equality that also requires matching types (1 != 1.0, tuple != list)."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+class _StoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'store.sqlite')
+        nbfc_store.clear_cache()
+
+    def tearDown(self):
+        nbfc_store.clear_cache()
+        self._tmp.cleanup()
+
+
+class TestRoundTrip(_StoreTestCase):
+    def test_every_dataset_matches_its_module(self):
+        nbfc_store.build(self.path)
+        for dataset, module in nbfc_store.DATASETS.items():
+            expected = nbfc_store.module_constants(module)
+            loaded   = nbfc_store.load(dataset, self.path)
+            self.assertEqual(sorted(loaded), sorted(expected), dataset)
+            for name in expected:
+                with self.subTest(dataset=dataset, name=name):
+                    self.assertTrue(_same(loaded[name], expected[name]))
+
+    def test_missing_store_is_built_on_first_load(self):
+        self.assertFalse(os.path.exists(self.path))
+        ts = nbfc_store.load('timeseries', self.path)
+        self.assertIn('NBFC_TIMESERIES', ts)
+        self.assertEqual(nbfc_store.versions(self.path), {'timeseries': 1})
+
+    def test_unknown_dataset_raises(self):
+        with self.assertRaises(KeyError):
+            nbfc_store.load('prices', self.path)
+
+
+class TestVersioning(_StoreTestCase):
+    def test_write_bumps_version_and_invalidates_cache(self):
+        nbfc_store.build(self.path, ['annual'])
+        first = nbfc_store.load('annual', self.path)
+        self.assertIs(nbfc_store.load('annual', self.path), first)
+
+        years = first['ANNUAL_YEARS']
+        v = nbfc_store.write_dataset('annual', {'ANNUAL_YEARS': years,
+                                                'NBFC_ANNUAL': {'X': {'aum_cr': [1, None, 2.5, 3]}}},
+                                     self.path)
+        self.assertEqual(v, 2)
+        second = nbfc_store.load('annual', self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second['NBFC_ANNUAL'], {'X': {'aum_cr': [1, None, 2.5, 3]}})
+
+
+class TestSourceChanges(_StoreTestCase):
+    """A store built from a data module follows edits to that module."""
+
+    def setUp(self):
+        super().setUp()
+        sys.path.insert(0, self._tmp.name)
+        self.module = os.path.join(self._tmp.name, 'nbfc_test_data.py')
+        self._write_module('VALUES = [1]\n')
+        self._datasets = patch.dict(nbfc_store.DATASETS, {'test': 'nbfc_test_data'}, clear=True)
+        self._datasets.start()
+
+    def tearDown(self):
+        self._datasets.stop()
+        sys.path.remove(self._tmp.name)
+        sys.modules.pop('nbfc_test_data', None)
+        super().tearDown()
+
+    def _write_module(self, src):
+        with open(self.module, 'w') as f:
+            f.write(src)
+        importlib.invalidate_caches()
+
+    def test_edited_module_is_rebuilt_on_load(self):
+        self.assertEqual(nbfc_store.load('test', self.path)['VALUES'], [1])
+        self.assertEqual(nbfc_store.load('test', self.path)['VALUES'], [1])
+        self.assertEqual(nbfc_store.versions(self.path), {'test': 1})
+
+        self._write_module('VALUES = [2, 3]\n')
+        self.assertEqual(nbfc_store.load('test', self.path)['VALUES'], [2, 3])
+        self.assertEqual(nbfc_store.versions(self.path), {'test': 2})
+
+    def test_directly_written_dataset_is_not_rebuilt(self):
+        nbfc_store.write_dataset('test', {'VALUES': [9]}, self.path)
+        self._write_module('VALUES = [2, 3]\n')
+        self.assertEqual(nbfc_store.load('test', self.path)['VALUES'], [9])
+
+    def test_registry_reloads_when_module_changes(self):
+        registry = nbfc_store.Registry(self.path, poll_interval=0)
+        first = registry.current()
+        self._write_module('VALUES = [2, 3]\n')
+        second = registry.current()
+        self.assertEqual(second.changed_since(first), {'test'})
+        self.assertEqual(second['test']['VALUES'], [2, 3])
+
+    def test_rebuild_reports_discarded_ingested_cells(self):
+        self._write_module("NBFC_ANNUAL = {'X': {'aum_cr': [1, 2], 'pat_cr': [3, 4]}}\n")
+        nbfc_store.load('test', self.path)
+        nbfc_store.update_series('test', 'NBFC_ANNUAL', [('X', 'aum_cr', 1, 5), ('X', 'pat_cr', 0, 3)],
+                                 self.path, ingested={'deck.json': 1.0})
+
+        self._write_module("NBFC_ANNUAL = {'X': {'aum_cr': [1, 2], 'pat_cr': [3, 4]}}  # edited\n")
+        with self.assertWarnsRegex(UserWarning, r'discarding 1 ingested cell\(s\): X/aum_cr\[1\]; .*deck\.json'):
+            self.assertEqual(nbfc_store.load('test', self.path)['NBFC_ANNUAL']['X']['aum_cr'], [1, 2])
+        self.assertEqual(nbfc_store.ingested_sources('test', self.path), {})
+
+    def test_concurrent_loads_rebuild_once(self):
+        real_build, calls = nbfc_store.build, []
+
+        def slow_build(*args, **kwargs):
+            calls.append(args)
+            time.sleep(0.2)
+            return real_build(*args, **kwargs)
+
+        with patch.object(nbfc_store, 'build', slow_build):
+            threads = [threading.Thread(target=nbfc_store.load, args=('test', self.path)) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(nbfc_store.versions(self.path), {'test': 1})
+
+    def test_recreated_store_is_not_served_from_cache(self):
+        self.assertEqual(nbfc_store.load('test', self.path)['VALUES'], [1])
+        os.remove(self.path)
+        # same dataset, same version number (1), different contents
+        nbfc_store.write_dataset('test', {'VALUES': [7]}, self.path)
+        self.assertEqual(nbfc_store.versions(self.path), {'test': 1})
+        self.assertEqual(nbfc_store.load('test', self.path)['VALUES'], [7])
+
+
+class TestSeriesOrder(_StoreTestCase):
+    def test_values_come_back_in_idx_order(self):
+        nbfc_store.write_dataset('annual', {'NBFC_ANNUAL': {'X': {'aum_cr': [1, 2]}}}, self.path)
+        nbfc_store.update_series('annual', 'NBFC_ANNUAL',
+                                 [('X', 'pat_cr', 2, 30), ('X', 'pat_cr', 0, 10), ('X', 'pat_cr', 1, 20)],
+                                 self.path)
+        self.assertEqual(nbfc_store.load('annual', self.path)['NBFC_ANNUAL'],
+                         {'X': {'aum_cr': [1, 2], 'pat_cr': [10, 20, 30]}})
+
+
+class TestRegistry(_StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        nbfc_store.build(self.path)
+        self.registry = nbfc_store.Registry(self.path, poll_interval=0)
+
+    def _bump_annual(self, value):
+        annual = nbfc_store.module_constants('nbfc_annual_data')
+        annual['NBFC_ANNUAL'] = {'X': {'aum_cr': [value]}}
+        nbfc_store.write_dataset('annual', annual, self.path)
+
+    def test_swap_reloads_only_changed_datasets(self):
+        changes = []
+        self.registry.on_change(lambda changed, snap: changes.append((changed, snap.version)))
+        first = self.registry.current()
+        self.assertIs(self.registry.current(), first)     # store untouched → same snapshot
+
+        self._bump_annual(1)
+        second = self.registry.current()
+        self.assertEqual(second.version, first.version + 1)
+        self.assertEqual(second.changed_since(first), {'annual'})
+        self.assertIs(second['timeseries']['NBFC_TIMESERIES'], first['timeseries']['NBFC_TIMESERIES'])
+        self.assertIs(second['shareholding']['SHAREHOLDING'], first['shareholding']['SHAREHOLDING'])
+        self.assertEqual(changes, [(set(nbfc_store.DATASETS), 1), ({'annual'}, 2)])
+
+        # the snapshot an in-flight rerun holds is unaffected by the swap
+        self.assertNotEqual(first['annual']['NBFC_ANNUAL'], {'X': {'aum_cr': [1]}})
+        self.assertEqual(second['annual']['NBFC_ANNUAL'], {'X': {'aum_cr': [1]}})
+
+    def test_poll_interval_defers_checks(self):
+        registry = nbfc_store.Registry(self.path, poll_interval=3600)
+        first = registry.current()
+        self._bump_annual(2)
+        self.assertIs(registry.current(), first)
+        self.assertEqual(registry.refresh().changed_since(first), {'annual'})
+
+    def test_snapshot_is_read_only(self):
+        snap = self.registry.current()
+        with self.assertRaises(AttributeError):
+            snap.version = 99
+        with self.assertRaises(TypeError):
+            snap['annual']['ANNUAL_YEARS'] = []
+        with self.assertRaises(TypeError):
+            snap.versions['annual'] = 0
+
+
+if __name__ == '__main__':
+    unittest.main()
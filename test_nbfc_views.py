@@ -0,0 +1,185 @@
+"""
+View cache test suite
+Checks derived views are recomputed only when a dataset, constant or series
+metric they declare changes in a temp data store.
+Run with: python3 test_nbfc_views.py
+"""
+
+import os, sys, tempfile, threading, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import nbfc_store
+import nbfc_views
+from nbfc_views import metrics, constants
+
+SERIES = {'A': {'aum_cr': [1, 2], 'pat_cr': [10, 20]},
+          'B': {'aum_cr': [3, 4], 'pat_cr': [30, 40]}}
+
+
+class TestViewGraph(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'store.sqlite')
+        nbfc_store.clear_cache()
+        nbfc_store.build(self.path, ['shareholding'])
+        nbfc_store.write_dataset('timeseries', {'QUARTERS': ['Q1', 'Q2'], 'NBFC_TIMESERIES': SERIES},
+                                 self.path)
+        self.registry = nbfc_store.Registry(self.path, poll_interval=0)
+        self.graph    = nbfc_views.ViewGraph(self.registry)
+        self.calls    = []
+
+        @self.graph.view('aum', metrics('aum_cr'))
+        def aum(entity):
+            self.calls.append(('aum', entity))
+            return self.registry.current()['timeseries']['NBFC_TIMESERIES'][entity]['aum_cr'][-1]
+
+        @self.graph.view('pat', metrics('pat_cr'))
+        def pat(entity):
+            self.calls.append(('pat', entity))
+            return 0
+
+        @self.graph.view('holders', constants('shareholding', 'SHAREHOLDING'))
+        def holders():
+            self.calls.append(('holders',))
+            return 0
+
+        self.aum, self.pat, self.holders = aum, pat, holders
+
+    def tearDown(self):
+        nbfc_store.clear_cache()
+        self._tmp.cleanup()
+
+    def _call_all(self):
+        self.aum('A'), self.aum('B'), self.pat('A'), self.holders()
+
+    def test_repeat_calls_hit(self):
+        self._call_all()
+        self._call_all()
+        self.assertEqual(len(self.calls), 4)
+        stats = self.graph.stats()
+        self.assertEqual(stats['aum'], {'hits': 2, 'recomputes': 2, 'invalidations': 0, 'entries': 2})
+
+    def test_metric_change_recomputes_only_dependents(self):
+        self._call_all()
+        nbfc_store.update_series('timeseries', 'NBFC_TIMESERIES', [('A', 'aum_cr', 1, 5)], self.path)
+        self.registry.refresh()
+        self.calls.clear()
+
+        self._call_all()
+        self.assertEqual(self.calls, [('aum', 'A'), ('aum', 'B')])
+        self.assertEqual(self.aum('A'), 5)
+        stats = self.graph.stats()
+        self.assertEqual(stats['aum']['invalidations'], 1)
+        self.assertEqual(stats['pat']['invalidations'], 0)
+        self.assertEqual(stats['holders']['invalidations'], 0)
+
+    def test_dataset_rewrite_with_same_values_keeps_cache(self):
+        self._call_all()
+        nbfc_store.build(self.path, ['shareholding'])   # new version, identical content
+        self.registry.refresh()
+        self.calls.clear()
+        self._call_all()
+        self.assertEqual(self.calls, [])
+
+    def test_new_quarter_invalidates_shape_dependents(self):
+        @self.graph.view('grid', constants('timeseries', 'QUARTERS', 'NBFC_TIMESERIES'))
+        def grid():
+            self.calls.append(('grid',))
+            return len(self.registry.current()['timeseries']['QUARTERS'])
+
+        self.assertEqual(grid(), 2)
+        self.aum('A')
+        # a quarter label added before its values arrive: no metric column changes
+        nbfc_store.write_dataset('timeseries', {'QUARTERS': ['Q1', 'Q2', 'Q3'], 'NBFC_TIMESERIES': SERIES},
+                                 self.path)
+        self.registry.refresh()
+        self.calls.clear()
+        self.assertEqual(grid(), 3)
+        self.aum('A')
+        self.assertEqual(self.calls, [('grid',)])
+
+    def test_pinned_snapshot_is_used(self):
+        old = self.registry.current()
+        nbfc_store.update_series('timeseries', 'NBFC_TIMESERIES', [('A', 'aum_cr', 1, 5)], self.path)
+        self.graph.use(old)
+        try:
+            self.aum('A')
+            key_stamps = {k[1] for k in self.graph._views['aum'].entries}
+            self.assertEqual(key_stamps, {(old.stamp('timeseries', 'NBFC_TIMESERIES', 'aum_cr'),)})
+        finally:
+            self.graph.use(None)
+
+    def test_pinned_fragment_rerun_after_reload(self):
+        @self.graph.view('aum_now', metrics('aum_cr'))
+        def aum_now(entity):
+            return self.graph.snapshot()['timeseries']['NBFC_TIMESERIES'][entity]['aum_cr'][-1]
+
+        old = self.registry.current()
+        self.graph.use(old)                          # the full run that defines the fragment
+        try:
+            @self.graph.pinned(old)
+            def fragment():
+                return aum_now('A')
+
+            self.assertEqual(fragment(), 2)
+            nbfc_store.update_series('timeseries', 'NBFC_TIMESERIES', [('A', 'aum_cr', 1, 5)], self.path)
+            self.registry.refresh()                  # hot reload between runs
+
+            # Streamlit reruns a fragment on a new thread, with no snapshot pinned
+            out = []
+            t = threading.Thread(target=lambda: out.append((fragment(), self.graph.snapshot())))
+            t.start()
+            t.join()
+            self.assertEqual(out[0][0], 2)
+            self.assertIs(out[0][1], old)
+            key_stamps = {k[1] for k in self.graph._views['aum_now'].entries}
+            self.assertEqual(key_stamps, {(old.stamp('timeseries', 'NBFC_TIMESERIES', 'aum_cr'),)})
+
+            # the next full run pins the new snapshot and recomputes
+            self.graph.use(self.registry.current())
+            self.assertEqual(aum_now('A'), 5)
+        finally:
+            self.graph.use(None)
+
+
+class TestSeriesViews(unittest.TestCase):
+    """The shared cubes / matrices / insight frame over a full store."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'store.sqlite')
+        nbfc_store.clear_cache()
+        nbfc_store.build(self.path, ['timeseries'])
+        self.registry = nbfc_store.Registry(self.path, poll_interval=0)
+        self.graph    = nbfc_views.ViewGraph(self.registry)
+        self.views    = nbfc_views.SeriesViews(self.graph)
+
+    def tearDown(self):
+        nbfc_store.clear_cache()
+        self._tmp.cleanup()
+
+    def _call_all(self):
+        v = self.views
+        v.rank_matrices(), v.radar_matrix(), v.radar_matrix('zscore'), v.insight_frame()
+        return {name: s['recomputes'] for name, s in self.graph.stats().items()}
+
+    def _update(self, metric, value):
+        nbfc_store.update_series('timeseries', 'NBFC_TIMESERIES', [('Bajaj Finance', metric, 8, value)], self.path)
+        self.registry.refresh(force=True)
+
+    def test_unrelated_metric_keeps_every_view_cached(self):
+        before = self._call_all()
+        self._update('t1_pct', 99.0)            # read by none of the shared views
+        self.assertEqual(self._call_all(), before)
+
+    def test_metric_update_recomputes_only_its_readers(self):
+        before = self._call_all()
+        self._update('pcr_pct', 99.0)           # radar + insight metric, not a rankings one
+        after = self._call_all()
+        self.assertEqual([name for name in after if after[name] != before[name]],
+                         ['radar_cube', 'radar_matrix', 'insight_frame'])
+        self.assertEqual(self.views.insight_frame()['Bajaj Finance']['pcr_pct'].base, 99.0)
+
+
+if __name__ == '__main__':
+    unittest.main()